@@ -8,6 +8,8 @@ This package provides:
 - apply: Firestore mutation engine with idempotency
 - family: Taxonomy and naming utilities
 - libs: HTTP clients and utilities
+- firestore_client: Shared Firestore client (emulator-aware)
+- catalog_snapshot: Local exercises snapshot for full-catalog scans
 
 Entry points:
 - workers/catalog_worker.py: Cloud Run Job worker
@@ -10,6 +10,10 @@ This is the core mutation engine. It:
 6. Records in journal
 7. Verifies post-state
 
+Bulk mode (bulk=True) applies plans of single-exercise updates (PATCH_FIELDS,
+RENAME_EXERCISE, DEPRECATE_EXERCISE) with prefetched reads and WriteBatch
+commits instead of four round trips per operation.
+
 Key rules:
 - Apply gate is enforced HERE, not by callers
 - Mode controls intent, env var controls capability
@@ -24,9 +28,10 @@ from __future__ import annotations
 
 import logging
 import re
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from google.cloud import firestore
 try:
@@ -35,6 +40,9 @@ except ImportError:
     # Fallback for different google-cloud-core versions
     from google.api_core.exceptions import AlreadyExists
 
+from app.family.cache import get_family_cache
+from app.family.counts import adjust_family_counts, family_count_deltas
+from app.firestore_client import MAX_BATCH_WRITES, get_documents, get_firestore_client
 from app.plans.models import ChangePlan, Operation, OperationType
 from app.apply.idempotency import IdempotencyGuard
 from app.apply.journal import ChangeJournal
@@ -44,6 +52,7 @@ from app.apply.paths import (
     validate_patch_paths,
     flatten_for_firestore,
     get_in,
+    apply_patch,
 )
 
 logger = logging.getLogger(__name__)
@@ -58,16 +67,17 @@ DOC_ID_SEPARATOR = "-"
 DOC_ID_PATTERN = re.compile(r'^[a-z0-9_-]+$')
 DOC_ID_MAX_LENGTH = 128
 
-# Initialize Firestore client lazily
-_db: Optional[firestore.Client] = None
+# Operation types bulk mode applies; plans with anything else run per-op
+BULK_OP_TYPES = frozenset({
+    OperationType.PATCH_FIELDS,
+    OperationType.RENAME_EXERCISE,
+    OperationType.DEPRECATE_EXERCISE,
+})
 
 
 def _get_db() -> firestore.Client:
-    """Get or initialize Firestore client."""
-    global _db
-    if _db is None:
-        _db = firestore.Client()
-    return _db
+    """Get the shared Firestore client."""
+    return get_firestore_client()
 
 
 def derive_deterministic_doc_id(family_slug: str, name_slug: str) -> str:
@@ -96,6 +106,62 @@ def derive_deterministic_doc_id(family_slug: str, name_slug: str) -> str:
     return doc_id
 
 
+def build_exercise_update(
+    op: Operation,
+    before_data: Dict[str, Any],
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """
+    Build the Firestore update for a single-exercise operation.
+    
+    Shared by the per-op handlers and bulk mode.
+    
+    Args:
+        op: RENAME_EXERCISE, PATCH_FIELDS or DEPRECATE_EXERCISE operation
+        before_data: Current exercise document
+        
+    Returns:
+        (update, journal_before, journal_after)
+    """
+    now = datetime.utcnow()
+    
+    if op.op_type == OperationType.RENAME_EXERCISE:
+        update = {
+            "name": op.after.get("name"),
+            "name_slug": op.after.get("name_slug"),
+            "updated_at": now,
+        }
+        before = {"name": before_data.get("name"), "name_slug": before_data.get("name_slug")}
+        return update, before, update
+    
+    if op.op_type == OperationType.PATCH_FIELDS:
+        # Convert patch to Firestore format (dotted paths + DELETE_FIELD)
+        update = flatten_for_firestore(op.patch)
+        update["updated_at"] = now
+        before = {path: get_in(before_data, path) for path in op.patch.keys()}
+        return update, before, op.patch
+    
+    if op.op_type == OperationType.DEPRECATE_EXERCISE:
+        update = {
+            "status": "deprecated",
+            "deprecated_at": now,
+            "updated_at": now,
+        }
+        return update, {"status": before_data.get("status")}, update
+    
+    raise ValueError(f"No exercise update for {op.op_type}")
+
+
+def _missing_fields_error(op: Operation) -> Optional[Dict[str, Any]]:
+    """INVALID_OP error if a single-exercise operation lacks required fields."""
+    if op.op_type == OperationType.RENAME_EXERCISE and (not op.targets or not op.after):
+        return {"code": "INVALID_OP", "message": "Missing targets or after"}
+    if op.op_type == OperationType.PATCH_FIELDS and (not op.targets or not op.patch):
+        return {"code": "INVALID_OP", "message": "Missing targets or patch"}
+    if op.op_type == OperationType.DEPRECATE_EXERCISE and not op.targets:
+        return {"code": "INVALID_OP", "message": "Missing targets"}
+    return None
+
+
 @dataclass
 class ApplyResult:
     """Result of applying a Change Plan."""
@@ -167,6 +233,12 @@ class ApplyEngine:
         REASSIGN_FAMILY     -> Bulk update family_slug
         UPDATE_FAMILY_REGISTRY -> Updates exercise_families collection
 
+    BULK MODE (bulk=True):
+        - One get_all for idempotency keys, one for before-images
+        - Each update is committed in the same WriteBatch as its idempotency
+          record; a batch that fails to commit is re-run op by op
+        - Plans with ops outside BULK_OP_TYPES fall back to per-op apply
+
     GOTCHAS:
         - DELETE_SENTINEL ("__DELETE__") maps to firestore.DELETE_FIELD
         - CREATE_EXERCISE uses doc ID collision for idempotency (not transactions)
@@ -183,6 +255,7 @@ class ApplyEngine:
         job_id: str,
         mode: str = "dry_run",
         attempt_id: Optional[str] = None,
+        bulk: bool = False,
     ):
         """
         Initialize engine for a job.
@@ -191,13 +264,19 @@ class ApplyEngine:
             job_id: Job ID
             mode: 'apply' or 'dry_run' (default: dry_run)
             attempt_id: Attempt ID
+            bulk: Use prefetched reads and batched writes where possible
         """
         self.job_id = job_id
         self.mode = mode
         self.attempt_id = attempt_id
+        self.bulk = bulk
         self.db = _get_db()
         self.idempotency = IdempotencyGuard(job_id)
         self.journal = ChangeJournal(job_id, attempt_id)
+        # Doc IDs / family slugs written, for family cache invalidation
+        self._touched: set = set()
+        # Pending catalog_family_counts deltas, committed in _finish
+        self._family_deltas: Counter = Counter()
     
     def apply(self, plan: ChangePlan) -> ApplyResult:
         """
@@ -245,6 +324,8 @@ class ApplyEngine:
             )
         
         # Apply mutations
+        if self.bulk:
+            return self._apply_mutations_bulk(plan)
         result = self._apply_mutations(plan)
         return result
     
@@ -294,38 +375,94 @@ class ApplyEngine:
         """Apply all mutations in the plan."""
         result = ApplyResult(success=True, mode=self.mode)
         
+        # One get_all resolves which ops a retried job can skip
+        self.idempotency.prefetch(self._idempotency_keys(plan).values())
+        
         for idx, operation in enumerate(plan.operations):
             if operation.op_type == OperationType.NO_CHANGE:
                 result.skipped_count += 1
                 continue
             
+            self._apply_and_count(result, idx, operation)
+        
+        return self._finish(result)
+    
+    def _idempotency_keys(self, plan: ChangePlan) -> Dict[int, str]:
+        """Idempotency key per operation index (NO_CHANGE ops excluded)."""
+        return {
+            idx: self.idempotency.compute_key(op.idempotency_key_seed or f"op_{idx}", idx)
+            for idx, op in enumerate(plan.operations)
+            if op.op_type != OperationType.NO_CHANGE
+        }
+    
+    def _apply_and_count(self, result: ApplyResult, idx: int, operation: Operation) -> None:
+        """Apply one operation and add its outcome to result."""
+        try:
+            op_result = self._apply_operation(idx, operation)
+        except Exception as e:
+            logger.exception("Operation %d failed: %s", idx, e)
+            result.failed_count += 1
+            result.errors.append({
+                "operation_index": idx,
+                "error": str(e),
+                "type": type(e).__name__,
+            })
+            return
+        
+        self._count(result, idx, operation, op_result)
+    
+    def _count(
+        self,
+        result: ApplyResult,
+        idx: int,
+        operation: Operation,
+        op_result: Dict[str, Any],
+    ) -> None:
+        """Add one operation's outcome to result."""
+        if op_result.get("skipped"):
+            result.skipped_count += 1
+        elif op_result.get("success"):
+            result.applied_count += 1
+            self._touched.update(operation.targets)
+            if isinstance(operation.patch, dict):
+                for key in ("family_slug", "exercise_id"):
+                    if isinstance(operation.patch.get(key), str):
+                        self._touched.add(operation.patch[key])
+            if op_result.get("doc_id"):
+                self._touched.add(op_result["doc_id"])
+            result.operations_applied.append({
+                "index": idx,
+                "op_type": operation.op_type.value,
+                "targets": operation.targets,
+                "doc_id": op_result.get("doc_id"),
+            })
+        else:
+            result.failed_count += 1
+            result.errors.append(op_result.get("error", {}))
+    
+    def _track_family_counts(
+        self,
+        before: Optional[Dict[str, Any]],
+        after: Optional[Dict[str, Any]],
+    ) -> None:
+        """Queue family count deltas for one exercise write."""
+        self._family_deltas.update(family_count_deltas(before, after))
+    
+    def _finish(self, result: ApplyResult) -> ApplyResult:
+        """Save the journal, update family counts and caches, set overall success."""
+        if self._touched:
+            get_family_cache().invalidate_targets(self._touched)
+            self._touched = set()
+        
+        if self._family_deltas:
             try:
-                op_result = self._apply_operation(idx, operation)
-                
-                if op_result.get("skipped"):
-                    result.skipped_count += 1
-                elif op_result.get("success"):
-                    result.applied_count += 1
-                    result.operations_applied.append({
-                        "index": idx,
-                        "op_type": operation.op_type.value,
-                        "targets": operation.targets,
-                        "doc_id": op_result.get("doc_id"),
-                    })
-                else:
-                    result.failed_count += 1
-                    result.errors.append(op_result.get("error", {}))
-                    
+                adjust_family_counts(self._family_deltas, db=self.db)
             except Exception as e:
-                logger.exception("Operation %d failed: %s", idx, e)
-                result.failed_count += 1
-                result.errors.append({
-                    "operation_index": idx,
-                    "error": str(e),
-                    "type": type(e).__name__,
-                })
-        
-        # Save journal
+                # Counts are derived data; rebuild-family-counts repairs drift
+                logger.warning("Family count update failed for %s: %s",
+                               dict(self._family_deltas), e)
+            self._family_deltas = Counter()
+        
         result.change_id = self.journal.save(
             result_summary=f"Applied {result.applied_count}, skipped {result.skipped_count}, failed {result.failed_count}"
         )
@@ -333,6 +470,131 @@ class ApplyEngine:
         result.success = result.failed_count == 0
         return result
     
+    def _apply_mutations_bulk(self, plan: ChangePlan) -> ApplyResult:
+        """
+        Apply single-exercise updates with prefetched reads and batched writes.
+        
+        Same per-op outcomes as _apply_mutations: idempotency hits are
+        skipped, missing docs and malformed ops fail (and are recorded as
+        failed), everything else is applied and journaled.
+        """
+        pending = [
+            (idx, op) for idx, op in enumerate(plan.operations)
+            if op.op_type != OperationType.NO_CHANGE
+        ]
+        unsupported = {op.op_type.value for _, op in pending if op.op_type not in BULK_OP_TYPES}
+        if unsupported:
+            logger.info("Bulk apply not supported for %s, applying per operation",
+                        sorted(unsupported))
+            return self._apply_mutations(plan)
+        
+        result = ApplyResult(success=True, mode=self.mode)
+        result.skipped_count = len(plan.operations) - len(pending)
+        
+        # Prefetch idempotency records (one get_all)
+        keys = self._idempotency_keys(plan)
+        executed = self.idempotency.prefetch(keys.values())
+        
+        to_apply = []
+        for idx, op in pending:
+            if keys[idx] in executed:
+                logger.info("Skipping operation %d (already executed)", idx)
+                result.skipped_count += 1
+            else:
+                to_apply.append((idx, op))
+        
+        # Prefetch before-images (one get_all)
+        current = {
+            doc.id: doc.to_dict()
+            for doc in get_documents(
+                EXERCISES_COLLECTION,
+                [op.targets[0] for _, op in to_apply if op.targets],
+                db=self.db,
+            )
+        }
+        
+        # Stage every op: (idx, op, update-or-None, op_result, journal before,
+        # journal after, family count deltas)
+        staged = []
+        for idx, op in to_apply:
+            error = _missing_fields_error(op)
+            if error is None and op.targets[0] not in current:
+                error = {"code": "DOC_NOT_FOUND", "message": f"Exercise {op.targets[0]} not found"}
+            if error is not None:
+                staged.append((idx, op, None, {"success": False, "error": error}, None, None, {}))
+                continue
+            
+            doc_id = op.targets[0]
+            before_data = current[doc_id]
+            update, before, after = build_exercise_update(op, before_data)
+            # Later ops on the same doc see this op's result, as in per-op mode
+            if op.op_type == OperationType.PATCH_FIELDS:
+                current[doc_id] = apply_patch(before_data, op.patch)
+            else:
+                current[doc_id] = {**before_data, **update}
+            deltas = family_count_deltas(before_data, current[doc_id])
+            staged.append((idx, op, update, {"success": True}, before, after, deltas))
+        
+        # Commit in WriteBatches, keeping each op's writes together
+        chunk: List[tuple] = []
+        writes = 0
+        for entry in staged:
+            entry_writes = 2 if entry[2] is not None else 1
+            if chunk and writes + entry_writes > MAX_BATCH_WRITES:
+                self._commit_bulk_chunk(result, chunk, keys)
+                chunk, writes = [], 0
+            chunk.append(entry)
+            writes += entry_writes
+        if chunk:
+            self._commit_bulk_chunk(result, chunk, keys)
+        
+        logger.info("Bulk applied %d operations (%d skipped, %d failed)",
+                    result.applied_count, result.skipped_count, result.failed_count)
+        return self._finish(result)
+    
+    def _commit_bulk_chunk(
+        self,
+        result: ApplyResult,
+        chunk: List[tuple],
+        keys: Dict[int, str],
+    ) -> None:
+        """Commit one WriteBatch of staged ops; re-run them per-op if it fails."""
+        batch = self.db.batch()
+        for idx, op, update, _, _, _, _ in chunk:
+            if update is not None:
+                batch.update(self.db.collection(EXERCISES_COLLECTION).document(op.targets[0]), update)
+        self.idempotency.record_many(
+            (
+                (keys[idx], op.op_type.value, op.targets,
+                 "success" if op_result.get("success") else "failed")
+                for idx, op, _, op_result, _, _, _ in chunk
+            ),
+            batch=batch,
+        )
+        
+        try:
+            batch.commit()
+        except Exception as e:
+            logger.warning("Bulk commit of %d operations failed, applying per operation: %s",
+                           len(chunk), e)
+            for idx, op, _, _, _, _, _ in chunk:
+                self._apply_and_count(result, idx, op)
+            return
+        
+        for idx, op, update, op_result, before, after, deltas in chunk:
+            self._family_deltas.update(deltas)
+            if update is not None:
+                self.journal.record_operation(
+                    operation_index=idx,
+                    operation_type=op.op_type.value,
+                    targets=[op.targets[0]],
+                    before=before,
+                    after=after,
+                    idempotency_key=op.idempotency_key_seed,
+                    rationale=op.rationale,
+                )
+            self._count(result, idx, op, op_result)
+    
     def _apply_operation(self, idx: int, operation: Operation) -> Dict[str, Any]:
         """Apply a single operation."""
         # Check idempotency
@@ -389,11 +651,7 @@ class ApplyEngine:
         before_data = before_doc.to_dict()
         
         # Use dotted path update
-        update = {
-            "name": op.after.get("name"),
-            "name_slug": op.after.get("name_slug"),
-            "updated_at": datetime.utcnow(),
-        }
+        update, before, after = build_exercise_update(op, before_data)
         
         doc_ref.update(update)
         
@@ -401,8 +659,8 @@ class ApplyEngine:
             operation_index=idx,
             operation_type=op.op_type.value,
             targets=[doc_id],
-            before={"name": before_data.get("name"), "name_slug": before_data.get("name_slug")},
-            after=update,
+            before=before,
+            after=after,
             idempotency_key=op.idempotency_key_seed,
             rationale=op.rationale,
         )
@@ -424,23 +682,19 @@ class ApplyEngine:
         
         before_data = before_doc.to_dict()
         
-        # Convert patch to Firestore format (dotted paths + DELETE_FIELD)
-        update = flatten_for_firestore(op.patch)
-        update["updated_at"] = datetime.utcnow()
+        # Dotted paths + DELETE_FIELD; before values recorded for journal
+        update, before, after = build_exercise_update(op, before_data)
         
         doc_ref.update(update)
-        
-        # Record before values for journal
-        before_values = {}
-        for path in op.patch.keys():
-            before_values[path] = get_in(before_data, path)
+        if "family_slug" in op.patch:
+            self._track_family_counts(before_data, apply_patch(before_data, op.patch))
         
         self.journal.record_operation(
             operation_index=idx,
             operation_type=op.op_type.value,
             targets=[doc_id],
-            before=before_values,
-            after=op.patch,
+            before=before,
+            after=after,
             idempotency_key=op.idempotency_key_seed,
             rationale=op.rationale,
         )
@@ -588,6 +842,7 @@ class ApplyEngine:
                 logger.info("Exercise %s already exists (idempotent create)", doc_id)
                 return {"success": True, "skipped": True, "doc_id": doc_id}
             raise
+        self._track_family_counts(None, exercise_data)
         
         self.journal.record_operation(
             operation_index=idx,
@@ -616,11 +871,7 @@ class ApplyEngine:
         
         before_data = before_doc.to_dict()
         
-        update = {
-            "status": "deprecated",
-            "deprecated_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow(),
-        }
+        update, before, after = build_exercise_update(op, before_data)
         
         doc_ref.update(update)
         
@@ -628,8 +879,8 @@ class ApplyEngine:
             operation_index=idx,
             operation_type=op.op_type.value,
             targets=[doc_id],
-            before={"status": before_data.get("status")},
-            after=update,
+            before=before,
+            after=after,
             idempotency_key=op.idempotency_key_seed,
             rationale=op.rationale,
         )
@@ -646,12 +897,24 @@ class ApplyEngine:
         if not new_family_slug:
             return {"success": False, "error": {"code": "INVALID_OP", "message": "Missing family_slug in patch"}}
         
+        # Current family of every target (one get_all) for family counts
+        current = {
+            doc.id: doc.to_dict()
+            for doc in get_documents(
+                EXERCISES_COLLECTION, op.targets,
+                field_paths=["family_slug"], db=self.db,
+            )
+        }
+        
         for doc_id in op.targets:
             doc_ref = self.db.collection(EXERCISES_COLLECTION).document(doc_id)
             doc_ref.update({
                 "family_slug": new_family_slug,
                 "updated_at": datetime.utcnow(),
             })
+            before_data = current.get(doc_id)
+            if before_data is not None:
+                self._track_family_counts(before_data, {**before_data, "family_slug": new_family_slug})
         
         self.journal.record_operation(
             operation_index=idx,
@@ -712,6 +975,7 @@ def apply_change_plan(
     job_id: Optional[str] = None,
     attempt_id: Optional[str] = None,
     verify: bool = False,
+    bulk: bool = False,
 ) -> ApplyResult:
     """
     Apply a Change Plan.
@@ -724,6 +988,7 @@ def apply_change_plan(
         job_id: Job ID (defaults to plan.job_id)
         attempt_id: Attempt ID
         verify: If True, run post-verification after apply
+        bulk: If True, use bulk mode (prefetched reads, batched writes)
         
     Returns:
         ApplyResult
@@ -732,7 +997,7 @@ def apply_change_plan(
         ApplyGateError: If mode='apply' but env gate not enabled
     """
     job_id = job_id or plan.job_id
-    engine = ApplyEngine(job_id, mode=mode, attempt_id=attempt_id)
+    engine = ApplyEngine(job_id, mode=mode, attempt_id=attempt_id, bulk=bulk)
     
     if verify:
         return engine.apply_with_verify(plan)
@@ -811,6 +1076,8 @@ __all__ = [
     "apply_change_plan",
     "ApplyResult",
     "ApplyGateError",
+    "BULK_OP_TYPES",
     "DELETE_SENTINEL",
+    "build_exercise_update",
     "derive_deterministic_doc_id",
 ]
@@ -5,16 +5,21 @@ Uses catalog_idempotency/{key} collection to track completed operations.
 Operations with matching idempotency keys are skipped.
 
 Key format: {job_id}:{operation_index}:{content_hash}
+
+For whole plans, prefetch() resolves every key with one get_all and
+record_many() writes records in batches, instead of one RPC per key.
 """
 
 from __future__ import annotations
 
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from google.cloud import firestore
 
+from app.firestore_client import MAX_BATCH_WRITES, get_documents, get_firestore_client
+
 logger = logging.getLogger(__name__)
 
 # Collection name
@@ -23,16 +28,13 @@ IDEMPOTENCY_COLLECTION = "catalog_idempotency"
 # TTL for idempotency records (7 days)
 IDEMPOTENCY_TTL_DAYS = 7
 
-# Initialize Firestore client lazily
-_db: Optional[firestore.Client] = None
+# (key, operation_type, targets, result) for record_many()
+ExecutionRecord = Tuple[str, str, list, str]
 
 
 def _get_db() -> firestore.Client:
-    """Get or initialize Firestore client."""
-    global _db
-    if _db is None:
-        _db = firestore.Client()
-    return _db
+    """Get the shared Firestore client."""
+    return get_firestore_client()
 
 
 class IdempotencyGuard:
@@ -52,6 +54,7 @@ class IdempotencyGuard:
         self.job_id = job_id
         self.db = _get_db()
         self._checked: Dict[str, bool] = {}
+        self._pending: List[Tuple[Any, Dict[str, Any]]] = []
     
     def compute_key(self, idempotency_seed: str, operation_index: int) -> str:
         """
@@ -90,12 +93,58 @@ class IdempotencyGuard:
         
         return result
     
+    def prefetch(self, keys: Iterable[str]) -> Set[str]:
+        """
+        Resolve many keys with one get_all.
+        
+        Later is_executed() calls for these keys are answered from memory.
+        
+        Args:
+            keys: Idempotency keys
+            
+        Returns:
+            Keys that were already executed
+        """
+        keys = list(keys)
+        unknown = [key for key in dict.fromkeys(keys) if key not in self._checked]
+        if unknown:
+            found = {
+                doc.id for doc in get_documents(
+                    IDEMPOTENCY_COLLECTION, unknown, field_paths=["result"], db=self.db,
+                )
+            }
+            for key in unknown:
+                self._checked[key] = key in found
+            if found:
+                logger.info("Idempotency prefetch: %d of %d keys already executed",
+                            len(found), len(unknown))
+        
+        return {key for key in keys if self._checked.get(key)}
+    
+    def _record_data(
+        self,
+        key: str,
+        operation_type: str,
+        targets: list,
+        result: str,
+    ) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "key": key,
+            "operation_type": operation_type,
+            "targets": targets,
+            "result": result,
+            "executed_at": datetime.utcnow(),
+            "expires_at": datetime.utcnow() + timedelta(days=IDEMPOTENCY_TTL_DAYS),
+        }
+    
     def record_execution(
         self,
         key: str,
         operation_type: str,
         targets: list,
         result: str = "success",
+        batch: Optional[firestore.WriteBatch] = None,
     ) -> bool:
         """
         Record that an operation was executed.
@@ -105,21 +154,18 @@ class IdempotencyGuard:
             operation_type: Type of operation
             targets: Affected targets
             result: Execution result
+            batch: Stage the write in this batch instead of writing now
             
         Returns:
             True if recorded successfully
         """
         doc_ref = self.db.collection(IDEMPOTENCY_COLLECTION).document(key)
+        data = self._record_data(key, operation_type, targets, result)
         
-        data = {
-            "job_id": self.job_id,
-            "key": key,
-            "operation_type": operation_type,
-            "targets": targets,
-            "result": result,
-            "executed_at": datetime.utcnow(),
-            "expires_at": datetime.utcnow() + timedelta(days=IDEMPOTENCY_TTL_DAYS),
-        }
+        if batch is not None:
+            # Only executed once the caller commits the batch
+            batch.set(doc_ref, data)
+            return True
         
         doc_ref.set(data)
         self._checked[key] = True
@@ -127,6 +173,65 @@ class IdempotencyGuard:
         logger.debug("Recorded idempotency: %s", key)
         return True
     
+    def record_many(
+        self,
+        records: Iterable[ExecutionRecord],
+        batch: Optional[firestore.WriteBatch] = None,
+        flush: bool = True,
+    ) -> int:
+        """
+        Record many executions.
+        
+        With a batch, the writes are staged in it (the caller commits, as in
+        record_execution). Otherwise they are buffered and, unless
+        flush=False, written by flush() in batches of 500.
+        
+        Args:
+            records: (key, operation_type, targets, result) tuples
+            batch: Stage the writes in this batch instead
+            flush: Flush the buffer now
+            
+        Returns:
+            Number of records staged or buffered
+        """
+        count = 0
+        for key, operation_type, targets, result in records:
+            doc_ref = self.db.collection(IDEMPOTENCY_COLLECTION).document(key)
+            data = self._record_data(key, operation_type, targets, result)
+            if batch is not None:
+                batch.set(doc_ref, data)
+            else:
+                self._pending.append((doc_ref, data))
+            count += 1
+        
+        if batch is None and flush:
+            self.flush()
+        return count
+    
+    def flush(self) -> int:
+        """
+        Write buffered records in batches of MAX_BATCH_WRITES.
+        
+        Returns:
+            Number of records written
+        """
+        written = 0
+        while self._pending:
+            chunk = self._pending[:MAX_BATCH_WRITES]
+            batch = self.db.batch()
+            for doc_ref, data in chunk:
+                batch.set(doc_ref, data)
+            batch.commit()
+            
+            del self._pending[:len(chunk)]
+            for doc_ref, data in chunk:
+                self._checked[data["key"]] = True
+            written += len(chunk)
+        
+        if written:
+            logger.debug("Flushed %d idempotency records", written)
+        return written
+    
     def check_and_record(
         self,
         idempotency_seed: str,
@@ -19,21 +19,17 @@ from typing import Any, Dict, List, Optional
 
 from google.cloud import firestore
 
+from app.firestore_client import get_firestore_client
+
 logger = logging.getLogger(__name__)
 
 # Collection name
 CHANGES_COLLECTION = "catalog_changes"
 
-# Initialize Firestore client lazily
-_db: Optional[firestore.Client] = None
-
 
 def _get_db() -> firestore.Client:
-    """Get or initialize Firestore client."""
-    global _db
-    if _db is None:
-        _db = firestore.Client()
-    return _db
+    """Get the shared Firestore client."""
+    return get_firestore_client()
 
 
 class ChangeJournal:
@@ -0,0 +1,422 @@
+"""
+Catalog Snapshot - Local copy of the exercises collection for full-catalog scans.
+
+The scheduled review, quality scan, batch enrichment script, dedup-catalog
+and export_exercises each paged through the whole exercises collection on
+every run. They now read through fetch_exercises(), which serves a local
+snapshot file and only downloads what changed since it was written.
+
+Refresh:
+- Full export when there is no snapshot, it targets another project, or
+  it is older than CATALOG_SNAPSHOT_MAX_AGE_SECS
+- Otherwise incremental: one range query per CHANGE_FIELDS field for docs
+  stamped after the snapshot's high-water mark (minus an overlap window
+  for writer clock skew), then a count() aggregation of the collection.
+  When the count disagrees with the snapshot, a keys-only scan finds the
+  deleted docs to drop (and any unstamped new docs to fetch)
+
+Writers must stamp what they change: content writes set updated_at,
+review/scan pipeline writes set review_metadata.updated_at (kept separate
+so pipeline bookkeeping doesn't look like content churn).
+
+File format: gzip-compressed JSON (datetimes tagged), written atomically.
+Set CATALOG_SNAPSHOT=false to always read Firestore directly. The snapshot
+only pays off where the file survives between runs (a workstation, a
+mounted volume via CATALOG_SNAPSHOT_PATH). Cloud Run Jobs start with an
+empty /tmp, so the scheduled review and quality scan jobs turn it off and
+rely on their change feed (app/reviewer/change_feed.py) instead.
+"""
+
+from __future__ import annotations
+
+import copy
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
+
+logger = logging.getLogger(__name__)
+
+CATALOG_SNAPSHOT_ENABLED = os.getenv("CATALOG_SNAPSHOT", "true").lower() in ("1", "true", "yes", "on")
+CATALOG_SNAPSHOT_PATH = os.getenv(
+    "CATALOG_SNAPSHOT_PATH",
+    os.path.join(tempfile.gettempdir(), "catalog_snapshot.json.gz"),
+)
+CATALOG_SNAPSHOT_MAX_AGE_SECS = int(os.getenv("CATALOG_SNAPSHOT_MAX_AGE_SECS", "86400"))
+
+EXERCISES_COLLECTION = "exercises"
+
+# Timestamps that mark a changed exercise
+CHANGE_FIELDS = ("updated_at", "review_metadata.updated_at")
+
+# Re-read this far behind the high-water mark (writers stamp with their own clocks)
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+# Page size for the full export
+EXPORT_PAGE_SIZE = 500
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+@dataclass
+class RefreshResult:
+    """What a refresh downloaded."""
+    full: bool
+    fetched: int
+    changed: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    duration_ms: int = 0
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    raise TypeError(f"Not serializable: {type(value).__name__}")
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1 and "$dt" in obj:
+        return datetime.fromisoformat(obj["$dt"])
+    return obj
+
+
+def _get_path(data: Dict[str, Any], dotted: str) -> Any:
+    for part in dotted.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
+
+
+def _as_utc(value: Any) -> Optional[datetime]:
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class CatalogSnapshot:
+    """
+    Exercise documents by doc ID, persisted to a local file.
+
+    exercises() and get() return copies; callers may mutate them.
+    """
+
+    def __init__(
+        self,
+        path: str = CATALOG_SNAPSHOT_PATH,
+        db: Optional["firestore.Client"] = None,
+        max_age_secs: int = CATALOG_SNAPSHOT_MAX_AGE_SECS,
+    ):
+        self.path = path
+        self._db = db
+        self.max_age_secs = max_age_secs
+        self._lock = threading.Lock()
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self.high_water: Optional[datetime] = None
+        self.full_at: Optional[datetime] = None
+        self.project: Optional[str] = None
+
+    @property
+    def db(self) -> "firestore.Client":
+        if self._db is None:
+            from app.firestore_client import get_firestore_client
+            self._db = get_firestore_client()
+        return self._db
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+
+    def exercises(self, max_exercises: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Exercises ordered by name, each with id and doc_id set.
+
+        Args:
+            max_exercises: Return at most this many
+
+        Returns:
+            List of exercise dicts
+        """
+        with self._lock:
+            ordered = sorted(self.docs.items(), key=lambda item: (item[1].get("name") or "", item[0]))
+            if max_exercises is not None:
+                ordered = ordered[:max_exercises]
+            result = []
+            for doc_id, data in ordered:
+                data = copy.deepcopy(data)
+                data["id"] = doc_id
+                data["doc_id"] = doc_id
+                result.append(data)
+        return result
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """One exercise document, or None."""
+        with self._lock:
+            data = self.docs.get(doc_id)
+            return copy.deepcopy(data) if data is not None else None
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    # -------------------------------------------------------------------------
+    # Refresh
+    # -------------------------------------------------------------------------
+
+    def refresh(self, full: bool = False) -> RefreshResult:
+        """
+        Bring the snapshot up to date and save it.
+
+        Args:
+            full: Force a full export
+
+        Returns:
+            RefreshResult (changed lists the doc IDs downloaded incrementally,
+            deleted the doc IDs dropped)
+        """
+        start = time.monotonic()
+        if not self.docs and not full:
+            self.load()
+
+        project = getattr(self.db, "project", None)
+        age = (
+            (datetime.now(timezone.utc) - self.full_at).total_seconds()
+            if self.full_at else None
+        )
+        if (
+            full
+            or self.high_water is None
+            or self.project != project
+            or age is None
+            or age > self.max_age_secs
+        ):
+            result = self._full_refresh()
+        else:
+            result = self._incremental_refresh()
+        self.project = project
+
+        if result.full or result.fetched or result.deleted:
+            self.save()
+        result.duration_ms = int((time.monotonic() - start) * 1000)
+        logger.info(
+            "Catalog snapshot refreshed (%s): %d fetched, %d deleted, %d exercises, %dms",
+            "full" if result.full else "incremental", result.fetched, len(result.deleted),
+            len(self.docs), result.duration_ms,
+        )
+        return result
+
+    def _full_refresh(self) -> RefreshResult:
+        started = datetime.now(timezone.utc)
+        docs: Dict[str, Dict[str, Any]] = {}
+        last_doc = None
+        while True:
+            query = self.db.collection(EXERCISES_COLLECTION).order_by("__name__").limit(EXPORT_PAGE_SIZE)
+            if last_doc is not None:
+                query = query.start_after(last_doc)
+            page = list(query.stream())
+            for doc in page:
+                docs[doc.id] = doc.to_dict() or {}
+            if len(page) < EXPORT_PAGE_SIZE:
+                break
+            last_doc = page[-1]
+
+        with self._lock:
+            self.docs = docs
+            self.high_water = self._max_stamp(docs.values()) or started
+            self.full_at = started
+        return RefreshResult(full=True, fetched=len(docs))
+
+    def _incremental_refresh(self) -> RefreshResult:
+        since = self.high_water - REFRESH_OVERLAP
+        changed: Dict[str, Dict[str, Any]] = {}
+        for change_field in CHANGE_FIELDS:
+            query = self.db.collection(EXERCISES_COLLECTION).where(change_field, ">", since)
+            for doc in query.stream():
+                changed[doc.id] = doc.to_dict() or {}
+
+        # The overlap window re-reads recent docs; only report real changes
+        with self._lock:
+            new_ids = [doc_id for doc_id, data in changed.items() if self.docs.get(doc_id) != data]
+            self.docs.update(changed)
+            stamp = self._max_stamp(changed.values())
+            if stamp and stamp > self.high_water:
+                self.high_water = stamp
+
+        deleted, added = self._reconcile_ids()
+        with self._lock:
+            for doc_id in deleted:
+                self.docs.pop(doc_id, None)
+            self.docs.update(added)
+        new_ids += [doc_id for doc_id in added if doc_id not in changed]
+        return RefreshResult(
+            full=False, fetched=len(changed) + len(added), changed=new_ids, deleted=deleted,
+        )
+
+    def _reconcile_ids(self) -> Tuple[List[str], Dict[str, Dict[str, Any]]]:
+        """
+        Deleted doc IDs, and unstamped docs missing from the snapshot.
+
+        Deletes leave no timestamp to query for. A count() aggregation
+        (one read per 1,000 docs) checks the snapshot still matches the
+        collection; only on a mismatch does a keys-only scan list the IDs.
+        """
+        from app.firestore_client import count_query, get_documents
+
+        coll = self.db.collection(EXERCISES_COLLECTION)
+        if count_query(coll) == len(self.docs):
+            return [], {}
+
+        live: List[str] = []
+        last_doc = None
+        while True:
+            query = coll.order_by("__name__").select(["__name__"]).limit(EXPORT_PAGE_SIZE)
+            if last_doc is not None:
+                query = query.start_after(last_doc)
+            page = list(query.stream())
+            live.extend(doc.id for doc in page)
+            if len(page) < EXPORT_PAGE_SIZE:
+                break
+            last_doc = page[-1]
+
+        live_ids = set(live)
+        with self._lock:
+            deleted = sorted(doc_id for doc_id in self.docs if doc_id not in live_ids)
+            unknown = [doc_id for doc_id in live if doc_id not in self.docs]
+        added = {
+            doc.id: doc.to_dict() or {}
+            for doc in get_documents(EXERCISES_COLLECTION, unknown, db=self.db)
+        }
+        if deleted or added:
+            logger.info("Catalog snapshot reconciled: %d deleted, %d unstamped added",
+                        len(deleted), len(added))
+        return deleted, added
+
+    @staticmethod
+    def _max_stamp(docs) -> Optional[datetime]:
+        stamps = [_as_utc(_get_path(data, f)) for data in docs for f in CHANGE_FIELDS]
+        stamps = [stamp for stamp in stamps if stamp is not None]
+        return max(stamps) if stamps else None
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def load(self) -> bool:
+        """Load the snapshot file; False if missing or unreadable."""
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                payload = json.load(f, object_hook=_decode)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning("Ignoring unreadable catalog snapshot %s: %s", self.path, e)
+            return False
+
+        if payload.get("version") != SNAPSHOT_FORMAT_VERSION:
+            return False
+        with self._lock:
+            self.docs = payload.get("docs") or {}
+            self.high_water = payload.get("high_water")
+            self.full_at = payload.get("full_at")
+            self.project = payload.get("project")
+        return True
+
+    def save(self) -> None:
+        """Write the snapshot file atomically."""
+        with self._lock:
+            payload = {
+                "version": SNAPSHOT_FORMAT_VERSION,
+                "project": self.project,
+                "high_water": self.high_water,
+                "full_at": self.full_at,
+                "docs": self.docs,
+            }
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+                    json.dump(payload, f, default=_encode, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+
+
+_snapshot: Optional[CatalogSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_catalog_snapshot(db: Optional["firestore.Client"] = None) -> CatalogSnapshot:
+    """Process-wide CatalogSnapshot, refreshed on first use."""
+    global _snapshot
+    with _snapshot_lock:
+        if _snapshot is None:
+            snapshot = CatalogSnapshot(db=db)
+            snapshot.refresh()
+            _snapshot = snapshot
+    return _snapshot
+
+
+def fetch_exercises(
+    db: Optional["firestore.Client"] = None,
+    max_exercises: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    All exercises ordered by name, each with id and doc_id set.
+
+    Served from the catalog snapshot (refreshed once per process); reads
+    Firestore directly when CATALOG_SNAPSHOT is off or the snapshot fails.
+
+    Args:
+        db: Client to use (default: shared client)
+        max_exercises: Return at most this many
+
+    Returns:
+        List of exercise dicts
+    """
+    if CATALOG_SNAPSHOT_ENABLED:
+        try:
+            return get_catalog_snapshot(db).exercises(max_exercises)
+        except Exception as e:
+            logger.warning("Catalog snapshot unavailable, reading Firestore: %s", e)
+
+    if db is None:
+        from app.firestore_client import get_firestore_client
+        db = get_firestore_client()
+
+    exercises: List[Dict[str, Any]] = []
+    last_doc = None
+    while max_exercises is None or len(exercises) < max_exercises:
+        batch_size = EXPORT_PAGE_SIZE if max_exercises is None else min(EXPORT_PAGE_SIZE, max_exercises - len(exercises))
+        query = db.collection(EXERCISES_COLLECTION).order_by("name").limit(batch_size)
+        if last_doc is not None:
+            query = query.start_after(last_doc)
+        docs = list(query.stream())
+        for doc in docs:
+            data = doc.to_dict()
+            data["id"] = doc.id
+            data["doc_id"] = doc.id
+            exercises.append(data)
+        if len(docs) < batch_size:
+            break
+        last_doc = docs[-1]
+    return exercises
+
+
+__all__ = [
+    "CATALOG_SNAPSHOT_PATH",
+    "CHANGE_FIELDS",
+    "CatalogSnapshot",
+    "RefreshResult",
+    "fetch_exercises",
+    "get_catalog_snapshot",
+]
@@ -4,6 +4,9 @@ Enrichment Module - LLM-backed field population for catalog exercises.
 This module provides:
 - EnrichmentSpec model for defining enrichment jobs
 - LLMClient abstraction for Vertex AI / mock backends
+- Bounded concurrent LLM fan-out with 429 backoff and a shared adaptive
+  concurrency limit
+- Opt-in response cache for deterministic LLM calls
 - Enrichment engine for computing and validating field values
 - Output validators for schema compliance
 
@@ -21,6 +24,18 @@ from app.enrichment.llm_client import (
     MODEL_REASONING,
     MODEL_FAST,
 )
+from app.enrichment.rate_limit import (
+    AdaptiveRateLimitGate,
+    RateLimitGate,
+    RateLimitedLLMClient,
+    get_llm_gate,
+    map_concurrent,
+)
+from app.enrichment.response_cache import (
+    CachedLLMClient,
+    ResponseCache,
+    get_response_cache,
+)
 from app.enrichment.engine import (
     compute_enrichment,
     validate_enrichment,
@@ -45,6 +60,16 @@ __all__ = [
     "get_llm_client",
     "MODEL_REASONING",
     "MODEL_FAST",
+    # Rate limiting
+    "AdaptiveRateLimitGate",
+    "RateLimitGate",
+    "RateLimitedLLMClient",
+    "get_llm_gate",
+    "map_concurrent",
+    # Response cache
+    "CachedLLMClient",
+    "ResponseCache",
+    "get_response_cache",
     # Engine
     "compute_enrichment",
     "validate_enrichment",
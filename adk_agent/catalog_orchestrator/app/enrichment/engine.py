@@ -9,6 +9,10 @@ ENTRY POINTS
       PREFERRED. Pass full exercise doc, LLM decides what to update.
       Returns {"success": bool, "changes": {field: value}, "reasoning": str}
 
+  enrich_exercises_holistic_batch(exercises, reviewer_hint, llm_client) -> List[Dict]
+      Holistic mode with K exercises per LLM call (shared guidance sent once).
+      Falls back to enrich_exercise_holistic per item on parse/validation failure.
+
   compute_enrichment(exercise, spec, llm_client) -> EnrichmentResult
       Single-field enrichment using EnrichmentSpec.
       Legacy mode - use holistic for new code.
@@ -54,9 +58,10 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.enrichment.models import EnrichmentSpec, EnrichmentResult
 from app.enrichment.llm_client import LLMClient, get_llm_client
@@ -230,13 +235,15 @@ def compute_enrichment(
     # Determine if this needs reasoning model
     require_reasoning = spec.requires_reasoning()
     result.model_used = client.get_model_name(require_reasoning)
+    prompt = None
+    output_schema = None
+    raw_response = None
     
     try:
         # Build prompt
         prompt = build_enrichment_prompt(exercise, spec)
         
         # Build output schema for structured output hint
-        output_schema = None
         if spec.output_type == "enum" and spec.allowed_values:
             output_schema = {"type": "string", "enum": spec.allowed_values}
         elif spec.output_type == "number":
@@ -271,11 +278,15 @@ def compute_enrichment(
                 "Enrichment validation failed for %s: %s",
                 exercise_id, validation.errors
             )
+            # Don't serve the rejected value to retries from the response cache
+            client.discard_cached_response(prompt, output_schema, require_reasoning=require_reasoning)
         
     except Exception as e:
         logger.exception("Enrichment failed for %s: %s", exercise_id, e)
         result.success = False
         result.validation_errors = [str(e)]
+        if raw_response is not None:
+            client.discard_cached_response(prompt, output_schema, require_reasoning=require_reasoning)
     
     return result
 
@@ -303,26 +314,59 @@ def compute_enrichment_batch(
     exercises: List[Dict[str, Any]],
     spec: EnrichmentSpec,
     llm_client: Optional[LLMClient] = None,
+    max_concurrency: int = 1,
+    timeout_secs: Optional[float] = None,
 ) -> List[EnrichmentResult]:
     """
     Compute enrichment values for a batch of exercises.
     
-    Processes exercises sequentially (parallel processing can be added later).
+    With max_concurrency > 1 the LLM calls run on a bounded thread pool,
+    drawing from the shared per-model token budget and the process-wide
+    adaptive gate, and backing off on 429s (see app.enrichment.rate_limit).
+    A client that is already a RateLimitedLLMClient is used as is. Results
+    are always in input order.
     
     Args:
         exercises: List of exercise data dicts
         spec: Enrichment specification
         llm_client: LLM client
+        max_concurrency: Concurrent LLM calls (1 = sequential)
+        timeout_secs: Per-exercise timeout; a timed-out exercise gets a
+            failed EnrichmentResult instead of stalling the batch
         
     Returns:
         List of EnrichmentResults
     """
+    from app.enrichment.rate_limit import (
+        RateLimitedLLMClient,
+        get_llm_gate,
+        map_concurrent,
+    )
+    
     client = llm_client or get_llm_client()
-    results = []
+    if max_concurrency > 1 and not isinstance(client, RateLimitedLLMClient):
+        client = RateLimitedLLMClient(client, get_llm_gate())
+    
+    def enrich_one(exercise: Dict[str, Any]) -> EnrichmentResult:
+        return compute_enrichment(exercise, spec, client)
     
-    for exercise in exercises:
-        result = compute_enrichment(exercise, spec, client)
-        results.append(result)
+    def timed_out(exercise: Dict[str, Any]) -> EnrichmentResult:
+        return EnrichmentResult(
+            exercise_id=exercise.get("id", exercise.get("doc_id", "unknown")),
+            spec_id=spec.spec_id,
+            spec_version=spec.spec_version,
+            model_used=client.get_model_name(spec.requires_reasoning()),
+            validation_errors=[f"Timed out after {timeout_secs}s"],
+            computed_at=datetime.utcnow(),
+        )
+    
+    results = map_concurrent(
+        enrich_one,
+        exercises,
+        max_concurrency,
+        timeout_secs=timeout_secs,
+        on_timeout=timed_out,
+    )
     
     # Log summary
     succeeded = sum(1 for r in results if r.success)
@@ -484,6 +528,9 @@ def enrich_field_with_guide(
         Dict with 'success', 'value', 'field_path', and optional 'error'
     """
     client = llm_client or get_llm_client()
+    prompt = None
+    output_schema = None
+    raw_response = None
     
     try:
         # Build prompt using field guide
@@ -493,7 +540,6 @@ def enrich_field_with_guide(
         field_spec = get_field_spec(field_path)
         
         # Build output schema hint
-        output_schema = None
         if field_spec.valid_values:
             output_schema = {"type": "string", "enum": field_spec.valid_values}
         elif field_spec.field_type == "boolean":
@@ -519,6 +565,8 @@ def enrich_field_with_guide(
         
     except Exception as e:
         logger.exception(f"Failed to enrich {field_path}: {e}")
+        if raw_response is not None:
+            client.discard_cached_response(prompt, output_schema)
         return {
             "success": False,
             "error": str(e),
@@ -914,6 +962,29 @@ HOLISTIC_ENRICHMENT_SCHEMA = {
 }
 
 
+# Batched variant: one result per exercise, matched back by exercise_key.
+HOLISTIC_BATCH_ENRICHMENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "exercise_key": {"type": "string"},
+                    **HOLISTIC_ENRICHMENT_SCHEMA["properties"],
+                },
+                "required": ["exercise_key", "changes", "reasoning", "confidence"],
+            },
+        },
+    },
+    "required": ["results"],
+}
+
+# Exercises packed into one batched holistic prompt
+HOLISTIC_BATCH_SIZE = int(os.getenv("ENRICHMENT_HOLISTIC_BATCH_SIZE", "5"))
+
+
 def enrich_exercise_holistic(
     exercise: Dict[str, Any],
     reviewer_hint: str = "",
@@ -969,38 +1040,25 @@ def enrich_exercise_holistic(
     
     client = llm_client or get_llm_client()
     exercise_id = exercise.get("id", exercise.get("doc_id", "unknown"))
+    prefix = prompt = raw_response = None
+
+    def discard_response() -> None:
+        # Keep a rejected response out of the response cache for retries
+        client.discard_cached_response(
+            prompt, {"type": "object"}, HOLISTIC_ENRICHMENT_SCHEMA, use_pro_model, prefix,
+        )
 
     try:
         # Auto-detect missing content fields and style violations
-        auto_hints = []
-
-        missing_fields = _detect_missing_content_fields(exercise)
-        if missing_fields:
-            auto_hints.append(
-                "Missing content fields that MUST be generated: "
-                + ", ".join(missing_fields)
-            )
-
-        style_issues = _detect_style_violations(exercise)
-        if style_issues:
-            auto_hints.append(
-                "Style guide violations that MUST be fixed:\n"
-                + "\n".join(f"- {issue}" for issue in style_issues)
-            )
+        reviewer_hint = _with_auto_hints(exercise, reviewer_hint)
 
-        if auto_hints:
-            auto_hint_text = "\n\n".join(auto_hints)
-            if reviewer_hint:
-                reviewer_hint = f"{reviewer_hint}\n\n{auto_hint_text}"
-            else:
-                reviewer_hint = auto_hint_text
-
-        # Build the prompt
-        prompt = _build_holistic_enrichment_prompt(exercise, reviewer_hint)
+        # Build the prompt (static prefix is served from context cache)
+        prefix, prompt = _build_holistic_enrichment_prompt_parts(exercise, reviewer_hint)
         
         # Call LLM with structured output hint
         # Default to Flash (cheaper), use Pro only when explicitly requested
-        raw_response = client.complete(
+        raw_response = client.complete_with_prefix(
+            prefix=prefix,
             prompt=prompt,
             output_schema={"type": "object"},
             response_schema=HOLISTIC_ENRICHMENT_SCHEMA,
@@ -1009,61 +1067,15 @@ def enrich_exercise_holistic(
         
         # Parse response
         parsed = _parse_holistic_response(raw_response)
+        if parsed.get("parse_failed"):
+            discard_response()
         
-        if not parsed.get("changes"):
-            logger.info(
-                "Holistic enrichment for %s: no changes needed (reasoning: %s)",
-                exercise_id, parsed.get("reasoning", "none")[:100]
-            )
-            return {
-                "success": True,
-                "changes": {},
-                "reasoning": parsed.get("reasoning", "No changes needed"),
-                "confidence": parsed.get("confidence", "high"),
-            }
-        
-        # Filter changes to only enrichable fields (as flat dotted paths)
-        valid_changes = {}
-        for field_path, value in parsed["changes"].items():
-            # Skip locked fields
-            if field_path in LOCKED_FIELDS:
-                logger.warning("Skipping locked field: %s", field_path)
-                continue
-            
-            # Check if field is enrichable
-            if field_path in ENRICHABLE_FIELD_PATHS:
-                valid_changes[field_path] = value
-            else:
-                # Check if it matches a prefix pattern
-                is_valid = False
-                for allowed in ENRICHABLE_FIELD_PATHS:
-                    if field_path.startswith(allowed + "."):
-                        is_valid = True
-                        break
-                
-                if is_valid:
-                    valid_changes[field_path] = value
-                else:
-                    logger.warning("Skipping non-enrichable field: %s", field_path)
-        
-        # Normalize the changes for consistency
-        normalized_changes = normalize_enrichment_output(valid_changes)
-        normalized_changes = validate_normalized_output(normalized_changes)
-
-        logger.info(
-            "Holistic enrichment for %s: %d changes (confidence: %s)",
-            exercise_id, len(normalized_changes), parsed.get("confidence", "unknown")
-        )
-
-        return {
-            "success": True,
-            "changes": normalized_changes,
-            "reasoning": parsed.get("reasoning", ""),
-            "confidence": parsed.get("confidence", "high"),
-        }
+        return _holistic_result_from_parsed(exercise_id, parsed)
         
     except Exception as e:
         logger.exception("Holistic enrichment failed for %s: %s", exercise_id, e)
+        if raw_response is not None:
+            discard_response()
         return {
             "success": False,
             "changes": {},
@@ -1073,11 +1085,228 @@ def enrich_exercise_holistic(
         }
 
 
-def _build_holistic_enrichment_prompt(
-    exercise: Dict[str, Any],
+def enrich_exercises_holistic_batch(
+    exercises: List[Dict[str, Any]],
     reviewer_hint: str = "",
-) -> str:
-    """Build prompt for holistic exercise enrichment."""
+    llm_client: Optional[LLMClient] = None,
+    use_pro_model: bool = False,
+    batch_size: int = HOLISTIC_BATCH_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Holistically enrich several exercises with one LLM call per batch.
+
+    The guidance, golden example and rules that dominate a holistic prompt are
+    sent once per batch of `batch_size` exercises instead of once per exercise.
+    Each exercise's result goes through the same filter → normalize → validate
+    steps as enrich_exercise_holistic().
+
+    FALLBACK:
+        An exercise is re-run alone via enrich_exercise_holistic() when the
+        batch call fails, the response can't be parsed, its result is missing
+        or malformed, or validation drops any of its fields.
+
+    Args:
+        exercises: Full exercise documents
+        reviewer_hint: Optional hint applied to every exercise
+        llm_client: LLM client (uses default if not provided)
+        use_pro_model: If True, use gemini-2.5-pro; if False (default), use gemini-2.5-flash
+        batch_size: Exercises per LLM call (1 = same as enrich_exercise_holistic)
+
+    Returns:
+        One result dict per exercise, in input order, shaped like
+        enrich_exercise_holistic()'s return value.
+    """
+    client = llm_client or get_llm_client()
+    batch_size = max(1, batch_size)
+    results: List[Dict[str, Any]] = []
+
+    for offset in range(0, len(exercises), batch_size):
+        batch = exercises[offset:offset + batch_size]
+        if len(batch) == 1:
+            results.append(enrich_exercise_holistic(
+                batch[0], reviewer_hint, client, use_pro_model,
+            ))
+            continue
+
+        batch_results = _enrich_holistic_batch_once(batch, reviewer_hint, client, use_pro_model)
+
+        fallback_count = 0
+        for exercise, result in zip(batch, batch_results):
+            if result is None:
+                fallback_count += 1
+                result = enrich_exercise_holistic(exercise, reviewer_hint, client, use_pro_model)
+            results.append(result)
+
+        logger.info(
+            "Batched holistic enrichment: %d exercises, %d fell back to single calls",
+            len(batch), fallback_count,
+        )
+
+    return results
+
+
+def _enrich_holistic_batch_once(
+    exercises: List[Dict[str, Any]],
+    reviewer_hint: str,
+    client: LLMClient,
+    use_pro_model: bool,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Run one batched holistic call.
+
+    Returns a result per exercise, or None for exercises that need a
+    single-exercise retry. A response that leaves any exercise to a retry is
+    dropped from the response cache, so the next run asks the model again.
+    """
+    prefix = prompt = raw_response = None
+
+    def discard_response() -> None:
+        client.discard_cached_response(
+            prompt, {"type": "object"}, HOLISTIC_BATCH_ENRICHMENT_SCHEMA, use_pro_model, prefix,
+        )
+
+    try:
+        hints = [_with_auto_hints(exercise, reviewer_hint) for exercise in exercises]
+        prefix, prompt = _build_holistic_batch_prompt(exercises, hints)
+        raw_response = client.complete_with_prefix(
+            prefix=prefix,
+            prompt=prompt,
+            output_schema={"type": "object"},
+            response_schema=HOLISTIC_BATCH_ENRICHMENT_SCHEMA,
+            require_reasoning=use_pro_model,
+        )
+        items = _parse_holistic_batch_response(raw_response)
+    except Exception as e:
+        logger.warning("Batched holistic enrichment call failed, falling back: %s", e)
+        if raw_response is not None:
+            discard_response()
+        return [None] * len(exercises)
+
+    results: List[Optional[Dict[str, Any]]] = []
+    for index, exercise in enumerate(exercises):
+        exercise_id = exercise.get("id", exercise.get("doc_id", "unknown"))
+        parsed = items.get(f"ex{index + 1}")
+        if parsed is None or not isinstance(parsed.get("changes"), dict):
+            results.append(None)
+            continue
+        try:
+            results.append(_holistic_result_from_parsed(exercise_id, parsed, strict=True))
+        except Exception as e:
+            logger.warning("Batched result for %s failed post-processing: %s", exercise_id, e)
+            results.append(None)
+
+    if any(result is None for result in results):
+        discard_response()
+    return results
+
+
+def _with_auto_hints(exercise: Dict[str, Any], reviewer_hint: str) -> str:
+    """Append auto-detected missing fields and style violations to the hint."""
+    auto_hints = []
+
+    missing_fields = _detect_missing_content_fields(exercise)
+    if missing_fields:
+        auto_hints.append(
+            "Missing content fields that MUST be generated: "
+            + ", ".join(missing_fields)
+        )
+
+    style_issues = _detect_style_violations(exercise)
+    if style_issues:
+        auto_hints.append(
+            "Style guide violations that MUST be fixed:\n"
+            + "\n".join(f"- {issue}" for issue in style_issues)
+        )
+
+    if auto_hints:
+        auto_hint_text = "\n\n".join(auto_hints)
+        if reviewer_hint:
+            reviewer_hint = f"{reviewer_hint}\n\n{auto_hint_text}"
+        else:
+            reviewer_hint = auto_hint_text
+
+    return reviewer_hint
+
+
+def _holistic_result_from_parsed(
+    exercise_id: str,
+    parsed: Dict[str, Any],
+    strict: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    Filter, normalize and validate parsed LLM changes into a holistic result.
+
+    With strict=True (batched mode), returns None instead of a partial result
+    when validation drops any field, so the caller can retry the exercise alone.
+    """
+    if not parsed.get("changes"):
+        logger.info(
+            "Holistic enrichment for %s: no changes needed (reasoning: %s)",
+            exercise_id, parsed.get("reasoning", "none")[:100]
+        )
+        return {
+            "success": True,
+            "changes": {},
+            "reasoning": parsed.get("reasoning", "No changes needed"),
+            "confidence": parsed.get("confidence", "high"),
+        }
+    
+    # Filter changes to only enrichable fields (as flat dotted paths)
+    valid_changes = {}
+    for field_path, value in parsed["changes"].items():
+        # Skip locked fields
+        if field_path in LOCKED_FIELDS:
+            logger.warning("Skipping locked field: %s", field_path)
+            continue
+        
+        # Check if field is enrichable
+        if field_path in ENRICHABLE_FIELD_PATHS:
+            valid_changes[field_path] = value
+        else:
+            # Check if it matches a prefix pattern
+            is_valid = False
+            for allowed in ENRICHABLE_FIELD_PATHS:
+                if field_path.startswith(allowed + "."):
+                    is_valid = True
+                    break
+            
+            if is_valid:
+                valid_changes[field_path] = value
+            else:
+                logger.warning("Skipping non-enrichable field: %s", field_path)
+    
+    # Normalize the changes for consistency
+    normalized_changes = normalize_enrichment_output(valid_changes)
+    validated_changes = validate_normalized_output(normalized_changes)
+
+    if strict and set(validated_changes) != set(normalized_changes):
+        logger.info(
+            "Holistic enrichment for %s: validation dropped %s",
+            exercise_id, sorted(set(normalized_changes) - set(validated_changes)),
+        )
+        return None
+    normalized_changes = validated_changes
+
+    logger.info(
+        "Holistic enrichment for %s: %d changes (confidence: %s)",
+        exercise_id, len(normalized_changes), parsed.get("confidence", "unknown")
+    )
+
+    return {
+        "success": True,
+        "changes": normalized_changes,
+        "reasoning": parsed.get("reasoning", ""),
+        "confidence": parsed.get("confidence", "high"),
+    }
+
+
+def _build_holistic_prompt_preamble(exercise: Dict[str, Any]) -> str:
+    """
+    Static head of every holistic prompt: guidance blocks plus a golden example.
+
+    Shared by the single-exercise and batched prompts. The golden example is
+    picked from `exercise` (the first exercise of a batch).
+    """
     from app.reviewer.what_good_looks_like import (
         WHAT_GOOD_LOOKS_LIKE,
         INSTRUCTIONS_GUIDANCE,
@@ -1090,12 +1319,7 @@ def _build_holistic_enrichment_prompt(
     example = _get_relevant_golden_example(exercise, "instructions")
     example_json = json.dumps(example, indent=2) if example else "N/A"
 
-    # Format current exercise data (exclude timestamps and internal fields)
-    display_exercise = {k: v for k, v in exercise.items()
-                       if k not in {"created_at", "updated_at", "doc_id", "id", "_debug_project_id"}}
-    exercise_json = json.dumps(display_exercise, indent=2, default=str)
-
-    prompt = f"""{WHAT_GOOD_LOOKS_LIKE}
+    return f"""{WHAT_GOOD_LOOKS_LIKE}
 
 {INSTRUCTIONS_GUIDANCE}
 
@@ -1121,28 +1345,17 @@ Here's an example of a well-enriched exercise:
 
 ## Your Task
 
-Review this exercise and enrich any fields that need improvement.
-
-### Current Exercise Data
-
-```json
-{exercise_json}
-```
-
 """
 
-    if reviewer_hint:
-        prompt += f"""### Reviewer Hint
-
-The catalog reviewer flagged these issues:
-{reviewer_hint}
 
-This is a hint about what might need fixing, but use your judgment - you may find
-other issues or decide the flagged issue isn't actually a problem.
+def _format_exercise_for_prompt(exercise: Dict[str, Any]) -> str:
+    """Exercise JSON for prompts (timestamps and internal fields excluded)."""
+    display_exercise = {k: v for k, v in exercise.items()
+                       if k not in {"created_at", "updated_at", "doc_id", "id", "_debug_project_id"}}
+    return json.dumps(display_exercise, indent=2, default=str)
 
-"""
 
-    prompt += """### Rules
+_HOLISTIC_RULES = """### Rules
 
 1. **NEVER change**: name, name_slug, family_slug, status (these are locked)
 2. **CAN change**:
@@ -1209,7 +1422,9 @@ If ANY of these fields are missing or empty, you MUST include them in your chang
 
 Do NOT skip missing content fields. Every exercise needs all of these.
 
-### Response Format
+"""
+
+_HOLISTIC_RESPONSE_FORMAT = """### Response Format
 
 Respond with a JSON object:
 
@@ -1237,7 +1452,125 @@ Use flat dotted paths for nested fields (e.g., "muscles.primary" not {"muscles":
 
 Respond with ONLY the JSON object."""
 
-    return prompt
+
+def _build_holistic_enrichment_prompt(
+    exercise: Dict[str, Any],
+    reviewer_hint: str = "",
+) -> str:
+    """Build prompt for holistic exercise enrichment."""
+    prefix, body = _build_holistic_enrichment_prompt_parts(exercise, reviewer_hint)
+    return prefix + body
+
+
+def _build_holistic_enrichment_prompt_parts(
+    exercise: Dict[str, Any],
+    reviewer_hint: str = "",
+) -> Tuple[str, str]:
+    """
+    Build the holistic prompt as (static prefix, per-exercise body).
+
+    The prefix is sent through complete_with_prefix() so it can be served
+    from the LLM context cache.
+    """
+    exercise_json = _format_exercise_for_prompt(exercise)
+
+    prefix = _build_holistic_prompt_preamble(exercise)
+    prompt = f"""Review this exercise and enrich any fields that need improvement.
+
+### Current Exercise Data
+
+```json
+{exercise_json}
+```
+
+"""
+
+    if reviewer_hint:
+        prompt += f"""### Reviewer Hint
+
+The catalog reviewer flagged these issues:
+{reviewer_hint}
+
+This is a hint about what might need fixing, but use your judgment - you may find
+other issues or decide the flagged issue isn't actually a problem.
+
+"""
+
+    prompt += _HOLISTIC_RULES + _HOLISTIC_RESPONSE_FORMAT
+
+    return prefix, prompt
+
+
+_HOLISTIC_BATCH_RESPONSE_FORMAT = """### Response Format
+
+Respond with a JSON object holding one result per exercise, in the order given:
+
+```json
+{
+  "results": [
+    {
+      "exercise_key": "ex1",
+      "reasoning": "Brief explanation of what you found and what you're changing",
+      "confidence": "high" | "medium" | "low",
+      "changes": {
+        "execution_notes": ["Cue 1", "Cue 2", ...],
+        "description": "...",
+        ...
+      }
+    },
+    ...
+  ]
+}
+```
+
+Every exercise_key must appear exactly once. Judge each exercise on its own;
+do not copy content between exercises.
+
+If an exercise needs no changes, return `"changes": {}` for it.
+
+Use flat dotted paths for nested fields (e.g., "muscles.primary" not {"muscles": {"primary": ...}})
+
+Respond with ONLY the JSON object."""
+
+
+def _build_holistic_batch_prompt(
+    exercises: List[Dict[str, Any]],
+    reviewer_hints: List[str],
+) -> Tuple[str, str]:
+    """
+    Build one prompt covering several exercises, as (static prefix, body).
+
+    The guidance, golden example and rules appear once; each exercise gets a
+    section keyed ex1..exN with its data and (optional) reviewer hint.
+    """
+    prefix = _build_holistic_prompt_preamble(exercises[0])
+    prompt = f"""Review each of the {len(exercises)} exercises below independently and enrich any
+fields that need improvement. Each exercise is identified by its exercise_key.
+
+Reviewer hints, where present, describe what the catalog reviewer flagged. They are
+hints about what might need fixing, but use your judgment - you may find other
+issues or decide a flagged issue isn't actually a problem.
+
+"""
+
+    for index, (exercise, hint) in enumerate(zip(exercises, reviewer_hints)):
+        prompt += f"""### Exercise ex{index + 1}
+
+```json
+{_format_exercise_for_prompt(exercise)}
+```
+
+"""
+        if hint:
+            prompt += f"""#### Reviewer Hint (ex{index + 1})
+
+{hint}
+
+"""
+
+    prompt += _HOLISTIC_RULES + _HOLISTIC_BATCH_RESPONSE_FORMAT
+
+    return prefix, prompt
 
 
 def _parse_holistic_response(raw_response: str) -> Dict[str, Any]:
@@ -1279,8 +1612,53 @@ def _parse_holistic_response(raw_response: str) -> Dict[str, Any]:
             "reasoning": f"Failed to parse: {response[:200]}",
             "confidence": "low",
             "changes": {},
+            "parse_failed": True,
+        }
+
+
+def _parse_holistic_batch_response(raw_response: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse a batched holistic response into {exercise_key: parsed_item}.
+
+    Raises ValueError if the response is not a JSON object with a results
+    list. Items without an exercise_key, or with a key that appears more than
+    once, are left out so those exercises fall back to single calls.
+    """
+    response = raw_response.strip()
+
+    # Handle markdown code blocks
+    if "```" in response:
+        parts = response.split("```")
+        if len(parts) >= 2:
+            response = parts[1]
+            if response.startswith("json"):
+                response = response[4:]
+            response = response.strip()
+
+    parsed = json.loads(response)
+    if not isinstance(parsed, dict) or not isinstance(parsed.get("results"), list):
+        raise ValueError("Batched response has no results list")
+
+    items: Dict[str, Dict[str, Any]] = {}
+    duplicates = set()
+    for item in parsed["results"]:
+        if not isinstance(item, dict) or not item.get("exercise_key"):
+            continue
+        key = str(item["exercise_key"])
+        if key in items:
+            duplicates.add(key)
+            continue
+        items[key] = {
+            "reasoning": item.get("reasoning", ""),
+            "confidence": item.get("confidence", "medium"),
+            "changes": item.get("changes"),
         }
 
+    for key in duplicates:
+        items.pop(key, None)
+
+    return items
+
 
 # =============================================================================
 # OUTPUT NORMALIZATION
@@ -1742,6 +2120,8 @@ __all__ = [
     "enrich_all_missing_fields",
     # Holistic enrichment
     "enrich_exercise_holistic",
+    "enrich_exercises_holistic_batch",
+    "HOLISTIC_BATCH_SIZE",
     "normalize_enrichment_output",
     "validate_normalized_output",
     "LOCKED_FIELDS",
@@ -6,15 +6,40 @@ Model selection:
 - gemini-2.5-flash: Simple extraction / classification
 
 Uses ADK/Vertex pattern consistent with canvas_orchestrator.
+
+Prompt-prefix caching:
+- complete_with_prefix(prefix, prompt) sends a large static prefix (guidance
+  blocks, few-shot examples) separately from the per-call prompt.
+- VertexLLMClient registers each prefix as Vertex cached content (TTL
+  LLM_PREFIX_CACHE_TTL_SECS) and reuses it by hash for the rest of the worker
+  run, so the prefix is billed at the cached-token rate.
+- If Vertex rejects the cached content (not found / invalid argument, e.g.
+  evicted server-side), the entry is dropped, the CachedContent is deleted and
+  the call is retried once inline. Other errors (429s included) propagate.
+- Other clients (MockLLMClient) send prefix + prompt inline.
+
+Client reuse:
+- get_llm_client() returns one VertexLLMClient per process.
+- ModelRegistry keeps GenerativeModel + GenerationConfig pairs alive per
+  (model, temperature, response schema hash, cached prefix).
+- complete_async() uses generate_content_async, so concurrent callers do not
+  need one thread per in-flight request.
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import json
 import logging
 import os
+import re
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +47,19 @@ logger = logging.getLogger(__name__)
 MODEL_REASONING = "gemini-2.5-pro"   # For complex reasoning
 MODEL_FAST = "gemini-2.5-flash"       # For simple tasks
 
+# Prompt-prefix cache configuration
+PREFIX_CACHE_ENABLED = os.getenv("LLM_PREFIX_CACHE", "true").lower() == "true"
+PREFIX_CACHE_TTL_SECS = int(os.getenv("LLM_PREFIX_CACHE_TTL_SECS", "3600"))
+# Vertex rejects cached content below a minimum size; shorter prefixes go inline
+PREFIX_CACHE_MIN_TOKENS = int(os.getenv("LLM_PREFIX_CACHE_MIN_TOKENS", "2048"))
+# Re-create cached content this long before its TTL runs out
+PREFIX_CACHE_REFRESH_MARGIN_SECS = 120
+# After a failed create, send the prefix inline this long before retrying
+PREFIX_CACHE_FAILURE_BACKOFF_SECS = 300
+
+# GenerativeModel instances kept alive by ModelRegistry
+MODEL_REGISTRY_MAX_ENTRIES = 64
+
 
 class LLMClient(ABC):
     """
@@ -59,6 +97,281 @@ class LLMClient(ABC):
     def get_model_name(self, require_reasoning: bool = False) -> str:
         """Get the model name that would be used."""
         pass
+    
+    def generation_config(self, require_reasoning: bool = False) -> Dict[str, Any]:
+        """Sampling settings used for a request (part of the response cache key)."""
+        return {}
+    
+    def discard_cached_response(
+        self,
+        prompt: str,
+        output_schema: Optional[Dict[str, Any]] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        require_reasoning: bool = False,
+        prefix: Optional[str] = None,
+    ) -> None:
+        """
+        Drop a stored response for this request, if the client caches them.
+
+        Callers that reject a response (unparseable, no decisions) call this
+        before retrying so the retry reaches the model. No-op by default.
+        """
+    
+    def complete_with_prefix(
+        self,
+        prefix: str,
+        prompt: str,
+        output_schema: Optional[Dict[str, Any]] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        require_reasoning: bool = False,
+    ) -> str:
+        """
+        Generate completion for prefix + prompt.
+
+        `prefix` is static text shared across many calls (guidance, few-shot
+        examples). Clients that support context caching send it as cached
+        content; the default sends it inline.
+        """
+        return self.complete(
+            prompt=prefix + prompt,
+            output_schema=output_schema,
+            response_schema=response_schema,
+            require_reasoning=require_reasoning,
+        )
+    
+    async def complete_async(
+        self,
+        prompt: str,
+        output_schema: Optional[Dict[str, Any]] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        require_reasoning: bool = False,
+        prefix: Optional[str] = None,
+    ) -> str:
+        """
+        Async completion. Same arguments as complete(), plus an optional
+        cacheable prefix (see complete_with_prefix).
+
+        The default runs the synchronous call on the event loop's thread pool;
+        VertexLLMClient overrides it with the SDK's native async API.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            functools.partial(
+                self.complete_with_prefix,
+                prefix or "",
+                prompt,
+                output_schema,
+                response_schema,
+                require_reasoning,
+            ),
+        )
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+class PromptPrefixCache:
+    """
+    Process-wide registry of cached prompt prefixes keyed by hash.
+
+    Each entry holds a backend handle (Vertex CachedContent) and a monotonic
+    expiry. get() returns the handle, creating it on first use or when it is
+    about to expire; it returns None when the prefix should be sent inline
+    (too short, caching disabled, or a recent create failed).
+    """
+
+    def __init__(
+        self,
+        ttl_secs: int = PREFIX_CACHE_TTL_SECS,
+        min_tokens: int = PREFIX_CACHE_MIN_TOKENS,
+        enabled: bool = PREFIX_CACHE_ENABLED,
+    ):
+        self.ttl_secs = ttl_secs
+        self.min_tokens = min_tokens
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._entries: Dict[str, Tuple[Optional[Any], float]] = {}
+        self.hits = 0
+        self.creates = 0
+        self.failures = 0
+
+    @staticmethod
+    def key(model_name: str, prefix: str) -> str:
+        return hashlib.sha256(f"{model_name}\n{prefix}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, key: str, now: float) -> Tuple[bool, Optional[Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        handle, expires_at = entry
+        if handle is None:
+            # Negative entry after a failed create
+            return now < expires_at, None
+        if now < expires_at - PREFIX_CACHE_REFRESH_MARGIN_SECS:
+            return True, handle
+        return False, None
+
+    def get(
+        self,
+        model_name: str,
+        prefix: str,
+        create: Callable[[str, int], Any],
+    ) -> Optional[Any]:
+        """
+        Return a cached handle for (model_name, prefix), or None to go inline.
+
+        create(key, ttl_secs) builds the backend handle; it runs at most once
+        per key at a time.
+        """
+        if not self.enabled or estimate_tokens(prefix) < self.min_tokens:
+            return None
+
+        key = self.key(model_name, prefix)
+        with self._lock:
+            found, handle = self._lookup(key, time.monotonic())
+            if found:
+                if handle is not None:
+                    self.hits += 1
+                return handle
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have created it while we waited
+            with self._lock:
+                found, handle = self._lookup(key, time.monotonic())
+                if found:
+                    if handle is not None:
+                        self.hits += 1
+                    return handle
+
+            try:
+                handle = create(key, self.ttl_secs)
+            except Exception as e:
+                logger.warning(
+                    "Prompt prefix cache create failed for %s (%s), sending inline: %s",
+                    model_name, key[:12], e,
+                )
+                with self._lock:
+                    self.failures += 1
+                    self._entries[key] = (None, time.monotonic() + PREFIX_CACHE_FAILURE_BACKOFF_SECS)
+                return None
+
+            with self._lock:
+                self.creates += 1
+                self._entries[key] = (handle, time.monotonic() + self.ttl_secs)
+            logger.info(
+                "Registered cached prompt prefix %s for %s (~%d tokens, ttl=%ds)",
+                key[:12], model_name, estimate_tokens(prefix), self.ttl_secs,
+            )
+            return handle
+
+    def invalidate(self, model_name: str, prefix: str, handle: Optional[Any] = None) -> bool:
+        """
+        Forget a prefix (e.g. the backend reports it expired).
+
+        With `handle`, the entry is only dropped if it still holds that handle,
+        so a caller holding a stale handle does not evict a fresh one created
+        by another thread. Returns True when an entry was dropped.
+        """
+        key = self.key(model_name, prefix)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (handle is not None and entry[0] is not handle):
+                return False
+            del self._entries[key]
+            return True
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": sum(1 for h, _ in self._entries.values() if h is not None),
+                "hits": self.hits,
+                "creates": self.creates,
+                "failures": self.failures,
+            }
+
+
+# Shared across all VertexLLMClient instances in the process
+_prefix_cache = PromptPrefixCache()
+
+
+def get_prefix_cache() -> PromptPrefixCache:
+    """Return the process-wide prompt-prefix cache."""
+    return _prefix_cache
+
+
+_CACHED_CONTENT_RE = re.compile(r"cached[ _]?content", re.IGNORECASE)
+
+
+def is_cached_prefix_error(error: BaseException) -> bool:
+    """
+    Check if Vertex rejected a request because of its cached content.
+
+    NotFound (404) means the cached content is gone. InvalidArgument (400)
+    only counts when the message refers to the cached content; other bad
+    requests are not fixed by going inline. Classes are matched by name, like
+    rate_limit.is_rate_limit_error.
+    """
+    name = type(error).__name__
+    code = getattr(error, "code", None)
+    if name == "NotFound" or code == 404:
+        return True
+    if name == "InvalidArgument" or code == 400:
+        return _CACHED_CONTENT_RE.search(str(error)) is not None
+    return False
+
+
+def _schema_hash(schema: Optional[Dict[str, Any]]) -> Optional[str]:
+    if not schema:
+        return None
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of (GenerativeModel, GenerationConfig) pairs.
+
+    Keyed by (model name, temperature, response schema hash, cached prefix).
+    Reusing the model object keeps its client and gRPC channel alive instead of
+    building a new one per request. Least recently used entries are dropped
+    past max_entries (cached-prefix models turn over as caches expire).
+    """
+
+    def __init__(self, max_entries: int = MODEL_REGISTRY_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[Any, Any]]" = OrderedDict()
+
+    def get(self, key: Tuple, build: Callable[[], Tuple[Any, Any]]) -> Tuple[Any, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        # Build outside the lock; a racing duplicate is harmless (one is kept)
+        entry = build()
+        with self._lock:
+            entry = self._entries.setdefault(key, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_model_registry = ModelRegistry()
 
 
 class VertexLLMClient(LLMClient):
@@ -103,6 +416,13 @@ class VertexLLMClient(LLMClient):
         """Get model name based on task complexity."""
         return MODEL_REASONING if require_reasoning else MODEL_FAST
     
+    def generation_config(self, require_reasoning: bool = False) -> Dict[str, Any]:
+        """Configure generation - higher token limit for structured JSON responses."""
+        return {
+            "temperature": 0.1 if require_reasoning else 0.0,
+            "max_output_tokens": 16384,
+        }
+    
     def complete(
         self,
         prompt: str,
@@ -122,86 +442,227 @@ class VertexLLMClient(LLMClient):
         Returns:
             Generated text
         """
-        self._ensure_initialized()
+        return self._complete(prompt, output_schema, response_schema, require_reasoning)
+    
+    def complete_with_prefix(
+        self,
+        prefix: str,
+        prompt: str,
+        output_schema: Optional[Dict[str, Any]] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        require_reasoning: bool = False,
+    ) -> str:
+        """
+        Generate completion with `prefix` served from Vertex context cache.
 
-        from vertexai.generative_models import GenerativeModel, GenerationConfig
+        Falls back to an inline prefix when the prefix is below
+        PREFIX_CACHE_MIN_TOKENS, caching is disabled, or cache creation fails.
+        """
+        return self._complete(
+            prompt, output_schema, response_schema, require_reasoning, prefix=prefix,
+        )
+    
+    def _create_cached_prefix(self, model_name: str, prefix: str, key: str, ttl_secs: int) -> Any:
+        """Register prefix as Vertex cached content."""
+        import datetime
+        from vertexai.preview import caching
+        
+        return caching.CachedContent.create(
+            model_name=model_name,
+            contents=[prefix],
+            ttl=datetime.timedelta(seconds=ttl_secs),
+            display_name=f"catalog-prefix-{key[:12]}",
+        )
+    
+    def _abandon_cached_prefix(self, model_name: str, prefix: str, cached_prefix: Any) -> None:
+        """Drop a rejected cached prefix and delete its CachedContent (best effort)."""
+        if not _prefix_cache.invalidate(model_name, prefix, cached_prefix):
+            return  # Another caller already dropped it
+        try:
+            cached_prefix.delete()
+        except Exception as e:
+            # Left to expire at its TTL
+            logger.debug("Could not delete cached prefix %s: %s", getattr(cached_prefix, "resource_name", ""), e)
+    
+    def _get_model(
+        self,
+        model_name: str,
+        require_reasoning: bool,
+        response_schema: Optional[Dict[str, Any]],
+        cached_prefix: Optional[Any],
+    ) -> Tuple[Any, Any]:
+        """Fetch (GenerativeModel, GenerationConfig) from the process-wide registry."""
+        base_config = self.generation_config(require_reasoning)
+        temperature = base_config["temperature"]
+        cache_name = None
+        if cached_prefix is not None:
+            cache_name = getattr(cached_prefix, "resource_name", None) or str(id(cached_prefix))
+        key = (model_name, temperature, _schema_hash(response_schema), cache_name)
 
-        model_name = self.get_model_name(require_reasoning)
-        logger.debug("Using model: %s (reasoning=%s)", model_name, require_reasoning)
+        def build() -> Tuple[Any, Any]:
+            from vertexai.generative_models import GenerativeModel, GenerationConfig
 
-        model = GenerativeModel(model_name)
+            config_kwargs = dict(base_config)
 
-        # Configure generation - higher token limit for structured JSON responses
-        config_kwargs = {
-            "temperature": 0.1 if require_reasoning else 0.0,
-            "max_output_tokens": 16384,
-        }
+            if response_schema:
+                config_kwargs["response_mime_type"] = "application/json"
+                config_kwargs["response_schema"] = response_schema
 
-        if response_schema:
-            config_kwargs["response_mime_type"] = "application/json"
-            config_kwargs["response_schema"] = response_schema
+            config = GenerationConfig(**config_kwargs)
 
-        config = GenerationConfig(**config_kwargs)
+            if cached_prefix is not None:
+                from vertexai.preview.generative_models import GenerativeModel as CachedGenerativeModel
+                return CachedGenerativeModel.from_cached_content(cached_content=cached_prefix), config
+            return GenerativeModel(model_name), config
+
+        return _model_registry.get(key, build)
+    
+    def _prepare(
+        self,
+        prompt: str,
+        output_schema: Optional[Dict[str, Any]],
+        response_schema: Optional[Dict[str, Any]],
+        require_reasoning: bool,
+        prefix: Optional[str],
+    ) -> Tuple[Any, Any, str, str, Optional[Any]]:
+        """Resolve model, config and final prompt text for one request."""
+        self._ensure_initialized()
+
+        model_name = self.get_model_name(require_reasoning)
+        logger.debug("Using model: %s (reasoning=%s)", model_name, require_reasoning)
+
+        cached_prefix = None
+        if prefix:
+            cached_prefix = _prefix_cache.get(
+                model_name,
+                prefix,
+                lambda key, ttl: self._create_cached_prefix(model_name, prefix, key, ttl),
+            )
+            if cached_prefix is None:
+                prompt = prefix + prompt
+
+        model, config = self._get_model(model_name, require_reasoning, response_schema, cached_prefix)
 
         # Text-append fallback only when no native response_schema
         if output_schema and not response_schema:
             schema_json = json.dumps(output_schema, indent=2)
             prompt = f"{prompt}\n\nRespond with valid JSON matching this schema:\n{schema_json}"
+
+        return model, config, model_name, prompt, cached_prefix
+    
+    def _complete(
+        self,
+        prompt: str,
+        output_schema: Optional[Dict[str, Any]],
+        response_schema: Optional[Dict[str, Any]],
+        require_reasoning: bool,
+        prefix: Optional[str] = None,
+    ) -> str:
+        model, config, model_name, request_text, cached_prefix = self._prepare(
+            prompt, output_schema, response_schema, require_reasoning, prefix,
+        )
         
         try:
             response = model.generate_content(
-                prompt,
+                request_text,
                 generation_config=config,
             )
-            
-            # Debug: Log response structure for thinking models
-            if hasattr(response, 'candidates') and response.candidates:
-                candidate = response.candidates[0]
-                if hasattr(candidate, 'finish_reason'):
-                    logger.debug("Finish reason: %s", candidate.finish_reason)
-                if hasattr(candidate, 'content') and candidate.content.parts:
-                    # Get all text parts (thinking models may have multiple)
-                    all_text = []
-                    for part in candidate.content.parts:
-                        if hasattr(part, 'text') and part.text:
-                            all_text.append(part.text)
-                    if len(all_text) > 1:
-                        logger.debug("Response has %d text parts", len(all_text))
-                        # Use last part which is typically the final answer
-                        result = all_text[-1].strip()
-                    else:
-                        result = response.text.strip()
+            return self._handle_response(response, model_name)
+
+        except Exception as e:
+            if cached_prefix is not None and is_cached_prefix_error(e):
+                # Cached content may have been evicted server-side; retry inline once
+                logger.warning("LLM completion with cached prefix failed, retrying inline: %s", e)
+                self._abandon_cached_prefix(model_name, prefix, cached_prefix)
+                return self._complete(
+                    prefix + prompt, output_schema, response_schema, require_reasoning,
+                )
+            logger.error("LLM completion failed: %s", e)
+            raise
+    
+    async def complete_async(
+        self,
+        prompt: str,
+        output_schema: Optional[Dict[str, Any]] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        require_reasoning: bool = False,
+        prefix: Optional[str] = None,
+    ) -> str:
+        """
+        Generate completion with the SDK's async API (generate_content_async).
+
+        No thread is held while waiting on Vertex. Creating a cached prefix
+        (once per prefix per TTL) still blocks briefly.
+        """
+        model, config, model_name, request_text, cached_prefix = self._prepare(
+            prompt, output_schema, response_schema, require_reasoning, prefix,
+        )
+        
+        try:
+            response = await model.generate_content_async(
+                request_text,
+                generation_config=config,
+            )
+            return self._handle_response(response, model_name)
+
+        except Exception as e:
+            if cached_prefix is not None and is_cached_prefix_error(e):
+                logger.warning("LLM completion with cached prefix failed, retrying inline: %s", e)
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._abandon_cached_prefix, model_name, prefix, cached_prefix,
+                )
+                return await self.complete_async(
+                    prefix + prompt, output_schema, response_schema, require_reasoning,
+                )
+            logger.error("LLM completion failed: %s", e)
+            raise
+    
+    def _handle_response(self, response: Any, model_name: str) -> str:
+        """Extract response text and record usage."""
+        # Debug: Log response structure for thinking models
+        if hasattr(response, 'candidates') and response.candidates:
+            candidate = response.candidates[0]
+            if hasattr(candidate, 'finish_reason'):
+                logger.debug("Finish reason: %s", candidate.finish_reason)
+            if hasattr(candidate, 'content') and candidate.content.parts:
+                # Get all text parts (thinking models may have multiple)
+                all_text = []
+                for part in candidate.content.parts:
+                    if hasattr(part, 'text') and part.text:
+                        all_text.append(part.text)
+                if len(all_text) > 1:
+                    logger.debug("Response has %d text parts", len(all_text))
+                    # Use last part which is typically the final answer
+                    result = all_text[-1].strip()
                 else:
                     result = response.text.strip()
             else:
                 result = response.text.strip()
-            
-            logger.debug("LLM response length: %d chars", len(result))
+        else:
+            result = response.text.strip()
+        
+        logger.debug("LLM response length: %d chars", len(result))
 
-            # Track LLM usage for cost attribution (fire-and-forget)
-            try:
-                from shared.usage_tracker import (
-                    extract_usage_from_vertex_response,
-                    track_usage,
+        # Track LLM usage for cost attribution (fire-and-forget)
+        try:
+            from shared.usage_tracker import (
+                extract_usage_from_vertex_response,
+                track_usage,
+            )
+            usage = extract_usage_from_vertex_response(response)
+            if usage.get("total_tokens"):
+                track_usage(
+                    user_id=None,
+                    category="system",
+                    system="catalog_orchestrator",
+                    feature="enrichment",
+                    model=model_name,
+                    **usage,
                 )
-                usage = extract_usage_from_vertex_response(response)
-                if usage.get("total_tokens"):
-                    track_usage(
-                        user_id=None,
-                        category="system",
-                        system="catalog_orchestrator",
-                        feature="enrichment",
-                        model=model_name,
-                        **usage,
-                    )
-            except Exception as track_err:
-                logger.debug("Usage tracking error (non-fatal): %s", track_err)
-
-            return result
+        except Exception as track_err:
+            logger.debug("Usage tracking error (non-fatal): %s", track_err)
 
-        except Exception as e:
-            logger.error("LLM completion failed: %s", e)
-            raise
+        return result
 
 
 class MockLLMClient(LLMClient):
@@ -280,6 +741,10 @@ class MockLLMClient(LLMClient):
         return self.default_enum_value
 
 
+_shared_client: Optional[LLMClient] = None
+_shared_client_lock = threading.Lock()
+
+
 def get_llm_client(use_mock: bool = False) -> LLMClient:
     """
     Factory function to get appropriate LLM client.
@@ -288,14 +753,28 @@ def get_llm_client(use_mock: bool = False) -> LLMClient:
         use_mock: If True, return MockLLMClient
         
     Returns:
-        LLMClient instance
+        LLMClient instance. The Vertex client is a process-wide singleton,
+        wrapped in CachedLLMClient when LLM_RESPONSE_CACHE is enabled.
     """
+    global _shared_client
+    
     if use_mock or os.environ.get("USE_MOCK_LLM", "").lower() == "true":
         logger.info("Using MockLLMClient")
         return MockLLMClient()
     
-    logger.info("Using VertexLLMClient")
-    return VertexLLMClient()
+    # One VertexLLMClient per process: vertexai.init runs once and the model
+    # registry / prefix cache are shared by every job and reviewer.
+    with _shared_client_lock:
+        if _shared_client is None:
+            from app.enrichment.response_cache import CachedLLMClient, get_response_cache
+            
+            logger.info("Using VertexLLMClient")
+            client: LLMClient = VertexLLMClient()
+            response_cache = get_response_cache()
+            if response_cache is not None:
+                client = CachedLLMClient(client, response_cache)
+            _shared_client = client
+        return _shared_client
 
 
 __all__ = [
@@ -303,6 +782,11 @@ __all__ = [
     "VertexLLMClient",
     "MockLLMClient",
     "get_llm_client",
+    "estimate_tokens",
+    "get_prefix_cache",
+    "is_cached_prefix_error",
+    "ModelRegistry",
+    "PromptPrefixCache",
     "MODEL_REASONING",
     "MODEL_FAST",
 ]
@@ -130,6 +130,7 @@ class ShardResult:
     succeeded: int = 0
     failed: int = 0
     skipped: int = 0  # Already had value (idempotency)
+    tokens_used: int = 0  # Estimated LLM tokens for the shard
     
     # Results per exercise
     results: List[EnrichmentResult] = field(default_factory=list)
@@ -148,6 +149,7 @@ class ShardResult:
             "succeeded": self.succeeded,
             "failed": self.failed,
             "skipped": self.skipped,
+            "tokens_used": self.tokens_used,
             "results": [r.to_dict() for r in self.results],
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
@@ -0,0 +1,746 @@
+"""
+Rate Limiting - Bounded concurrent LLM calls with 429 backoff.
+
+Enrichment shards fan out one LLM call per exercise. Running them one after
+another makes a 200-exercise shard take longer than the lease renewal margin,
+so the calls run on a bounded thread pool instead.
+
+Pieces:
+- RateLimitGate: bounded semaphore with a shared cooldown. When any call hits
+  RESOURCE_EXHAUSTED (429), every caller waits out the cooldown before its next
+  request, instead of each thread hammering the quota on its own. Threads
+  block on the semaphore; coroutines park on a future that a release (from
+  any thread or event loop) resolves, so waiting costs no polling.
+- AdaptiveRateLimitGate: RateLimitGate whose limit moves AIMD-style. It grows
+  by about one slot per limit's worth of healthy calls and halves on a 429 or
+  when latency climbs well above the baseline for calls of that size. One
+  instance is shared process-wide (get_llm_gate), so the reviewer, quality
+  scanner and enrichment draw from one project quota instead of each guessing
+  a fixed concurrency.
+- RateLimitedLLMClient: LLMClient wrapper that routes complete() and
+  complete_async() through a gate, reports latency back to it and retries
+  429s with exponential backoff + jitter.
+- TokenBudget: sliding one-minute token window. One budget per model name is
+  shared process-wide (get_token_budget), so concurrent shards and jobs in the
+  same worker draw from the same tokens-per-minute quota. acquire_async waits
+  with asyncio.sleep instead of holding an executor thread.
+- map_concurrent(): runs fn over items on a thread pool and returns results in
+  input order, so callers build identical plans to the sequential path.
+  Optional per-item timeout so one slow call cannot stall the whole batch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import asynccontextmanager, contextmanager
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar,
+)
+
+from app.enrichment.llm_client import LLMClient, MODEL_FAST, MODEL_REASONING, estimate_tokens
+from app.enrichment.response_cache import CachedLLMClient
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Concurrent LLM calls per enrichment shard (1 = sequential)
+DEFAULT_LLM_CONCURRENCY = int(os.getenv("ENRICHMENT_LLM_CONCURRENCY", "8"))
+
+# Per-exercise timeout for the single-field enrichment path
+DEFAULT_LLM_TIMEOUT_SECS = float(os.getenv("ENRICHMENT_LLM_TIMEOUT_SECS", "120"))
+
+# 429 retry policy
+MAX_RATE_LIMIT_RETRIES = 5
+BACKOFF_BASE_SECS = 2.0
+BACKOFF_MAX_SECS = 60.0
+
+# Shared adaptive gate: starting, floor and ceiling concurrency across all
+# LLM callers in the process
+LLM_CONCURRENCY_INITIAL = int(os.getenv("LLM_CONCURRENCY_INITIAL", "8"))
+LLM_CONCURRENCY_MIN = int(os.getenv("LLM_CONCURRENCY_MIN", "1"))
+LLM_CONCURRENCY_MAX = int(os.getenv("LLM_CONCURRENCY_MAX", "32"))
+
+# A call slower than this multiple of its baseline counts as congestion
+LLM_LATENCY_TOLERANCE = float(os.getenv("LLM_LATENCY_TOLERANCE", "2.0"))
+
+# Multiplicative decrease factor, and the minimum gap between decreases (one
+# burst of concurrent 429s is one congestion event, not many)
+DECREASE_FACTOR = 0.5
+DECREASE_HOLD_SECS = 5.0
+
+# How fast a latency baseline drifts up towards slower healthy calls
+# (it drops to a faster call immediately)
+BASELINE_DRIFT = 0.05
+
+# Tokens-per-minute budget per model (0 = unlimited). Defaults sit below the
+# project's Vertex quota so a burst of shards backs off locally instead of 429ing.
+TOKENS_PER_MINUTE = {
+    MODEL_FAST: int(os.getenv("LLM_TPM_LIMIT_FAST", "2000000")),
+    MODEL_REASONING: int(os.getenv("LLM_TPM_LIMIT_REASONING", "500000")),
+}
+
+# Output tokens reserved per request on top of the prompt estimate
+ESTIMATED_OUTPUT_TOKENS = 1024
+
+TOKEN_WINDOW_SECS = 60.0
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Check if an exception is a quota / rate-limit rejection.
+
+    Matches google.api_core ResourceExhausted / TooManyRequests by class name
+    so this module does not import google libraries, or an HTTP code of 429.
+    The message is not inspected: a prompt or exercise ID containing "429"
+    must not turn an ordinary failure into a retried, gate-shrinking one.
+    """
+    if type(error).__name__ in {"ResourceExhausted", "TooManyRequests"}:
+        return True
+    return getattr(error, "code", None) == 429
+
+
+def compute_rate_limit_backoff(attempt: int) -> float:
+    """
+    Backoff delay before retry number `attempt` (0-based).
+
+    Exponential with full jitter on top: base * 2^attempt, capped at
+    BACKOFF_MAX_SECS, plus up to one base interval of jitter.
+    """
+    delay = min(BACKOFF_BASE_SECS * (2 ** attempt), BACKOFF_MAX_SECS)
+    return delay + random.uniform(0, BACKOFF_BASE_SECS)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class RateLimitGate:
+    """
+    Bounded semaphore with a shared cooldown.
+
+    slot() blocks until a concurrency slot is free and no cooldown is active.
+    report_rate_limited() starts (or extends) a cooldown that all callers
+    honour, so one 429 backs off the whole fan-out rather than one thread.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_LLM_CONCURRENCY):
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+        self._cooldown_until = 0.0
+        self.rate_limited_count = 0
+        # Coroutines waiting for a slot: (their loop, future to resolve)
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._waiters_lock = threading.Lock()
+
+    def _cooldown_remaining(self) -> float:
+        with self._lock:
+            return self._cooldown_until - time.monotonic()
+
+    def _wait_for_cooldown(self) -> None:
+        while True:
+            remaining = self._cooldown_remaining()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    def _acquire(self) -> None:
+        self._semaphore.acquire()
+
+    def _try_acquire(self) -> bool:
+        return self._semaphore.acquire(blocking=False)
+
+    def _release(self) -> None:
+        self._semaphore.release()
+        self._wake_async_waiters()
+
+    def _wake_async_waiters(self) -> None:
+        """Resolve every parked coroutine's future; each retries its acquire."""
+        with self._waiters_lock:
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                pass  # loop already closed
+
+    def _try_acquire_or_park(self) -> Optional[asyncio.Future]:
+        """
+        Take a slot (None) or register a future that the next release
+        resolves. Both happen under _waiters_lock, which every release takes
+        after freeing its slot, so no wake-up is lost in between.
+        """
+        with self._waiters_lock:
+            if self._try_acquire():
+                return None
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._async_waiters.append((loop, future))
+            return future
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one concurrency slot for the duration of a call."""
+        self._wait_for_cooldown()
+        self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def slot_async(self) -> AsyncIterator[None]:
+        """slot() for coroutines: waits without blocking the event loop."""
+        while True:
+            remaining = self._cooldown_remaining()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+                continue
+            future = self._try_acquire_or_park()
+            if future is None:
+                break
+            await future
+        try:
+            yield
+        finally:
+            self._release()
+
+    def report_rate_limited(self, delay_secs: float) -> None:
+        """Pause all callers for at least delay_secs."""
+        with self._lock:
+            self.rate_limited_count += 1
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay_secs)
+
+    def report_success(self, latency_secs: float, key: str = "") -> None:
+        """Record a completed call. The fixed gate ignores it."""
+
+
+class AdaptiveRateLimitGate(RateLimitGate):
+    """
+    RateLimitGate with an AIMD concurrency limit.
+
+    - Additive increase: each healthy call adds 1/limit, so the limit grows by
+      about one slot per limit's worth of calls, up to max_concurrency.
+    - Multiplicative decrease: a 429, or a call slower than
+      latency_tolerance x the baseline for its key, multiplies the limit by
+      DECREASE_FACTOR (at most once per DECREASE_HOLD_SECS), down to
+      min_concurrency.
+
+    Baselines are kept per key (model and prompt size bucket, see
+    RateLimitedLLMClient) because a 20-exercise review and a one-field
+    enrichment call have very different healthy latencies.
+    Lowering the limit never interrupts calls already running; new calls
+    wait until in-flight drops below it.
+    """
+
+    def __init__(
+        self,
+        initial_concurrency: int = LLM_CONCURRENCY_INITIAL,
+        min_concurrency: int = LLM_CONCURRENCY_MIN,
+        max_concurrency: int = LLM_CONCURRENCY_MAX,
+        latency_tolerance: float = LLM_LATENCY_TOLERANCE,
+    ):
+        super().__init__(max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.latency_tolerance = latency_tolerance
+        self._limit = float(min(max(initial_concurrency, self.min_concurrency), self.max_concurrency))
+        self._in_flight = 0
+        self._changed = threading.Condition(self._lock)
+        self._baselines: Dict[str, float] = {}
+        self._last_decrease = float("-inf")
+        self.latency_backoff_count = 0
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        with self._lock:
+            return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Calls currently holding a slot."""
+        with self._lock:
+            return self._in_flight
+
+    def _acquire(self) -> None:
+        with self._changed:
+            while self._in_flight >= int(self._limit):
+                self._changed.wait()
+            self._in_flight += 1
+
+    def _try_acquire(self) -> bool:
+        with self._changed:
+            if self._in_flight >= int(self._limit):
+                return False
+            self._in_flight += 1
+            return True
+
+    def _release(self) -> None:
+        with self._changed:
+            self._in_flight -= 1
+            self._changed.notify()
+        self._wake_async_waiters()
+
+    def report_rate_limited(self, delay_secs: float) -> None:
+        """Pause all callers for at least delay_secs and cut the limit."""
+        super().report_rate_limited(delay_secs)
+        self._decrease("rate limited")
+
+    def report_success(self, latency_secs: float, key: str = "") -> None:
+        """Grow the limit after a healthy call; cut it after a slow one."""
+        with self._changed:
+            baseline = self._baselines.get(key)
+            if baseline is None or latency_secs < baseline:
+                self._baselines[key] = latency_secs
+            else:
+                self._baselines[key] = baseline + BASELINE_DRIFT * (latency_secs - baseline)
+            slow = baseline is not None and latency_secs > baseline * self.latency_tolerance
+            grew = False
+            if not slow and int(self._limit) < self.max_concurrency:
+                before = int(self._limit)
+                self._limit = min(self._limit + 1.0 / self._limit, float(self.max_concurrency))
+                grew = int(self._limit) > before
+                if grew:
+                    self._changed.notify_all()
+        if grew:
+            self._wake_async_waiters()
+        if not slow:
+            return
+        logger.debug("LLM call %s took %.1fs (baseline %.1fs)", key, latency_secs, baseline)
+        self._decrease("latency")
+
+    def _decrease(self, reason: str) -> None:
+        with self._changed:
+            now = time.monotonic()
+            if now - self._last_decrease < DECREASE_HOLD_SECS:
+                return
+            self._last_decrease = now
+            if reason == "latency":
+                self.latency_backoff_count += 1
+            before = int(self._limit)
+            self._limit = max(self._limit * DECREASE_FACTOR, float(self.min_concurrency))
+            after = int(self._limit)
+        if after < before:
+            logger.info("LLM concurrency %d -> %d (%s)", before, after, reason)
+
+
+class TokenBudget:
+    """
+    Sliding one-minute token window.
+
+    acquire(n) blocks until n more tokens fit in the last TOKEN_WINDOW_SECS,
+    then records them. A request larger than the whole budget is clamped to
+    the budget so it can still run once the window is empty.
+    """
+
+    def __init__(self, tokens_per_minute: int):
+        self.tokens_per_minute = tokens_per_minute
+        self._lock = threading.Lock()
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._used = 0
+
+    def _prune(self, now: float) -> None:
+        while self._window and now - self._window[0][0] >= TOKEN_WINDOW_SECS:
+            _, tokens = self._window.popleft()
+            self._used -= tokens
+
+    def _try_reserve(self, tokens: int) -> float:
+        """Record tokens if they fit (returns 0), else seconds until the oldest entry expires."""
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            if self._used + tokens <= self.tokens_per_minute:
+                self._window.append((now, tokens))
+                self._used += tokens
+                return 0.0
+            return max(TOKEN_WINDOW_SECS - (now - self._window[0][0]), 0.01)
+
+    def acquire(self, tokens: int) -> float:
+        """Reserve tokens from the budget. Returns seconds spent waiting."""
+        if self.tokens_per_minute <= 0:
+            return 0.0
+        tokens = min(tokens, self.tokens_per_minute)
+        waited = 0.0
+        while True:
+            delay = self._try_reserve(tokens)
+            if not delay:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    async def acquire_async(self, tokens: int) -> float:
+        """acquire() for coroutines: waits without blocking the event loop."""
+        if self.tokens_per_minute <= 0:
+            return 0.0
+        tokens = min(tokens, self.tokens_per_minute)
+        waited = 0.0
+        while True:
+            delay = self._try_reserve(tokens)
+            if not delay:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+    @property
+    def used(self) -> int:
+        """Tokens recorded in the current window."""
+        with self._lock:
+            self._prune(time.monotonic())
+            return self._used
+
+
+_llm_gate: Optional[AdaptiveRateLimitGate] = None
+_llm_gate_lock = threading.Lock()
+
+
+def get_llm_gate() -> AdaptiveRateLimitGate:
+    """Process-wide adaptive gate shared by every LLM caller."""
+    global _llm_gate
+    with _llm_gate_lock:
+        if _llm_gate is None:
+            _llm_gate = AdaptiveRateLimitGate()
+        return _llm_gate
+
+
+_token_budgets: Dict[str, TokenBudget] = {}
+_token_budgets_lock = threading.Lock()
+
+
+def get_token_budget(model_name: str) -> TokenBudget:
+    """
+    Process-wide TokenBudget for a model.
+
+    Models without a configured limit (e.g. mock-model) get an unlimited budget.
+    """
+    with _token_budgets_lock:
+        budget = _token_budgets.get(model_name)
+        if budget is None:
+            budget = TokenBudget(TOKENS_PER_MINUTE.get(model_name, 0))
+            _token_budgets[model_name] = budget
+        return budget
+
+
+class RateLimitedLLMClient(LLMClient):
+    """
+    LLMClient wrapper adding a concurrency gate, a per-model token budget
+    and 429 retries.
+
+    Non-rate-limit errors propagate unchanged on the first attempt, so callers
+    see the same failures as with the wrapped client. rate_limited_count
+    counts this client's 429s (the gate's count spans every client sharing it);
+    tokens_used estimates prompt plus response tokens of its successful calls.
+
+    A CachedLLMClient passed in is unwrapped: the response cache is checked
+    before the gate and misses are stored after it. Cache hits take no slot,
+    spend no token budget and are not reported to the adaptive gate, whose
+    latency baseline a sub-millisecond hit would otherwise reset (making
+    every real call look slow).
+    """
+
+    def __init__(
+        self,
+        client: LLMClient,
+        gate: Optional[RateLimitGate] = None,
+        max_retries: int = MAX_RATE_LIMIT_RETRIES,
+        use_token_budget: bool = True,
+    ):
+        self.response_cache: Optional[CachedLLMClient] = None
+        if isinstance(client, CachedLLMClient):
+            self.response_cache = client
+            client = client.client
+        self.client = client
+        self.gate = gate or RateLimitGate()
+        self.max_retries = max_retries
+        self.use_token_budget = use_token_budget
+        self.rate_limited_count = 0
+        self.tokens_used = 0
+        self._tokens_lock = threading.Lock()
+
+    def get_model_name(self, require_reasoning: bool = False) -> str:
+        return self.client.get_model_name(require_reasoning)
+
+    def generation_config(self, require_reasoning: bool = False) -> Dict[str, Any]:
+        return self.client.generation_config(require_reasoning)
+
+    def discard_cached_response(
+        self,
+        prompt: str,
+        output_schema: Optional[Dict[str, Any]] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        require_reasoning: bool = False,
+        prefix: Optional[str] = None,
+    ) -> None:
+        (self.response_cache or self.client).discard_cached_response(
+            prompt, output_schema, response_schema, require_reasoning, prefix,
+        )
+
+    def complete(
+        self,
+        prompt: str,
+        output_schema: Optional[Dict[str, Any]] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        require_reasoning: bool = False,
+    ) -> str:
+        return self._cached_call(
+            prompt,
+            output_schema,
+            response_schema,
+            require_reasoning,
+            lambda: self.client.complete(
+                prompt=prompt,
+                output_schema=output_schema,
+                response_schema=response_schema,
+                require_reasoning=require_reasoning,
+            ),
+        )
+
+    def complete_with_prefix(
+        self,
+        prefix: str,
+        prompt: str,
+        output_schema: Optional[Dict[str, Any]] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        require_reasoning: bool = False,
+    ) -> str:
+        return self._cached_call(
+            prefix + prompt,
+            output_schema,
+            response_schema,
+            require_reasoning,
+            lambda: self.client.complete_with_prefix(
+                prefix=prefix,
+                prompt=prompt,
+                output_schema=output_schema,
+                response_schema=response_schema,
+                require_reasoning=require_reasoning,
+            ),
+        )
+
+    async def complete_async(
+        self,
+        prompt: str,
+        output_schema: Optional[Dict[str, Any]] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        require_reasoning: bool = False,
+        prefix: Optional[str] = None,
+    ) -> str:
+        return await self._cached_call_async(
+            (prefix or "") + prompt,
+            output_schema,
+            response_schema,
+            require_reasoning,
+            lambda: self.client.complete_async(
+                prompt=prompt,
+                output_schema=output_schema,
+                response_schema=response_schema,
+                require_reasoning=require_reasoning,
+                prefix=prefix,
+            ),
+        )
+
+    def _latency_key(self, full_prompt: str, require_reasoning: bool) -> str:
+        # Calls within a factor of two in prompt size share a latency baseline
+        size_bucket = int(math.log2(estimate_tokens(full_prompt)))
+        return f"{self.client.get_model_name(require_reasoning)}:{size_bucket}"
+
+    def _count_tokens(self, full_prompt: str, response: str) -> None:
+        tokens = estimate_tokens(full_prompt) + estimate_tokens(response or "")
+        with self._tokens_lock:
+            self.tokens_used += tokens
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        if not is_rate_limit_error(error) or attempt >= self.max_retries:
+            return False
+        delay = compute_rate_limit_backoff(attempt)
+        logger.warning(
+            "LLM rate limited (attempt %d/%d), backing off %.1fs: %s",
+            attempt + 1, self.max_retries, delay, error,
+        )
+        self.rate_limited_count += 1
+        self.gate.report_rate_limited(delay)
+        return True
+
+    def _cached_call(
+        self,
+        full_prompt: str,
+        output_schema: Optional[Dict[str, Any]],
+        response_schema: Optional[Dict[str, Any]],
+        require_reasoning: bool,
+        request: Callable[[], str],
+    ) -> str:
+        if self.response_cache is None:
+            return self._call(full_prompt, require_reasoning, request)
+        key, cached = self.response_cache.lookup(full_prompt, output_schema, response_schema, require_reasoning)
+        if cached is not None:
+            return cached
+        response = self._call(full_prompt, require_reasoning, request)
+        self.response_cache.store(key, response)
+        return response
+
+    async def _cached_call_async(
+        self,
+        full_prompt: str,
+        output_schema: Optional[Dict[str, Any]],
+        response_schema: Optional[Dict[str, Any]],
+        require_reasoning: bool,
+        request: Callable[[], Awaitable[str]],
+    ) -> str:
+        if self.response_cache is None:
+            return await self._call_async(full_prompt, require_reasoning, request)
+        # Cache backends may block (Firestore)
+        loop = asyncio.get_running_loop()
+        key, cached = await loop.run_in_executor(
+            None, self.response_cache.lookup, full_prompt, output_schema, response_schema, require_reasoning,
+        )
+        if cached is not None:
+            return cached
+        response = await self._call_async(full_prompt, require_reasoning, request)
+        await loop.run_in_executor(None, self.response_cache.store, key, response)
+        return response
+
+    def _call(self, full_prompt: str, require_reasoning: bool, request: Callable[[], str]) -> str:
+        key = self._latency_key(full_prompt, require_reasoning)
+        attempt = 0
+        while True:
+            if self.use_token_budget:
+                budget = get_token_budget(self.client.get_model_name(require_reasoning))
+                budget.acquire(estimate_tokens(full_prompt) + ESTIMATED_OUTPUT_TOKENS)
+            with self.gate.slot():
+                start = time.monotonic()
+                try:
+                    response = request()
+                except Exception as e:
+                    if not self._should_retry(e, attempt):
+                        raise
+                else:
+                    self.gate.report_success(time.monotonic() - start, key)
+                    self._count_tokens(full_prompt, response)
+                    return response
+            attempt += 1
+
+    async def _call_async(
+        self,
+        full_prompt: str,
+        require_reasoning: bool,
+        request: Callable[[], Awaitable[str]],
+    ) -> str:
+        key = self._latency_key(full_prompt, require_reasoning)
+        attempt = 0
+        while True:
+            if self.use_token_budget:
+                budget = get_token_budget(self.client.get_model_name(require_reasoning))
+                await budget.acquire_async(estimate_tokens(full_prompt) + ESTIMATED_OUTPUT_TOKENS)
+            async with self.gate.slot_async():
+                start = time.monotonic()
+                try:
+                    response = await request()
+                except Exception as e:
+                    if not self._should_retry(e, attempt):
+                        raise
+                else:
+                    self.gate.report_success(time.monotonic() - start, key)
+                    self._count_tokens(full_prompt, response)
+                    return response
+            attempt += 1
+
+
+def map_concurrent(
+    fn: Callable[[T], R],
+    items: Sequence[T],
+    max_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+    timeout_secs: Optional[float] = None,
+    on_timeout: Optional[Callable[[T], R]] = None,
+) -> List[R]:
+    """
+    Apply fn to every item on a bounded thread pool.
+
+    Results are returned in input order regardless of completion order.
+    max_concurrency <= 1 without a timeout runs sequentially on the calling
+    thread. Exceptions from fn propagate (callers are expected to catch per item).
+
+    With timeout_secs, an item that has been running longer than that is
+    abandoned and its slot in the result list is filled with on_timeout(item)
+    (None if not given). The timeout clock starts when the item starts running,
+    not when it is queued. Abandoned calls keep their thread until they return,
+    but the batch does not wait for them.
+    """
+    if timeout_secs is None:
+        if max_concurrency <= 1 or len(items) <= 1:
+            return [fn(item) for item in items]
+
+        with ThreadPoolExecutor(
+            max_workers=min(max_concurrency, len(items)),
+            thread_name_prefix="llm-fanout",
+        ) as pool:
+            return list(pool.map(fn, items))
+
+    if not items:
+        return []
+
+    started: Dict[int, float] = {}
+
+    def run(index: int) -> R:
+        started[index] = time.monotonic()
+        return fn(items[index])
+
+    results: List[Any] = [None] * len(items)
+    pool = ThreadPoolExecutor(
+        max_workers=min(max(1, max_concurrency), len(items)),
+        thread_name_prefix="llm-fanout",
+    )
+    try:
+        futures = {pool.submit(run, i): i for i in range(len(items))}
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            next_check = timeout_secs
+            for future in list(pending):
+                index = futures[future]
+                start = started.get(index)
+                if start is None or future.done():
+                    continue
+                elapsed = now - start
+                if elapsed >= timeout_secs:
+                    pending.discard(future)
+                    logger.warning(
+                        "Item %d timed out after %.1fs, abandoning", index, elapsed,
+                    )
+                    results[index] = on_timeout(items[index]) if on_timeout else None
+                else:
+                    next_check = min(next_check, timeout_secs - elapsed)
+            if not pending:
+                break
+            done, _ = wait(pending, timeout=max(next_check, 0.01), return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                results[futures[future]] = future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+__all__ = [
+    "DEFAULT_LLM_CONCURRENCY",
+    "DEFAULT_LLM_TIMEOUT_SECS",
+    "AdaptiveRateLimitGate",
+    "RateLimitGate",
+    "RateLimitedLLMClient",
+    "TokenBudget",
+    "compute_rate_limit_backoff",
+    "estimate_tokens",
+    "get_llm_gate",
+    "get_token_budget",
+    "is_rate_limit_error",
+    "map_concurrent",
+]
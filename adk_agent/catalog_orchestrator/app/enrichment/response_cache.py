@@ -0,0 +1,460 @@
+"""
+Response Cache - Content-addressed cache for deterministic LLM calls.
+
+Enrichment and quality scanning run at temperature 0.0 on MODEL_FAST. Repair
+loop retries, watchdog re-queues and repeated scheduled reviews send
+byte-identical prompts for unchanged exercises; this cache answers those from
+storage instead of paying for the same completion again.
+
+Opt-in via LLM_RESPONSE_CACHE:
+- "off" (default): no caching
+- "sqlite": local SQLite file (LLM_RESPONSE_CACHE_PATH). Survives within one
+  Cloud Run execution - covers repair-loop retries and re-leased jobs.
+- "firestore": catalog_llm_cache collection. Shared across executions and
+  workers - covers repeated scheduled runs.
+
+Key = sha256 of (model, generation config, full prompt text, output_schema,
+response_schema). Only calls with temperature 0 are cached.
+
+A caller that rejects a response (e.g. the review agent getting no
+decisions) calls discard_cached_response() before retrying, so the retry
+reaches the model and the rejected answer is not served again. complete_async
+runs cache reads and writes on the executor; the Firestore backend blocks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from app.enrichment.llm_client import LLMClient
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_BACKEND = os.getenv("LLM_RESPONSE_CACHE", "off").lower()
+RESPONSE_CACHE_TTL_SECS = int(os.getenv("LLM_RESPONSE_CACHE_TTL_SECS", str(7 * 24 * 3600)))
+RESPONSE_CACHE_PATH = os.getenv("LLM_RESPONSE_CACHE_PATH", "/tmp/catalog_llm_cache.sqlite3")
+# SQLite backend evicts least recently used entries beyond this total size
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("LLM_RESPONSE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+FIRESTORE_CACHE_COLLECTION = "catalog_llm_cache"
+# Firestore documents are capped at 1 MiB; larger responses are not cached
+FIRESTORE_MAX_VALUE_BYTES = 900 * 1024
+
+
+def response_cache_key(
+    model_name: str,
+    config: Dict[str, Any],
+    prompt: str,
+    output_schema: Optional[Dict[str, Any]] = None,
+    response_schema: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Content address for one LLM request."""
+    payload = json.dumps(
+        {
+            "model": model_name,
+            "config": config,
+            "prompt": prompt,
+            "output_schema": output_schema,
+            "response_schema": response_schema,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCacheBackend(ABC):
+    """Storage for cached responses."""
+
+    @abstractmethod
+    def get(self, key: str, ttl_secs: int) -> Optional[str]:
+        """Return the stored response if present and younger than ttl_secs."""
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl_secs: int) -> None:
+        """Store a response."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a response (missing keys are ignored)."""
+
+
+class SQLiteResponseCache(ResponseCacheBackend):
+    """
+    Local SQLite backend.
+
+    One table keyed by hash. Reads bump accessed_at; writes evict least
+    recently accessed rows once the stored bytes exceed max_bytes.
+    """
+
+    def __init__(self, path: str = RESPONSE_CACHE_PATH, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, ttl_secs: int) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at > ttl_secs:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            return value
+
+    def set(self, key: str, value: str, ttl_secs: int) -> None:
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        evict_keys = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ):
+            if total - freed <= self.max_bytes:
+                break
+            evict_keys.append((key,))
+            freed += size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evict_keys)
+        logger.info("Response cache evicted %d entries (%d bytes)", len(evict_keys), freed)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class FirestoreResponseCache(ResponseCacheBackend):
+    """
+    Firestore backend (catalog_llm_cache/{key}).
+
+    expires_at is written on every entry; configure a Firestore TTL policy on
+    that field to have old entries deleted server-side. Size-based eviction
+    is left to the TTL policy.
+    """
+
+    def __init__(self, collection: str = FIRESTORE_CACHE_COLLECTION):
+        self.collection = collection
+
+    def _get_db(self):
+        from app.firestore_client import get_firestore_client
+        return get_firestore_client()
+
+    def get(self, key: str, ttl_secs: int) -> Optional[str]:
+        doc = self._get_db().collection(self.collection).document(key).get()
+        if not doc.exists:
+            return None
+        data = doc.to_dict() or {}
+        expires_at = data.get("expires_at")
+        if expires_at and expires_at.replace(tzinfo=None) < datetime.utcnow():
+            return None
+        return data.get("value")
+
+    def set(self, key: str, value: str, ttl_secs: int) -> None:
+        if len(value.encode("utf-8")) > FIRESTORE_MAX_VALUE_BYTES:
+            return
+        now = datetime.now(timezone.utc)
+        self._get_db().collection(self.collection).document(key).set({
+            "value": value,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=ttl_secs),
+        })
+
+    def delete(self, key: str) -> None:
+        self._get_db().collection(self.collection).document(key).delete()
+
+
+class ResponseCache:
+    """
+    Backend plus TTL and hit/miss counters.
+
+    Backend errors are logged and treated as misses; the cache never fails
+    an LLM call.
+    """
+
+    def __init__(self, backend: ResponseCacheBackend, ttl_secs: int = RESPONSE_CACHE_TTL_SECS):
+        self.backend = backend
+        self.ttl_secs = ttl_secs
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.errors = 0
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self.backend.get(key, self.ttl_secs)
+        except Exception as e:
+            logger.warning("Response cache read failed (treated as miss): %s", e)
+            value = None
+            with self._lock:
+                self.errors += 1
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        try:
+            self.backend.set(key, value, self.ttl_secs)
+        except Exception as e:
+            logger.warning("Response cache write failed (non-fatal): %s", e)
+            with self._lock:
+                self.errors += 1
+            return
+        with self._lock:
+            self.stores += 1
+
+    def delete(self, key: str) -> None:
+        try:
+            self.backend.delete(key)
+        except Exception as e:
+            logger.warning("Response cache delete failed (non-fatal): %s", e)
+            with self._lock:
+                self.errors += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "errors": self.errors,
+            }
+
+
+class CachedLLMClient(LLMClient):
+    """
+    LLMClient wrapper that answers repeated deterministic requests from cache.
+
+    Requests whose generation config has a non-zero temperature go straight
+    to the wrapped client. A prefix sent via complete_with_prefix is part of
+    the key (same key as the equivalent inline prompt).
+
+    RateLimitedLLMClient unwraps this client and calls lookup() / store()
+    itself, so cache hits bypass its gate and token budget.
+    """
+
+    def __init__(self, client: LLMClient, cache: ResponseCache):
+        self.client = client
+        self.cache = cache
+
+    def get_model_name(self, require_reasoning: bool = False) -> str:
+        return self.client.get_model_name(require_reasoning)
+
+    def generation_config(self, require_reasoning: bool = False) -> Dict[str, Any]:
+        return self.client.generation_config(require_reasoning)
+
+    def _key(
+        self,
+        full_prompt: str,
+        output_schema: Optional[Dict[str, Any]],
+        response_schema: Optional[Dict[str, Any]],
+        require_reasoning: bool,
+    ) -> Optional[str]:
+        config = self.generation_config(require_reasoning)
+        if config.get("temperature", 0.0) != 0.0:
+            return None
+        return response_cache_key(
+            self.get_model_name(require_reasoning),
+            config,
+            full_prompt,
+            output_schema,
+            response_schema,
+        )
+
+    def lookup(
+        self,
+        full_prompt: str,
+        output_schema: Optional[Dict[str, Any]] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        require_reasoning: bool = False,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Look a request up in the cache.
+
+        Returns:
+            (key, cached response). key is None for uncacheable requests;
+            the response is None on a miss.
+        """
+        key = self._key(full_prompt, output_schema, response_schema, require_reasoning)
+        if key is None:
+            return None, None
+        return key, self.cache.get(key)
+
+    def store(self, key: Optional[str], response: str) -> None:
+        """Store a response under a key from lookup() (no-op for None)."""
+        if key is not None:
+            self.cache.set(key, response)
+
+    def discard_cached_response(
+        self,
+        prompt: str,
+        output_schema: Optional[Dict[str, Any]] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        require_reasoning: bool = False,
+        prefix: Optional[str] = None,
+    ) -> None:
+        key = self._key((prefix or "") + prompt, output_schema, response_schema, require_reasoning)
+        if key is not None:
+            self.cache.delete(key)
+
+    def complete(
+        self,
+        prompt: str,
+        output_schema: Optional[Dict[str, Any]] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        require_reasoning: bool = False,
+    ) -> str:
+        return self.complete_with_prefix(
+            "", prompt, output_schema, response_schema, require_reasoning,
+        )
+
+    def complete_with_prefix(
+        self,
+        prefix: str,
+        prompt: str,
+        output_schema: Optional[Dict[str, Any]] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        require_reasoning: bool = False,
+    ) -> str:
+        key, cached = self.lookup(prefix + prompt, output_schema, response_schema, require_reasoning)
+        if cached is not None:
+            return cached
+
+        if prefix:
+            response = self.client.complete_with_prefix(
+                prefix=prefix,
+                prompt=prompt,
+                output_schema=output_schema,
+                response_schema=response_schema,
+                require_reasoning=require_reasoning,
+            )
+        else:
+            response = self.client.complete(
+                prompt=prompt,
+                output_schema=output_schema,
+                response_schema=response_schema,
+                require_reasoning=require_reasoning,
+            )
+
+        self.store(key, response)
+        return response
+
+    async def complete_async(
+        self,
+        prompt: str,
+        output_schema: Optional[Dict[str, Any]] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        require_reasoning: bool = False,
+        prefix: Optional[str] = None,
+    ) -> str:
+        loop = asyncio.get_running_loop()
+        key, cached = await loop.run_in_executor(
+            None, self.lookup, (prefix or "") + prompt, output_schema, response_schema, require_reasoning,
+        )
+        if cached is not None:
+            return cached
+
+        response = await self.client.complete_async(
+            prompt=prompt,
+            output_schema=output_schema,
+            response_schema=response_schema,
+            require_reasoning=require_reasoning,
+            prefix=prefix,
+        )
+
+        if key is not None:
+            await loop.run_in_executor(None, self.store, key, response)
+        return response
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Process-wide ResponseCache for the configured backend, or None when
+    LLM_RESPONSE_CACHE is off (or the backend can't be opened).
+    """
+    global _response_cache
+
+    if RESPONSE_CACHE_BACKEND not in ("sqlite", "firestore"):
+        return None
+
+    with _response_cache_lock:
+        if _response_cache is None:
+            try:
+                if RESPONSE_CACHE_BACKEND == "firestore":
+                    backend: ResponseCacheBackend = FirestoreResponseCache()
+                else:
+                    backend = SQLiteResponseCache()
+            except Exception as e:
+                logger.warning("Response cache unavailable, continuing without it: %s", e)
+                return None
+            _response_cache = ResponseCache(backend)
+            logger.info("LLM response cache enabled: backend=%s ttl=%ds",
+                        RESPONSE_CACHE_BACKEND, _response_cache.ttl_secs)
+        return _response_cache
+
+
+__all__ = [
+    "CachedLLMClient",
+    "FirestoreResponseCache",
+    "ResponseCache",
+    "ResponseCacheBackend",
+    "SQLiteResponseCache",
+    "get_response_cache",
+    "response_cache_key",
+]
@@ -0,0 +1,201 @@
+"""
+Family Cache - Per-process cache of a family's exercise documents.
+
+Family jobs read the same family several times: get_family_summary and
+get_family_exercises in an audit, fetch_family_snapshot for the plan
+compiler, and again on every repair-loop attempt. This cache serves those
+reads from one Firestore query per family.
+
+Validation: each entry carries a version stamp, the family's member count
+and max exercises.updated_at. A cache hit re-reads only that stamp (one
+count() aggregation plus a one-document query, which needs the
+family_slug ASC + updated_at DESC index); a different stamp means the
+family changed and it is re-fetched. The count catches exercises that left
+the family (merged away, reassigned, deleted), which never move the max
+updated_at of the members that remain. ApplyEngine invalidates the families
+it touched when it commits, and FAMILY_CACHE_TTL_SECS bounds how long an
+entry can be served at all.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
+
+logger = logging.getLogger(__name__)
+
+FAMILY_CACHE_ENABLED = os.getenv("FAMILY_CACHE", "true").lower() in ("1", "true", "yes", "on")
+FAMILY_CACHE_TTL_SECS = int(os.getenv("FAMILY_CACHE_TTL_SECS", "300"))
+FAMILY_CACHE_MAX_ENTRIES = 256
+
+EXERCISES_COLLECTION = "exercises"
+
+# Stamp lookup failed (e.g. index missing) - treat the entry as stale
+_UNKNOWN = object()
+
+
+@dataclass
+class _Entry:
+    exercises: Dict[str, Dict[str, Any]]
+    stamp: Any
+    fetched_at: float
+
+
+def family_stamp(exercises: Dict[str, Dict[str, Any]]) -> Any:
+    """Version stamp for a family: (member count, max updated_at)."""
+    stamps = [data["updated_at"] for data in exercises.values() if data.get("updated_at")]
+    return (len(exercises), max(stamps) if stamps else None)
+
+
+class FamilyCache:
+    """
+    Exercise documents per family_slug, validated by version stamp.
+
+    Returned dicts are copies; callers may mutate them.
+    """
+
+    def __init__(
+        self,
+        ttl_secs: int = FAMILY_CACHE_TTL_SECS,
+        max_entries: int = FAMILY_CACHE_MAX_ENTRIES,
+        enabled: bool = FAMILY_CACHE_ENABLED,
+    ):
+        self.ttl_secs = ttl_secs
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_exercises(
+        self,
+        family_slug: str,
+        db: Optional["firestore.Client"] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a family's exercise documents.
+
+        Args:
+            family_slug: Family to read
+            db: Client to use (default: shared client)
+
+        Returns:
+            Dict of doc_id -> document data
+        """
+        if db is None:
+            from app.firestore_client import get_firestore_client
+            db = get_firestore_client()
+
+        if self.enabled:
+            with self._lock:
+                entry = self._entries.get(family_slug)
+            if entry is not None and time.monotonic() - entry.fetched_at < self.ttl_secs:
+                if self._read_stamp(db, family_slug) == entry.stamp:
+                    with self._lock:
+                        self.hits += 1
+                        if family_slug in self._entries:
+                            self._entries.move_to_end(family_slug)
+                    return copy.deepcopy(entry.exercises)
+
+        exercises = {
+            doc.id: doc.to_dict()
+            for doc in db.collection(EXERCISES_COLLECTION)
+            .where("family_slug", "==", family_slug)
+            .stream()
+        }
+
+        if self.enabled:
+            with self._lock:
+                self.misses += 1
+                self._entries[family_slug] = _Entry(
+                    exercises=exercises,
+                    stamp=family_stamp(exercises),
+                    fetched_at=time.monotonic(),
+                )
+                self._entries.move_to_end(family_slug)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return copy.deepcopy(exercises)
+
+    def _read_stamp(self, db: "firestore.Client", family_slug: str) -> Any:
+        """Current stamp from Firestore (member count, newest updated_at)."""
+        from google.cloud import firestore
+
+        from app.firestore_client import count_query
+
+        try:
+            members = db.collection(EXERCISES_COLLECTION).where("family_slug", "==", family_slug)
+            newest = None
+            query = (
+                members
+                .order_by("updated_at", direction=firestore.Query.DESCENDING)
+                .limit(1)
+                .select(["updated_at"])
+            )
+            for doc in query.stream():
+                newest = (doc.to_dict() or {}).get("updated_at")
+            return (count_query(members), newest)
+        except Exception as e:
+            logger.warning("Family stamp lookup failed for %s, re-fetching: %s", family_slug, e)
+            return _UNKNOWN
+
+    def invalidate(self, family_slug: Optional[str] = None) -> None:
+        """Drop one family, or every family when family_slug is None."""
+        with self._lock:
+            if family_slug is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(family_slug, None)
+
+    def invalidate_targets(self, targets: Iterable[str]) -> int:
+        """
+        Drop every cached family named in targets or containing one of them.
+
+        Args:
+            targets: Family slugs and/or exercise doc IDs
+
+        Returns:
+            Number of families dropped
+        """
+        targets = set(targets)
+        with self._lock:
+            stale = [
+                family_slug for family_slug, entry in self._entries.items()
+                if family_slug in targets or not targets.isdisjoint(entry.exercises)
+            ]
+            for family_slug in stale:
+                del self._entries[family_slug]
+        if stale:
+            logger.debug("Invalidated cached families: %s", stale)
+        return len(stale)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_family_cache = FamilyCache()
+
+
+def get_family_cache() -> FamilyCache:
+    """Process-wide FamilyCache."""
+    return _family_cache
+
+
+__all__ = [
+    "FAMILY_CACHE_TTL_SECS",
+    "FamilyCache",
+    "family_stamp",
+    "get_family_cache",
+]
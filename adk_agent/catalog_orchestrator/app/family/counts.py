@@ -0,0 +1,241 @@
+"""
+Family Counts - Incrementally maintained exercise count per family.
+
+list_families_summary used to stream every exercise (projected to
+family_slug) and GROUP BY in Python; the maintenance and duplicate
+detection scans paid for that full catalog scan on every run. Counts now
+live in catalog_family_counts/{family_slug} and a family listing is one
+stream of that small collection.
+
+Counting rule: every exercise document counts toward its family_slug,
+whatever its status (deprecated and merged exercises included), matching
+the scan this replaced.
+
+Maintenance:
+- ApplyEngine collects deltas on create, reassign and family_slug patches,
+  and commits them with adjust_family_counts() when a plan finishes
+  (Firestore Increment, so concurrent jobs compose)
+- `python cli.py rebuild-family-counts` recomputes every count from one
+  exercises scan; run it after bulk edits made outside ApplyEngine or if
+  the collection was never built
+
+Readers trust the counts only once a rebuild has written the built marker
+(catalog_index_markers/family_counts). Before that, ApplyEngine deltas may
+have created counters for the families they touched, which are partial
+(and can go negative); readers fall back to scan_family_counts() and the
+first rebuild overwrites those counters with absolute values.
+
+Counts live outside exercise_families on purpose: registry docs are
+governance records (upserted whole by UPDATE_FAMILY_REGISTRY) and a
+counter write would otherwise create half-empty registry docs.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional
+
+from app.firestore_client import MAX_BATCH_WRITES
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
+
+logger = logging.getLogger(__name__)
+
+FAMILY_COUNTS_COLLECTION = "catalog_family_counts"
+EXERCISES_COLLECTION = "exercises"
+
+# Built marker, written by rebuild_family_counts
+INDEX_MARKERS_COLLECTION = "catalog_index_markers"
+FAMILY_COUNTS_MARKER = "family_counts"
+
+
+def counted_family(data: Optional[Mapping[str, Any]]) -> Optional[str]:
+    """Family an exercise document counts toward, or None."""
+    if not data:
+        return None
+    return data.get("family_slug") or None
+
+
+def family_count_deltas(
+    before: Optional[Mapping[str, Any]],
+    after: Optional[Mapping[str, Any]],
+) -> Dict[str, int]:
+    """
+    Count changes for one exercise going from before to after.
+
+    Args:
+        before: Document before the write (None for a create)
+        after: Document after the write
+
+    Returns:
+        Dict of family_slug -> delta (empty when nothing changed)
+    """
+    old, new = counted_family(before), counted_family(after)
+    if old == new:
+        return {}
+    deltas: Dict[str, int] = {}
+    if old:
+        deltas[old] = -1
+    if new:
+        deltas[new] = 1
+    return deltas
+
+
+def adjust_family_counts(
+    deltas: Mapping[str, int],
+    db: Optional["firestore.Client"] = None,
+) -> int:
+    """
+    Apply count deltas with Increment (one WriteBatch per 500 families).
+
+    Args:
+        deltas: family_slug -> change in exercise count
+        db: Client to use (default: shared client)
+
+    Returns:
+        Number of family count docs written
+    """
+    from google.cloud import firestore
+
+    deltas = {slug: delta for slug, delta in deltas.items() if slug and delta}
+    if not deltas:
+        return 0
+
+    if db is None:
+        from app.firestore_client import get_firestore_client
+        db = get_firestore_client()
+
+    coll = db.collection(FAMILY_COUNTS_COLLECTION)
+    now = datetime.utcnow()
+    items = list(deltas.items())
+    for start in range(0, len(items), MAX_BATCH_WRITES):
+        batch = db.batch()
+        for slug, delta in items[start:start + MAX_BATCH_WRITES]:
+            batch.set(coll.document(slug), {
+                "family_slug": slug,
+                "exercise_count": firestore.Increment(delta),
+                "updated_at": now,
+            }, merge=True)
+        batch.commit()
+
+    logger.debug("Adjusted family counts: %s", deltas)
+    return len(deltas)
+
+
+def family_counts_built(db: Optional["firestore.Client"] = None) -> bool:
+    """True once rebuild_family_counts has built the counts."""
+    if db is None:
+        from app.firestore_client import get_firestore_client
+        db = get_firestore_client()
+
+    return db.collection(INDEX_MARKERS_COLLECTION).document(FAMILY_COUNTS_MARKER).get().exists
+
+
+def read_family_counts(db: Optional["firestore.Client"] = None) -> Dict[str, int]:
+    """
+    Read every maintained family count.
+
+    Returns:
+        Dict of family_slug -> exercise_count (empty if never built)
+    """
+    if db is None:
+        from app.firestore_client import get_firestore_client
+        db = get_firestore_client()
+
+    return {
+        doc.id: int((doc.to_dict() or {}).get("exercise_count") or 0)
+        for doc in db.collection(FAMILY_COUNTS_COLLECTION).select(["exercise_count"]).stream()
+    }
+
+
+def scan_family_counts(db: Optional["firestore.Client"] = None) -> Dict[str, int]:
+    """Count exercises per family with a full (projected) exercises scan."""
+    if db is None:
+        from app.firestore_client import get_firestore_client
+        db = get_firestore_client()
+
+    counts: Counter = Counter()
+    query = db.collection(EXERCISES_COLLECTION).select(["family_slug"])
+    for doc in query.stream():
+        slug = counted_family(doc.to_dict())
+        if slug:
+            counts[slug] += 1
+    return dict(counts)
+
+
+def rebuild_family_counts(
+    db: Optional["firestore.Client"] = None,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Recompute every family count from the exercises collection.
+
+    Families that no longer have exercises are kept with a count of
+    0, so an in-flight Increment can't resurrect a stale count. Writes the
+    built marker once the counts are in place.
+
+    Args:
+        db: Client to use (default: shared client)
+        dry_run: Compute and diff only, write nothing
+
+    Returns:
+        Dict with counts, families, exercises, changed (slug -> (old, new))
+    """
+    if db is None:
+        from app.firestore_client import get_firestore_client
+        db = get_firestore_client()
+
+    counts = scan_family_counts(db)
+    existing = read_family_counts(db)
+
+    target = {slug: 0 for slug in existing}
+    target.update(counts)
+    changed = {
+        slug: (existing.get(slug), count)
+        for slug, count in target.items()
+        if existing.get(slug) != count
+    }
+
+    if not dry_run and changed:
+        coll = db.collection(FAMILY_COUNTS_COLLECTION)
+        now = datetime.utcnow()
+        items = sorted(changed)
+        for start in range(0, len(items), MAX_BATCH_WRITES):
+            batch = db.batch()
+            for slug in items[start:start + MAX_BATCH_WRITES]:
+                batch.set(coll.document(slug), {
+                    "family_slug": slug,
+                    "exercise_count": target[slug],
+                    "updated_at": now,
+                })
+            batch.commit()
+        logger.info("Rebuilt family counts: %d families changed", len(changed))
+
+    if not dry_run:
+        db.collection(INDEX_MARKERS_COLLECTION).document(FAMILY_COUNTS_MARKER).set({
+            "built_at": datetime.utcnow(),
+            "families": len(counts),
+            "exercises": sum(counts.values()),
+        })
+
+    return {
+        "counts": counts,
+        "families": len(counts),
+        "exercises": sum(counts.values()),
+        "changed": changed,
+    }
+
+
+__all__ = [
+    "FAMILY_COUNTS_COLLECTION",
+    "adjust_family_counts",
+    "counted_family",
+    "family_count_deltas",
+    "family_counts_built",
+    "read_family_counts",
+    "rebuild_family_counts",
+    "scan_family_counts",
+]
@@ -14,24 +14,21 @@ from typing import Any, Dict, List, Optional
 
 from google.cloud import firestore
 
+from app.family.cache import get_family_cache
 from app.family.models import FamilyRegistry, FamilyStatus, ExerciseSummary
+from app.firestore_client import get_firestore_client, query_in
 
 logger = logging.getLogger(__name__)
 
 # Collection names
 FAMILIES_COLLECTION = "exercise_families"
 EXERCISES_COLLECTION = "exercises"
-
-# Initialize Firestore client lazily
-_db: Optional[firestore.Client] = None
+ALIASES_COLLECTION = "exercise_aliases"
 
 
 def get_db() -> firestore.Client:
-    """Get or initialize Firestore client."""
-    global _db
-    if _db is None:
-        _db = firestore.Client()
-    return _db
+    """Get the shared Firestore client."""
+    return get_firestore_client()
 
 
 def get_family_registry(family_slug: str) -> Optional[FamilyRegistry]:
@@ -113,23 +110,50 @@ def get_family_exercises(family_slug: str) -> List[ExerciseSummary]:
     """
     Get all exercises for a family.
     
+    Served from the per-process family cache (app/family/cache.py).
+    
     Args:
         family_slug: Family to fetch
         
     Returns:
         List of ExerciseSummary (token-safe projections)
     """
-    db = get_db()
-    query = (
-        db.collection(EXERCISES_COLLECTION)
-        .where("family_slug", "==", family_slug)
-    )
+    docs = get_family_cache().get_exercises(family_slug, db=get_db())
+    
+    return [ExerciseSummary.from_doc(doc_id, data) for doc_id, data in docs.items()]
+
+
+def get_family_aliases(
+    family_slug: str,
+    exercise_ids: List[str],
+    db: Optional[firestore.Client] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Get aliases for a family without scanning exercise_aliases.
+    
+    Runs one family_slug == X query plus exercise_id "in" queries over
+    exercise_ids (query_in), so cost scales with the family size.
+    
+    Args:
+        family_slug: Family whose family-level aliases to include
+        exercise_ids: Exercise doc IDs whose aliases to include
+        db: Client to use (default: shared client)
+        
+    Returns:
+        Dict of alias_slug -> alias data (alias_slug field set)
+    """
+    db = db or get_db()
+    
+    docs = list(db.collection(ALIASES_COLLECTION).where("family_slug", "==", family_slug).stream())
+    docs.extend(query_in(ALIASES_COLLECTION, "exercise_id", exercise_ids, db=db))
     
-    exercises = []
-    for doc in query.stream():
-        exercises.append(ExerciseSummary.from_doc(doc.id, doc.to_dict()))
+    aliases = {}
+    for doc in docs:
+        data = doc.to_dict()
+        data["alias_slug"] = doc.id
+        aliases[doc.id] = data
     
-    return exercises
+    return aliases
 
 
 def get_or_create_family_registry(family_slug: str) -> FamilyRegistry:
@@ -220,6 +244,7 @@ __all__ = [
     "upsert_family_registry",
     "list_family_registries",
     "get_family_exercises",
+    "get_family_aliases",
     "get_or_create_family_registry",
     "get_family_summary",
 ]
@@ -0,0 +1,237 @@
+"""
+Firestore Client - One shared client per process.
+
+Every catalog module gets its Firestore client from get_firestore_client()
+instead of constructing its own. Building a client pays for credential
+lookup and gRPC channel setup, so a job that touches the queue, registry,
+idempotency, journal and executor helpers used to do that five times over.
+google.cloud.firestore.Client is thread-safe, so one instance is shared by
+worker threads (WORKER_CONCURRENCY) and the heartbeat.
+
+Emulator: when FIRESTORE_EMULATOR_HOST is set the client targets the
+"demo-povver" project, matching scripts/export_catalog_to_emulator.py.
+
+get_documents() fetches many documents by ID with a few large get_all
+(BatchGetDocuments) calls instead of one small call per chunk. get_all is
+not bound by the value limit of "in" queries. query_in() runs a field "in"
+filter over any number of values as concurrent chunked queries.
+count_query() and count_by_value() count matches with server-side count()
+aggregations, so counting never downloads the documents.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
+
+logger = logging.getLogger(__name__)
+
+EMULATOR_PROJECT = "demo-povver"
+
+# Documents per get_all call, and how many calls run at once for large ID lists
+GET_ALL_CHUNK_SIZE = int(os.getenv("FIRESTORE_GET_ALL_CHUNK_SIZE", "300"))
+GET_ALL_MAX_CONCURRENCY = int(os.getenv("FIRESTORE_GET_ALL_MAX_CONCURRENCY", "4"))
+
+# Max values in a Firestore "in" filter
+IN_QUERY_MAX_VALUES = 30
+
+# Firestore caps a WriteBatch at 500 writes
+MAX_BATCH_WRITES = 500
+
+_client: Optional["firestore.Client"] = None
+_client_lock = threading.Lock()
+
+
+def is_emulator() -> bool:
+    """True when FIRESTORE_EMULATOR_HOST points at a local emulator."""
+    return bool(os.environ.get("FIRESTORE_EMULATOR_HOST"))
+
+
+def get_firestore_client() -> "firestore.Client":
+    """Get the process-wide Firestore client, building it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build_client()
+    return _client
+
+
+def _build_client() -> "firestore.Client":
+    from google.cloud import firestore
+
+    if is_emulator():
+        logger.info(
+            "Using Firestore emulator at %s (project=%s)",
+            os.environ["FIRESTORE_EMULATOR_HOST"], EMULATOR_PROJECT,
+        )
+        return firestore.Client(project=EMULATOR_PROJECT)
+
+    # Production - use default ADC project
+    return firestore.Client()
+
+
+def get_documents(
+    collection: str,
+    doc_ids: Sequence[str],
+    field_paths: Optional[List[str]] = None,
+    db: Optional["firestore.Client"] = None,
+    chunk_size: int = GET_ALL_CHUNK_SIZE,
+    max_concurrency: int = GET_ALL_MAX_CONCURRENCY,
+) -> List[Any]:
+    """
+    Fetch documents by ID with bulk get_all calls.
+
+    IDs are de-duplicated and split into chunks of chunk_size; chunks run
+    concurrently (up to max_concurrency) when there is more than one.
+
+    Args:
+        collection: Collection name
+        doc_ids: Document IDs to fetch
+        field_paths: Optional field mask (only these fields are returned)
+        db: Client to use (default: shared client)
+        chunk_size: Documents per get_all call
+        max_concurrency: Parallel get_all calls
+
+    Returns:
+        Snapshots of the documents that exist, in doc_ids order
+    """
+    ids = list(dict.fromkeys(doc_ids))
+    if not ids:
+        return []
+
+    db = db or get_firestore_client()
+    coll = db.collection(collection)
+    chunk_size = max(1, chunk_size)
+    chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+
+    def fetch(chunk: List[str]) -> List[Any]:
+        refs = [coll.document(doc_id) for doc_id in chunk]
+        return list(db.get_all(refs, field_paths=field_paths))
+
+    results = _run_chunks(fetch, chunks, max_concurrency)
+
+    # get_all does not preserve request order
+    by_id = {doc.id: doc for chunk_docs in results for doc in chunk_docs if doc.exists}
+    return [by_id[doc_id] for doc_id in ids if doc_id in by_id]
+
+
+def query_in(
+    collection: str,
+    field: str,
+    values: Sequence[Any],
+    field_paths: Optional[List[str]] = None,
+    db: Optional["firestore.Client"] = None,
+    max_concurrency: int = GET_ALL_MAX_CONCURRENCY,
+) -> List[Any]:
+    """
+    Find documents whose field is one of values.
+
+    Values are de-duplicated and split into "in" filters of
+    IN_QUERY_MAX_VALUES; the chunk queries run concurrently.
+
+    Args:
+        collection: Collection name
+        field: Field to match
+        values: Values to match
+        field_paths: Optional projection (only these fields are returned)
+        db: Client to use (default: shared client)
+        max_concurrency: Parallel queries
+
+    Returns:
+        Matching snapshots (chunk order, unordered within a chunk)
+    """
+    unique = list(dict.fromkeys(values))
+    if not unique:
+        return []
+
+    db = db or get_firestore_client()
+    coll = db.collection(collection)
+    chunks = [unique[i:i + IN_QUERY_MAX_VALUES] for i in range(0, len(unique), IN_QUERY_MAX_VALUES)]
+
+    def run(chunk: List[Any]) -> List[Any]:
+        query = coll.where(field, "in", chunk)
+        if field_paths:
+            query = query.select(field_paths)
+        return list(query.stream())
+
+    return [doc for chunk_docs in _run_chunks(run, chunks, max_concurrency) for doc in chunk_docs]
+
+
+def count_query(query: Any) -> int:
+    """Number of documents a query matches (one count() aggregation)."""
+    result = query.count(alias="count").get()
+    return int(result[0][0].value) if result else 0
+
+
+def count_by_value(
+    collection: str,
+    field: str,
+    values: Sequence[Any],
+    db: Optional["firestore.Client"] = None,
+    max_concurrency: int = GET_ALL_MAX_CONCURRENCY,
+) -> Dict[Any, int]:
+    """
+    Count documents per value of a field.
+
+    One count() aggregation per value, run concurrently. Each costs one
+    read per 1,000 matching index entries, not one per document.
+
+    Args:
+        collection: Collection name
+        field: Field to match with ==
+        values: Values to count
+        db: Client to use (default: shared client)
+        max_concurrency: Parallel aggregations
+
+    Returns:
+        Dict of value -> count (every value, including zeros)
+    """
+    values = list(dict.fromkeys(values))
+    if not values:
+        return {}
+    db = db or get_firestore_client()
+    coll = db.collection(collection)
+
+    def count(chunk: List[Any]) -> List[int]:
+        return [count_query(coll.where(field, "==", chunk[0]))]
+
+    counts = _run_chunks(count, [[value] for value in values], max_concurrency)
+    return {value: chunk_counts[0] for value, chunk_counts in zip(values, counts)}
+
+
+def _run_chunks(fn: Callable[[List[Any]], List[Any]], chunks: List[List[Any]], max_concurrency: int) -> List[List[Any]]:
+    """fn over each chunk, concurrently when there is more than one."""
+    if len(chunks) == 1 or max_concurrency <= 1:
+        return [fn(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(chunks))) as pool:
+        return list(pool.map(fn, chunks))
+
+
+def reset_firestore_client() -> None:
+    """Drop the shared client (tests, or after changing emulator settings)."""
+    global _client
+    with _client_lock:
+        _client = None
+
+
+__all__ = [
+    "EMULATOR_PROJECT",
+    "GET_ALL_CHUNK_SIZE",
+    "GET_ALL_MAX_CONCURRENCY",
+    "IN_QUERY_MAX_VALUES",
+    "MAX_BATCH_WRITES",
+    "count_by_value",
+    "count_query",
+    "get_documents",
+    "get_firestore_client",
+    "is_emulator",
+    "query_in",
+    "reset_firestore_client",
+]
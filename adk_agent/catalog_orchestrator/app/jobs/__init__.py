@@ -27,8 +27,11 @@ from app.jobs.models import (
 )
 
 from app.jobs.queue import (
+    BulkCreateError,
     create_job,
+    create_jobs_bulk,
     poll_job,
+    poll_jobs,
     lease_job,
     complete_job,
     fail_job,
@@ -57,8 +60,11 @@ __all__ = [
     "JobPayload",
     "AttemptLog",
     # Queue
+    "BulkCreateError",
     "create_job",
+    "create_jobs_bulk",
     "poll_job",
+    "poll_jobs",
     "lease_job",
     "complete_job",
     "fail_job",
@@ -732,7 +732,7 @@ class JobExecutor:
         Enumerates target exercises and creates shard jobs for parallel processing.
         """
         from app.enrichment.models import EnrichmentSpec
-        from app.jobs.queue import create_job
+        from app.jobs.queue import create_jobs_bulk
         from app.jobs.models import JobType, JobQueue
         
         enrichment_spec_data = self.payload.get("enrichment_spec", {})
@@ -775,18 +775,20 @@ class JobExecutor:
         # Chunk into shards
         shards = [target_ids[i:i + shard_size] for i in range(0, len(target_ids), shard_size)]
         
-        # Create child jobs
-        child_job_ids = []
-        for shard_ids in shards:
-            child = create_job(
-                job_type=JobType.CATALOG_ENRICH_FIELD_SHARD,
-                queue=JobQueue.MAINTENANCE,
-                exercise_doc_ids=shard_ids,
-                mode=self.mode,
-                enrichment_spec=enrichment_spec_data,
-                parent_job_id=self.job_id,
-            )
-            child_job_ids.append(child.id)
+        # Create child jobs (batched commits; the parent records the fan-out)
+        child_job_ids = create_jobs_bulk(
+            [
+                {
+                    "job_type": JobType.CATALOG_ENRICH_FIELD_SHARD,
+                    "queue": JobQueue.MAINTENANCE,
+                    "exercise_doc_ids": shard_ids,
+                    "mode": self.mode,
+                    "enrichment_spec": enrichment_spec_data,
+                }
+                for shard_ids in shards
+            ],
+            parent_job_id=self.job_id,
+        )
         
         return {
             "success": True,
@@ -810,7 +812,7 @@ class JobExecutor:
 
         MODES:
             Holistic (preferred): enrichment_spec.fields_to_enrich is set
-                -> Calls enrich_exercise_holistic() for each exercise
+                -> Calls enrich_exercises_holistic_batch() (K exercises per prompt)
                 -> LLM sees full doc + reviewer hints, decides what to update
                 -> More coherent results than single-field
 
@@ -915,8 +917,21 @@ class JobExecutor:
     ) -> Dict[str, Any]:
         """
         Execute holistic enrichment - pass full doc to LLM with reviewer hints.
+
+        Exercises are packed into batched prompts
+        (enrichment_spec.batch_size, default ENRICHMENT_HOLISTIC_BATCH_SIZE)
+        and the batch calls fan out on a bounded pool
+        (enrichment_spec.max_concurrency, default ENRICHMENT_LLM_CONCURRENCY)
+        behind the process-wide adaptive gate (get_llm_gate). Results are consumed in input order,
+        so the ChangePlan and idempotency seeds match the sequential path.
         """
-        from app.enrichment.engine import enrich_exercise_holistic
+        from app.enrichment.engine import HOLISTIC_BATCH_SIZE, enrich_exercises_holistic_batch
+        from app.enrichment.rate_limit import (
+            DEFAULT_LLM_CONCURRENCY,
+            RateLimitedLLMClient,
+            get_llm_gate,
+            map_concurrent,
+        )
         from app.plans.models import Operation, OperationType, RiskLevel, ChangePlan
         from datetime import datetime
         
@@ -942,16 +957,34 @@ class JobExecutor:
             "no_changes": 0,
         }
         
-        for exercise in exercises:
-            exercise_id = exercise.get("id", exercise.get("doc_id", "unknown"))
-            
-            # Call holistic enrichment
-            result = enrich_exercise_holistic(
-                exercise=exercise,
+        max_concurrency = enrichment_spec_data.get("max_concurrency", DEFAULT_LLM_CONCURRENCY)
+        gated_client = RateLimitedLLMClient(llm_client, get_llm_gate())
+        
+        batch_size = max(1, enrichment_spec_data.get("batch_size", HOLISTIC_BATCH_SIZE))
+        batches = [exercises[i:i + batch_size] for i in range(0, len(exercises), batch_size)]
+        
+        def enrich_batch(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            return enrich_exercises_holistic_batch(
+                exercises=batch,
                 reviewer_hint=reviewer_hint,
-                llm_client=llm_client,
+                llm_client=gated_client,
                 use_pro_model=use_pro_model,
+                batch_size=batch_size,
             )
+        
+        # Call holistic enrichment for all exercises (results in input order)
+        enrichment_results = [
+            result
+            for batch_results in map_concurrent(enrich_batch, batches, max_concurrency)
+            for result in batch_results
+        ]
+        
+        if gated_client.rate_limited_count:
+            results_summary["rate_limited"] = gated_client.rate_limited_count
+        results_summary["tokens_used"] = gated_client.tokens_used
+        
+        for exercise, result in zip(exercises, enrichment_results):
+            exercise_id = exercise.get("id", exercise.get("doc_id", "unknown"))
             
             if not result["success"]:
                 results_summary["failed"] += 1
@@ -1052,7 +1085,7 @@ class JobExecutor:
         
         if self.mode == "apply" and operations:
             from app.apply.engine import apply_change_plan
-            apply_result = apply_change_plan(plan, mode=self.mode, job_id=self.job_id)
+            apply_result = apply_change_plan(plan, mode=self.mode, job_id=self.job_id, bulk=True)
             result["applied"] = apply_result.success
             result["apply_result"] = apply_result.to_dict()
         
@@ -1070,10 +1103,17 @@ class JobExecutor:
         """
         from app.enrichment.models import EnrichmentSpec, ShardResult
         from app.enrichment.engine import compute_enrichment_batch
+        from app.enrichment.rate_limit import (
+            DEFAULT_LLM_CONCURRENCY,
+            DEFAULT_LLM_TIMEOUT_SECS,
+            RateLimitedLLMClient,
+            get_llm_gate,
+        )
         from app.plans.models import Operation, OperationType, RiskLevel, ChangePlan
         from datetime import datetime
         
         spec = EnrichmentSpec.from_dict(enrichment_spec_data)
+        gated_client = RateLimitedLLMClient(llm_client, get_llm_gate())
         
         # Create shard result tracker
         shard_result = ShardResult(
@@ -1085,7 +1125,13 @@ class JobExecutor:
         )
         
         # Compute enrichment for each exercise
-        enrichment_results = compute_enrichment_batch(exercises, spec, llm_client)
+        enrichment_results = compute_enrichment_batch(
+            exercises,
+            spec,
+            gated_client,
+            max_concurrency=enrichment_spec_data.get("max_concurrency", DEFAULT_LLM_CONCURRENCY),
+            timeout_secs=enrichment_spec_data.get("timeout_secs", DEFAULT_LLM_TIMEOUT_SECS),
+        )
         
         # Build operations for successful enrichments
         operations = []
@@ -1111,6 +1157,7 @@ class JobExecutor:
             else:
                 shard_result.failed += 1
         
+        shard_result.tokens_used = gated_client.tokens_used
         shard_result.completed_at = datetime.utcnow()
         
         # Create change plan
@@ -1137,7 +1184,7 @@ class JobExecutor:
         
         if self.mode == "apply" and operations:
             from app.apply.engine import apply_change_plan
-            apply_result = apply_change_plan(plan, mode=self.mode, job_id=self.job_id)
+            apply_result = apply_change_plan(plan, mode=self.mode, job_id=self.job_id, bulk=True)
             result["applied"] = apply_result.success
             result["apply_result"] = apply_result.to_dict()
         
@@ -1145,9 +1192,9 @@ class JobExecutor:
     
     def _get_filtered_exercise_ids(self, filter_criteria: Dict[str, Any]) -> List[str]:
         """Get exercise IDs matching filter criteria."""
-        from google.cloud import firestore
+        from app.firestore_client import get_firestore_client
         
-        db = firestore.Client()
+        db = get_firestore_client()
         query = db.collection("exercises")
         
         if filter_criteria.get("equipment"):
@@ -1164,35 +1211,27 @@ class JobExecutor:
     
     def _get_all_exercise_ids(self, limit: int = 10000) -> List[str]:
         """Get all exercise IDs (with limit)."""
-        from google.cloud import firestore
+        from app.firestore_client import get_firestore_client
         
-        db = firestore.Client()
+        db = get_firestore_client()
         query = db.collection("exercises").limit(limit)
         
         return [doc.id for doc in query.stream()]
     
-    def _get_exercises_batch(self, exercise_ids: List[str]) -> List[Dict[str, Any]]:
-        """Fetch exercise documents by IDs."""
-        from google.cloud import firestore
-        
-        if not exercise_ids:
-            return []
+    def _get_exercises_batch(
+        self,
+        exercise_ids: List[str],
+        field_paths: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fetch exercise documents by IDs (bulk get_all, input order)."""
+        from app.firestore_client import get_documents
         
-        db = firestore.Client()
         exercises = []
-        
-        # Batch in chunks of 10 (Firestore limit for in queries)
-        for i in range(0, len(exercise_ids), 10):
-            batch_ids = exercise_ids[i:i + 10]
-            refs = [db.collection("exercises").document(doc_id) for doc_id in batch_ids]
-            docs = db.get_all(refs)
-            
-            for doc in docs:
-                if doc.exists:
-                    data = doc.to_dict()
-                    data["id"] = doc.id
-                    data["doc_id"] = doc.id
-                    exercises.append(data)
+        for doc in get_documents("exercises", exercise_ids, field_paths=field_paths):
+            data = doc.to_dict()
+            data["id"] = doc.id
+            data["doc_id"] = doc.id
+            exercises.append(data)
         
         return exercises
     
@@ -1499,6 +1538,7 @@ Respond with ONLY the JSON object."""
                 llm_result = json.loads(json_match.group())
             else:
                 logger.warning("Could not parse LLM repair response for job %s", executor.job_id)
+                llm_client.discard_cached_response(prompt, {"type": "object"})
                 return None
         
         # Check if LLM thinks repair is possible
@@ -450,6 +450,7 @@ def execute_schema_cleanup(
     """
     from google.cloud import firestore
     from app.apply.engine import apply_change_plan
+    from app.firestore_client import get_firestore_client
     
     # Deprecated fields to remove (complete list)
     DEPRECATED_FIELDS = [
@@ -505,7 +506,7 @@ def execute_schema_cleanup(
         }
 
     # Fetch exercises to check which have deprecated fields
-    db = firestore.Client()
+    db = get_firestore_client()
     exercises_with_fields = []
 
     for doc_id in exercise_doc_ids:
@@ -591,7 +592,7 @@ def execute_schema_cleanup(
     }
     
     if mode == "apply" and operations:
-        apply_result = apply_change_plan(plan, mode=mode, job_id=job_id)
+        apply_result = apply_change_plan(plan, mode=mode, job_id=job_id, bulk=True)
         result["applied"] = apply_result.success
         result["apply_result"] = apply_result.to_dict()
     
@@ -0,0 +1,285 @@
+"""
+Job Progress - Aggregate shard progress per fan-out parent.
+
+Watching a CATALOG_ENRICH_FIELD run used to mean querying catalog_jobs by
+payload.parent_job_id and reading every shard on each refresh. Progress
+now lives in one document per parent, catalog_job_progress/{parent_job_id},
+which shard completions update with Increment transforms (so concurrent
+workers compose).
+
+Maintenance (app/jobs/queue.py, app/jobs/watchdog.py):
+- create_jobs_bulk(..., parent_job_id=...) writes the document with zeroed
+  counters before the children are queued (so no early completion is
+  overwritten), and takes back children whose batch failed
+- complete_job, terminal fail_job outcomes and the watchdog's deadletter
+  path count the finished shard, adding the per-exercise counts the worker
+  put in result_summary.shard_result
+- retry_job takes a finished shard's contribution back out
+- `python cli.py rebuild-job-progress JOB_ID` recomputes a parent's document
+  from its shards (parents fanned out before this existed, or after manual
+  edits)
+
+ETA is derived on read (get_job_progress) from the shard rate so far.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Tuple
+
+from app.jobs.models import JobStatus
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
+
+logger = logging.getLogger(__name__)
+
+JOB_PROGRESS_COLLECTION = "catalog_job_progress"
+JOBS_COLLECTION = "catalog_jobs"
+
+# Per-exercise counts carried in result_summary.shard_result
+PROGRESS_COUNT_FIELDS = ("succeeded", "failed", "no_changes", "tokens_used")
+
+# Shard outcomes counted as children_succeeded (others as children_failed)
+SUCCEEDED_STATUSES = frozenset({
+    JobStatus.SUCCEEDED.value,
+    JobStatus.SUCCEEDED_DRY_RUN.value,
+})
+
+# Shard statuses counted in children_done
+FINISHED_STATUSES = SUCCEEDED_STATUSES | {
+    JobStatus.NEEDS_REVIEW.value,
+    JobStatus.DEADLETTER.value,
+    JobStatus.FAILED.value,
+}
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: Any) -> Optional[datetime]:
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def shard_progress_counts(result: Mapping[str, Any]) -> Optional[Dict[str, int]]:
+    """
+    Per-exercise counts from an executor shard result, for
+    result_summary.shard_result. None for results without a shard_result.
+
+    Single-field shards report values that were already set as skipped;
+    those count as no_changes.
+    """
+    shard = result.get("shard_result")
+    if not isinstance(shard, Mapping):
+        return None
+    counts = {name: int(shard.get(name) or 0) for name in PROGRESS_COUNT_FIELDS}
+    counts["no_changes"] += int(shard.get("skipped") or 0)
+    return counts
+
+
+def progress_init_write(
+    db: "firestore.Client",
+    parent_job_id: str,
+    children_total: int,
+    exercises_total: int,
+    now: Optional[datetime] = None,
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Progress document for a fresh fan-out, as a (doc ref, data) pair to set.
+
+    Args:
+        db: Firestore client
+        parent_job_id: Parent job ID
+        children_total: Shard jobs created
+        exercises_total: Exercises across the shards
+        now: Start time (default: now)
+
+    Returns:
+        (DocumentReference, data)
+    """
+    now = now or _utcnow()
+    data: Dict[str, Any] = {
+        "parent_job_id": parent_job_id,
+        "children_total": children_total,
+        "exercises_total": exercises_total,
+        "children_done": 0,
+        "children_succeeded": 0,
+        "children_failed": 0,
+        "started_at": now,
+        "updated_at": now,
+    }
+    data.update({name: 0 for name in PROGRESS_COUNT_FIELDS})
+    return db.collection(JOB_PROGRESS_COLLECTION).document(parent_job_id), data
+
+
+def record_child_progress(
+    db: "firestore.Client",
+    job_data: Mapping[str, Any],
+    status: str,
+    writer: Any,
+    result_summary: Optional[Mapping[str, Any]] = None,
+    sign: int = 1,
+) -> bool:
+    """
+    Count a shard reaching a terminal status in its parent's progress.
+
+    Does nothing for jobs without payload.parent_job_id.
+
+    Args:
+        db: Firestore client
+        job_data: Shard job document (payload.parent_job_id is used)
+        status: Terminal JobStatus value the shard reached
+        writer: Transaction or WriteBatch the update is added to
+        result_summary: Shard result summary (shard_result counts are added)
+        sign: 1 to add the shard, -1 to take it back out (retry_job)
+
+    Returns:
+        True if an update was added
+    """
+    from google.cloud import firestore
+
+    parent_job_id = (job_data.get("payload") or {}).get("parent_job_id")
+    if not parent_job_id:
+        return False
+
+    outcome = "children_succeeded" if status in SUCCEEDED_STATUSES else "children_failed"
+    update: Dict[str, Any] = {
+        "children_done": firestore.Increment(sign),
+        outcome: firestore.Increment(sign),
+        "updated_at": _utcnow(),
+    }
+    counts = (result_summary or {}).get("shard_result") or {}
+    for name in PROGRESS_COUNT_FIELDS:
+        if counts.get(name):
+            update[name] = firestore.Increment(sign * int(counts[name]))
+
+    ref = db.collection(JOB_PROGRESS_COLLECTION).document(parent_job_id)
+    writer.set(ref, update, merge=True)
+    return True
+
+
+def summarize_progress(data: Mapping[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Progress document plus derived fields: remaining, percent, complete,
+    elapsed_secs and eta_secs (None until the first shard finishes).
+    """
+    now = now or _utcnow()
+    total = int(data.get("children_total") or 0)
+    done = int(data.get("children_done") or 0)
+    started = _aware(data.get("started_at"))
+    elapsed = max(0.0, (now - started).total_seconds()) if started else None
+
+    eta: Optional[float] = None
+    if done >= total:
+        eta = 0.0
+    elif done > 0 and elapsed is not None:
+        eta = elapsed / done * (total - done)
+
+    summary = dict(data)
+    summary.update({
+        "remaining": max(0, total - done),
+        "percent": round(100.0 * done / total, 1) if total else 100.0,
+        "complete": done >= total,
+        "elapsed_secs": round(elapsed) if elapsed is not None else None,
+        "eta_secs": round(eta) if eta is not None else None,
+    })
+    return summary
+
+
+def get_job_progress(
+    parent_job_id: str,
+    db: Optional["firestore.Client"] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Summarized progress for a parent job (one document read).
+
+    Returns:
+        summarize_progress() output, or None if the job never fanned out
+    """
+    if db is None:
+        from app.firestore_client import get_firestore_client
+        db = get_firestore_client()
+    snapshot = db.collection(JOB_PROGRESS_COLLECTION).document(parent_job_id).get()
+    if not snapshot.exists:
+        return None
+    return summarize_progress(snapshot.to_dict() or {})
+
+
+def rebuild_job_progress(
+    parent_job_id: str,
+    db: Optional["firestore.Client"] = None,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Recompute a parent's progress document from its shard jobs.
+
+    Nothing is written when the job has no shards.
+
+    Args:
+        parent_job_id: Parent job ID
+        db: Client to use (default: shared client)
+        dry_run: Compute only, write nothing
+
+    Returns:
+        The recomputed progress data
+    """
+    if db is None:
+        from app.firestore_client import get_firestore_client
+        db = get_firestore_client()
+
+    children = list(
+        db.collection(JOBS_COLLECTION)
+        .where("payload.parent_job_id", "==", parent_job_id)
+        .select(["status", "created_at", "payload.exercise_doc_ids", "result_summary.shard_result"])
+        .stream()
+    )
+
+    exercises_total = 0
+    started = None
+    counters: Dict[str, int] = {"children_done": 0, "children_succeeded": 0, "children_failed": 0}
+    counters.update({name: 0 for name in PROGRESS_COUNT_FIELDS})
+    for doc in children:
+        data = doc.to_dict() or {}
+        exercises_total += len((data.get("payload") or {}).get("exercise_doc_ids") or [])
+        created = _aware(data.get("created_at"))
+        if created and (started is None or created < started):
+            started = created
+        status = data.get("status")
+        if status not in FINISHED_STATUSES:
+            continue
+        counters["children_done"] += 1
+        counters["children_succeeded" if status in SUCCEEDED_STATUSES else "children_failed"] += 1
+        counts = (data.get("result_summary") or {}).get("shard_result") or {}
+        for name in PROGRESS_COUNT_FIELDS:
+            counters[name] += int(counts.get(name) or 0)
+
+    ref, progress = progress_init_write(db, parent_job_id, len(children), exercises_total, started)
+    progress.update(counters)
+    progress["updated_at"] = _utcnow()
+
+    if children and not dry_run:
+        ref.set(progress)
+
+    logger.info(
+        "Job progress rebuild%s for %s: %d/%d shards done",
+        " (dry run)" if dry_run else "", parent_job_id,
+        counters["children_done"], len(children),
+    )
+    return progress
+
+
+__all__ = [
+    "FINISHED_STATUSES",
+    "JOB_PROGRESS_COLLECTION",
+    "PROGRESS_COUNT_FIELDS",
+    "get_job_progress",
+    "progress_init_write",
+    "rebuild_job_progress",
+    "record_child_progress",
+    "shard_progress_counts",
+    "summarize_progress",
+]
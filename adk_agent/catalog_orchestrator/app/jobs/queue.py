@@ -7,14 +7,19 @@ Lease acquisition is conditional on status, run_after, and existing lease.
 Collections:
 - catalog_jobs/{jobId}: Job documents
 - catalog_locks/{family_slug}: Family locks
+- catalog_job_targets/{job_type}:{exercise_id}: Pending-job index for
+  deduplication (see app/jobs/targets.py)
+- catalog_job_progress/{parent_job_id}: Shard progress per fan-out parent
+  (see app/jobs/progress.py)
 """
 
 from __future__ import annotations
 
 import logging
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 
 def _utcnow() -> datetime:
@@ -32,7 +37,19 @@ def _make_naive(dt: datetime) -> datetime:
 
 from google.cloud import firestore
 
+from app.firestore_client import MAX_BATCH_WRITES, count_by_value, get_firestore_client
 from app.jobs.models import Job, JobPayload, JobQueue, JobStatus, JobType
+from app.jobs.progress import (
+    FINISHED_STATUSES,
+    JOB_PROGRESS_COLLECTION,
+    progress_init_write,
+    record_child_progress,
+)
+from app.jobs.targets import (
+    clear_job_targets,
+    find_pending_targets,
+    job_target_writes,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -45,22 +62,103 @@ ATTEMPTS_COLLECTION = "catalog_job_runs"
 LEASE_DURATION_SECS = 300  # 5 minutes
 LEASE_RENEWAL_MARGIN_SECS = 120  # 2 minutes
 
-# Initialize Firestore client lazily
-_db: Optional[firestore.Client] = None
+# Upper bound for poll_jobs() batches (keeps the lease transaction small)
+POLL_BATCH_MAX = 50
+
+# Parallel WriteBatch commits in create_jobs_bulk
+BULK_CREATE_MAX_CONCURRENCY = 8
 
 
 def get_db() -> firestore.Client:
-    """Get or initialize Firestore client."""
-    global _db
-    if _db is None:
-        _db = firestore.Client()
-    return _db
+    """Get the shared Firestore client."""
+    return get_firestore_client()
 
 
 # =============================================================================
 # JOB CREATION
 # =============================================================================
 
+def new_job_id() -> str:
+    """Generate a job document ID."""
+    return f"job-{uuid.uuid4().hex[:12]}"
+
+
+def _new_job(
+    job_type: JobType,
+    queue: JobQueue = JobQueue.PRIORITY,
+    priority: int = 100,
+    family_slug: Optional[str] = None,
+    exercise_doc_ids: Optional[List[str]] = None,
+    mode: str = "dry_run",
+    intent: Optional[Dict[str, Any]] = None,
+    merge_config: Optional[Dict[str, Any]] = None,
+    enrichment_spec: Optional[Dict[str, Any]] = None,
+    filter_criteria: Optional[Dict[str, Any]] = None,
+    shard_size: int = 200,
+    parent_job_id: Optional[str] = None,
+    job_id: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> Job:
+    """Build a queued Job (not yet written)."""
+    now = now or datetime.utcnow()
+    payload = JobPayload(
+        family_slug=family_slug,
+        exercise_doc_ids=exercise_doc_ids or [],
+        mode=mode,
+        intent=intent,
+        merge_config=merge_config,
+        enrichment_spec=enrichment_spec,
+        filter_criteria=filter_criteria,
+        shard_size=shard_size,
+        parent_job_id=parent_job_id,
+    )
+    return Job(
+        id=job_id or new_job_id(),
+        type=job_type,
+        queue=queue,
+        priority=priority,
+        status=JobStatus.QUEUED,
+        payload=payload,
+        attempts=0,
+        max_attempts=5,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _job_writes(db: firestore.Client, job: Job) -> List[Tuple[Any, Dict[str, Any]]]:
+    """
+    The job's index entries then the job document, as (doc ref, data) pairs
+    to set.
+
+    The document comes last so that a job too large for one WriteBatch is
+    only written once all of its index entries are (see _commit_job_writes).
+    """
+    writes = job_target_writes(
+        db, job.id, job.type.value, job.payload.exercise_doc_ids, job.created_at,
+    )
+    writes.append((db.collection(JOBS_COLLECTION).document(job.id), job.to_dict()))
+    return writes
+
+
+def _commit_job_writes(db: firestore.Client, writes: List[Tuple[Any, Dict[str, Any]]]) -> None:
+    """
+    Commit _job_writes output in order, MAX_BATCH_WRITES per WriteBatch.
+
+    Up to MAX_BATCH_WRITES - 1 targets this is one atomic batch. Past that,
+    the index entries go first and the job document is in the last batch:
+    if an earlier batch fails the error propagates and the job is never
+    created. The entries already written point at a job ID that does not
+    exist, which find_pending_targets ignores and rebuild_job_targets
+    deletes; a later job for the same targets overwrites them.
+    """
+    for start in range(0, len(writes), MAX_BATCH_WRITES):
+        batch = db.batch()
+        for ref, data in writes[start:start + MAX_BATCH_WRITES]:
+            batch.set(ref, data)
+        batch.commit()
+
+
 def create_job(
     job_type: JobType,
     queue: JobQueue = JobQueue.PRIORITY,
@@ -78,6 +176,11 @@ def create_job(
     """
     Create a new job in the queue.
     
+    The job and its pending-job index entries (catalog_job_targets) are
+    written in one batch. A job with MAX_BATCH_WRITES or more targets needs
+    several; its document is written last, so it is only created once it is
+    fully indexed (see _commit_job_writes).
+    
     Args:
         job_type: Type of job
         queue: Queue lane (priority or maintenance)
@@ -96,38 +199,17 @@ def create_job(
         Created Job object
     """
     db = get_db()
-    
-    job_id = f"job-{uuid.uuid4().hex[:12]}"
-    now = datetime.utcnow()
-    
-    payload = JobPayload(
-        family_slug=family_slug,
-        exercise_doc_ids=exercise_doc_ids or [],
-        mode=mode,
-        intent=intent,
-        merge_config=merge_config,
-        enrichment_spec=enrichment_spec,
-        filter_criteria=filter_criteria,
-        shard_size=shard_size,
+    job = _new_job(
+        job_type, queue=queue, priority=priority, family_slug=family_slug,
+        exercise_doc_ids=exercise_doc_ids, mode=mode, intent=intent,
+        merge_config=merge_config, enrichment_spec=enrichment_spec,
+        filter_criteria=filter_criteria, shard_size=shard_size,
         parent_job_id=parent_job_id,
     )
-    
-    job = Job(
-        id=job_id,
-        type=job_type,
-        queue=queue,
-        priority=priority,
-        status=JobStatus.QUEUED,
-        payload=payload,
-        attempts=0,
-        max_attempts=5,
-        created_at=now,
-        updated_at=now,
-    )
+    job_id = job.id
     
     # Write to Firestore
-    doc_ref = db.collection(JOBS_COLLECTION).document(job_id)
-    doc_ref.set(job.to_dict())
+    _commit_job_writes(db, _job_writes(db, job))
     
     logger.info("Created job: %s, type=%s, family=%s", 
                job_id, job_type.value, family_slug)
@@ -135,6 +217,153 @@ def create_job(
     return job
 
 
+class BulkCreateError(Exception):
+    """
+    Raised by create_jobs_bulk when some batch commits failed.
+    
+    created_ids are the jobs whose documents were committed (they are in
+    the queue and will run); failed_ids are the jobs that were not written.
+    The first commit error is chained as __cause__.
+    """
+    
+    def __init__(self, message: str, created_ids: List[str], failed_ids: List[str]):
+        super().__init__(message)
+        self.created_ids = created_ids
+        self.failed_ids = failed_ids
+
+
+def create_jobs_bulk(
+    specs: Sequence[Dict[str, Any]],
+    parent_job_id: Optional[str] = None,
+    db: Optional[firestore.Client] = None,
+    max_concurrency: int = BULK_CREATE_MAX_CONCURRENCY,
+) -> List[str]:
+    """
+    Create many jobs with batched, concurrent commits.
+    
+    Each spec holds create_job keyword arguments (job_type is required)
+    and may carry a preassigned job_id from new_job_id(). Jobs and their
+    index entries are packed into WriteBatches of up to MAX_BATCH_WRITES
+    writes, a job never split across two of them. A job too large for one
+    batch is committed on its own like create_job does, index entries
+    first, and counts as created only if its document was written.
+    
+    With parent_job_id, every child gets payload.parent_job_id. Before any
+    child is written, the parent document records the fan-out
+    (child_job_ids, children_total) and catalog_job_progress/{parent_job_id}
+    starts from zero, replacing any earlier fan-out record; a shard that
+    finishes while later batches are still committing then adds to the
+    fresh counters instead of being overwritten by them.
+    
+    Every batch is attempted even if another fails, so a failure leaves
+    only the jobs of the failed batches unwritten. The parent's fan-out
+    record is then cut back to the children that were written.
+    
+    Args:
+        specs: create_job keyword dicts, one per job
+        parent_job_id: Parent job the jobs are shards of
+        db: Client to use (default: shared client)
+        max_concurrency: Parallel batch commits
+        
+    Returns:
+        Job IDs, in spec order
+        
+    Raises:
+        BulkCreateError: Some batches failed to commit (created_ids and
+            failed_ids split the jobs by whether their document was written)
+    """
+    if not specs:
+        return []
+    db = db or get_db()
+    now = datetime.utcnow()
+    
+    jobs = []
+    for spec in specs:
+        spec = dict(spec)
+        if parent_job_id:
+            spec["parent_job_id"] = parent_job_id
+        jobs.append(_new_job(now=now, **spec))
+    
+    batches: List[List[Tuple[Any, Dict[str, Any]]]] = [[]]
+    # Batch holding each job's writes
+    job_batch: Dict[str, int] = {}
+    for job in jobs:
+        writes = _job_writes(db, job)
+        if batches[-1] and len(batches[-1]) + len(writes) > MAX_BATCH_WRITES:
+            batches.append([])
+        job_batch[job.id] = len(batches) - 1
+        # An oversized job fills a unit of its own (several WriteBatches)
+        batches[-1].extend(writes)
+    
+    job_ids = [job.id for job in jobs]
+    exercises = {job.id: len(job.payload.exercise_doc_ids) for job in jobs}
+    if parent_job_id:
+        batch = db.batch()
+        batch.update(db.collection(JOBS_COLLECTION).document(parent_job_id), {
+            "child_job_ids": job_ids,
+            "children_total": len(job_ids),
+            "updated_at": _utcnow(),
+        })
+        batch.set(*progress_init_write(db, parent_job_id, len(job_ids), sum(exercises.values())))
+        batch.commit()
+    
+    def commit(writes: List[Tuple[Any, Dict[str, Any]]]) -> Optional[Exception]:
+        try:
+            _commit_job_writes(db, writes)
+        except Exception as e:
+            logger.warning("Job batch commit failed (%d writes): %s", len(writes), e)
+            return e
+        return None
+    
+    if len(batches) == 1 or max_concurrency <= 1:
+        errors = [commit(writes) for writes in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(batches))) as pool:
+            errors = list(pool.map(commit, batches))
+    
+    failed = [job_id for job_id in job_ids if errors[job_batch[job_id]] is not None]
+    if failed:
+        created = [job_id for job_id in job_ids if errors[job_batch[job_id]] is None]
+        if parent_job_id:
+            _trim_fan_out(db, parent_job_id, created, len(failed), sum(exercises[job_id] for job_id in failed))
+        raise BulkCreateError(
+            f"{len(failed)} of {len(job_ids)} jobs not created",
+            created_ids=created,
+            failed_ids=failed,
+        ) from next(e for e in errors if e is not None)
+    
+    logger.info("Created %d jobs in %d batches%s", len(job_ids), len(batches),
+                f" for parent {parent_job_id}" if parent_job_id else "")
+    
+    return job_ids
+
+
+def _trim_fan_out(
+    db: firestore.Client,
+    parent_job_id: str,
+    created: List[str],
+    failed_children: int,
+    failed_exercises: int,
+) -> None:
+    """Shrink a parent's fan-out record to the children create_jobs_bulk wrote."""
+    batch = db.batch()
+    batch.update(db.collection(JOBS_COLLECTION).document(parent_job_id), {
+        "child_job_ids": created,
+        "children_total": len(created),
+        "updated_at": _utcnow(),
+    })
+    # Increments, so shards that already finished keep their counts
+    batch.set(db.collection(JOB_PROGRESS_COLLECTION).document(parent_job_id), {
+        "children_total": firestore.Increment(-failed_children),
+        "exercises_total": firestore.Increment(-failed_exercises),
+        "updated_at": _utcnow(),
+    }, merge=True)
+    try:
+        batch.commit()
+    except Exception as e:
+        logger.error("Failed to trim fan-out of %s (run rebuild-job-progress): %s", parent_job_id, e)
+
+
 # =============================================================================
 # JOB POLLING
 # =============================================================================
@@ -257,6 +486,235 @@ def lease_job(job_id: str, worker_id: str) -> Optional[Job]:
         return None
 
 
+def poll_jobs(worker_id: str, max_jobs: int) -> List[Job]:
+    """
+    Poll for up to max_jobs ready jobs and lease them in one transaction.
+
+    Batch variant of poll_job(). One candidate query plus one transaction
+    leases the whole batch, instead of one transaction per job.
+    Ordering matches poll_job(): priority queue first, then priority
+    descending. Jobs with run_after in the future are skipped.
+
+    Candidates are chosen outside the transaction: the query over-fetches,
+    jobs that are not runnable yet (run_after, unexpired lease) are
+    filtered out and the first max_jobs are kept. The transaction re-reads
+    and leases only those, so a job leased by another worker in between is
+    dropped from the batch rather than double-leased (the batch is not
+    refilled; the next poll picks up more).
+
+    Args:
+        worker_id: ID of the worker polling
+        max_jobs: Maximum jobs to lease (capped at POLL_BATCH_MAX)
+
+    Returns:
+        Leased Jobs in queue order (empty if no jobs available)
+    """
+    max_jobs = max(1, min(max_jobs, POLL_BATCH_MAX))
+    if max_jobs == 1:
+        job = poll_job(worker_id)
+        return [job] if job else []
+
+    db = get_db()
+    now = datetime.utcnow()
+
+    # Over-fetch so jobs filtered out below still leave a full batch
+    query = (
+        db.collection(JOBS_COLLECTION)
+        .where("status", "==", JobStatus.QUEUED.value)
+        .order_by("queue")  # priority < maintenance alphabetically
+        .order_by("priority", direction=firestore.Query.DESCENDING)
+        .limit(max_jobs * 2 + 10)
+    )
+
+    candidate_ids = []
+    for doc in query.stream():
+        data = doc.to_dict()
+        run_after = _make_naive(data.get("run_after"))
+        if run_after and run_after > now:
+            continue
+        existing_lease = _make_naive(data.get("lease_expires_at"))
+        if existing_lease and existing_lease > now:
+            continue
+        candidate_ids.append(doc.id)
+        if len(candidate_ids) >= max_jobs:
+            break
+
+    if not candidate_ids:
+        return []
+
+    refs = [db.collection(JOBS_COLLECTION).document(job_id) for job_id in candidate_ids]
+
+    @firestore.transactional
+    def lease_batch_transaction(transaction, refs):
+        # All reads before any writes (Firestore transaction rule)
+        snapshots = {doc.id: doc for doc in transaction.get_all(refs)}
+        now = datetime.utcnow()
+        lease_expires = now + timedelta(seconds=LEASE_DURATION_SECS)
+
+        leased = []
+        for ref in refs:
+            doc = snapshots.get(ref.id)
+            if doc is None or not doc.exists:
+                continue
+
+            data = doc.to_dict()
+
+            # Same checks as lease_job()
+            if data.get("status") != JobStatus.QUEUED.value:
+                continue
+            run_after = _make_naive(data.get("run_after"))
+            if run_after and run_after > now:
+                continue
+            existing_lease = _make_naive(data.get("lease_expires_at"))
+            if existing_lease and existing_lease > now:
+                continue
+
+            update = {
+                "status": JobStatus.LEASED.value,
+                "lease_owner": worker_id,
+                "lease_expires_at": lease_expires,
+                "attempts": data.get("attempts", 0) + 1,
+                "updated_at": now,
+            }
+            transaction.update(ref, update)
+
+            updated_data = data.copy()
+            updated_data.update(update)
+            leased.append(Job.from_dict(updated_data))
+
+        return leased
+
+    transaction = db.transaction()
+    try:
+        jobs = lease_batch_transaction(transaction, refs)
+        if jobs:
+            logger.info("Leased %d jobs to worker %s: %s",
+                       len(jobs), worker_id, [job.id for job in jobs])
+        return jobs
+    except Exception as e:
+        logger.warning("Failed to lease job batch for %s: %s", worker_id, e)
+        return []
+
+
+def renew_leases(job_ids: List[str], worker_id: str) -> Optional[List[str]]:
+    """
+    Renew leases for a batch of jobs still owned by this worker.
+
+    Used by the worker heartbeat to keep jobs from a poll_jobs() batch
+    leased while they wait for local processing. Renewal follows the
+    same margin rule as renew_lease().
+
+    Args:
+        job_ids: Jobs to renew
+        worker_id: Worker that holds the leases
+
+    Returns:
+        Job IDs whose lease is still held (renewed or not yet expiring),
+        or None if the renewal transaction itself failed
+    """
+    if not job_ids:
+        return []
+
+    db = get_db()
+    refs = [db.collection(JOBS_COLLECTION).document(job_id) for job_id in job_ids]
+
+    @firestore.transactional
+    def renew_batch_transaction(transaction, refs):
+        snapshots = list(transaction.get_all(refs))
+        now = datetime.utcnow()
+        margin = timedelta(seconds=LEASE_RENEWAL_MARGIN_SECS)
+        new_expires = now + timedelta(seconds=LEASE_DURATION_SECS)
+
+        held = []
+        for doc in snapshots:
+            if not doc.exists:
+                continue
+
+            data = doc.to_dict()
+            if data.get("lease_owner") != worker_id:
+                continue
+
+            expires = _make_naive(data.get("lease_expires_at"))
+            if not expires:
+                continue
+
+            if expires <= now + margin:
+                transaction.update(doc.reference, {
+                    "lease_expires_at": new_expires,
+                    "updated_at": now,
+                })
+            held.append(doc.id)
+
+        return held
+
+    transaction = db.transaction()
+    try:
+        return renew_batch_transaction(transaction, refs)
+    except Exception as e:
+        logger.warning("Failed to renew leases for %d jobs: %s", len(job_ids), e)
+        return None
+
+
+def release_jobs(job_ids: List[str], worker_id: str) -> int:
+    """
+    Return leased-but-unstarted jobs to the queue.
+
+    Called when a worker stops before working through its whole
+    poll_jobs() batch (deadline, signal). Only jobs still LEASED by
+    this worker are released, and the attempt counted at lease time
+    is given back since the job never ran.
+
+    Args:
+        job_ids: Jobs to release
+        worker_id: Worker that holds the leases
+
+    Returns:
+        Number of jobs released
+    """
+    if not job_ids:
+        return 0
+
+    db = get_db()
+    refs = [db.collection(JOBS_COLLECTION).document(job_id) for job_id in job_ids]
+
+    @firestore.transactional
+    def release_transaction(transaction, refs):
+        snapshots = list(transaction.get_all(refs))
+        now = datetime.utcnow()
+
+        released = 0
+        for doc in snapshots:
+            if not doc.exists:
+                continue
+
+            data = doc.to_dict()
+            if data.get("lease_owner") != worker_id:
+                continue
+            if data.get("status") != JobStatus.LEASED.value:
+                continue
+
+            transaction.update(doc.reference, {
+                "status": JobStatus.QUEUED.value,
+                "lease_owner": None,
+                "lease_expires_at": None,
+                "attempts": max(data.get("attempts", 1) - 1, 0),
+                "updated_at": now,
+            })
+            released += 1
+
+        return released
+
+    transaction = db.transaction()
+    try:
+        released = release_transaction(transaction, refs)
+        if released:
+            logger.info("Released %d unstarted jobs from worker %s", released, worker_id)
+        return released
+    except Exception as e:
+        logger.warning("Failed to release jobs for %s: %s", worker_id, e)
+        return 0
+
+
 # =============================================================================
 # JOB COMPLETION
 # =============================================================================
@@ -298,6 +756,9 @@ def complete_job(
         
         now = datetime.utcnow()
         
+        # Every completion status is terminal; reads before writes
+        clear_job_targets(db, job_id, data, transaction, reader=transaction)
+        record_child_progress(db, data, status.value, transaction, result_summary)
         transaction.update(doc_ref, {
             "status": status.value,
             "lease_owner": None,
@@ -378,6 +839,8 @@ def fail_job(
             })
         elif is_transient:
             # Exhausted retries
+            clear_job_targets(db, job_id, data, transaction, reader=transaction)
+            record_child_progress(db, data, JobStatus.DEADLETTER.value, transaction)
             transaction.update(doc_ref, {
                 "status": JobStatus.DEADLETTER.value,
                 "lease_owner": None,
@@ -389,6 +852,8 @@ def fail_job(
             })
         else:
             # Deterministic error - needs human review
+            clear_job_targets(db, job_id, data, transaction, reader=transaction)
+            record_child_progress(db, data, JobStatus.NEEDS_REVIEW.value, transaction)
             transaction.update(doc_ref, {
                 "status": JobStatus.NEEDS_REVIEW.value,
                 "lease_owner": None,
@@ -416,6 +881,9 @@ def retry_job(job_id: str, delay_seconds: int = 0) -> bool:
     """
     Manually retry a job (e.g., from NEEDS_REVIEW or DEADLETTER).
     
+    The job goes back into the pending-job index. A finished shard is
+    taken back out of its parent's progress.
+    
     Args:
         job_id: Job to retry
         delay_seconds: Delay before retry
@@ -430,13 +898,36 @@ def retry_job(job_id: str, delay_seconds: int = 0) -> bool:
     run_after = now + timedelta(seconds=delay_seconds) if delay_seconds else now
     
     try:
-        doc_ref.update({
+        doc = doc_ref.get()
+        if not doc.exists:
+            logger.error("Failed to retry job %s: not found", job_id)
+            return False
+        data = doc.to_dict() or {}
+        exercise_ids = (data.get("payload") or {}).get("exercise_doc_ids") or []
+        
+        batch = db.batch()
+        batch.update(doc_ref, {
             "status": JobStatus.QUEUED.value,
             "lease_owner": None,
             "lease_expires_at": None,
             "run_after": run_after,
             "updated_at": now,
         })
+        written = 1
+        if data.get("status") in FINISHED_STATUSES:
+            record_child_progress(
+                db, data, data["status"], batch, data.get("result_summary"), sign=-1,
+            )
+            written += 1
+        targets = job_target_writes(db, job_id, data.get("type", ""), exercise_ids, now)
+        for ref, target in targets:
+            if written == MAX_BATCH_WRITES:
+                batch.commit()
+                batch = db.batch()
+                written = 0
+            batch.set(ref, target)
+            written += 1
+        batch.commit()
         logger.info("Retry queued for job: %s", job_id)
         return True
     except Exception as e:
@@ -765,7 +1256,9 @@ def find_pending_job(
     Check if a pending job exists for this exercise and type.
     
     Used to prevent duplicate job creation when reviewer runs frequently.
-    A job is "pending" if status is QUEUED, LEASED, or RUNNING.
+    A job is "pending" if status is QUEUED, LEASED, or RUNNING. Reads one
+    catalog_job_targets entry, then the job it points at to confirm its
+    status.
     
     Args:
         job_type: Type of job to check for
@@ -774,36 +1267,13 @@ def find_pending_job(
     Returns:
         Job ID if a pending job exists, None otherwise
     """
-    db = get_db()
-    
-    # Query jobs of this type that are still pending
-    pending_statuses = [
-        JobStatus.QUEUED.value,
-        JobStatus.LEASED.value,
-        JobStatus.RUNNING.value,
-    ]
-    
-    query = (
-        db.collection(JOBS_COLLECTION)
-        .where("type", "==", job_type.value)
-        .where("status", "in", pending_statuses)
-        .limit(200)  # Check recent jobs (uses type+status index)
-    )
-    
-    for doc in query.stream():
-        data = doc.to_dict()
-        payload = data.get("payload", {})
-        exercise_ids = payload.get("exercise_doc_ids", [])
-        
-        # Check if this exercise is in the job's target list
-        if exercise_doc_id in exercise_ids:
-            logger.debug(
-                "Found pending job %s for exercise %s",
-                doc.id, exercise_doc_id
-            )
-            return doc.id
-    
-    return None
+    job_id = find_pending_targets(job_type.value, [exercise_doc_id], db=get_db()).get(exercise_doc_id)
+    if job_id:
+        logger.debug(
+            "Found pending job %s for exercise %s",
+            job_id, exercise_doc_id
+        )
+    return job_id
 
 
 def find_pending_jobs_batch(
@@ -813,7 +1283,9 @@ def find_pending_jobs_batch(
     """
     Check for pending jobs for multiple exercises at once.
     
-    More efficient than calling find_pending_job() in a loop.
+    One batched get_all on catalog_job_targets, however many exercises
+    and however deep the queue, and one on catalog_jobs to drop entries
+    whose job is no longer pending.
     
     Args:
         job_type: Type of job to check for
@@ -825,31 +1297,7 @@ def find_pending_jobs_batch(
     if not exercise_doc_ids:
         return {}
     
-    db = get_db()
-    exercise_set = set(exercise_doc_ids)
-    result = {}
-    
-    pending_statuses = [
-        JobStatus.QUEUED.value,
-        JobStatus.LEASED.value,
-        JobStatus.RUNNING.value,
-    ]
-    
-    query = (
-        db.collection(JOBS_COLLECTION)
-        .where("type", "==", job_type.value)
-        .where("status", "in", pending_statuses)
-        .limit(500)
-    )
-    
-    for doc in query.stream():
-        data = doc.to_dict()
-        payload = data.get("payload", {})
-        job_exercise_ids = payload.get("exercise_doc_ids", [])
-        
-        for ex_id in job_exercise_ids:
-            if ex_id in exercise_set and ex_id not in result:
-                result[ex_id] = doc.id
+    result = find_pending_targets(job_type.value, exercise_doc_ids, db=get_db())
     
     if result:
         logger.info(
@@ -860,10 +1308,38 @@ def find_pending_jobs_batch(
     return result
 
 
+# =============================================================================
+# QUEUE STATS
+# =============================================================================
+
+def count_jobs_by_status(
+    statuses: Optional[List[JobStatus]] = None,
+) -> Dict[str, int]:
+    """
+    Count jobs per status with server-side count() aggregations.
+    
+    No job documents are downloaded, and counts are exact at any queue
+    depth. The cost is one read per status per 1,000 matching jobs.
+    
+    Args:
+        statuses: Statuses to count (default: every JobStatus)
+        
+    Returns:
+        Dict of status value -> count (zeros included)
+    """
+    values = [status.value for status in (statuses or list(JobStatus))]
+    return count_by_value(JOBS_COLLECTION, "status", values, db=get_db())
+
+
 __all__ = [
     "create_job",
+    "create_jobs_bulk",
+    "new_job_id",
     "poll_job",
+    "poll_jobs",
     "lease_job",
+    "renew_leases",
+    "release_jobs",
     "complete_job",
     "fail_job",
     "retry_job",
@@ -875,4 +1351,5 @@ __all__ = [
     "LockLostError",
     "find_pending_job",
     "find_pending_jobs_batch",
+    "count_jobs_by_status",
 ]
@@ -19,6 +19,7 @@ from typing import Any, Dict, List, Optional
 
 from google.cloud import firestore
 
+from app.firestore_client import get_firestore_client
 from app.jobs.models import Job, JobStatus, JobType
 
 logger = logging.getLogger(__name__)
@@ -32,16 +33,10 @@ JOBS_COLLECTION = "catalog_jobs"
 COMPLETED_JOB_RETENTION_DAYS = 7  # Delete completed jobs after 7 days
 FAILED_JOB_RETENTION_DAYS = 30   # Keep failed jobs longer for investigation
 
-# Initialize Firestore client lazily
-_db: Optional[firestore.Client] = None
-
 
 def get_db() -> firestore.Client:
-    """Get or initialize Firestore client."""
-    global _db
-    if _db is None:
-        _db = firestore.Client()
-    return _db
+    """Get the shared Firestore client."""
+    return get_firestore_client()
 
 
 def write_run_history(
@@ -0,0 +1,332 @@
+"""
+Job Targets - Index of pending jobs by job type and exercise.
+
+find_pending_job / find_pending_jobs_batch used to stream a few hundred
+pending jobs of a type and scan each payload.exercise_doc_ids in Python;
+the query limit meant duplicates went unnoticed once the queue was deep.
+Pending targets now live in catalog_job_targets/{job_type}:{exercise_id}
+and deduplicating any number of candidates is one batched get_all.
+
+Maintenance (app/jobs/queue.py, app/jobs/watchdog.py):
+- create_job writes the job and its target docs in one WriteBatch; a job
+  with too many targets for one is written after all of its target docs
+- complete_job, fail_job (terminal outcomes) and the watchdog's deadletter
+  path delete the target docs that still point at the job
+- retry_job re-indexes a job it puts back in the queue
+- `python cli.py rebuild-job-targets` rebuilds the index from the pending
+  jobs; run it once to build it and after editing jobs outside the queue
+  module (scripts/cleanup_duplicate_jobs.py, manual fixes)
+
+When two pending jobs share a target, the doc points at the newest one and
+clearing only deletes docs that still point at the finishing job.
+
+Readers trust the index only once rebuild_job_targets has written its built
+marker (catalog_index_markers/job_targets); until then jobs created before
+the index existed are missing from it, so find_pending_targets queries the
+pending jobs instead. Every job ID read from the index is checked against
+catalog_jobs (one more get_all), and entries whose job is gone or no longer
+pending - left behind by edits outside the queue module - are ignored.
+
+CATALOG_ENRICH_FIELD_SHARD jobs are not indexed: nothing deduplicates
+against them, and a large fan-out would otherwise write one index entry per
+exercise.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from app.firestore_client import MAX_BATCH_WRITES, get_documents
+from app.jobs.models import JobStatus, JobType
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
+
+logger = logging.getLogger(__name__)
+
+JOB_TARGETS_COLLECTION = "catalog_job_targets"
+JOBS_COLLECTION = "catalog_jobs"
+
+# Built marker, alongside the family counts marker (app/family/counts.py)
+INDEX_MARKERS_COLLECTION = "catalog_index_markers"
+JOB_TARGETS_MARKER = "job_targets"
+
+# Jobs in these statuses are indexed
+PENDING_STATUSES = frozenset({
+    JobStatus.QUEUED.value,
+    JobStatus.LEASED.value,
+    JobStatus.RUNNING.value,
+})
+
+# Job types left out of the index (never deduplicated against)
+UNINDEXED_JOB_TYPES = frozenset({
+    JobType.CATALOG_ENRICH_FIELD_SHARD.value,
+})
+
+
+def target_id(job_type: str, exercise_id: str) -> str:
+    """Document ID of the index entry for one job type and exercise."""
+    return f"{job_type}:{exercise_id}"
+
+
+def _job_target_ids(job_data: Mapping[str, Any]) -> List[str]:
+    if job_data.get("type") in UNINDEXED_JOB_TYPES:
+        return []
+    payload = job_data.get("payload") or {}
+    exercise_ids = payload.get("exercise_doc_ids") or []
+    return [target_id(job_data.get("type", ""), ex_id) for ex_id in dict.fromkeys(exercise_ids) if ex_id]
+
+
+def _created_at(doc: Any) -> datetime:
+    created = (doc.to_dict() or {}).get("created_at")
+    if not isinstance(created, datetime):
+        return datetime.min
+    return created.replace(tzinfo=None)
+
+
+def job_target_writes(
+    db: "firestore.Client",
+    job_id: str,
+    job_type: str,
+    exercise_ids: Sequence[str],
+    now: Optional[datetime] = None,
+) -> List[Tuple[Any, Dict[str, Any]]]:
+    """
+    Index entries for a pending job, as (doc ref, data) pairs to set.
+
+    Args:
+        db: Firestore client
+        job_id: Job ID
+        job_type: JobType value
+        exercise_ids: Target exercise IDs (payload.exercise_doc_ids)
+        now: Timestamp to record (default: utcnow)
+
+    Returns:
+        List of (DocumentReference, data); empty for UNINDEXED_JOB_TYPES
+    """
+    if job_type in UNINDEXED_JOB_TYPES:
+        return []
+    now = now or datetime.utcnow()
+    coll = db.collection(JOB_TARGETS_COLLECTION)
+    return [
+        (coll.document(target_id(job_type, ex_id)), {
+            "job_id": job_id,
+            "job_type": job_type,
+            "exercise_id": ex_id,
+            "created_at": now,
+        })
+        for ex_id in dict.fromkeys(exercise_ids)
+        if ex_id
+    ]
+
+
+def clear_job_targets(
+    db: "firestore.Client",
+    job_id: str,
+    job_data: Mapping[str, Any],
+    writer: Any,
+    reader: Any = None,
+) -> int:
+    """
+    Delete the index entries that still point at a job leaving the queue.
+
+    Reads happen here, so inside a transaction call this before any
+    transaction writes.
+
+    Args:
+        db: Firestore client
+        job_id: Job ID
+        job_data: Job document (type and payload.exercise_doc_ids are used)
+        writer: Transaction or WriteBatch the deletes are added to
+        reader: Transaction to read in (default: read with db)
+
+    Returns:
+        Number of index entries deleted
+    """
+    ids = _job_target_ids(job_data)
+    if not ids:
+        return 0
+    coll = db.collection(JOB_TARGETS_COLLECTION)
+    refs = [coll.document(doc_id) for doc_id in ids]
+    snapshots = (reader or db).get_all(refs)
+    cleared = 0
+    for snapshot in snapshots:
+        if snapshot.exists and (snapshot.to_dict() or {}).get("job_id") == job_id:
+            writer.delete(snapshot.reference)
+            cleared += 1
+    return cleared
+
+
+def job_targets_built(db: Optional["firestore.Client"] = None) -> bool:
+    """True once rebuild_job_targets has built the index."""
+    if db is None:
+        from app.firestore_client import get_firestore_client
+        db = get_firestore_client()
+
+    return db.collection(INDEX_MARKERS_COLLECTION).document(JOB_TARGETS_MARKER).get().exists
+
+
+def find_pending_targets(
+    job_type: str,
+    exercise_ids: Sequence[str],
+    db: Optional["firestore.Client"] = None,
+) -> Dict[str, str]:
+    """
+    Pending jobs of a type for many exercises, from the index.
+
+    Job IDs found in the index are kept only if the job is still pending.
+    Before the index is built, the pending jobs of the type are queried
+    instead.
+
+    Args:
+        job_type: JobType value
+        exercise_ids: Exercise IDs to check
+        db: Client to use (default: shared client)
+
+    Returns:
+        Dict of exercise_id -> pending job_id (only exercises with one)
+    """
+    ids = [ex_id for ex_id in dict.fromkeys(exercise_ids) if ex_id]
+    if not ids:
+        return {}
+    if db is None:
+        from app.firestore_client import get_firestore_client
+        db = get_firestore_client()
+
+    if not job_targets_built(db):
+        logger.warning("catalog_job_targets not built, querying pending jobs "
+                       "(run `cli.py rebuild-job-targets --apply`)")
+        return _scan_pending_jobs(db, job_type, ids)
+
+    docs = get_documents(
+        JOB_TARGETS_COLLECTION,
+        [target_id(job_type, ex_id) for ex_id in ids],
+        field_paths=["job_id", "exercise_id"],
+        db=db,
+    )
+    found = {}
+    for doc in docs:
+        data = doc.to_dict() or {}
+        if data.get("exercise_id") and data.get("job_id"):
+            found[data["exercise_id"]] = data["job_id"]
+    if not found:
+        return {}
+
+    pending = {
+        doc.id for doc in get_documents(JOBS_COLLECTION, list(found.values()), field_paths=["status"], db=db)
+        if (doc.to_dict() or {}).get("status") in PENDING_STATUSES
+    }
+    result = {ex_id: job_id for ex_id, job_id in found.items() if job_id in pending}
+    if len(result) < len(found):
+        logger.info("Ignored %d stale %s index entries (job no longer pending)",
+                    len(found) - len(result), job_type)
+    return result
+
+
+def _scan_pending_jobs(db: "firestore.Client", job_type: str, exercise_ids: List[str]) -> Dict[str, str]:
+    """find_pending_targets without the index: stream the pending jobs of the type."""
+    wanted = set(exercise_ids)
+    result: Dict[str, str] = {}
+    query = (
+        db.collection(JOBS_COLLECTION)
+        .where("type", "==", job_type)
+        .where("status", "in", sorted(PENDING_STATUSES))
+        .select(["payload.exercise_doc_ids"])
+    )
+    for doc in query.stream():
+        payload = (doc.to_dict() or {}).get("payload") or {}
+        for ex_id in payload.get("exercise_doc_ids") or []:
+            if ex_id in wanted and ex_id not in result:
+                result[ex_id] = doc.id
+    return result
+
+
+def rebuild_job_targets(
+    db: Optional["firestore.Client"] = None,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Rebuild the index from the pending jobs.
+
+    The newest pending job wins when several share a target, as with
+    create_job. Entries for targets without a pending job are deleted.
+    Writes the built marker once the index is rewritten.
+
+    Args:
+        db: Client to use (default: shared client)
+        dry_run: Compute and diff only, write nothing
+
+    Returns:
+        Dict with pending_jobs, targets, written, deleted
+    """
+    if db is None:
+        from app.firestore_client import get_firestore_client
+        db = get_firestore_client()
+
+    jobs = list(
+        db.collection(JOBS_COLLECTION)
+        .where("status", "in", sorted(PENDING_STATUSES))
+        .select(["type", "payload.exercise_doc_ids", "created_at"])
+        .stream()
+    )
+    jobs.sort(key=_created_at)
+
+    expected: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    for doc in jobs:
+        data = doc.to_dict() or {}
+        exercise_ids = (data.get("payload") or {}).get("exercise_doc_ids") or []
+        for ref, entry in job_target_writes(db, doc.id, data.get("type", ""), exercise_ids):
+            expected[ref.id] = (doc.id, entry)
+
+    existing = {
+        doc.id: (doc.to_dict() or {}).get("job_id")
+        for doc in db.collection(JOB_TARGETS_COLLECTION).select(["job_id"]).stream()
+    }
+
+    to_write = [doc_id for doc_id, (job_id, _) in expected.items() if existing.get(doc_id) != job_id]
+    to_delete = [doc_id for doc_id in existing if doc_id not in expected]
+
+    if not dry_run:
+        coll = db.collection(JOB_TARGETS_COLLECTION)
+        ops = [("set", doc_id) for doc_id in to_write] + [("delete", doc_id) for doc_id in to_delete]
+        for start in range(0, len(ops), MAX_BATCH_WRITES):
+            batch = db.batch()
+            for op, doc_id in ops[start:start + MAX_BATCH_WRITES]:
+                if op == "set":
+                    batch.set(coll.document(doc_id), expected[doc_id][1])
+                else:
+                    batch.delete(coll.document(doc_id))
+            batch.commit()
+        db.collection(INDEX_MARKERS_COLLECTION).document(JOB_TARGETS_MARKER).set({
+            "built_at": datetime.utcnow(),
+            "pending_jobs": len(jobs),
+            "targets": len(expected),
+        })
+
+    logger.info(
+        "Job targets rebuild%s: %d pending jobs, %d targets, %d written, %d deleted",
+        " (dry run)" if dry_run else "", len(jobs), len(expected), len(to_write), len(to_delete),
+    )
+    return {
+        "pending_jobs": len(jobs),
+        "targets": len(expected),
+        "written": len(to_write),
+        "deleted": len(to_delete),
+    }
+
+
+__all__ = [
+    "INDEX_MARKERS_COLLECTION",
+    "JOB_TARGETS_COLLECTION",
+    "JOB_TARGETS_MARKER",
+    "PENDING_STATUSES",
+    "UNINDEXED_JOB_TYPES",
+    "clear_job_targets",
+    "find_pending_targets",
+    "job_target_writes",
+    "job_targets_built",
+    "rebuild_job_targets",
+    "target_id",
+]
@@ -7,14 +7,26 @@ Key responsibilities:
 3. Cleanup old idempotency records
 
 Uses only lease_expires_at as source of truth for stuck detection.
+
+Every scan is paginated (WATCHDOG_PAGE_SIZE documents per page, followed
+with start_after until the query is exhausted), so one run clears any
+backlog. Re-queues and deletes go through a BulkWriter, which batches and
+parallelizes the writes; each carries a last_update_time precondition where
+a concurrent change matters (a renewed lease, a re-acquired lock), and
+writes that lose that race are counted as skipped. Deadletters stay one
+WriteBatch per job so the status change, index cleanup and fan-out progress
+land together. Each step reports pages, elapsed_secs and docs_per_sec.
 """
 
 from __future__ import annotations
 
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
+from google.api_core import exceptions as gcp_exceptions
 from google.cloud import firestore
 
 from app.jobs.models import Job, JobStatus
@@ -23,6 +35,8 @@ from app.jobs.queue import (
     LOCKS_COLLECTION,
     get_db,
 )
+from app.jobs.progress import record_child_progress
+from app.jobs.targets import clear_job_targets
 
 logger = logging.getLogger(__name__)
 
@@ -32,21 +46,100 @@ IDEMPOTENCY_COLLECTION = "catalog_idempotency"
 # Watchdog configuration
 IDEMPOTENCY_TTL_DAYS = 7
 
+# Documents per scan page
+WATCHDOG_PAGE_SIZE = 500
+
+# BulkWriter attempts per write before it counts as an error
+WATCHDOG_WRITE_ATTEMPTS = 5
+
+# google.rpc.Code values for writes whose document changed since the scan
+_NOT_FOUND = 5
+_FAILED_PRECONDITION = 9
+
+
+def _scan_pages(query: firestore.Query, page_size: Optional[int] = None) -> Iterator[List[Any]]:
+    """Pages of a query's matches, following start_after until exhausted."""
+    page_size = page_size or WATCHDOG_PAGE_SIZE
+    last_doc = None
+    while True:
+        page_query = query.limit(page_size)
+        if last_doc is not None:
+            page_query = page_query.start_after(last_doc)
+        page = list(page_query.stream())
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        last_doc = page[-1]
+
+
+def _naive(value: Any) -> Any:
+    if isinstance(value, datetime) and value.tzinfo:
+        return value.replace(tzinfo=None)
+    return value
+
+
+class _BulkTally:
+    """
+    BulkWriter callbacks that count outcomes into a results dict.
+
+    Callbacks run on the writer's threads, hence the lock. Writes whose
+    precondition failed (document changed or gone since the scan) are
+    counted as skipped and not retried.
+    """
+
+    def __init__(self, results: Dict[str, Any], done_key: str):
+        self.results = results
+        self.done_key = done_key
+        self._lock = threading.Lock()
+
+    def attach(self, bulk_writer: Any) -> Any:
+        bulk_writer.on_write_result(self.on_result)
+        bulk_writer.on_write_error(self.on_error)
+        return bulk_writer
+
+    def on_result(self, reference: Any, result: Any, bulk_writer: Any) -> None:
+        with self._lock:
+            self.results[self.done_key] += 1
+
+    def on_error(self, failure: Any, bulk_writer: Any) -> bool:
+        if failure.code in (_FAILED_PRECONDITION, _NOT_FOUND):
+            with self._lock:
+                self.results["skipped"] += 1
+            return False
+        if failure.attempts < WATCHDOG_WRITE_ATTEMPTS:
+            return True
+        logger.error("Watchdog write failed for %s: %s",
+                     getattr(failure.operation, "reference", None), failure.message)
+        with self._lock:
+            self.results["errors"] += 1
+        return False
+
+
+def _record_throughput(results: Dict[str, Any], started: float, pages: int) -> None:
+    elapsed = time.monotonic() - started
+    results["pages"] = pages
+    results["elapsed_secs"] = round(elapsed, 2)
+    results["docs_per_sec"] = round(results["found"] / elapsed, 1) if elapsed > 0 else None
+
 
 def recover_stuck_jobs(dry_run: bool = True) -> Dict[str, Any]:
     """
     Find and recover jobs stuck in leased/running with expired leases.
     
-    Uses lease_expires_at as the single source of truth.
+    Uses lease_expires_at as the single source of truth. Scans every page
+    of stuck jobs; re-queues go through one BulkWriter, deadletters are one
+    WriteBatch each. Jobs updated since the scan are skipped.
     
     Args:
         dry_run: If True, only report what would be done
         
     Returns:
-        Summary of stuck jobs found and actions taken
+        Summary of stuck jobs found and actions taken, with throughput
     """
     db = get_db()
     now = datetime.utcnow()
+    started = time.monotonic()
     
     # Query for stuck jobs:
     # - Status is LEASED or RUNNING
@@ -57,163 +150,199 @@ def recover_stuck_jobs(dry_run: bool = True) -> Dict[str, Any]:
         "found": 0,
         "recovered": 0,
         "deadlettered": 0,
+        "skipped": 0,
         "errors": 0,
         "jobs": [],
         "dry_run": dry_run,
     }
     
+    bulk_writer = None if dry_run else _BulkTally(results, "recovered").attach(db.bulk_writer())
+    pages = 0
+    
     for status in stuck_statuses:
         query = (
             db.collection(JOBS_COLLECTION)
             .where("status", "==", status)
             .where("lease_expires_at", "<", now)
-            .limit(100)
+            .order_by("lease_expires_at")
         )
         
-        for doc in query.stream():
-            data = doc.to_dict()
-            job_id = doc.id
-            
-            results["found"] += 1
-            results["jobs"].append({
-                "id": job_id,
-                "type": data.get("type"),
-                "status": data.get("status"),
-                "lease_expires_at": str(data.get("lease_expires_at")),
-                "attempts": data.get("attempts"),
-                "last_lease_owner": data.get("last_lease_owner") or data.get("lease_owner"),
-            })
-            
-            if dry_run:
-                continue
-            
-            try:
-                # Recover the job
-                recovered = _recover_single_job(db, doc.id, data, now)
-                if recovered == "recovered":
-                    results["recovered"] += 1
-                elif recovered == "deadlettered":
-                    results["deadlettered"] += 1
-            except Exception as e:
-                logger.error("Failed to recover job %s: %s", job_id, e)
-                results["errors"] += 1
+        for page in _scan_pages(query):
+            pages += 1
+            for doc in page:
+                data = doc.to_dict()
+                job_id = doc.id
+                
+                results["found"] += 1
+                results["jobs"].append({
+                    "id": job_id,
+                    "type": data.get("type"),
+                    "status": data.get("status"),
+                    "lease_expires_at": str(data.get("lease_expires_at")),
+                    "attempts": data.get("attempts"),
+                    "last_lease_owner": data.get("last_lease_owner") or data.get("lease_owner"),
+                })
+                
+                if dry_run:
+                    continue
+                
+                try:
+                    if data.get("attempts", 1) >= data.get("max_attempts", 5):
+                        results[_deadletter_job(db, doc, data, now)] += 1
+                    else:
+                        _requeue_job(db, bulk_writer, doc, data, now)
+                except Exception as e:
+                    logger.error("Failed to recover job %s: %s", job_id, e)
+                    results["errors"] += 1
     
-    logger.info("Watchdog: found=%d stuck jobs, recovered=%d, deadlettered=%d",
-               results["found"], results["recovered"], results["deadlettered"])
+    if bulk_writer is not None:
+        bulk_writer.close()
+    _record_throughput(results, started, pages)
+    
+    logger.info("Watchdog: found=%d stuck jobs, recovered=%d, deadlettered=%d, skipped=%d "
+                "(%d pages, %.1fs, %s docs/s)",
+                results["found"], results["recovered"], results["deadlettered"], results["skipped"],
+                pages, results["elapsed_secs"], results["docs_per_sec"])
     
     return results
 
 
-def _recover_single_job(
+def _requeue_job(
+    db: firestore.Client,
+    bulk_writer: Any,
+    doc: Any,
+    data: Dict[str, Any],
+    now: datetime,
+) -> None:
+    """Queue a re-queue of a stuck job (with backoff) on the BulkWriter."""
+    job = Job.from_dict(data)
+    backoff = job.compute_backoff_seconds()
+    run_after = now + timedelta(seconds=backoff)
+    
+    # Re-queue with backoff, unless the job changed since the scan
+    bulk_writer.update(doc.reference, {
+        "status": JobStatus.QUEUED.value,
+        "lease_owner": None,
+        "lease_expires_at": None,
+        "run_after": run_after,
+        "last_error_at": now,
+        "last_lease_owner": data.get("lease_owner"),
+        "error": {
+            "code": "LEASE_EXPIRED",
+            "message": "Job lease expired, recovered by watchdog",
+        },
+        "updated_at": now,
+    }, option=db.write_option(last_update_time=doc.update_time))
+    logger.info("Recovering stuck job: %s, retry after %ds", doc.id, backoff)
+
+
+def _deadletter_job(
     db: firestore.Client,
-    job_id: str,
+    doc: Any,
     data: Dict[str, Any],
     now: datetime,
 ) -> str:
     """
-    Recover a single stuck job.
+    Deadletter a stuck job that exhausted its retries.
+    
+    The status change, pending-job index cleanup and fan-out progress are
+    one WriteBatch.
     
     Returns:
-        "recovered" if re-queued, "deadlettered" if exhausted retries
+        "deadlettered", or "skipped" if the job changed since the scan
     """
-    doc_ref = db.collection(JOBS_COLLECTION).document(job_id)
-    
     attempts = data.get("attempts", 1)
-    max_attempts = data.get("max_attempts", 5)
-    
-    if attempts >= max_attempts:
-        # Exhausted retries - deadletter
-        doc_ref.update({
-            "status": JobStatus.DEADLETTER.value,
-            "lease_owner": None,
-            "lease_expires_at": None,
-            "last_error_at": now,
-            "error": {
-                "code": "LEASE_EXPIRED",
-                "message": f"Job stuck after {attempts} attempts, lease expired",
-            },
-            "updated_at": now,
-        })
-        logger.info("Deadlettered stuck job: %s (attempts=%d)", job_id, attempts)
-        return "deadlettered"
-    else:
-        # Compute backoff for retry
-        job = Job.from_dict(data)
-        backoff = job.compute_backoff_seconds()
-        run_after = now + timedelta(seconds=backoff)
-        
-        # Re-queue with backoff
-        doc_ref.update({
-            "status": JobStatus.QUEUED.value,
-            "lease_owner": None,
-            "lease_expires_at": None,
-            "run_after": run_after,
-            "last_error_at": now,
-            "last_lease_owner": data.get("lease_owner"),
-            "error": {
-                "code": "LEASE_EXPIRED",
-                "message": "Job lease expired, recovered by watchdog",
-            },
-            "updated_at": now,
-        })
-        logger.info("Recovered stuck job: %s, retry after %ds", job_id, backoff)
-        return "recovered"
+    batch = db.batch()
+    clear_job_targets(db, doc.id, data, batch)
+    record_child_progress(db, data, JobStatus.DEADLETTER.value, batch)
+    batch.update(doc.reference, {
+        "status": JobStatus.DEADLETTER.value,
+        "lease_owner": None,
+        "lease_expires_at": None,
+        "last_error_at": now,
+        "error": {
+            "code": "LEASE_EXPIRED",
+            "message": f"Job stuck after {attempts} attempts, lease expired",
+        },
+        "updated_at": now,
+    }, option=db.write_option(last_update_time=doc.update_time))
+    try:
+        batch.commit()
+    except (gcp_exceptions.FailedPrecondition, gcp_exceptions.NotFound):
+        logger.info("Stuck job %s changed since the scan, not deadlettered", doc.id)
+        return "skipped"
+    logger.info("Deadlettered stuck job: %s (attempts=%d)", doc.id, attempts)
+    return "deadlettered"
 
 
 def cleanup_expired_locks(dry_run: bool = True) -> Dict[str, Any]:
     """
     Cleanup expired family locks.
     
-    Finds locks where expires_at < now and deletes them.
+    Finds locks where expires_at < now (every page) and deletes them with a
+    BulkWriter. Locks re-acquired since the scan are skipped.
     
     Args:
         dry_run: If True, only report what would be done
         
     Returns:
-        Summary of locks cleaned up
+        Summary of locks cleaned up, with throughput
     """
     db = get_db()
     now = datetime.utcnow()
+    started = time.monotonic()
     
     results = {
         "found": 0,
         "cleaned": 0,
+        "skipped": 0,
         "errors": 0,
         "locks": [],
         "dry_run": dry_run,
     }
     
+    bulk_writer = None if dry_run else _BulkTally(results, "cleaned").attach(db.bulk_writer())
+    pages = 0
+    
     query = (
         db.collection(LOCKS_COLLECTION)
         .where("expires_at", "<", now)
-        .limit(100)
+        .order_by("expires_at")
     )
     
-    for doc in query.stream():
-        data = doc.to_dict()
-        family_slug = doc.id
-        
-        results["found"] += 1
-        results["locks"].append({
-            "family_slug": family_slug,
-            "job_id": data.get("job_id"),
-            "worker_id": data.get("worker_id"),
-            "expires_at": str(data.get("expires_at")),
-        })
-        
-        if dry_run:
-            continue
-        
-        try:
-            doc.reference.delete()
-            results["cleaned"] += 1
-            logger.info("Cleaned up expired lock: %s", family_slug)
-        except Exception as e:
-            logger.error("Failed to cleanup lock %s: %s", family_slug, e)
-            results["errors"] += 1
+    for page in _scan_pages(query):
+        pages += 1
+        for doc in page:
+            data = doc.to_dict()
+            family_slug = doc.id
+            
+            results["found"] += 1
+            results["locks"].append({
+                "family_slug": family_slug,
+                "job_id": data.get("job_id"),
+                "worker_id": data.get("worker_id"),
+                "expires_at": str(data.get("expires_at")),
+            })
+            
+            if dry_run:
+                continue
+            
+            try:
+                bulk_writer.delete(
+                    doc.reference,
+                    option=db.write_option(last_update_time=doc.update_time),
+                )
+            except Exception as e:
+                logger.error("Failed to cleanup lock %s: %s", family_slug, e)
+                results["errors"] += 1
     
-    logger.info("Lock cleanup: found=%d, cleaned=%d", 
-               results["found"], results["cleaned"])
+    if bulk_writer is not None:
+        bulk_writer.close()
+    _record_throughput(results, started, pages)
+    
+    logger.info("Lock cleanup: found=%d, cleaned=%d, skipped=%d (%d pages, %.1fs, %s docs/s)",
+                results["found"], results["cleaned"], results["skipped"],
+                pages, results["elapsed_secs"], results["docs_per_sec"])
     
     return results
 
@@ -225,71 +354,66 @@ def cleanup_idempotency_records(
     """
     Cleanup old idempotency records.
     
-    Deletes records where expires_at < now or created_at + ttl < now.
+    Deletes records where expires_at < now or created_at + ttl < now, every
+    page of both, with a BulkWriter.
     
     Args:
         dry_run: If True, only report what would be done
         ttl_days: TTL for records in days
         
     Returns:
-        Summary of records cleaned up
+        Summary of records cleaned up, with throughput
     """
     db = get_db()
     now = datetime.utcnow()
     cutoff = now - timedelta(days=ttl_days)
+    started = time.monotonic()
     
     results = {
         "found": 0,
         "cleaned": 0,
+        "skipped": 0,
         "errors": 0,
         "dry_run": dry_run,
     }
     
-    # Query by expires_at if set
-    query1 = (
-        db.collection(IDEMPOTENCY_COLLECTION)
-        .where("expires_at", "<", now)
-        .limit(500)
-    )
+    bulk_writer = None if dry_run else _BulkTally(results, "cleaned").attach(db.bulk_writer())
+    pages = 0
+    coll = db.collection(IDEMPOTENCY_COLLECTION)
     
-    for doc in query1.stream():
-        results["found"] += 1
-        
-        if dry_run:
-            continue
-        
-        try:
-            doc.reference.delete()
-            results["cleaned"] += 1
-        except Exception as e:
-            results["errors"] += 1
-    
-    # Also query by created_at for records without expires_at
-    query2 = (
-        db.collection(IDEMPOTENCY_COLLECTION)
-        .where("created_at", "<", cutoff)
-        .limit(500)
-    )
+    # Query by expires_at if set, then by created_at for records without it
+    queries = [
+        ("expires_at", coll.where("expires_at", "<", now).order_by("expires_at")),
+        ("created_at", coll.where("created_at", "<", cutoff).order_by("created_at")),
+    ]
     
-    for doc in query2.stream():
-        # Skip if already counted (has expires_at and was deleted)
-        data = doc.to_dict()
-        if data.get("expires_at") and data["expires_at"] < now:
-            continue
-        
-        results["found"] += 1
-        
-        if dry_run:
-            continue
-        
-        try:
-            doc.reference.delete()
-            results["cleaned"] += 1
-        except Exception as e:
-            results["errors"] += 1
+    for field, query in queries:
+        for page in _scan_pages(query):
+            pages += 1
+            for doc in page:
+                if field == "created_at":
+                    # Skip if already counted by the expires_at query
+                    expires_at = _naive((doc.to_dict() or {}).get("expires_at"))
+                    if expires_at and expires_at < now:
+                        continue
+                
+                results["found"] += 1
+                
+                if dry_run:
+                    continue
+                
+                try:
+                    bulk_writer.delete(doc.reference)
+                except Exception:
+                    results["errors"] += 1
+    
+    if bulk_writer is not None:
+        bulk_writer.close()
+    _record_throughput(results, started, pages)
     
-    logger.info("Idempotency cleanup: found=%d, cleaned=%d",
-               results["found"], results["cleaned"])
+    logger.info("Idempotency cleanup: found=%d, cleaned=%d (%d pages, %.1fs, %s docs/s)",
+                results["found"], results["cleaned"],
+                pages, results["elapsed_secs"], results["docs_per_sec"])
     
     return results
 
@@ -305,12 +429,14 @@ def run_watchdog(dry_run: bool = True) -> Dict[str, Any]:
         Combined results from all tasks
     """
     logger.info("Running watchdog (dry_run=%s)", dry_run)
+    started = time.monotonic()
     
     results = {
         "stuck_jobs": recover_stuck_jobs(dry_run),
         "expired_locks": cleanup_expired_locks(dry_run),
         "idempotency": cleanup_idempotency_records(dry_run),
     }
+    results["elapsed_secs"] = round(time.monotonic() - started, 2)
     
     return results
 
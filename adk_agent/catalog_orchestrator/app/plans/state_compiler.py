@@ -668,29 +668,23 @@ def fetch_family_snapshot(family_slug: str) -> FamilySnapshot:
     Returns:
         FamilySnapshot with exercises and aliases
     """
-    from google.cloud import firestore
+    from app.family.cache import get_family_cache
+    from app.family.registry import get_family_aliases
+    from app.firestore_client import get_firestore_client
     
-    db = firestore.Client()
+    db = get_firestore_client()
     
-    # Fetch exercises
+    # Fetch exercises (per-process family cache)
     exercises = {}
-    query = db.collection("exercises").where("family_slug", "==", family_slug)
-    for doc in query.stream():
-        data = doc.to_dict()
-        data["doc_id"] = doc.id
-        exercises[doc.id] = ExerciseDoc.from_dict(data)
-    
-    # Fetch aliases for this family's exercises
-    exercise_ids = set(exercises.keys())
-    aliases = {}
-    
-    # Also include family-level aliases
-    for doc in db.collection("exercise_aliases").stream():
-        data = doc.to_dict()
-        data["alias_slug"] = doc.id
-        
-        if data.get("exercise_id") in exercise_ids or data.get("family_slug") == family_slug:
-            aliases[doc.id] = AliasDoc.from_dict(data)
+    for doc_id, data in get_family_cache().get_exercises(family_slug, db=db).items():
+        data["doc_id"] = doc_id
+        exercises[doc_id] = ExerciseDoc.from_dict(data)
+    
+    # Fetch aliases for this family's exercises, plus family-level aliases
+    aliases = {
+        alias_slug: AliasDoc.from_dict(data)
+        for alias_slug, data in get_family_aliases(family_slug, list(exercises), db=db).items()
+    }
     
     # Fetch registry if exists
     registry = None
@@ -643,7 +643,9 @@ def validate_global_slug_uniqueness(
     """
     Validate that slugs touched in plan don't collide with catalog outside snapshot.
     
-    This is a targeted lookup for slugs in the plan diff, not a full scan.
+    This is a targeted lookup for slugs in the plan diff, not a full scan:
+    chunked name_slug "in" queries plus one get_all for aliases, so the
+    RPC count stays flat as plans grow.
     Call this BEFORE apply to catch global collisions.
     
     Args:
@@ -652,40 +654,39 @@ def validate_global_slug_uniqueness(
     Returns:
         ValidationResult with collision errors
     """
-    from google.cloud import firestore
+    from app.firestore_client import get_documents, get_firestore_client, query_in
     
     result = ValidationResult(valid=True)
     
     if not compiled.slugs_touched:
         return result
     
-    db = firestore.Client()
+    db = get_firestore_client()
     exercises_in_snapshot = set(compiled.post_state.exercises.keys())
     
-    # Check each touched slug
-    for name_slug in compiled.slugs_touched:
-        # Skip if this is a doc_id (likely already in snapshot)
-        if name_slug in exercises_in_snapshot:
-            continue
-        
-        # Query for exercises with this slug outside the snapshot
-        query = db.collection("exercises").where("name_slug", "==", name_slug).limit(1)
-        for doc in query.stream():
-            if doc.id not in exercises_in_snapshot:
-                result.add_error(
-                    "GLOBAL_SLUG_COLLISION",
-                    f"Slug '{name_slug}' already exists in catalog (doc: {doc.id})",
-                    field="name_slug",
-                    doc_id=doc.id,
-                )
+    # Skip doc_ids (likely already in snapshot)
+    slugs = [s for s in compiled.slugs_touched if s not in exercises_in_snapshot]
     
-    # Check alias collisions
-    for alias_slug in compiled.aliases_touched:
-        if alias_slug in compiled.post_state.aliases:
-            continue  # Already in our plan
-        
-        alias_doc = db.collection("exercise_aliases").document(alias_slug).get()
-        if alias_doc.exists:
+    # Exercises with these slugs outside the snapshot (chunked "in" queries)
+    outside: Dict[str, str] = {}
+    for doc in query_in("exercises", "name_slug", slugs, field_paths=["name_slug"], db=db):
+        if doc.id not in exercises_in_snapshot:
+            outside.setdefault(doc.to_dict().get("name_slug"), doc.id)
+    
+    for name_slug in slugs:
+        if name_slug in outside:
+            result.add_error(
+                "GLOBAL_SLUG_COLLISION",
+                f"Slug '{name_slug}' already exists in catalog (doc: {outside[name_slug]})",
+                field="name_slug",
+                doc_id=outside[name_slug],
+            )
+    
+    # Check alias collisions (aliases already in our plan are fine)
+    alias_slugs = [a for a in compiled.aliases_touched if a not in compiled.post_state.aliases]
+    existing_aliases = {doc.id for doc in get_documents("exercise_aliases", alias_slugs, field_paths=[], db=db)}
+    for alias_slug in alias_slugs:
+        if alias_slug in existing_aliases:
             result.add_error(
                 "GLOBAL_ALIAS_COLLISION",
                 f"Alias '{alias_slug}' already exists in catalog",
@@ -0,0 +1,177 @@
+"""
+Change Feed - Exercises changed since a consumer's last run.
+
+The scheduled review and quality scan used to fetch the whole catalog and
+throw most of it away in their filters. In change-driven mode they read
+only exercises stamped after a high-water mark, so read cost and runtime
+follow catalog churn instead of catalog size.
+
+State: catalog_change_feed/{consumer} holds one mark per stamp field
+(e.g. updated_at, review_metadata.updated_at). A consumer with no marks
+runs a full pass and then starts the feed from that run's start time.
+
+Marks only move past documents the consumer actually processed: when a
+run is capped (max_exercises), the mark stops at the oldest deferred
+document. Consumers filter out work they've already done, so the
+documents re-read below that mark are cheap.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
+
+logger = logging.getLogger(__name__)
+
+CHANGE_FEED_COLLECTION = "catalog_change_feed"
+EXERCISES_COLLECTION = "exercises"
+
+# Re-read this far behind each mark (writers stamp with their own clocks)
+CHANGE_FEED_OVERLAP = timedelta(minutes=5)
+
+
+def get_stamp(data: Dict[str, Any], field: str) -> Optional[datetime]:
+    """Value of a dotted timestamp field as an aware UTC datetime, or None."""
+    value: Any = data
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class ChangeFeed:
+    """
+    High-water marks for one consumer over one or more stamp fields.
+
+    Usage:
+        feed = ChangeFeed("quality_scan", ["updated_at"], db)
+        changed = feed.fetch()          # None until the first full run
+        ...process...
+        feed.advance(changed, processed_ids)
+    """
+
+    def __init__(
+        self,
+        consumer: str,
+        fields: Sequence[str],
+        db: "firestore.Client",
+    ):
+        self.consumer = consumer
+        self.fields = list(fields)
+        self.db = db
+        self._marks: Optional[Dict[str, datetime]] = None
+
+    @property
+    def _ref(self):
+        return self.db.collection(CHANGE_FEED_COLLECTION).document(self.consumer)
+
+    def marks(self) -> Dict[str, datetime]:
+        """Current mark per field (empty before the first run)."""
+        if self._marks is None:
+            snapshot = self._ref.get()
+            data = snapshot.to_dict() if snapshot.exists else {}
+            stored = (data or {}).get("marks") or {}
+            self._marks = {}
+            for field in self.fields:
+                stamp = get_stamp(stored, field.replace(".", "__"))
+                if stamp is not None:
+                    self._marks[field] = stamp
+        return self._marks
+
+    def fetch(self, extra_filters: Iterable[Tuple[str, str, Any]] = ()) -> Optional[List[Dict[str, Any]]]:
+        """
+        Exercises stamped after the marks, plus any matching extra_filters.
+
+        Args:
+            extra_filters: (field, op, value) queries whose matches are always
+                included (e.g. a backlog flag)
+
+        Returns:
+            Exercise dicts with id/doc_id set, or None when the feed has no
+            marks yet (caller should run a full pass)
+        """
+        marks = self.marks()
+        if len(marks) < len(self.fields):
+            return None
+
+        coll = self.db.collection(EXERCISES_COLLECTION)
+        queries = [coll.where(field, ">", marks[field] - CHANGE_FEED_OVERLAP) for field in self.fields]
+        queries += [coll.where(field, op, value) for field, op, value in extra_filters]
+
+        changed: Dict[str, Dict[str, Any]] = {}
+        for query in queries:
+            for doc in query.stream():
+                if doc.id not in changed:
+                    data = doc.to_dict() or {}
+                    data["id"] = doc.id
+                    data["doc_id"] = doc.id
+                    changed[doc.id] = data
+
+        logger.info("Change feed %s: %d exercises since %s",
+                    self.consumer, len(changed), {f: m.isoformat() for f, m in marks.items()})
+        return list(changed.values())
+
+    def advance(
+        self,
+        fetched: Sequence[Dict[str, Any]],
+        processed_ids: Iterable[str],
+    ) -> Dict[str, datetime]:
+        """
+        Move the marks past what this run handled and save them.
+
+        Per field the new mark is the newest stamp among fetched documents,
+        held back to just before the oldest fetched-but-unprocessed one.
+        Documents filtered out as not needing work count as handled; pass
+        them in processed_ids too.
+
+        Args:
+            fetched: Documents returned by fetch()
+            processed_ids: Doc IDs handled (processed or deliberately skipped)
+
+        Returns:
+            Saved marks
+        """
+        processed = set(processed_ids)
+        marks = dict(self.marks())
+        for field in self.fields:
+            stamps = [(get_stamp(doc, field), doc["doc_id"]) for doc in fetched]
+            stamps = [(stamp, doc_id) for stamp, doc_id in stamps if stamp is not None]
+            deferred = [stamp for stamp, doc_id in stamps if doc_id not in processed]
+            if deferred:
+                candidate = min(deferred) - timedelta(microseconds=1)
+            elif stamps:
+                candidate = max(stamp for stamp, _ in stamps)
+            else:
+                continue
+            if field not in marks or candidate > marks[field]:
+                marks[field] = candidate
+        self._save(marks)
+        return marks
+
+    def reset(self, mark: datetime) -> None:
+        """Start (or restart) the feed at mark, e.g. after a full pass."""
+        mark = mark if mark.tzinfo else mark.replace(tzinfo=timezone.utc)
+        self._save({field: mark for field in self.fields})
+
+    def _save(self, marks: Dict[str, datetime]) -> None:
+        # Dotted field names would be read back as nested paths
+        self._ref.set({
+            "consumer": self.consumer,
+            "marks": {field.replace(".", "__"): mark for field, mark in marks.items()},
+            "updated_at": datetime.now(timezone.utc),
+        })
+        self._marks = marks
+
+
+__all__ = [
+    "CHANGE_FEED_COLLECTION",
+    "ChangeFeed",
+    "get_stamp",
+]
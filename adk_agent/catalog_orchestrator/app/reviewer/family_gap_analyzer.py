@@ -387,13 +387,13 @@ Respond with ONLY the JSON object."""
         """
         from app.jobs.queue import create_job
         from app.family.taxonomy import derive_name_slug, derive_canonical_name
-        from google.cloud import firestore
+        from app.firestore_client import get_firestore_client
         
         jobs_created = []
         jobs_skipped_existing = []
         
         # Get Firestore client for duplicate check
-        db = firestore.Client() if not dry_run else None
+        db = get_firestore_client() if not dry_run else None
         
         for suggestion in gap_result.suggestions[:max_jobs]:
             job_info = {
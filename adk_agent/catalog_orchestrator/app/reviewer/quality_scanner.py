@@ -27,6 +27,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
 from app.enrichment.llm_client import get_llm_client, LLMClient
+from app.enrichment.rate_limit import RateLimitedLLMClient, get_llm_gate
 
 logger = logging.getLogger(__name__)
 
@@ -343,7 +344,8 @@ class QualityScanner:
 
     def _get_llm_client(self) -> LLMClient:
         if self._llm_client is None:
-            self._llm_client = get_llm_client()
+            # Shares the process-wide adaptive gate with the reviewer and enrichment
+            self._llm_client = RateLimitedLLMClient(get_llm_client(), get_llm_gate())
         return self._llm_client
 
     def scan_batch(
@@ -451,12 +453,15 @@ class QualityScanner:
 
         exercises_json = json.dumps(exercises_for_prompt, indent=2)
         prompt = QUALITY_SCAN_PROMPT.format(exercises_json=exercises_json)
+        # Rubric + examples are the same for every batch (context-cache prefix)
+        prefix, marker, body = prompt.partition("Exercises to scan:\n")
 
         try:
             llm_client = self._get_llm_client()
             # Use Flash (require_reasoning=False)
-            response = llm_client.complete(
-                prompt=prompt,
+            response = llm_client.complete_with_prefix(
+                prefix=prefix,
+                prompt=marker + body,
                 require_reasoning=False,  # Use gemini-2.5-flash
             )
 
@@ -570,7 +575,7 @@ def save_scan_results(
     db,
     results: List[QualityScanResult],
     dry_run: bool = True,
-) -> Dict[str, int]:
+) -> Dict[str, Any]:
     """
     Save quality scan results to Firestore using batched writes.
 
@@ -587,14 +592,16 @@ def save_scan_results(
         dry_run: If True, don't actually update
 
     Returns:
-        Summary of updates
+        Summary of updates (failed_ids lists the exercises whose batch
+        commit failed)
     """
     if not db:
         logger.warning("No Firestore client - cannot save scan results")
-        return {"updated": 0, "errors": 0}
+        return {"updated": 0, "errors": 0, "failed_ids": []}
 
     updated = 0
     errors = 0
+    failed_ids: List[str] = []
     now = datetime.now(timezone.utc)
 
     # Firestore batch limit is 500 operations
@@ -616,6 +623,7 @@ def save_scan_results(
         # Process in batches for efficiency
         batch = db.batch()
         batch_count = 0
+        batch_ids: List[str] = []
 
         for result in results:
             if not result.exercise_id:
@@ -629,11 +637,13 @@ def save_scan_results(
                 "review_metadata.scanner_version": SCANNER_VERSION,
                 "review_metadata.issue_type": result.issue_type,
                 "review_metadata.scan_method": result.scan_method,
+                "review_metadata.updated_at": now,
             }
 
             doc_ref = db.collection("exercises").document(result.exercise_id)
             batch.update(doc_ref, update_data)
             batch_count += 1
+            batch_ids.append(result.exercise_id)
             updated += 1
 
             # Commit batch when it reaches the limit
@@ -645,8 +655,10 @@ def save_scan_results(
                     logger.warning("Batch commit failed: %s", e)
                     errors += batch_count
                     updated -= batch_count
+                    failed_ids.extend(batch_ids)
                 batch = db.batch()
                 batch_count = 0
+                batch_ids = []
 
         # Commit remaining
         if batch_count > 0:
@@ -657,13 +669,14 @@ def save_scan_results(
                 logger.warning("Final batch commit failed: %s", e)
                 errors += batch_count
                 updated -= batch_count
+                failed_ids.extend(batch_ids)
 
     logger.info(
         "Saved scan results: updated=%d, errors=%d, dry_run=%s",
         updated, errors, dry_run,
     )
 
-    return {"updated": updated, "errors": errors}
+    return {"updated": updated, "errors": errors, "failed_ids": failed_ids}
 
 
 # =============================================================================
@@ -24,9 +24,10 @@ import json
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
 from app.enrichment.llm_client import get_llm_client, LLMClient
+from app.enrichment.rate_limit import RateLimitedLLMClient, get_llm_gate
 
 logger = logging.getLogger(__name__)
 
@@ -426,7 +427,9 @@ class CatalogReviewAgent:
     
     def _get_llm_client(self) -> LLMClient:
         if self._llm_client is None:
-            self._llm_client = get_llm_client()
+            # Concurrency is set by the process-wide adaptive gate, shared
+            # with the quality scanner and enrichment
+            self._llm_client = RateLimitedLLMClient(get_llm_client(), get_llm_gate())
         return self._llm_client
     
     def _build_review_prompt(
@@ -435,6 +438,22 @@ class CatalogReviewAgent:
         family_context: Optional[Dict[str, List[str]]] = None,
     ) -> str:
         """Build the review prompt for a batch of exercises."""
+        prefix, body = self._build_review_prompt_parts(exercises, family_context)
+        return prefix + body
+    
+    def _build_review_prompt_parts(
+        self,
+        exercises: List[Dict[str, Any]],
+        family_context: Optional[Dict[str, List[str]]] = None,
+    ) -> Tuple[str, str]:
+        """
+        Build the review prompt as (static prefix, per-batch body).
+
+        The prefix (system prompt, few-shot examples, task description) is the
+        same for every batch and is sent through complete_with_prefix(). At
+        ~1,700 tokens it is below the default LLM_PREFIX_CACHE_MIN_TOKENS, so
+        it is sent inline unless that threshold is lowered.
+        """
         
         # Format exercises for prompt
         exercises_json = json.dumps(exercises, indent=2, default=str)
@@ -446,7 +465,7 @@ class CatalogReviewAgent:
             for family, equipment in family_context.items():
                 family_section += f"- {family}: {', '.join(equipment)}\n"
         
-        prompt = f"""{SYSTEM_PROMPT}
+        prefix = f"""{SYSTEM_PROMPT}
 
 {FEW_SHOT_EXAMPLES}
 
@@ -463,7 +482,9 @@ Think through each exercise systematically:
 - First assess what's there
 - Then decide if action is needed
 - Explain your reasoning clearly
-{family_section}
+"""
+
+        prompt = f"""{family_section}
 ## Exercises to Review
 
 {exercises_json}
@@ -490,7 +511,7 @@ Don't over-engineer. Gaps are informational only - no auto-creation.
 
 Respond with ONLY the JSON object, no markdown code blocks."""
 
-        return prompt
+        return prefix, prompt
     
     def review_batch(
         self,
@@ -533,142 +554,173 @@ Respond with ONLY the JSON object, no markdown code blocks."""
         if not exercises:
             return result
         
-        # Build family context from exercises if not provided
-        if family_context is None and self.include_gap_analysis:
-            family_context = {}
-            for ex in exercises:
-                family = ex.get("family_slug", "")
-                if family:
-                    if family not in family_context:
-                        family_context[family] = []
-                    equipment = ex.get("equipment", [])
-                    if equipment:
-                        primary = equipment[0] if isinstance(equipment, list) else equipment
-                        if primary not in family_context[family]:
-                            family_context[family].append(primary)
+        family_context = self._batch_family_context(exercises, family_context)
         
-        # Build and execute prompt
-        prompt = self._build_review_prompt(exercises, family_context)
+        # Build and execute prompt (static prefix is served from context cache)
+        prefix, prompt = self._build_review_prompt_parts(exercises, family_context)
         
         try:
             llm_client = self._get_llm_client()
-            response = llm_client.complete(
+            response = llm_client.complete_with_prefix(
+                prefix=prefix,
                 prompt=prompt,
                 output_schema=OUTPUT_SCHEMA,
                 require_reasoning=False,  # V1.4: Flash-first for cost efficiency
             )
-            
-            # Parse response
             parsed = self._parse_response(response)
 
             # Retry once if 0 decisions returned for a non-empty batch
-            decisions_returned = len(parsed.get("exercises", []))
-            if decisions_returned == 0 and len(exercises) > 0:
+            # (unparseable responses parse to 0 decisions). The rejected
+            # response is dropped from the response cache first, or the
+            # retry would be answered with it again.
+            if not parsed.get("exercises"):
                 logger.warning(
                     "Batch returned 0/%d decisions — retrying once",
                     len(exercises),
                 )
-                response = llm_client.complete(
+                llm_client.discard_cached_response(prompt, OUTPUT_SCHEMA, prefix=prefix)
+                response = llm_client.complete_with_prefix(
+                    prefix=prefix,
                     prompt=prompt,
                     output_schema=OUTPUT_SCHEMA,
                     require_reasoning=False,
                 )
                 parsed = self._parse_response(response)
-                decisions_returned = len(parsed.get("exercises", []))
-                if decisions_returned == 0:
-                    logger.error(
-                        "Retry also returned 0/%d decisions", len(exercises)
-                    )
-                    batch_ids = [
-                        ex.get("id", ex.get("doc_id", ""))
-                        for ex in exercises
-                    ]
-                    result.retry_failed_ids = batch_ids
-
-            # Map exercise IDs to names for enrichment
-            id_to_name = {ex.get("id", ex.get("doc_id", "")): ex.get("name", "") for ex in exercises}
-            
-            # Process exercise decisions
-            for ex_decision in parsed.get("exercises", []):
-                exercise_id = ex_decision.get("exercise_id", "")
-                decision_str = ex_decision.get("decision", "KEEP").upper()
-
-                # Extract quality_score, default to 1.0 for KEEP, 0.5 for others
-                quality_score = ex_decision.get("quality_score")
-                if quality_score is None:
-                    quality_score = 1.0 if decision_str == "KEEP" else 0.5
-
-                decision = ExerciseDecision(
-                    exercise_id=exercise_id,
-                    exercise_name=id_to_name.get(exercise_id, ""),
-                    decision=decision_str,
-                    confidence=ex_decision.get("confidence", "medium"),
-                    reasoning=ex_decision.get("reasoning", ""),
-                    quality_score=float(quality_score),
-                    fix_details=ex_decision.get("fix_details"),
-                    merge_into=ex_decision.get("merge_into"),
-                )
-                result.decisions.append(decision)
-                
-                # Update counts
-                if decision_str == "KEEP":
-                    result.keep_count += 1
-                elif decision_str == "ENRICH":
-                    result.enrich_count += 1
-                elif decision_str == "FIX_IDENTITY":
-                    result.fix_count += 1
-                elif decision_str == "ARCHIVE":
-                    result.archive_count += 1
-                elif decision_str == "MERGE":
-                    result.merge_count += 1
-            
-            # Process duplicates
-            for dup in parsed.get("duplicates", []):
-                cluster = DuplicateCluster(
-                    canonical_id=dup.get("canonical_id", ""),
-                    canonical_name=dup.get("canonical_name", ""),
-                    duplicate_ids=dup.get("duplicate_ids", []),
-                    reasoning=dup.get("reasoning", ""),
-                )
-                result.duplicates.append(cluster)
-            
-            # Process gaps (check both "equipment_gaps" and legacy "gaps" keys)
-            gaps_list = parsed.get("equipment_gaps", parsed.get("gaps", []))
-            for gap in gaps_list:
-                suggestion = GapSuggestion(
-                    family_slug=gap.get("family_slug", ""),
-                    missing_equipment=gap.get("missing_equipment", ""),
-                    suggested_name=gap.get("suggested_name", ""),
-                    reasoning=gap.get("reasoning", ""),
-                    confidence=gap.get("confidence", "medium"),
-                )
-                result.gaps.append(suggestion)
-            
-            logger.info(
-                "Reviewed batch: %d exercises | KEEP=%d ENRICH=%d FIX=%d ARCHIVE=%d MERGE=%d | %d gaps",
-                result.exercises_reviewed,
-                result.keep_count,
-                result.enrich_count,
-                result.fix_count,
-                result.archive_count,
-                result.merge_count,
-                len(result.gaps),
-            )
-            
+                if not parsed.get("exercises"):
+                    llm_client.discard_cached_response(prompt, OUTPUT_SCHEMA, prefix=prefix)
+
+            self._record_review(result, exercises, parsed)
+
         except Exception as e:
-            logger.exception("Review batch failed: %s", e)
-            # On failure, mark all as KEEP to be safe
+            self._record_review_failure(result, exercises, e)
+        
+        return result
+    
+    def _batch_family_context(
+        self,
+        exercises: List[Dict[str, Any]],
+        family_context: Optional[Dict[str, List[str]]],
+    ) -> Optional[Dict[str, List[str]]]:
+        """Build family context from the batch if not provided."""
+        if family_context is None and self.include_gap_analysis:
+            family_context = {}
             for ex in exercises:
-                result.decisions.append(ExerciseDecision(
-                    exercise_id=ex.get("id", ex.get("doc_id", "")),
-                    exercise_name=ex.get("name", ""),
-                    decision="KEEP",
-                    confidence="low",
-                    reasoning=f"LLM review failed: {str(e)}",
-                ))
+                family = ex.get("family_slug", "")
+                if family:
+                    if family not in family_context:
+                        family_context[family] = []
+                    equipment = ex.get("equipment", [])
+                    if equipment:
+                        primary = equipment[0] if isinstance(equipment, list) else equipment
+                        if primary not in family_context[family]:
+                            family_context[family].append(primary)
+        
+        return family_context
+    
+    def _record_review(
+        self,
+        result: BatchReviewResult,
+        exercises: List[Dict[str, Any]],
+        parsed: Dict[str, Any],
+    ) -> None:
+        """Fill result with the decisions, duplicates and gaps from a parsed response."""
+        if not parsed.get("exercises"):
+            logger.error(
+                "Retry also returned 0/%d decisions", len(exercises)
+            )
+            result.retry_failed_ids = [
+                ex.get("id", ex.get("doc_id", ""))
+                for ex in exercises
+            ]
+
+        # Map exercise IDs to names for enrichment
+        id_to_name = {ex.get("id", ex.get("doc_id", "")): ex.get("name", "") for ex in exercises}
+        
+        # Process exercise decisions
+        for ex_decision in parsed.get("exercises", []):
+            exercise_id = ex_decision.get("exercise_id", "")
+            decision_str = ex_decision.get("decision", "KEEP").upper()
+
+            # Extract quality_score, default to 1.0 for KEEP, 0.5 for others
+            quality_score = ex_decision.get("quality_score")
+            if quality_score is None:
+                quality_score = 1.0 if decision_str == "KEEP" else 0.5
+
+            decision = ExerciseDecision(
+                exercise_id=exercise_id,
+                exercise_name=id_to_name.get(exercise_id, ""),
+                decision=decision_str,
+                confidence=ex_decision.get("confidence", "medium"),
+                reasoning=ex_decision.get("reasoning", ""),
+                quality_score=float(quality_score),
+                fix_details=ex_decision.get("fix_details"),
+                merge_into=ex_decision.get("merge_into"),
+            )
+            result.decisions.append(decision)
+            
+            # Update counts
+            if decision_str == "KEEP":
                 result.keep_count += 1
+            elif decision_str == "ENRICH":
+                result.enrich_count += 1
+            elif decision_str == "FIX_IDENTITY":
+                result.fix_count += 1
+            elif decision_str == "ARCHIVE":
+                result.archive_count += 1
+            elif decision_str == "MERGE":
+                result.merge_count += 1
         
-        return result
+        # Process duplicates
+        for dup in parsed.get("duplicates", []):
+            cluster = DuplicateCluster(
+                canonical_id=dup.get("canonical_id", ""),
+                canonical_name=dup.get("canonical_name", ""),
+                duplicate_ids=dup.get("duplicate_ids", []),
+                reasoning=dup.get("reasoning", ""),
+            )
+            result.duplicates.append(cluster)
+        
+        # Process gaps (check both "equipment_gaps" and legacy "gaps" keys)
+        gaps_list = parsed.get("equipment_gaps", parsed.get("gaps", []))
+        for gap in gaps_list:
+            suggestion = GapSuggestion(
+                family_slug=gap.get("family_slug", ""),
+                missing_equipment=gap.get("missing_equipment", ""),
+                suggested_name=gap.get("suggested_name", ""),
+                reasoning=gap.get("reasoning", ""),
+                confidence=gap.get("confidence", "medium"),
+            )
+            result.gaps.append(suggestion)
+        
+        logger.info(
+            "Reviewed batch: %d exercises | KEEP=%d ENRICH=%d FIX=%d ARCHIVE=%d MERGE=%d | %d gaps",
+            result.exercises_reviewed,
+            result.keep_count,
+            result.enrich_count,
+            result.fix_count,
+            result.archive_count,
+            result.merge_count,
+            len(result.gaps),
+        )
+    
+    def _record_review_failure(
+        self,
+        result: BatchReviewResult,
+        exercises: List[Dict[str, Any]],
+        error: Exception,
+    ) -> None:
+        """On LLM failure, mark every exercise KEEP with low confidence."""
+        logger.exception("Review batch failed: %s", error)
+        # On failure, mark all as KEEP to be safe
+        for ex in exercises:
+            result.decisions.append(ExerciseDecision(
+                exercise_id=ex.get("id", ex.get("doc_id", "")),
+                exercise_name=ex.get("name", ""),
+                decision="KEEP",
+                confidence="low",
+                reasoning=f"LLM review failed: {str(error)}",
+            ))
+            result.keep_count += 1
     
     def _parse_response(self, response: str) -> Dict[str, Any]:
         """
@@ -825,14 +877,63 @@ Respond with ONLY the JSON object, no markdown code blocks."""
         exercises: List[Dict[str, Any]],
         family_context: Optional[Dict[str, List[str]]] = None,
     ) -> BatchReviewResult:
-        """Async version of review_batch for concurrent processing."""
-        # Run in thread pool since LLM client may be synchronous
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
+        """
+        Async version of review_batch for concurrent processing.
+
+        Uses LLMClient.complete_async, so with VertexLLMClient no thread is
+        held per in-flight batch. Same retry and failure behaviour as
+        review_batch.
+        """
+        result = BatchReviewResult(exercises_reviewed=len(exercises))
+        
+        if not exercises:
+            return result
+        
+        family_context = self._batch_family_context(exercises, family_context)
+        prefix, prompt = self._build_review_prompt_parts(exercises, family_context)
+        
+        try:
+            llm_client = self._get_llm_client()
+            response = await llm_client.complete_async(
+                prompt=prompt,
+                output_schema=OUTPUT_SCHEMA,
+                require_reasoning=False,
+                prefix=prefix,
+            )
+            parsed = self._parse_response(response)
+
+            # Retry once if 0 decisions returned for a non-empty batch,
+            # dropping the rejected response from the cache as in review_batch
+            if not parsed.get("exercises"):
+                logger.warning(
+                    "Batch returned 0/%d decisions — retrying once",
+                    len(exercises),
+                )
+                await self._discard_cached_response_async(llm_client, prompt, prefix)
+                response = await llm_client.complete_async(
+                    prompt=prompt,
+                    output_schema=OUTPUT_SCHEMA,
+                    require_reasoning=False,
+                    prefix=prefix,
+                )
+                parsed = self._parse_response(response)
+                if not parsed.get("exercises"):
+                    await self._discard_cached_response_async(llm_client, prompt, prefix)
+
+            self._record_review(result, exercises, parsed)
+
+        except Exception as e:
+            self._record_review_failure(result, exercises, e)
+        
+        return result
+
+    @staticmethod
+    async def _discard_cached_response_async(llm_client: LLMClient, prompt: str, prefix: str) -> None:
+        """discard_cached_response on the executor (cache backends may block)."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
             None,
-            self.review_batch,
-            exercises,
-            family_context,
+            lambda: llm_client.discard_cached_response(prompt, OUTPUT_SCHEMA, prefix=prefix),
         )
 
 
@@ -840,23 +941,34 @@ Respond with ONLY the JSON object, no markdown code blocks."""
 # CATALOG-WIDE REVIEW
 # =============================================================================
 
+# Batches queued for the LLM gate at once. Actual LLM concurrency is set
+# by the shared adaptive gate (app.enrichment.rate_limit.get_llm_gate);
+# this only has to stay above its ceiling for the gate to use it.
+DEFAULT_MAX_IN_FLIGHT = 32
+
+
 async def review_catalog_async(
     exercises: List[Dict[str, Any]],
     batch_size: int = 20,
-    max_concurrent: int = 3,
     include_gap_analysis: bool = True,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
 ) -> List[BatchReviewResult]:
     """
     Review entire catalog with concurrent batch processing.
     
+    At most max_in_flight batches are in flight, as with
+    review_catalog_stream; the shared adaptive gate decides how many LLM
+    calls actually run, raising concurrency while calls stay fast and
+    backing off on RESOURCE_EXHAUSTED.
+    
     Args:
         exercises: All exercises to review
         batch_size: Exercises per batch
-        max_concurrent: Maximum concurrent LLM calls
         include_gap_analysis: Whether to include gap suggestions
+        max_in_flight: Maximum batches in flight
         
     Returns:
-        List of BatchReviewResult for each batch
+        List of BatchReviewResult for each batch, in batch order
     """
     agent = CatalogReviewAgent(
         batch_size=batch_size,
@@ -866,7 +978,86 @@ async def review_catalog_async(
     # Split into batches
     batches = [exercises[i:i + batch_size] for i in range(0, len(exercises), batch_size)]
     
-    # Build global family context
+    family_context = _catalog_family_context(exercises)
+    
+    logger.info("Starting catalog review: %d exercises in %d batches", len(exercises), len(batches))
+    
+    in_flight = asyncio.Semaphore(max(1, max_in_flight))
+    
+    async def review(batch: List[Dict[str, Any]]) -> BatchReviewResult:
+        async with in_flight:
+            return await agent.review_batch_async(batch, family_context)
+    
+    results = await asyncio.gather(*(review(batch) for batch in batches))
+    
+    return list(results)
+
+
+async def review_catalog_stream(
+    exercises: List[Dict[str, Any]],
+    batch_size: int = 20,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    include_gap_analysis: bool = True,
+) -> AsyncIterator[BatchReviewResult]:
+    """
+    Review a catalog batch by batch, yielding each result as it completes.
+    
+    At most max_in_flight batches are in flight, and the shared adaptive
+    gate decides how many of those are calling the LLM. A finished batch
+    is replaced by the next one before its result is yielded, and nothing
+    beyond that is started until the consumer asks for more - a slow
+    consumer (job creation) holds the pipeline back instead of letting
+    results pile up.
+    
+    Results arrive in completion order, not batch order. Closing the
+    generator early (aclose) cancels the batches still in flight.
+    
+    Args:
+        exercises: All exercises to review
+        batch_size: Exercises per batch
+        max_in_flight: Maximum batches in flight
+        include_gap_analysis: Whether to include gap suggestions
+        
+    Yields:
+        BatchReviewResult per batch
+    """
+    agent = CatalogReviewAgent(
+        batch_size=batch_size,
+        include_gap_analysis=include_gap_analysis,
+    )
+    family_context = _catalog_family_context(exercises)
+    batches = (exercises[i:i + batch_size] for i in range(0, len(exercises), batch_size))
+    
+    logger.info("Streaming catalog review: %d exercises, up to %d batches in flight",
+                len(exercises), max_in_flight)
+    
+    pending: Set[asyncio.Task] = set()
+    
+    def start_next() -> None:
+        batch = next(batches, None)
+        if batch:
+            pending.add(asyncio.ensure_future(agent.review_batch_async(batch, family_context)))
+    
+    for _ in range(max(1, max_in_flight)):
+        start_next()
+    
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.discard(task)
+                start_next()
+                yield task.result()
+    finally:
+        # Consumer stopped early (or failed): drop the batches still in flight
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _catalog_family_context(exercises: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Global family context: family_slug -> primary equipment already covered."""
     family_context: Dict[str, List[str]] = {}
     for ex in exercises:
         family = ex.get("family_slug", "")
@@ -878,20 +1069,7 @@ async def review_catalog_async(
                 primary = equipment[0] if isinstance(equipment, list) else equipment
                 if primary not in family_context[family]:
                     family_context[family].append(primary)
-    
-    logger.info("Starting catalog review: %d exercises in %d batches", len(exercises), len(batches))
-    
-    # Process batches with semaphore for concurrency control
-    semaphore = asyncio.Semaphore(max_concurrent)
-    
-    async def review_with_semaphore(batch):
-        async with semaphore:
-            return await agent.review_batch_async(batch, family_context)
-    
-    tasks = [review_with_semaphore(batch) for batch in batches]
-    results = await asyncio.gather(*tasks)
-    
-    return list(results)
+    return family_context
 
 
 def review_catalog(
@@ -925,4 +1103,5 @@ __all__ = [
     "GapSuggestion",
     "review_catalog",
     "review_catalog_async",
+    "review_catalog_stream",
 ]
@@ -9,10 +9,17 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.jobs.models import JobType, JobQueue
-from app.jobs.queue import create_job, find_pending_job
+from app.jobs.queue import (
+    BulkCreateError,
+    create_job,
+    create_jobs_bulk,
+    find_pending_job,
+    find_pending_jobs_batch,
+    new_job_id,
+)
 from app.reviewer.catalog_reviewer import (
     BatchReviewResult,
     ReviewResult,
@@ -75,11 +82,22 @@ class ReviewJobCreator:
         """
         Create jobs from a batch review result.
         
+        Jobs are written together with create_jobs_bulk once the whole
+        batch has been processed.
+        
         Returns summary of jobs created.
         """
         jobs_created = []
         jobs_skipped = []
         
+        candidates = [
+            result for result in batch_result.results
+            if result.issues and (result.needs_enrichment or result.needs_human_review)
+        ]
+        pending_jobs = self._find_pending_jobs(candidates)
+        # (spec, job_info) pairs, written in one bulk call below
+        specs: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        
         for result in batch_result.results:
             if not result.needs_enrichment and not result.needs_human_review:
                 continue
@@ -92,10 +110,12 @@ class ReviewJobCreator:
                 continue
             
             # Create job for this exercise
-            job_info = self.create_job_for_exercise(result)
+            job_info = self.create_job_for_exercise(result, pending_jobs, specs)
             if job_info:
                 jobs_created.append(job_info)
         
+        self._create_jobs(specs)
+        
         return {
             "jobs_created": len(jobs_created),
             "jobs_skipped": len(jobs_skipped),
@@ -104,9 +124,91 @@ class ReviewJobCreator:
             "skipped": jobs_skipped,
         }
     
+    def _submit_job(
+        self,
+        spec: Dict[str, Any],
+        job_info: Dict[str, Any],
+        specs: Optional[List[Tuple[Dict[str, Any], Dict[str, Any]]]] = None,
+    ) -> None:
+        """
+        Create a job from create_job keyword arguments and record its ID in
+        job_info, or append it to specs for _create_jobs when given.
+        Failures are recorded in job_info["error"].
+        """
+        if specs is not None:
+            job_info["job_id"] = spec["job_id"] = new_job_id()
+            specs.append((spec, job_info))
+            self._jobs_created += 1
+            return
+        
+        try:
+            job = create_job(**spec)
+            job_info["job_id"] = job.id
+            self._jobs_created += 1
+            logger.info(
+                "Created %s job %s for exercise %s",
+                job.type.value, job.id, job_info["exercise_id"],
+            )
+        except Exception as e:
+            logger.exception("Failed to create job for %s: %s", job_info["exercise_id"], e)
+            job_info["error"] = str(e)
+    
+    def _create_jobs(self, specs: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+        """
+        Write jobs collected by _submit_job in one create_jobs_bulk call.
+        Jobs that were not written get job_info["error"] instead of a job_id.
+        """
+        if not specs:
+            return
+        try:
+            create_jobs_bulk([spec for spec, _ in specs])
+            logger.info("Created %d review jobs", len(specs))
+            return
+        except BulkCreateError as e:
+            logger.error("Failed to create %d of %d review jobs: %s", len(e.failed_ids), len(specs), e.__cause__)
+            failed, error = set(e.failed_ids), str(e.__cause__)
+        except Exception as e:
+            logger.exception("Failed to create %d review jobs: %s", len(specs), e)
+            failed, error = {spec["job_id"] for spec, _ in specs}, str(e)
+        for spec, job_info in specs:
+            if spec["job_id"] in failed:
+                job_info.pop("job_id", None)
+                job_info["error"] = error
+        self._jobs_created -= len(failed)
+    
+    def _job_type_for(self, result: ReviewResult) -> JobType:
+        """Job type create_job_for_exercise picks for a result's issues."""
+        issues_by_category: Dict[IssueCategory, List[QualityIssue]] = {}
+        for issue in result.issues:
+            if issue.category not in issues_by_category:
+                issues_by_category[issue.category] = []
+            issues_by_category[issue.category].append(issue)
+        
+        primary_category = self._get_primary_category(issues_by_category)
+        return CATEGORY_TO_JOB_TYPE.get(primary_category, JobType.CATALOG_ENRICH_FIELD)
+    
+    def _find_pending_jobs(self, results: List[ReviewResult]) -> Optional[Dict[str, str]]:
+        """
+        Pending job per exercise for a batch of results, one index lookup
+        per job type. None in dry-run mode (no dedup check).
+        """
+        if self.dry_run:
+            return None
+        
+        ids_by_type: Dict[JobType, List[str]] = {}
+        for result in results:
+            ids_by_type.setdefault(self._job_type_for(result), []).append(result.exercise_id)
+        
+        pending: Dict[str, str] = {}
+        for job_type, exercise_ids in ids_by_type.items():
+            pending.update(find_pending_jobs_batch(job_type, exercise_ids))
+        return pending
+    
     def create_job_for_exercise(
         self,
         result: ReviewResult,
+        pending_jobs: Optional[Dict[str, str]] = None,
+        specs: Optional[List[Tuple[Dict[str, Any], Dict[str, Any]]]] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Create a single job for an exercise with issues.
@@ -114,23 +216,26 @@ class ReviewJobCreator:
         Groups issues by category and creates appropriate job type.
         If LLM confidence is low, escalates to human review instead of auto-fix.
         Skips job creation if a pending job already exists for this exercise.
+        
+        Args:
+            result: Review result for one exercise
+            pending_jobs: exercise_id -> pending job ID, prefetched by
+                create_jobs_from_batch_review; looked up per exercise if None
+            specs: Collects the job for a later bulk write instead of
+                creating it now (see _create_jobs)
         """
         if not result.issues:
             return None
         
         # Determine job type first for dedup check
-        issues_by_category_preview: Dict[IssueCategory, List[QualityIssue]] = {}
-        for issue in result.issues:
-            if issue.category not in issues_by_category_preview:
-                issues_by_category_preview[issue.category] = []
-            issues_by_category_preview[issue.category].append(issue)
-        
-        primary_category = self._get_primary_category(issues_by_category_preview)
-        job_type = CATEGORY_TO_JOB_TYPE.get(primary_category, JobType.CATALOG_ENRICH_FIELD)
+        job_type = self._job_type_for(result)
         
         # Check for existing pending job (skip in dry-run mode)
         if not self.dry_run:
-            existing_job_id = find_pending_job(job_type, result.exercise_id)
+            if pending_jobs is not None:
+                existing_job_id = pending_jobs.get(result.exercise_id)
+            else:
+                existing_job_id = find_pending_job(job_type, result.exercise_id)
             if existing_job_id:
                 logger.debug(
                     "Skipping exercise %s - pending job exists: %s",
@@ -151,7 +256,7 @@ class ReviewJobCreator:
         # If we have LLM issues and the result explicitly flags for human review,
         # create a human review job instead of auto-fix
         if needs_human_escalation and llm_issues:
-            return self._create_human_review_job(result, llm_issues)
+            return self._create_human_review_job(result, llm_issues, specs)
         
         # Group issues by category
         issues_by_category: Dict[IssueCategory, List[QualityIssue]] = {}
@@ -193,24 +298,16 @@ class ReviewJobCreator:
         }
         
         if not self.dry_run:
-            try:
-                job = create_job(
-                    job_type=job_type,
-                    queue=queue,
-                    priority=priority,
-                    family_slug=result.family_slug,
-                    exercise_doc_ids=[result.exercise_id],
-                    enrichment_spec=enrichment_spec,
-                )
-                job_info["job_id"] = job.id
-                self._jobs_created += 1
-                logger.info(
-                    "Created job %s for exercise %s",
-                    job.id, result.exercise_id
-                )
-            except Exception as e:
-                logger.exception("Failed to create job for %s: %s", result.exercise_id, e)
-                job_info["error"] = str(e)
+            self._submit_job({
+                "job_type": job_type,
+                "queue": queue,
+                "priority": priority,
+                "family_slug": result.family_slug,
+                "exercise_doc_ids": [result.exercise_id],
+                "enrichment_spec": enrichment_spec,
+            }, job_info, specs)
+            if pending_jobs is not None and "job_id" in job_info:
+                pending_jobs[result.exercise_id] = job_info["job_id"]
         else:
             job_info["job_id"] = f"dry-run-{result.exercise_id}"
             self._jobs_created += 1
@@ -255,6 +352,7 @@ class ReviewJobCreator:
         self,
         result: ReviewResult,
         llm_issues: List[QualityIssue],
+        specs: Optional[List[Tuple[Dict[str, Any], Dict[str, Any]]]] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Create a human review job when LLM confidence is low.
@@ -283,31 +381,21 @@ class ReviewJobCreator:
         }
         
         if not self.dry_run:
-            try:
-                # Create audit job for human review
-                job = create_job(
-                    job_type=HUMAN_REVIEW_JOB_TYPE,
-                    queue=JobQueue.PRIORITY,
-                    priority=90,
-                    family_slug=result.family_slug,
-                    exercise_doc_ids=[result.exercise_id],
-                    enrichment_spec={
-                        "type": "human_review",
-                        "exercise_id": result.exercise_id,
-                        "issues": issue_descriptions,
-                        "quality_score": result.quality_score,
-                        "llm_issue_count": len(llm_issues),
-                    },
-                )
-                job_info["job_id"] = job.id
-                self._jobs_created += 1
-                logger.info(
-                    "Created HUMAN_REVIEW job %s for exercise %s (LLM low confidence)",
-                    job.id, result.exercise_id
-                )
-            except Exception as e:
-                logger.exception("Failed to create human review job for %s: %s", result.exercise_id, e)
-                job_info["error"] = str(e)
+            # Create audit job for human review (LLM low confidence)
+            self._submit_job({
+                "job_type": HUMAN_REVIEW_JOB_TYPE,
+                "queue": JobQueue.PRIORITY,
+                "priority": 90,
+                "family_slug": result.family_slug,
+                "exercise_doc_ids": [result.exercise_id],
+                "enrichment_spec": {
+                    "type": "human_review",
+                    "exercise_id": result.exercise_id,
+                    "issues": issue_descriptions,
+                    "quality_score": result.quality_score,
+                    "llm_issue_count": len(llm_issues),
+                },
+            }, job_info, specs)
         else:
             job_info["job_id"] = f"dry-run-human-{result.exercise_id}"
             self._jobs_created += 1
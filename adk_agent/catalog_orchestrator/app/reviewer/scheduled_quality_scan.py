@@ -29,7 +29,7 @@ import logging
 import os
 import sys
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -40,6 +40,9 @@ from app.reviewer.quality_scanner import (
     save_scan_results,
     SCANNER_VERSION,
 )
+from app.catalog_snapshot import fetch_exercises
+from app.firestore_client import get_firestore_client
+from app.reviewer.change_feed import ChangeFeed, get_stamp
 from app.jobs.models import JobType, JobQueue
 
 logger = logging.getLogger(__name__)
@@ -49,18 +52,15 @@ DEFAULT_MAX_EXERCISES = 1000
 DEFAULT_BATCH_SIZE = 50
 DEFAULT_MAX_JOBS = 200
 
+# Change feed consumer (app/reviewer/change_feed.py); content edits only
+CHANGE_FEED_CONSUMER = "quality_scan"
+CHANGE_FEED_FIELDS = ("updated_at",)
+
 
 def _get_firestore_client():
     """Get Firestore client."""
     try:
-        from google.cloud import firestore
-
-        emulator_host = os.environ.get("FIRESTORE_EMULATOR_HOST")
-        if emulator_host:
-            logger.info("Using Firestore emulator at %s", emulator_host)
-            return firestore.Client(project="demo-povver")
-
-        return firestore.Client()
+        return get_firestore_client()
     except Exception as e:
         logger.warning("Failed to get Firestore client: %s", e)
         return None
@@ -81,43 +81,35 @@ def fetch_exercises_for_scan(
         return []
 
     exercises = []
-    last_doc = None
-
-    while len(exercises) < max_exercises:
-        batch_size = min(500, max_exercises - len(exercises))
-        query = db.collection("exercises").order_by("name").limit(batch_size)
-
-        if last_doc:
-            query = query.start_after(last_doc)
 
-        docs = list(query.stream())
-
-        if not docs:
+    # Served from the local catalog snapshot (see app.catalog_snapshot)
+    for data in fetch_exercises(db):
+        if len(exercises) >= max_exercises:
             break
 
-        for doc in docs:
-            data = doc.to_dict()
-            data["id"] = doc.id
-            data["doc_id"] = doc.id
-
-            # Skip if recently scanned with current version (unless force)
-            if not force_rescan:
-                review_meta = data.get("review_metadata", {})
-                scanner_version = review_meta.get("scanner_version")
-                if scanner_version == SCANNER_VERSION:
-                    continue
-
-            exercises.append(data)
+        # Skip if recently scanned with current version (unless force)
+        if not force_rescan:
+            review_meta = data.get("review_metadata", {})
+            scanner_version = review_meta.get("scanner_version")
+            if scanner_version == SCANNER_VERSION:
+                continue
 
-        last_doc = docs[-1]
-
-        if len(docs) < batch_size:
-            break
+        exercises.append(data)
 
     logger.info("Fetched %d exercises for quality scan", len(exercises))
     return exercises
 
 
+def needs_rescan(exercise: Dict[str, Any]) -> bool:
+    """True if an exercise was never scanned, scanned by an older scanner, or edited since."""
+    review_meta = exercise.get("review_metadata") or {}
+    if review_meta.get("scanner_version") != SCANNER_VERSION:
+        return True
+    last_scanned = get_stamp(review_meta, "last_scanned_at")
+    updated = get_stamp(exercise, "updated_at")
+    return last_scanned is None or (updated is not None and updated > last_scanned)
+
+
 def create_enrich_jobs_from_scan(
     results: List[QualityScanResult],
     exercises: List[Dict[str, Any]],
@@ -134,7 +126,7 @@ def create_enrich_jobs_from_scan(
     Both use Flash model via the enrichment worker — no Pro review needed.
     Deduplicates against pending jobs to avoid double-queuing.
     """
-    from app.jobs.queue import create_job, find_pending_jobs_batch
+    from app.jobs.queue import BulkCreateError, create_jobs_bulk, find_pending_jobs_batch, new_job_id
 
     # Build exercise lookup
     exercise_lookup: Dict[str, Dict[str, Any]] = {}
@@ -159,6 +151,7 @@ def create_enrich_jobs_from_scan(
     skipped_duplicate = 0
 
     jobs_created = []
+    specs: List[Dict[str, Any]] = []
     total_jobs = 0
 
     for result in enrichable:
@@ -181,32 +174,45 @@ def create_enrich_jobs_from_scan(
         }
 
         if not dry_run:
-            try:
-                job = create_job(
-                    job_type=JobType.CATALOG_ENRICH_FIELD,
-                    queue=JobQueue.MAINTENANCE,
-                    priority=40,
-                    mode="apply",
-                    exercise_doc_ids=[result.exercise_id],
-                    enrichment_spec={
-                        "type": "enrich_content",
-                        "source": "quality_scanner",
-                        "issue_type": result.issue_type,
-                        "quality_score": result.quality_score,
-                        "details": result.details,
-                    },
-                )
-                job_info["job_id"] = job.id
-                total_jobs += 1
-            except Exception as e:
-                logger.warning("Failed to create job for %s: %s", result.exercise_id, e)
-                job_info["error"] = str(e)
+            job_info["job_id"] = new_job_id()
+            specs.append({
+                "job_id": job_info["job_id"],
+                "job_type": JobType.CATALOG_ENRICH_FIELD,
+                "queue": JobQueue.MAINTENANCE,
+                "priority": 40,
+                "mode": "apply",
+                "exercise_doc_ids": [result.exercise_id],
+                "enrichment_spec": {
+                    "type": "enrich_content",
+                    "source": "quality_scanner",
+                    "issue_type": result.issue_type,
+                    "quality_score": result.quality_score,
+                    "details": result.details,
+                },
+            })
         else:
             job_info["job_id"] = f"dry-run-enrich-{result.exercise_id}"
-            total_jobs += 1
+        total_jobs += 1
 
         jobs_created.append(job_info)
 
+    if specs:
+        try:
+            create_jobs_bulk(specs)
+            failed, error = set(), ""
+        except BulkCreateError as e:
+            logger.warning("Failed to create %d of %d enrichment jobs: %s",
+                           len(e.failed_ids), len(specs), e.__cause__)
+            failed, error = set(e.failed_ids), str(e.__cause__)
+        except Exception as e:
+            logger.warning("Failed to create %d enrichment jobs: %s", len(specs), e)
+            failed, error = {spec["job_id"] for spec in specs}, str(e)
+        for job_info in jobs_created:
+            if job_info.get("job_id") in failed:
+                job_info["error"] = error
+                job_info.pop("job_id")
+        total_jobs -= len(failed)
+
     if skipped_duplicate:
         logger.info("Skipped %d exercises with pending enrichment jobs", skipped_duplicate)
 
@@ -225,10 +231,15 @@ def run_quality_scan(
     dry_run: bool = True,
     force_rescan: bool = False,
     create_jobs: bool = True,
+    changes_only: bool = False,
 ) -> Dict[str, Any]:
     """
     Run the Tier 1 quality scan.
 
+    With changes_only, scans only exercises edited since the last run (see
+    app/reviewer/change_feed.py). The first such run, or one with
+    force_rescan, is a full pass that starts the feed.
+
     Args:
         max_exercises: Maximum exercises to scan
         batch_size: Exercises per LLM batch
@@ -236,6 +247,7 @@ def run_quality_scan(
         dry_run: If True, don't save results or create jobs
         force_rescan: If True, rescan all exercises (ignore scanner_version)
         create_jobs: If True, create ENRICH jobs for missing_fields
+        changes_only: If True, scan only exercises changed since the last run
 
     Returns:
         Summary of scan results
@@ -248,10 +260,29 @@ def run_quality_scan(
 
     db = _get_firestore_client()
 
+    feed = ChangeFeed(CHANGE_FEED_CONSUMER, CHANGE_FEED_FIELDS, db) if changes_only and db else None
+    changed = feed.fetch() if feed and not force_rescan else None
+
     # Fetch exercises
-    exercises = fetch_exercises_for_scan(db, max_exercises, force_rescan)
+    if changed is None:
+        exercises = fetch_exercises_for_scan(db, max_exercises, force_rescan)
+    else:
+        exercises = [ex for ex in changed if needs_rescan(ex)][:max_exercises]
+
+    def advance_feed(failed_ids: Sequence[str] = ()) -> None:
+        # Exercises whose scan result write failed keep their old stamp, so
+        # the marks must not move past them
+        if not feed or dry_run:
+            return
+        if changed is not None:
+            failed = set(failed_ids)
+            feed.advance(changed, [i for i in _handled_ids(changed, exercises) if i not in failed])
+        elif len(exercises) < max_exercises and not failed_ids:
+            # Full pass covered the whole catalog; feed starts here
+            feed.reset(start_time)
 
     if not exercises:
+        advance_feed()
         logger.info("No exercises need scanning")
         return {
             "started_at": start_time.isoformat(),
@@ -269,6 +300,7 @@ def run_quality_scan(
 
     # Save results to Firestore
     save_result = save_scan_results(db, scan_result.results, dry_run=dry_run)
+    advance_feed(save_result["failed_ids"])
 
     # Create ENRICH jobs for enrichable exercises (missing_fields + content_style)
     job_result = {"total_jobs": 0, "dry_run": dry_run, "skipped_duplicate": 0, "jobs": []}
@@ -289,6 +321,7 @@ def run_quality_scan(
         "duration_seconds": duration_secs,
         "dry_run": dry_run,
         "scanner_version": SCANNER_VERSION,
+        "changes_only": changed is not None,
         "scan": {
             "total_scanned": scan_result.total_scanned,
             "heuristic_passed": scan_result.heuristic_passed,
@@ -323,6 +356,15 @@ def run_quality_scan(
     return summary
 
 
+def _handled_ids(changed: List[Dict[str, Any]], scanned: List[Dict[str, Any]]) -> List[str]:
+    """Changed docs this run scanned or found up to date (everything but capped-off rescans)."""
+    scanned_ids = {ex["doc_id"] for ex in scanned}
+    return [
+        ex["doc_id"] for ex in changed
+        if ex["doc_id"] in scanned_ids or not needs_rescan(ex)
+    ]
+
+
 def main():
     """CLI entrypoint for scheduled quality scan."""
     parser = argparse.ArgumentParser(description="Run Tier 1 quality scan")
@@ -354,6 +396,10 @@ def main():
         "--skip-jobs", action="store_true",
         help="Don't create ENRICH jobs"
     )
+    parser.add_argument(
+        "--changes-only", action="store_true",
+        help="Scan only exercises changed since the last run"
+    )
     parser.add_argument(
         "--verbose", "-v", action="store_true",
         help="Verbose logging"
@@ -377,6 +423,7 @@ def main():
         dry_run=dry_run,
         force_rescan=args.force_rescan,
         create_jobs=not args.skip_jobs,
+        changes_only=args.changes_only,
     )
 
     # Print summary
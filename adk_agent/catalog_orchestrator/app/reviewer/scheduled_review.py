@@ -30,12 +30,13 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import functools
 import json
 import logging
 import os
 import sys
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Set
 
 # Add parent to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -44,9 +45,12 @@ from app.reviewer.review_agent import (
     CatalogReviewAgent,
     BatchReviewResult,
     ExerciseDecision,
-    review_catalog,
+    review_catalog_stream,
 )
+from app.catalog_snapshot import fetch_exercises
+from app.firestore_client import get_firestore_client
 from app.jobs.models import JobType, JobQueue
+from app.reviewer.change_feed import ChangeFeed
 
 logger = logging.getLogger(__name__)
 
@@ -61,20 +65,24 @@ DEFAULT_MAX_JOBS = 500  # Create more jobs per run
 QUALITY_THRESHOLD = 0.9  # Exercises with quality_score >= this are skipped
 REVIEW_VERSION = "1.3"  # Bump when review logic changes significantly
 
+# Batches in flight in the streaming review pipeline (LLM concurrency within
+# that is set by the shared adaptive gate)
+REVIEW_MAX_IN_FLIGHT = int(os.getenv("REVIEW_MAX_IN_FLIGHT", "32"))
+
+# Change feed consumer (app/reviewer/change_feed.py). review_metadata.updated_at
+# picks up Tier 1 scan results; the backlog flags are always re-read.
+CHANGE_FEED_CONSUMER = "scheduled_review"
+CHANGE_FEED_FIELDS = ("updated_at", "review_metadata.updated_at")
+CHANGE_FEED_BACKLOG = (
+    ("review_metadata.needs_full_review", "==", True),
+    ("review_metadata.needs_retry", "==", True),
+)
+
 
 def _get_firestore_client():
     """Get Firestore client for catalog reads."""
     try:
-        from google.cloud import firestore
-        
-        # Check if using emulator - use demo project for emulator
-        emulator_host = os.environ.get("FIRESTORE_EMULATOR_HOST")
-        if emulator_host:
-            logger.info("Using Firestore emulator at %s", emulator_host)
-            return firestore.Client(project="demo-povver")
-        
-        # Production - use default ADC project
-        return firestore.Client()
+        return get_firestore_client()
     except Exception as e:
         logger.warning("Failed to get Firestore client: %s", e)
         return None
@@ -85,7 +93,7 @@ def fetch_all_exercises(
     max_exercises: int = 500,
 ) -> List[Dict[str, Any]]:
     """
-    Fetch exercises from Firestore.
+    Fetch exercises (ordered by name) via the local catalog snapshot.
     
     Args:
         db: Firestore client
@@ -97,31 +105,7 @@ def fetch_all_exercises(
     if not db:
         return []
     
-    exercises = []
-    last_doc = None
-    
-    while len(exercises) < max_exercises:
-        batch_size = min(500, max_exercises - len(exercises))
-        query = db.collection("exercises").order_by("name").limit(batch_size)
-        
-        if last_doc:
-            query = query.start_after(last_doc)
-        
-        docs = list(query.stream())
-        
-        if not docs:
-            break
-        
-        for doc in docs:
-            data = doc.to_dict()
-            data["id"] = doc.id
-            data["doc_id"] = doc.id
-            exercises.append(data)
-        
-        last_doc = docs[-1]
-        
-        if len(docs) < batch_size:
-            break
+    exercises = fetch_exercises(db, max_exercises)
     
     logger.info("Fetched %d exercises from Firestore", len(exercises))
     return exercises
@@ -219,7 +203,7 @@ def save_review_metadata(
     decisions: List[ExerciseDecision],
     dry_run: bool = True,
     retry_failed_ids: Optional[List[str]] = None,
-) -> Dict[str, int]:
+) -> Dict[str, Any]:
     """
     Save review metadata back to Firestore using batched writes.
 
@@ -240,16 +224,18 @@ def save_review_metadata(
         retry_failed_ids: Exercise IDs that failed batch retry
 
     Returns:
-        Summary of updates made
+        Summary of updates made (failed_ids lists the exercises whose batch
+        commit failed)
     """
     if not db:
         logger.warning("No Firestore client - cannot save review metadata")
-        return {"updated": 0, "errors": 0}
+        return {"updated": 0, "errors": 0, "failed_ids": []}
 
     retry_set = set(retry_failed_ids) if retry_failed_ids else set()
 
     updated = 0
     errors = 0
+    failed_ids: List[str] = []
     now = datetime.now(timezone.utc)
 
     # Firestore batch limit is 500 operations
@@ -269,6 +255,7 @@ def save_review_metadata(
         # Process in batches for efficiency
         batch = db.batch()
         batch_count = 0
+        batch_ids: List[str] = []
 
         for decision in decisions:
             if not decision.exercise_id:
@@ -283,11 +270,13 @@ def save_review_metadata(
                 "review_metadata.needs_review": decision.decision != "KEEP",
                 # Clear the needs_full_review flag since Pro has reviewed it
                 "review_metadata.needs_full_review": False,
+                "review_metadata.updated_at": now,
             }
 
             doc_ref = db.collection("exercises").document(decision.exercise_id)
             batch.update(doc_ref, review_metadata)
             batch_count += 1
+            batch_ids.append(decision.exercise_id)
             updated += 1
 
             # Commit batch when it reaches the limit
@@ -299,8 +288,10 @@ def save_review_metadata(
                     logger.warning("Batch commit failed: %s", e)
                     errors += batch_count
                     updated -= batch_count
+                    failed_ids.extend(batch_ids)
                 batch = db.batch()
                 batch_count = 0
+                batch_ids = []
 
         # Commit remaining
         if batch_count > 0:
@@ -311,6 +302,7 @@ def save_review_metadata(
                 logger.warning("Final batch commit failed: %s", e)
                 errors += batch_count
                 updated -= batch_count
+                failed_ids.extend(batch_ids)
 
         # Mark retry-failed exercises so the next review run picks them up
         if retry_set:
@@ -321,6 +313,7 @@ def save_review_metadata(
                 retry_batch.update(doc_ref, {
                     "review_metadata.needs_retry": True,
                     "review_metadata.needs_full_review": True,
+                    "review_metadata.updated_at": datetime.now(timezone.utc),
                 })
                 retry_count += 1
                 if retry_count >= 400:
@@ -346,7 +339,7 @@ def save_review_metadata(
         dry_run,
     )
 
-    return {"updated": updated, "errors": errors}
+    return {"updated": updated, "errors": errors, "failed_ids": failed_ids}
 
 
 def _find_active_exercise_by_name(db, name: str, exclude_id: str):
@@ -385,6 +378,9 @@ def create_jobs_from_decisions(
     """
     Create jobs from review agent decisions.
     
+    Jobs are collected while the decisions are walked and written together
+    with create_jobs_bulk.
+    
     Args:
         batch_results: List of BatchReviewResult from review agent
         exercises: Original exercise data (for lookup)
@@ -394,7 +390,7 @@ def create_jobs_from_decisions(
     Returns:
         Summary of jobs created
     """
-    from app.jobs.queue import create_job
+    from app.jobs.queue import BulkCreateError, create_jobs_bulk, new_job_id
     
     # Determine job mode based on dry_run flag
     job_mode = "dry_run" if dry_run else "apply"
@@ -414,6 +410,12 @@ def create_jobs_from_decisions(
         "add_exercise": [],
     }
     total_jobs = 0
+    specs: List[Dict[str, Any]] = []
+    
+    def queue_job(**spec: Any) -> str:
+        spec["job_id"] = new_job_id()
+        specs.append(spec)
+        return spec["job_id"]
     
     # Process all batch results
     for batch in batch_results:
@@ -440,7 +442,7 @@ def create_jobs_from_decisions(
             if not dry_run:
                 try:
                     if decision.decision == "ENRICH":
-                        job = create_job(
+                        job_id = queue_job(
                             job_type=JobType.CATALOG_ENRICH_FIELD,
                             queue=JobQueue.MAINTENANCE,
                             priority=50,
@@ -451,7 +453,7 @@ def create_jobs_from_decisions(
                                 "reason": decision.reasoning,
                             },
                         )
-                        job_info["job_id"] = job.id
+                        job_info["job_id"] = job_id
                         jobs_created["enrich"].append(job_info)
                         
                     elif decision.decision == "FIX_IDENTITY":
@@ -470,7 +472,7 @@ def create_jobs_from_decisions(
                                 "FIX_IDENTITY -> MERGE: '%s' already exists as %s",
                                 new_name, collision.id,
                             )
-                            job = create_job(
+                            job_id = queue_job(
                                 job_type=JobType.TARGETED_FIX,
                                 queue=JobQueue.PRIORITY,
                                 priority=60,
@@ -485,11 +487,11 @@ def create_jobs_from_decisions(
                                     ),
                                 },
                             )
-                            job_info["job_id"] = job.id
+                            job_info["job_id"] = job_id
                             jobs_created["merge"].append(job_info)
                         else:
                             # Normal FIX_IDENTITY -> TARGETED_FIX
-                            job = create_job(
+                            job_id = queue_job(
                                 job_type=JobType.TARGETED_FIX,
                                 queue=JobQueue.PRIORITY,
                                 priority=70,
@@ -502,11 +504,11 @@ def create_jobs_from_decisions(
                                     "reason": decision.reasoning,
                                 },
                             )
-                            job_info["job_id"] = job.id
+                            job_info["job_id"] = job_id
                             jobs_created["fixidentity"].append(job_info)
                         
                     elif decision.decision == "ARCHIVE":
-                        job = create_job(
+                        job_id = queue_job(
                             job_type=JobType.TARGETED_FIX,
                             queue=JobQueue.MAINTENANCE,
                             priority=30,
@@ -517,13 +519,13 @@ def create_jobs_from_decisions(
                                 "reason": decision.reasoning,
                             },
                         )
-                        job_info["job_id"] = job.id
+                        job_info["job_id"] = job_id
                         jobs_created["archive"].append(job_info)
                         
                     elif decision.decision == "MERGE":
                         # MERGE -> TARGETED_FIX with merge details
                         # Full FAMILY_MERGE is complex and needs manual review
-                        job = create_job(
+                        job_id = queue_job(
                             job_type=JobType.TARGETED_FIX,
                             queue=JobQueue.PRIORITY,
                             priority=60,
@@ -536,13 +538,13 @@ def create_jobs_from_decisions(
                                 "reason": decision.reasoning,
                             },
                         )
-                        job_info["job_id"] = job.id
+                        job_info["job_id"] = job_id
                         jobs_created["merge"].append(job_info)
                     
                     total_jobs += 1
                     
                 except Exception as e:
-                    logger.exception("Failed to create job for %s: %s", decision.exercise_id, e)
+                    logger.exception("Failed to prepare job for %s: %s", decision.exercise_id, e)
                     job_info["error"] = str(e)
             else:
                 # Dry-run: just record what would be created
@@ -569,6 +571,23 @@ def create_jobs_from_decisions(
                 len(batch.gaps),
             )
     
+    if specs:
+        try:
+            create_jobs_bulk(specs)
+            failed, error = set(), ""
+        except BulkCreateError as e:
+            logger.error("Failed to create %d of %d review jobs: %s", len(e.failed_ids), len(specs), e.__cause__)
+            failed, error = set(e.failed_ids), str(e.__cause__)
+        except Exception as e:
+            logger.exception("Failed to create %d review jobs: %s", len(specs), e)
+            failed, error = {spec["job_id"] for spec in specs}, str(e)
+        for infos in jobs_created.values():
+            for info in infos:
+                if info.get("job_id") in failed:
+                    info.pop("job_id")
+                    info["error"] = error
+        total_jobs -= len(failed)
+    
     return {
         "total_jobs": total_jobs,
         "dry_run": dry_run,
@@ -583,6 +602,154 @@ def create_jobs_from_decisions(
     }
 
 
+def run_review_pipeline(
+    db,
+    exercises: List[Dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    include_gap_analysis: bool = True,
+    dry_run: bool = True,
+    max_jobs: int = DEFAULT_MAX_JOBS,
+    max_in_flight: int = REVIEW_MAX_IN_FLIGHT,
+) -> Dict[str, Any]:
+    """
+    Review exercises and act on each batch as soon as it is reviewed.
+    
+    Streaming pipeline: review_catalog_stream keeps max_in_flight batches
+    in flight (the shared adaptive gate sets how many call the LLM at once), and each finished batch goes straight to job creation
+    and review metadata writes (blocking Firestore calls, run off the event
+    loop). Jobs reach the queue while later batches are still reviewing, and
+    batch results are dropped once counted instead of held until the end.
+    
+    Once max_jobs jobs exist the stream is closed: batches still in flight
+    are cancelled and the rest are not reviewed, since their decisions
+    could not become jobs. Their exercises are returned in unreviewed_ids
+    (they get no review metadata, so the next run picks them up).
+    
+    Args:
+        db: Firestore client
+        exercises: Exercises to review (already filtered)
+        batch_size: Exercises per LLM batch
+        include_gap_analysis: Whether to include gap suggestions
+        dry_run: If True, don't create jobs or write metadata
+        max_jobs: Maximum jobs to create across all batches
+        max_in_flight: Batches in flight at once
+        
+    Returns:
+        Dict with totals (decision counts), jobs (as create_jobs_from_decisions),
+        review_metadata (as save_review_metadata) and unreviewed_ids
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(_run_review_pipeline_async(
+            db, exercises, batch_size, include_gap_analysis, dry_run, max_jobs, max_in_flight,
+        ))
+    finally:
+        loop.close()
+
+
+async def _run_review_pipeline_async(
+    db,
+    exercises: List[Dict[str, Any]],
+    batch_size: int,
+    include_gap_analysis: bool,
+    dry_run: bool,
+    max_jobs: int,
+    max_in_flight: int,
+) -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    
+    totals = {
+        "batches": 0, "reviewed": 0, "keep": 0, "enrich": 0, "fix_identity": 0,
+        "archive": 0, "merge": 0, "gaps": 0, "duplicates": 0,
+    }
+    jobs: Dict[str, List[Dict[str, Any]]] = {
+        "enrich": [], "fixidentity": [], "archive": [], "merge": [], "add_exercise": [],
+    }
+    total_jobs = 0
+    metadata: Dict[str, Any] = {"updated": 0, "errors": 0, "failed_ids": []}
+    reviewed_ids: Set[str] = set()
+    unreviewed_ids: List[str] = []
+    
+    stream = review_catalog_stream(
+        exercises,
+        batch_size=batch_size,
+        max_in_flight=max_in_flight,
+        include_gap_analysis=include_gap_analysis,
+    )
+    try:
+        async for batch in stream:
+            totals["batches"] += 1
+            totals["reviewed"] += batch.exercises_reviewed
+            totals["keep"] += batch.keep_count
+            totals["enrich"] += batch.enrich_count
+            totals["fix_identity"] += batch.fix_count
+            totals["archive"] += batch.archive_count
+            totals["merge"] += batch.merge_count
+            totals["gaps"] += len(batch.gaps)
+            totals["duplicates"] += len(batch.duplicates)
+            reviewed_ids.update(d.exercise_id for d in batch.decisions)
+            reviewed_ids.update(batch.retry_failed_ids)
+            
+            batch_jobs = await loop.run_in_executor(None, functools.partial(
+                create_jobs_from_decisions,
+                [batch],
+                exercises=exercises,
+                dry_run=dry_run,
+                max_jobs=max_jobs - total_jobs,
+            ))
+            total_jobs += batch_jobs["total_jobs"]
+            for job_type, created in batch_jobs["jobs"].items():
+                jobs[job_type].extend(created)
+            
+            # V1.3: Save review metadata back to Firestore (quality scores, timestamps)
+            batch_metadata = await loop.run_in_executor(None, functools.partial(
+                save_review_metadata,
+                db,
+                batch.decisions,
+                dry_run=dry_run,
+                retry_failed_ids=batch.retry_failed_ids,
+            ))
+            metadata["updated"] += batch_metadata["updated"]
+            metadata["errors"] += batch_metadata["errors"]
+            metadata["failed_ids"].extend(batch_metadata["failed_ids"])
+            
+            logger.info(
+                "Batch %d done: %d reviewed, %d jobs (%d total)",
+                totals["batches"], batch.exercises_reviewed, batch_jobs["total_jobs"], total_jobs,
+            )
+            
+            if total_jobs >= max_jobs:
+                unreviewed_ids = [
+                    ex_id for ex_id in (ex.get("id") or ex.get("doc_id", "") for ex in exercises)
+                    if ex_id and ex_id not in reviewed_ids
+                ]
+                if unreviewed_ids:
+                    logger.info("max_jobs=%d reached, leaving %d exercises unreviewed",
+                                max_jobs, len(unreviewed_ids))
+                break
+    finally:
+        # Cancels the batches still in flight
+        await stream.aclose()
+    
+    return {
+        "totals": totals,
+        "jobs": {
+            "total_jobs": total_jobs,
+            "dry_run": dry_run,
+            "jobs": jobs,
+            "by_type": {
+                "enrich": len(jobs["enrich"]),
+                "fix_identity": len(jobs["fixidentity"]),
+                "archive": len(jobs["archive"]),
+                "merge": len(jobs["merge"]),
+                "add_exercise": len(jobs["add_exercise"]),
+            },
+        },
+        "review_metadata": metadata,
+        "unreviewed_ids": unreviewed_ids,
+    }
+
+
 def run_scheduled_review(
     max_exercises: int = DEFAULT_MAX_EXERCISES,
     batch_size: int = DEFAULT_BATCH_SIZE,
@@ -591,10 +758,15 @@ def run_scheduled_review(
     run_gap_analysis: bool = True,
     enable_llm_review: bool = True,  # Now True by default since we're LLM-first
     force_review: bool = False,  # V1.3: Force review all, ignoring quality filter
+    changes_only: bool = False,
 ) -> Dict[str, Any]:
     """
     Run a scheduled catalog review using the unified LLM review agent.
 
+    With changes_only, reads only exercises changed or flagged since the
+    last run (see app/reviewer/change_feed.py) instead of the catalog. The
+    first such run, or one with force_review, is a full pass.
+
     Args:
         max_exercises: Maximum exercises to review
         batch_size: Exercises per LLM batch
@@ -603,6 +775,7 @@ def run_scheduled_review(
         run_gap_analysis: If True, include gap suggestions in review
         enable_llm_review: Must be True for unified agent
         force_review: If True, review all exercises (ignore quality filter)
+        changes_only: If True, review only exercises changed since the last run
 
     Returns:
         Summary of review and jobs created
@@ -615,8 +788,11 @@ def run_scheduled_review(
 
     db = _get_firestore_client()
 
-    # Fetch all exercises
-    all_exercises = fetch_all_exercises(db, max_exercises)
+    feed = ChangeFeed(CHANGE_FEED_CONSUMER, CHANGE_FEED_FIELDS, db) if changes_only and db else None
+    changed = feed.fetch(CHANGE_FEED_BACKLOG) if feed and not force_review else None
+
+    # Fetch all exercises (or only the changed ones)
+    all_exercises = fetch_all_exercises(db, max_exercises) if changed is None else changed
 
     # V1.3: Filter to only exercises that need review (cost optimization)
     exercises = filter_exercises_for_review(
@@ -624,8 +800,25 @@ def run_scheduled_review(
         quality_threshold=QUALITY_THRESHOLD,
         force_review=force_review,
     )
-    
+    deferred_ids: set = set()
+    if changed is not None and len(exercises) > max_exercises:
+        deferred_ids = {ex["doc_id"] for ex in exercises[max_exercises:]}
+        exercises = exercises[:max_exercises]
+
+    def advance_feed(failed_ids: Sequence[str] = ()) -> None:
+        # Exercises whose metadata write failed keep their old stamp, so
+        # the marks must not move past them
+        if not feed or dry_run:
+            return
+        if changed is not None:
+            held = deferred_ids | set(failed_ids)
+            feed.advance(changed, [ex["doc_id"] for ex in changed if ex["doc_id"] not in held])
+        elif len(all_exercises) < max_exercises and not failed_ids:
+            # Full pass covered the whole catalog; feed starts here
+            feed.reset(start_time)
+
     if not exercises:
+        advance_feed()
         logger.warning("No exercises found to review")
         return {
             "started_at": start_time.isoformat(),
@@ -636,47 +829,33 @@ def run_scheduled_review(
             "jobs": {"total_created": 0},
         }
     
-    # Run unified review agent
-    batch_results = review_catalog(
-        exercises=exercises,
+    # Review, create jobs and save review metadata batch by batch
+    pipeline = run_review_pipeline(
+        db,
+        exercises,
         batch_size=batch_size,
         include_gap_analysis=run_gap_analysis,
+        dry_run=dry_run,
+        max_jobs=max_jobs,
     )
-    
-    # Aggregate results
-    total_reviewed = sum(r.exercises_reviewed for r in batch_results)
-    total_keep = sum(r.keep_count for r in batch_results)
-    total_enrich = sum(r.enrich_count for r in batch_results)
-    total_fix = sum(r.fix_count for r in batch_results)
-    total_archive = sum(r.archive_count for r in batch_results)
-    total_merge = sum(r.merge_count for r in batch_results)
-    total_gaps = sum(len(r.gaps) for r in batch_results)
-    total_duplicates = sum(len(r.duplicates) for r in batch_results)
+    totals = pipeline["totals"]
+    job_result = pipeline["jobs"]
+    metadata_result = pipeline["review_metadata"]
+    total_reviewed = totals["reviewed"]
+    total_keep = totals["keep"]
+    total_enrich = totals["enrich"]
+    total_fix = totals["fix_identity"]
+    total_archive = totals["archive"]
+    total_merge = totals["merge"]
+    total_gaps = totals["gaps"]
+    total_duplicates = totals["duplicates"]
     
     logger.info(
         "Review complete: %d exercises | KEEP=%d ENRICH=%d FIX=%d ARCHIVE=%d MERGE=%d | %d gaps",
         total_reviewed, total_keep, total_enrich, total_fix, total_archive, total_merge, total_gaps
     )
-    
-    # Create jobs from decisions
-    job_result = create_jobs_from_decisions(
-        batch_results,
-        exercises=exercises,
-        dry_run=dry_run,
-        max_jobs=max_jobs,
-    )
-
-    # V1.3: Save review metadata back to Firestore (quality scores, timestamps)
-    all_decisions = []
-    retry_failed_ids = []
-    for batch in batch_results:
-        all_decisions.extend(batch.decisions)
-        retry_failed_ids.extend(batch.retry_failed_ids)
-
-    metadata_result = save_review_metadata(
-        db, all_decisions, dry_run=dry_run,
-        retry_failed_ids=retry_failed_ids,
-    )
+    # Exercises left unreviewed at max_jobs are held like failed writes
+    advance_feed(metadata_result["failed_ids"] + pipeline["unreviewed_ids"])
 
     end_time = datetime.now(timezone.utc)
     duration_secs = (end_time - start_time).total_seconds()
@@ -687,10 +866,12 @@ def run_scheduled_review(
         "duration_seconds": duration_secs,
         "dry_run": dry_run,
         "review_version": REVIEW_VERSION,
+        "changes_only": changed is not None,
         "review": {
             "total_fetched": len(all_exercises),
             "total_reviewed": total_reviewed,
             "skipped_high_quality": len(all_exercises) - len(exercises),
+            "not_reviewed_max_jobs": len(pipeline["unreviewed_ids"]),
             "decisions": {
                 "keep": total_keep,
                 "enrich": total_enrich,
@@ -753,6 +934,10 @@ def main():
         "--force-review", action="store_true",
         help="Force review all exercises (ignore quality-based filtering)"
     )
+    parser.add_argument(
+        "--changes-only", action="store_true",
+        help="Review only exercises changed or flagged since the last run"
+    )
     parser.add_argument(
         "--verbose", "-v", action="store_true",
         help="Verbose logging"
@@ -776,6 +961,7 @@ def main():
         dry_run=dry_run,
         run_gap_analysis=not args.skip_gap_analysis,
         force_review=args.force_review,
+        changes_only=args.changes_only,
     )
     
     # Print summary
@@ -17,18 +17,14 @@ from typing import Any, Dict, List, Optional
 
 from google.cloud import firestore
 
-logger = logging.getLogger(__name__)
+from app.firestore_client import get_firestore_client
 
-# Initialize Firestore client lazily
-_db: Optional[firestore.Client] = None
+logger = logging.getLogger(__name__)
 
 
 def _get_db() -> firestore.Client:
-    """Get or initialize Firestore client."""
-    global _db
-    if _db is None:
-        _db = firestore.Client()
-    return _db
+    """Get the shared Firestore client."""
+    return get_firestore_client()
 
 
 async def get_family_summary(family_slug: str) -> Dict[str, Any]:
@@ -132,9 +128,8 @@ async def get_family_aliases(family_slug: str) -> Dict[str, Any]:
     logger.info("get_family_aliases: family=%s", family_slug)
     
     try:
-        from app.family.registry import get_family_exercises
+        from app.family.registry import get_family_aliases, get_family_exercises
         
-        db = _get_db()
         exercises = get_family_exercises(family_slug)
         
         if not exercises:
@@ -148,31 +143,15 @@ async def get_family_aliases(family_slug: str) -> Dict[str, Any]:
         # Get doc_ids
         doc_ids = [ex.doc_id for ex in exercises]
         
-        # Query aliases that point to these exercises
+        # Aliases that point to these exercises, plus family-level aliases
         aliases = []
         exercise_aliases: Dict[str, List[str]] = {doc_id: [] for doc_id in doc_ids}
         
-        # Query by exercise_id
-        for doc_id in doc_ids:
-            query = (
-                db.collection("exercise_aliases")
-                .where("exercise_id", "==", doc_id)
-            )
-            for doc in query.stream():
-                alias_data = doc.to_dict()
-                alias_data["alias_slug"] = doc.id
-                aliases.append(alias_data)
-                exercise_aliases[doc_id].append(doc.id)
-        
-        # Also query by family_slug
-        query = (
-            db.collection("exercise_aliases")
-            .where("family_slug", "==", family_slug)
-        )
-        for doc in query.stream():
-            alias_data = doc.to_dict()
-            alias_data["alias_slug"] = doc.id
-            alias_data["is_family_alias"] = True
+        for alias_slug, alias_data in get_family_aliases(family_slug, doc_ids).items():
+            if alias_data.get("exercise_id") in exercise_aliases:
+                exercise_aliases[alias_data["exercise_id"]].append(alias_slug)
+            else:
+                alias_data["is_family_alias"] = True
             aliases.append(alias_data)
         
         return {
@@ -239,7 +218,10 @@ async def list_families_summary(
     """
     List families with summary stats.
     
-    Groups exercises by family_slug and returns summaries.
+    Reads the maintained catalog_family_counts collection (see
+    app.family.counts). Until `cli.py rebuild-family-counts` has built it
+    (written its marker), falls back to grouping a full exercises scan
+    client-side.
     
     Args:
         min_size: Minimum exercises per family
@@ -249,23 +231,20 @@ async def list_families_summary(
     Returns:
         Dict with families list and total count
     """
+    from app.family.counts import family_counts_built, read_family_counts, scan_family_counts
+    
     logger.info("list_families_summary: min_size=%d, limit=%d", min_size, limit)
     
     try:
         db = _get_db()
         
-        # Get distinct family_slugs with counts
-        # Note: Firestore doesn't support GROUP BY, so we do this client-side
-        # For production, consider a Cloud Function or aggregation
-        
-        query = db.collection("exercises").select(["family_slug"])
-        
-        family_counts: Dict[str, int] = {}
-        for doc in query.stream():
-            data = doc.to_dict()
-            slug = data.get("family_slug", "")
-            if slug:
-                family_counts[slug] = family_counts.get(slug, 0) + 1
+        if family_counts_built(db):
+            family_counts = read_family_counts(db)
+        else:
+            logger.warning("catalog_family_counts not built, scanning exercises "
+                           "(run `cli.py rebuild-family-counts --apply`)")
+            family_counts = scan_family_counts(db)
+        family_counts = {slug: count for slug, count in family_counts.items() if count > 0}
         
         # Filter by min_size
         families = [
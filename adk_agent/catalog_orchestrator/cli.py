@@ -21,13 +21,14 @@ from __future__ import annotations
 import json
 import os
 import sys
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 # Add parent to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import click
 
+from app.firestore_client import get_firestore_client
 from app.jobs.queue import create_job
 from app.jobs.models import JobType, JobQueue
 
@@ -413,9 +414,7 @@ def job_status(job_id: str):
     Example:
         python cli.py job-status job-abc123def456
     """
-    from google.cloud import firestore
-    
-    db = firestore.Client()
+    db = get_firestore_client()
     doc = db.collection("catalog_jobs").document(job_id).get()
     
     if not doc.exists:
@@ -447,6 +446,43 @@ def job_status(job_id: str):
     
     if data.get("error"):
         click.echo(click.style(f"  Error:   {json.dumps(data['error'], indent=2)}", fg="red"))
+    
+    if data.get("children_total"):
+        from app.jobs.progress import get_job_progress
+        
+        progress = get_job_progress(job_id, db)
+        if progress:
+            _echo_job_progress(progress)
+
+
+def _format_secs(secs: Optional[int]) -> str:
+    if secs is None:
+        return "-"
+    hours, rest = divmod(int(secs), 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def _echo_job_progress(progress: Dict[str, Any]) -> None:
+    """Print a fan-out parent's catalog_job_progress summary."""
+    click.echo("  Shards:")
+    click.echo(
+        f"    Done:      {progress['children_done']}/{progress['children_total']} "
+        f"({progress['percent']}%), {progress['children_failed']} failed"
+    )
+    click.echo(
+        f"    Exercises: {progress.get('succeeded', 0)} enriched, "
+        f"{progress.get('no_changes', 0)} unchanged, {progress.get('failed', 0)} failed "
+        f"of {progress.get('exercises_total', 0)}"
+    )
+    click.echo(f"    Tokens:    ~{progress.get('tokens_used', 0):,}")
+    if progress["complete"]:
+        click.echo(f"    Elapsed:   {_format_secs(progress['elapsed_secs'])} (complete)")
+    else:
+        click.echo(
+            f"    Elapsed:   {_format_secs(progress['elapsed_secs'])}, "
+            f"ETA {_format_secs(progress['eta_secs'])}"
+        )
 
 
 # =============================================================================
@@ -463,7 +499,7 @@ def list_jobs(status: Optional[str], job_type: Optional[str], limit: int):
     """List catalog jobs with optional filters."""
     from google.cloud import firestore
     
-    db = firestore.Client()
+    db = get_firestore_client()
     query = db.collection("catalog_jobs").order_by("created_at", direction=firestore.Query.DESCENDING)
     
     if status:
@@ -657,7 +693,7 @@ def list_changes(job_id: Optional[str], limit: int):
     """
     from google.cloud import firestore
     
-    db = firestore.Client()
+    db = get_firestore_client()
     query = db.collection("catalog_changes").order_by(
         "completed_at", direction=firestore.Query.DESCENDING
     )
@@ -714,10 +750,9 @@ def change_details(change_id: str):
     Example:
         python cli.py change-details job-abc123_12345678
     """
-    from google.cloud import firestore
     import json
     
-    db = firestore.Client()
+    db = get_firestore_client()
     doc = db.collection("catalog_changes").document(change_id).get()
     
     if not doc.exists:
@@ -759,6 +794,7 @@ def change_details(change_id: str):
 @click.option("--dry-run/--apply", default=True, help="Dry-run mode (default: True)")
 @click.option("--skip-gap-analysis", is_flag=True, help="Skip equipment gap analysis")
 @click.option("--force-review", is_flag=True, help="Force review all exercises (ignore quality filter)")
+@click.option("--changes-only", is_flag=True, help="Review only exercises changed since the last run")
 @click.option("--verbose", "-v", is_flag=True, help="Verbose output")
 def run_review_cmd(
     max_exercises: int,
@@ -767,6 +803,7 @@ def run_review_cmd(
     dry_run: bool,
     skip_gap_analysis: bool,
     force_review: bool,
+    changes_only: bool,
     verbose: bool,
 ):
     """
@@ -785,6 +822,7 @@ def run_review_cmd(
         python cli.py run-review                    # Dry-run review
         python cli.py run-review --apply            # Create jobs
         python cli.py run-review --max-exercises 50 --batch-size 10 -v
+        python cli.py run-review --apply --changes-only  # Only what changed
     """
     import logging
     
@@ -803,6 +841,7 @@ def run_review_cmd(
     click.echo(f"  Dry-run:         {dry_run}")
     click.echo(f"  Gap analysis:    {not skip_gap_analysis}")
     click.echo(f"  Force review:    {force_review}")
+    click.echo(f"  Changes only:    {changes_only}")
     click.echo()
 
     summary = run_scheduled_review(
@@ -812,6 +851,7 @@ def run_review_cmd(
         dry_run=dry_run,
         run_gap_analysis=not skip_gap_analysis,
         force_review=force_review,
+        changes_only=changes_only,
     )
     
     click.echo("\n" + "=" * 60)
@@ -925,19 +965,11 @@ def backup_catalog_cmd(target: str, incremental: bool):
 
 @cli.command("queue-stats")
 def queue_stats():
-    """Show job queue statistics."""
-    from google.cloud import firestore
-    
-    db = firestore.Client()
+    """Show job queue statistics (server-side counts, no job documents read)."""
+    from app.jobs.queue import count_jobs_by_status
     
     # Count by status
-    status_counts = {}
-    for status in ["queued", "leased", "running", "succeeded", "succeeded_dry_run", 
-                   "failed", "needs_review", "deadletter"]:
-        query = db.collection("catalog_jobs").where("status", "==", status)
-        count = len(list(query.limit(1000).stream()))
-        if count > 0:
-            status_counts[status] = count
+    status_counts = {status: count for status, count in count_jobs_by_status().items() if count > 0}
     
     click.echo("Job Queue Stats")
     click.echo("===============")
@@ -1160,6 +1192,7 @@ def normalize_catalog_cmd(dry_run: bool, field: Optional[str], verbose: bool):
         python cli.py normalize-catalog --field execution_notes --dry-run -v
     """
     import logging
+    from datetime import datetime
 
     log_level = logging.DEBUG if verbose else logging.INFO
     logging.basicConfig(
@@ -1167,7 +1200,6 @@ def normalize_catalog_cmd(dry_run: bool, field: Optional[str], verbose: bool):
         format="%(asctime)s - %(levelname)s - %(message)s"
     )
 
-    from google.cloud import firestore
     from app.enrichment.engine import (
         _normalize_content_array,
         _normalize_equipment,
@@ -1179,7 +1211,7 @@ def normalize_catalog_cmd(dry_run: bool, field: Optional[str], verbose: bool):
         _normalize_category,
     )
 
-    db = firestore.Client()
+    db = get_firestore_client()
 
     click.echo(f"Fetching all exercises from Firestore...")
     exercises = list(db.collection("exercises").stream())
@@ -1312,7 +1344,7 @@ def normalize_catalog_cmd(dry_run: bool, field: Optional[str], verbose: bool):
 
             if not dry_run:
                 doc_ref = db.collection("exercises").document(doc.id)
-                batch.update(doc_ref, updates)
+                batch.update(doc_ref, {**updates, "updated_at": datetime.utcnow()})
                 batch_count += 1
 
                 # Commit every 400 operations
@@ -1370,6 +1402,9 @@ def dedup_catalog_cmd(dry_run: bool, verbose: bool):
     """
     import logging
     from collections import defaultdict
+    from datetime import datetime
+
+    from app.catalog_snapshot import fetch_exercises
 
     log_level = logging.DEBUG if verbose else logging.INFO
     logging.basicConfig(
@@ -1377,24 +1412,21 @@ def dedup_catalog_cmd(dry_run: bool, verbose: bool):
         format="%(asctime)s - %(levelname)s - %(message)s",
     )
 
-    from google.cloud import firestore
-
-    db = firestore.Client()
+    db = get_firestore_client()
 
     click.echo("Fetching exercises from Firestore...")
-    all_docs = list(db.collection("exercises").stream())
-    click.echo(f"  Found {len(all_docs)} exercises")
+    all_exercises = fetch_exercises(db)
+    click.echo(f"  Found {len(all_exercises)} exercises")
 
     # Group by normalized name, excluding merged/deprecated
     groups = defaultdict(list)
-    for doc in all_docs:
-        data = doc.to_dict()
+    for data in all_exercises:
         status = data.get("status", "approved")
         if status in ("merged", "deprecated"):
             continue
         name = (data.get("name") or "").strip().lower()
         if name:
-            groups[name].append((doc.id, data))
+            groups[name].append((data["doc_id"], data))
 
     # Filter to groups with 2+ exercises
     dup_groups = {name: members for name, members in groups.items()
@@ -1473,6 +1505,7 @@ def dedup_catalog_cmd(dry_run: bool, verbose: bool):
                 batch.update(doc_ref, {
                     "status": "merged",
                     "merged_into": canonical_id,
+                    "updated_at": datetime.utcnow(),
                 })
                 batch_count += 1
 
@@ -1488,8 +1521,8 @@ def dedup_catalog_cmd(dry_run: bool, verbose: bool):
         click.echo(f"  Committed final batch of {batch_count} merges")
 
     active_remaining = sum(
-        1 for doc in all_docs
-        if (doc.to_dict().get("status", "approved") not in ("merged", "deprecated"))
+        1 for data in all_exercises
+        if (data.get("status", "approved") not in ("merged", "deprecated"))
     ) - total_merged
 
     click.echo(f"\n{'=' * 50}")
@@ -1513,5 +1546,146 @@ def dedup_catalog_cmd(dry_run: bool, verbose: bool):
         ))
 
 
+# =============================================================================
+# CATALOG SNAPSHOT
+# =============================================================================
+
+@cli.command("catalog-snapshot")
+@click.option("--full", is_flag=True, help="Re-export the whole catalog")
+def catalog_snapshot_cmd(full: bool):
+    """
+    Refresh the local catalog snapshot used by full-catalog scans.
+
+    Incremental by default (only exercises stamped since the last refresh).
+
+    Examples:
+        python cli.py catalog-snapshot          # Incremental refresh
+        python cli.py catalog-snapshot --full   # Full re-export
+    """
+    from app.catalog_snapshot import CatalogSnapshot
+
+    snapshot = CatalogSnapshot(db=get_firestore_client())
+    result = snapshot.refresh(full=full)
+
+    click.echo(f"Snapshot: {snapshot.path}")
+    click.echo(f"  Refresh: {'full' if result.full else 'incremental'}")
+    click.echo(f"  Fetched: {result.fetched} ({len(result.changed)} changed)")
+    click.echo(f"  Exercises: {len(snapshot)}")
+    click.echo(f"  High-water mark: {snapshot.high_water}")
+    click.echo(f"  Duration: {result.duration_ms}ms")
+
+
+# =============================================================================
+# FAMILY COUNTS
+# =============================================================================
+
+@cli.command("rebuild-family-counts")
+@click.option("--dry-run/--apply", default=True, help="Dry-run mode (default: True)")
+@click.option("--verbose", "-v", is_flag=True, help="Show every changed family")
+def rebuild_family_counts_cmd(dry_run: bool, verbose: bool):
+    """
+    Recompute catalog_family_counts from the exercises collection.
+
+    ApplyEngine keeps the counts up to date incrementally; run this once to
+    build them, and after bulk edits made outside ApplyEngine.
+
+    Examples:
+        python cli.py rebuild-family-counts          # Show drift
+        python cli.py rebuild-family-counts --apply  # Rewrite counts
+    """
+    from app.family.counts import rebuild_family_counts
+
+    click.echo("Scanning exercises...")
+    result = rebuild_family_counts(get_firestore_client(), dry_run=dry_run)
+    changed = result["changed"]
+
+    click.echo(f"  Families: {result['families']}")
+    click.echo(f"  Exercises: {result['exercises']}")
+    click.echo(f"  Counts changed: {len(changed)}")
+
+    if verbose:
+        for slug, (old, new) in sorted(changed.items()):
+            click.echo(f"    {slug}: {'-' if old is None else old} -> {new}")
+
+    if dry_run:
+        click.echo(click.style("\nDry-run mode: No changes applied", fg="yellow"))
+        if changed:
+            click.echo("  Run with --apply to rewrite counts")
+    else:
+        click.echo(click.style(f"\nRewrote {len(changed)} family counts", fg="green"))
+
+
+
+# =============================================================================
+# JOB TARGETS
+# =============================================================================
+
+@cli.command("rebuild-job-targets")
+@click.option("--dry-run/--apply", default=True, help="Dry-run mode (default: True)")
+def rebuild_job_targets_cmd(dry_run: bool):
+    """
+    Rebuild the pending-job index (catalog_job_targets) from queued jobs.
+
+    The queue keeps the index up to date; run this once to build it, and
+    after editing jobs outside app/jobs/queue.py. Dedup queries the pending
+    jobs instead until --apply has written the built marker.
+
+    Examples:
+        python cli.py rebuild-job-targets          # Show drift
+        python cli.py rebuild-job-targets --apply  # Rewrite the index
+    """
+    from app.jobs.targets import rebuild_job_targets
+
+    click.echo("Scanning pending jobs...")
+    result = rebuild_job_targets(get_firestore_client(), dry_run=dry_run)
+
+    click.echo(f"  Pending jobs: {result['pending_jobs']}")
+    click.echo(f"  Targets: {result['targets']}")
+    click.echo(f"  Entries to write: {result['written']}")
+    click.echo(f"  Stale entries: {result['deleted']}")
+
+    if dry_run:
+        click.echo(click.style("\nDry-run mode: No changes applied", fg="yellow"))
+        if result["written"] or result["deleted"]:
+            click.echo("  Run with --apply to rewrite the index")
+    else:
+        click.echo(click.style(
+            f"\nWrote {result['written']} entries, deleted {result['deleted']}", fg="green",
+        ))
+
+
+# =============================================================================
+# JOB PROGRESS
+# =============================================================================
+
+@cli.command("rebuild-job-progress")
+@click.argument("job_id")
+@click.option("--dry-run/--apply", default=True, help="Dry-run mode (default: True)")
+def rebuild_job_progress_cmd(job_id: str, dry_run: bool):
+    """
+    Recompute a fan-out parent's progress (catalog_job_progress) from its shards.
+
+    Shard completions keep the document up to date; run this for parents
+    fanned out before it existed, or after editing shard jobs by hand.
+
+    Examples:
+        python cli.py rebuild-job-progress job-abc123def456
+        python cli.py rebuild-job-progress job-abc123def456 --apply
+    """
+    from app.jobs.progress import rebuild_job_progress, summarize_progress
+
+    click.echo(f"Scanning shards of {job_id}...")
+    result = rebuild_job_progress(job_id, get_firestore_client(), dry_run=dry_run)
+    if not result["children_total"]:
+        click.echo(click.style(f"✗ No shard jobs found for {job_id}", fg="red"), err=True)
+        sys.exit(1)
+    _echo_job_progress(summarize_progress(result))
+
+    if dry_run:
+        click.echo(click.style("\nDry-run mode: No changes applied", fg="yellow"))
+    else:
+        click.echo(click.style("\nProgress document rewritten", fg="green"))
+
+
 if __name__ == "__main__":
     cli()
@@ -72,30 +72,10 @@ def get_firestore_client():
 
 
 def fetch_all_exercises(db, max_exercises: int = 2000) -> List[Dict[str, Any]]:
-    """Fetch all exercises from Firestore."""
-    exercises = []
-    last_doc = None
+    """Fetch all exercises via the local catalog snapshot."""
+    from app.catalog_snapshot import fetch_exercises
 
-    while len(exercises) < max_exercises:
-        batch_size = min(500, max_exercises - len(exercises))
-        query = db.collection("exercises").order_by("name").limit(batch_size)
-
-        if last_doc:
-            query = query.start_after(last_doc)
-
-        docs = list(query.stream())
-        if not docs:
-            break
-
-        for doc in docs:
-            data = doc.to_dict()
-            data["id"] = doc.id
-            data["doc_id"] = doc.id
-            exercises.append(data)
-
-        last_doc = docs[-1]
-        if len(docs) < batch_size:
-            break
+    exercises = fetch_exercises(db, max_exercises)
 
     logger.info("Fetched %d exercises", len(exercises))
     return exercises
@@ -171,7 +151,7 @@ def queue_schema_cleanup_jobs(
     """
     Queue SCHEMA_CLEANUP jobs for exercises with legacy fields.
     """
-    from app.jobs.queue import create_job
+    from app.jobs.queue import BulkCreateError, create_jobs_bulk
     from app.jobs.models import JobType, JobQueue
 
     if not exercises_with_legacy:
@@ -179,37 +159,41 @@ def queue_schema_cleanup_jobs(
         return {"jobs_created": 0, "exercises": 0}
 
     exercise_ids = list(exercises_with_legacy.keys())
+    batches = [exercise_ids[i:i + batch_size] for i in range(0, len(exercise_ids), batch_size)]
     jobs_created = 0
 
-    # Create jobs in batches
-    for i in range(0, len(exercise_ids), batch_size):
-        batch_ids = exercise_ids[i:i + batch_size]
-
-        if dry_run:
+    if dry_run:
+        for batch_ids in batches:
             logger.info(
                 "Would create SCHEMA_CLEANUP job for %d exercises: %s...",
                 len(batch_ids),
                 batch_ids[:3],
             )
-            jobs_created += 1
-        else:
-            try:
-                job = create_job(
-                    job_type=JobType.SCHEMA_CLEANUP,
-                    queue=JobQueue.MAINTENANCE,
-                    priority=60,
-                    mode="apply",
-                    exercise_doc_ids=batch_ids,
-                    enrichment_spec={
+        jobs_created = len(batches)
+    else:
+        try:
+            job_ids = create_jobs_bulk([
+                {
+                    "job_type": JobType.SCHEMA_CLEANUP,
+                    "queue": JobQueue.MAINTENANCE,
+                    "priority": 60,
+                    "mode": "apply",
+                    "exercise_doc_ids": batch_ids,
+                    "enrichment_spec": {
                         "type": "schema_cleanup",
                         "legacy_fields": list(LEGACY_FIELDS),
                         "source": "batch_enrich_catalog",
                     },
-                )
-                logger.info("Created SCHEMA_CLEANUP job %s for %d exercises", job.id, len(batch_ids))
-                jobs_created += 1
-            except Exception as e:
-                logger.error("Failed to create SCHEMA_CLEANUP job: %s", e)
+                }
+                for batch_ids in batches
+            ])
+            logger.info("Created %d SCHEMA_CLEANUP jobs for %d exercises", len(job_ids), len(exercise_ids))
+            jobs_created = len(job_ids)
+        except BulkCreateError as e:
+            logger.error("Failed to create %d SCHEMA_CLEANUP jobs: %s", len(e.failed_ids), e.__cause__)
+            jobs_created = len(e.created_ids)
+        except Exception as e:
+            logger.error("Failed to create SCHEMA_CLEANUP jobs: %s", e)
 
     return {
         "jobs_created": jobs_created,
@@ -227,7 +211,7 @@ def queue_enrichment_jobs(
     """
     Queue CATALOG_ENRICH_FIELD jobs for holistic enrichment.
     """
-    from app.jobs.queue import create_job
+    from app.jobs.queue import BulkCreateError, create_jobs_bulk
     from app.jobs.models import JobType, JobQueue
 
     if not exercises_needing_enrichment:
@@ -235,43 +219,47 @@ def queue_enrichment_jobs(
         return {"jobs_created": 0, "exercises": 0}
 
     exercise_ids = list(exercises_needing_enrichment.keys())
+    batches = [exercise_ids[i:i + batch_size] for i in range(0, len(exercise_ids), batch_size)]
     jobs_created = 0
     model_name = "gemini-2.5-pro" if use_pro_model else "gemini-2.5-flash"
 
-    # Create jobs in batches
-    for i in range(0, len(exercise_ids), batch_size):
-        batch_ids = exercise_ids[i:i + batch_size]
-
-        if dry_run:
+    if dry_run:
+        for batch_ids in batches:
             logger.info(
                 "Would create CATALOG_ENRICH_FIELD job (%s) for %d exercises: %s...",
                 model_name,
                 len(batch_ids),
                 batch_ids[:3],
             )
-            jobs_created += 1
-        else:
-            try:
-                job = create_job(
-                    job_type=JobType.CATALOG_ENRICH_FIELD,
-                    queue=JobQueue.MAINTENANCE,
-                    priority=40,
-                    mode="apply",
-                    exercise_doc_ids=batch_ids,
-                    enrichment_spec={
+        jobs_created = len(batches)
+    else:
+        try:
+            job_ids = create_jobs_bulk([
+                {
+                    "job_type": JobType.CATALOG_ENRICH_FIELD,
+                    "queue": JobQueue.MAINTENANCE,
+                    "priority": 40,
+                    "mode": "apply",
+                    "exercise_doc_ids": batch_ids,
+                    "enrichment_spec": {
                         "type": "holistic",
                         "use_pro_model": use_pro_model,
                         "source": "batch_enrich_catalog",
                         "fields_to_enrich": list(ENRICHABLE_FIELDS),
                     },
-                )
-                logger.info(
-                    "Created CATALOG_ENRICH_FIELD job %s (%s) for %d exercises",
-                    job.id, model_name, len(batch_ids),
-                )
-                jobs_created += 1
-            except Exception as e:
-                logger.error("Failed to create CATALOG_ENRICH_FIELD job: %s", e)
+                }
+                for batch_ids in batches
+            ])
+            logger.info(
+                "Created %d CATALOG_ENRICH_FIELD jobs (%s) for %d exercises",
+                len(job_ids), model_name, len(exercise_ids),
+            )
+            jobs_created = len(job_ids)
+        except BulkCreateError as e:
+            logger.error("Failed to create %d CATALOG_ENRICH_FIELD jobs: %s", len(e.failed_ids), e.__cause__)
+            jobs_created = len(e.created_ids)
+        except Exception as e:
+            logger.error("Failed to create CATALOG_ENRICH_FIELD jobs: %s", e)
 
     return {
         "jobs_created": jobs_created,
@@ -16,6 +16,8 @@ import sys
 from datetime import datetime
 from typing import Any, Dict
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s"
@@ -71,17 +73,15 @@ def export_exercises(
     """
     db = get_firestore_client()
 
-    logger.info("Fetching exercises from Firestore...")
+    logger.info("Fetching exercises (local catalog snapshot)...")
 
-    query = db.collection("exercises")
-    if limit:
-        query = query.limit(limit)
+    from app.catalog_snapshot import fetch_exercises
 
     exercises = []
-    for doc in query.stream():
-        data = doc.to_dict()
+    for data in fetch_exercises(db, limit):
         # Add doc ID to data
-        data["_doc_id"] = doc.id
+        data["_doc_id"] = data.pop("doc_id")
+        data.pop("id", None)
         # Serialize for JSON
         serialized = serialize_value(data)
         exercises.append(serialized)
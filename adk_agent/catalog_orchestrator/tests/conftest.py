@@ -0,0 +1,19 @@
+"""
+Shared fixtures for the unit tests.
+
+The tests need google-cloud-firestore (test_requirements.txt) for the
+modules under test and the sentinels the fake understands; no test talks to
+a real project.
+"""
+
+import pytest
+from google.cloud import firestore
+
+from tests.fakes import FakeDB, fake_transactional
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """Empty in-memory Firestore, with firestore.transactional swapped for the fake."""
+    monkeypatch.setattr(firestore, "transactional", fake_transactional)
+    return FakeDB()
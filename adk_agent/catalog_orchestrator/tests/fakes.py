@@ -0,0 +1,456 @@
+"""
+In-memory Firestore fake shared by the unit tests.
+
+Covers the slice of google.cloud.firestore the catalog modules use:
+collections and documents, where/order_by/limit/start_after/select queries,
+count() aggregations, get_all, WriteBatch, BulkWriter, transactions (with
+fake_transactional standing in for firestore.transactional), write
+preconditions on update_time, and the Increment / DELETE_FIELD /
+SERVER_TIMESTAMP sentinels.
+
+Data lives in FakeDB.collections as {collection: {doc_id: dict}}; tests seed
+and inspect it directly. Every document write bumps the doc's update_time
+(an integer version). Hooks and logs for assertions:
+
+- queries: every query that was streamed or aggregated
+- get_all_calls: ([doc ids], field_paths) per get_all call
+- commits: number of WriteBatch commits attempted
+- before_commit: optional callable(batch) run before each WriteBatch commit
+  applies; raise from it to fail the commit
+- stale_reads: doc IDs whose query snapshots report the previous
+  update_time, as if another writer touched them right after the read
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from google.api_core import exceptions as gcp_exceptions
+from google.cloud.firestore_v1 import transforms
+
+_MISSING = object()
+
+
+def get_path(data: Optional[Dict[str, Any]], dotted: str) -> Any:
+    """Value at a dotted field path, or None."""
+    for part in dotted.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
+
+
+def _lookup(data: Dict[str, Any], dotted: str) -> Any:
+    for part in dotted.split("."):
+        if not isinstance(data, dict) or part not in data:
+            return _MISSING
+        data = data[part]
+    return data
+
+
+def _resolve(current: Any, value: Any) -> Any:
+    if isinstance(value, transforms.Increment):
+        return (current if isinstance(current, (int, float)) else 0) + value.value
+    if value is transforms.SERVER_TIMESTAMP:
+        return datetime.now(timezone.utc)
+    return copy.deepcopy(value)
+
+
+def _set_path(data: Dict[str, Any], dotted: str, value: Any) -> None:
+    parts = dotted.split(".")
+    for part in parts[:-1]:
+        if not isinstance(data.get(part), dict):
+            data[part] = {}
+        data = data[part]
+    if value is transforms.DELETE_FIELD:
+        data.pop(parts[-1], None)
+    else:
+        data[parts[-1]] = _resolve(data.get(parts[-1]), value)
+
+
+def _merge(target: Dict[str, Any], data: Dict[str, Any]) -> None:
+    for key, value in data.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        elif value is transforms.DELETE_FIELD:
+            target.pop(key, None)
+        else:
+            target[key] = _resolve(target.get(key), value)
+
+
+def _project(data: Dict[str, Any], field_paths: Optional[List[str]]) -> Dict[str, Any]:
+    if not field_paths:
+        return copy.deepcopy(data)
+    projected: Dict[str, Any] = {}
+    for path in field_paths:
+        value = _lookup(data, path)
+        if value is not _MISSING:
+            _set_path(projected, path, value)
+    return projected
+
+
+class FakeSnapshot:
+    def __init__(self, ref: "FakeRef", data: Optional[Dict[str, Any]], update_time: Any = None):
+        self.reference = ref
+        self.id = ref.id
+        self.exists = data is not None
+        self.update_time = update_time
+        self._data = data
+
+    def get(self, field_path: str) -> Any:
+        return get_path(self._data, field_path)
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+
+class FakeRef:
+    def __init__(self, db: "FakeDB", collection: str, doc_id: str):
+        self.db = db
+        self.collection = collection
+        self.id = doc_id
+        self.path = f"{collection}/{doc_id}"
+
+    @property
+    def docs(self) -> Dict[str, Dict[str, Any]]:
+        return self.db.docs(self.collection)
+
+    def snapshot(self, field_paths: Optional[List[str]] = None) -> FakeSnapshot:
+        data = self.docs.get(self.id)
+        if data is not None:
+            data = _project(data, field_paths)
+        return FakeSnapshot(self, data, self.db.versions.get(self.path, 0))
+
+    def get(self, field_paths: Optional[List[str]] = None, transaction: Any = None) -> FakeSnapshot:
+        return self.snapshot(field_paths)
+
+    def set(self, data: Dict[str, Any], merge: bool = False) -> None:
+        self.db.apply([("set", self, data, {"merge": merge})])
+
+    def update(self, data: Dict[str, Any], option: Any = None) -> None:
+        self.db.apply([("update", self, data, {"option": option})])
+
+    def create(self, data: Dict[str, Any]) -> None:
+        self.db.apply([("create", self, data, {})])
+
+    def delete(self, option: Any = None) -> None:
+        self.db.apply([("delete", self, None, {"option": option})])
+
+    def __repr__(self) -> str:
+        return f"FakeRef({self.path!r})"
+
+
+class FakeQuery:
+    def __init__(
+        self,
+        db: "FakeDB",
+        collection: str,
+        filters: tuple = (),
+        orders: tuple = (),
+        limit: Optional[int] = None,
+        cursor: Optional[FakeSnapshot] = None,
+        projection: Optional[List[str]] = None,
+    ):
+        self.db = db
+        self.collection = collection
+        self.filters = filters
+        self.orders = orders
+        self._limit = limit
+        self.cursor = cursor
+        self.projection = projection
+
+    def _with(self, **changes: Any) -> "FakeQuery":
+        args = dict(filters=self.filters, orders=self.orders, limit=self._limit,
+                    cursor=self.cursor, projection=self.projection)
+        args.update(changes)
+        return FakeQuery(self.db, self.collection, **args)
+
+    def where(self, field: str, op: str, value: Any) -> "FakeQuery":
+        return self._with(filters=self.filters + ((field, op, value),))
+
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "FakeQuery":
+        return self._with(orders=self.orders + ((field, direction),))
+
+    def limit(self, n: int) -> "FakeQuery":
+        return self._with(limit=n)
+
+    def start_after(self, snapshot: FakeSnapshot) -> "FakeQuery":
+        return self._with(cursor=snapshot)
+
+    def select(self, field_paths: List[str]) -> "FakeQuery":
+        return self._with(projection=list(field_paths))
+
+    @staticmethod
+    def _field(doc_id: str, data: Dict[str, Any], field: str) -> Any:
+        return doc_id if field == "__name__" else _lookup(data, field)
+
+    def _matches(self, doc_id: str, data: Dict[str, Any]) -> bool:
+        for field, op, value in self.filters:
+            current = self._field(doc_id, data, field)
+            if current is _MISSING:
+                return False
+            if op == "==":
+                ok = current == value
+            elif op == "!=":
+                ok = current != value
+            elif op == "in":
+                ok = current in value
+            elif op == "not-in":
+                ok = current not in value
+            elif op == "array_contains":
+                ok = isinstance(current, list) and value in current
+            else:
+                try:
+                    ok = {
+                        "<": current < value if current is not None else False,
+                        "<=": current <= value if current is not None else False,
+                        ">": current > value if current is not None else False,
+                        ">=": current >= value if current is not None else False,
+                    }[op]
+                except TypeError:
+                    ok = False
+            if not ok:
+                return False
+        return True
+
+    def _sort_key(self, doc_id: str, data: Dict[str, Any]) -> tuple:
+        return tuple(self._field(doc_id, data, field) for field, _ in self.orders) + (doc_id,)
+
+    def _matching(self) -> List[tuple]:
+        docs = self.db.docs(self.collection)
+        rows = [
+            (doc_id, data) for doc_id, data in list(docs.items())
+            if self._matches(doc_id, data)
+            and all(self._field(doc_id, data, field) is not _MISSING for field, _ in self.orders)
+        ]
+        for field, direction in reversed(self.orders):
+            rows.sort(key=lambda row: self._field(row[0], row[1], field),
+                      reverse=direction == "DESCENDING")
+        if not self.orders:
+            rows.sort(key=lambda row: row[0])
+        if self.cursor is not None:
+            ids = [doc_id for doc_id, _ in rows]
+            if self.cursor.id in ids:
+                rows = rows[ids.index(self.cursor.id) + 1:]
+            else:
+                key = self._sort_key(self.cursor.id, self.cursor.to_dict() or {})
+                rows = [row for row in rows if self._sort_key(*row) > key]
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        return rows
+
+    def stream(self, transaction: Any = None):
+        self.db.log_query(self)
+        for doc_id, data in self._matching():
+            ref = FakeRef(self.db, self.collection, doc_id)
+            snapshot = ref.snapshot(self.projection)
+            if doc_id in self.db.stale_reads:
+                snapshot.update_time -= 1
+            yield snapshot
+
+    def get(self, transaction: Any = None) -> List[FakeSnapshot]:
+        return list(self.stream())
+
+    def count(self, alias: Optional[str] = None) -> "FakeAggregation":
+        return FakeAggregation(self, alias)
+
+
+class FakeAggregation:
+    def __init__(self, query: FakeQuery, alias: Optional[str]):
+        self.query = query
+        self.alias = alias
+
+    def get(self, transaction: Any = None) -> List[List[SimpleNamespace]]:
+        self.query.db.log_query(self.query, aggregation=True)
+        return [[SimpleNamespace(alias=self.alias, value=len(self.query._matching()))]]
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self, db: "FakeDB", name: str):
+        super().__init__(db, name)
+        self.id = name
+
+    def document(self, doc_id: Optional[str] = None) -> FakeRef:
+        return FakeRef(self.db, self.collection, doc_id or self.db.new_id())
+
+
+class FakeWriteOption(SimpleNamespace):
+    """Precondition: the document's update_time must still be this."""
+
+
+class FakeBatch:
+    def __init__(self, db: "FakeDB"):
+        self.db = db
+        self.ops: List[tuple] = []
+
+    def set(self, ref: FakeRef, data: Dict[str, Any], merge: bool = False) -> None:
+        self.ops.append(("set", ref, data, {"merge": merge}))
+
+    def update(self, ref: FakeRef, data: Dict[str, Any], option: Any = None) -> None:
+        self.ops.append(("update", ref, data, {"option": option}))
+
+    def create(self, ref: FakeRef, data: Dict[str, Any]) -> None:
+        self.ops.append(("create", ref, data, {}))
+
+    def delete(self, ref: FakeRef, option: Any = None) -> None:
+        self.ops.append(("delete", ref, None, {"option": option}))
+
+    def commit(self) -> List[Any]:
+        with self.db.lock:
+            self.db.commits += 1
+        if self.db.before_commit is not None:
+            self.db.before_commit(self)
+        self.db.apply(self.ops)
+        return []
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+
+class FakeTransaction(FakeBatch):
+    """Buffers writes until fake_transactional commits them."""
+
+    def get_all(self, refs: List[FakeRef], field_paths: Optional[List[str]] = None):
+        return self.db.get_all(refs, field_paths=field_paths)
+
+    def commit(self) -> List[Any]:
+        self.db.apply(self.ops)
+        self.ops = []
+        return []
+
+
+def fake_transactional(fn: Callable) -> Callable:
+    """Stand-in for firestore.transactional: run once, then commit."""
+
+    def run(transaction: FakeTransaction, *args: Any, **kwargs: Any) -> Any:
+        result = fn(transaction, *args, **kwargs)
+        transaction.commit()
+        return result
+
+    return run
+
+
+class FakeBulkWriter:
+    """Queues writes and applies them on flush()/close(), reporting through the callbacks."""
+
+    def __init__(self, db: "FakeDB"):
+        self.db = db
+        self.ops: List[tuple] = []
+        self.closed = False
+        self._on_result: Callable = lambda ref, result, writer: None
+        self._on_error: Callable = lambda failure, writer: False
+
+    def on_write_result(self, callback: Callable) -> None:
+        self._on_result = callback
+
+    def on_write_error(self, callback: Callable) -> None:
+        self._on_error = callback
+
+    def set(self, ref: FakeRef, data: Dict[str, Any], merge: bool = False) -> None:
+        self.ops.append(("set", ref, data, {"merge": merge}))
+
+    def update(self, ref: FakeRef, data: Dict[str, Any], option: Any = None) -> None:
+        self.ops.append(("update", ref, data, {"option": option}))
+
+    def delete(self, ref: FakeRef, option: Any = None) -> None:
+        self.ops.append(("delete", ref, None, {"option": option}))
+
+    def flush(self) -> None:
+        ops, self.ops = self.ops, []
+        for op in ops:
+            try:
+                self.db.apply([op])
+            except gcp_exceptions.GoogleAPICallError as e:
+                failure = SimpleNamespace(code=e.grpc_status_code.value[0], attempts=1,
+                                          message=str(e), operation=op[1])
+                self._on_error(failure, self)
+                continue
+            self._on_result(op[1], None, self)
+
+    def close(self) -> None:
+        self.flush()
+        self.closed = True
+
+
+class FakeDB:
+    project = "test-project"
+
+    def __init__(self, collections: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None):
+        self.collections: Dict[str, Dict[str, Dict[str, Any]]] = collections or {}
+        self.versions: Dict[str, int] = {}
+        self.queries: List[FakeQuery] = []
+        self.aggregations: List[FakeQuery] = []
+        self.get_all_calls: List[tuple] = []
+        self.commits = 0
+        self.bulk_writers: List[FakeBulkWriter] = []
+        self.before_commit: Optional[Callable[[FakeBatch], None]] = None
+        self.stale_reads: set = set()
+        self.lock = threading.RLock()
+        self._ids = 0
+
+    def docs(self, collection: str) -> Dict[str, Dict[str, Any]]:
+        return self.collections.setdefault(collection, {})
+
+    def new_id(self) -> str:
+        with self.lock:
+            self._ids += 1
+            return f"auto{self._ids:06d}"
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self, name)
+
+    def batch(self) -> FakeBatch:
+        return FakeBatch(self)
+
+    def transaction(self, **kwargs: Any) -> FakeTransaction:
+        return FakeTransaction(self)
+
+    def bulk_writer(self, **kwargs: Any) -> FakeBulkWriter:
+        writer = FakeBulkWriter(self)
+        self.bulk_writers.append(writer)
+        return writer
+
+    def write_option(self, last_update_time: Any = None, exists: Optional[bool] = None) -> FakeWriteOption:
+        return FakeWriteOption(last_update_time=last_update_time, exists=exists)
+
+    def get_all(self, refs: List[FakeRef], field_paths: Optional[List[str]] = None, transaction: Any = None):
+        """Snapshots (missing docs included) in reverse order, like an unordered server."""
+        refs = list(refs)
+        with self.lock:
+            self.get_all_calls.append(([ref.id for ref in refs], field_paths))
+        return [ref.snapshot(field_paths) for ref in reversed(refs)]
+
+    def log_query(self, query: FakeQuery, aggregation: bool = False) -> None:
+        with self.lock:
+            (self.aggregations if aggregation else self.queries).append(query)
+
+    def apply(self, ops: List[tuple]) -> None:
+        """Apply writes atomically: preconditions are checked before anything is written."""
+        with self.lock:
+            for op, ref, _, kwargs in ops:
+                option = kwargs.get("option")
+                if option is not None and option.last_update_time is not None:
+                    if self.versions.get(ref.path, 0) != option.last_update_time:
+                        raise gcp_exceptions.FailedPrecondition(f"{ref.path} changed")
+                if op == "update" and ref.id not in ref.docs:
+                    raise gcp_exceptions.NotFound(f"{ref.path} not found")
+                if op == "create" and ref.id in ref.docs:
+                    raise gcp_exceptions.AlreadyExists(f"{ref.path} exists")
+            for op, ref, data, kwargs in ops:
+                docs = ref.docs
+                if op == "delete":
+                    docs.pop(ref.id, None)
+                elif op == "update":
+                    for path, value in data.items():
+                        _set_path(docs[ref.id], path, value)
+                elif op == "set" and kwargs.get("merge") and ref.id in docs:
+                    _merge(docs[ref.id], data)
+                else:
+                    fresh: Dict[str, Any] = {}
+                    _merge(fresh, data)
+                    docs[ref.id] = fresh
+                self.versions[ref.path] = self.versions.get(ref.path, 0) + 1
@@ -0,0 +1,137 @@
+"""
+Tests for the local catalog snapshot.
+
+Runs against the in-memory Firestore fake (tests/fakes.py), which records
+every query; the snapshot file goes to pytest's tmp_path.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.catalog_snapshot import CatalogSnapshot
+
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _queries(db):
+    """Each streamed query: its range filter field, or "page" for export pages."""
+    return [query.filters[0][0] if query.filters else "page" for query in db.queries]
+
+
+@pytest.fixture
+def db(fake_db):
+    fake_db.collections["exercises"] = {
+        f"ex{i:03d}": {"name": f"Exercise {1199 - i:04d}", "updated_at": T0}
+        for i in range(1200)
+    }
+    return fake_db
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "snapshot.json.gz")
+
+
+class TestCatalogSnapshot:
+
+    def test_first_refresh_exports_everything(self, db, path):
+        snapshot = CatalogSnapshot(path=path, db=db)
+
+        result = snapshot.refresh()
+
+        assert result.full and result.fetched == 1200
+        assert _queries(db) == ["page", "page", "page"]
+        assert snapshot.high_water == T0
+
+    def test_exercises_sorted_by_name_with_ids(self, db, path):
+        snapshot = CatalogSnapshot(path=path, db=db)
+        snapshot.refresh()
+
+        first = snapshot.exercises(max_exercises=2)
+
+        assert [e["name"] for e in first] == ["Exercise 0000", "Exercise 0001"]
+        assert first[0]["id"] == first[0]["doc_id"] == "ex1199"
+
+    def test_reload_refreshes_only_changes(self, db, path):
+        CatalogSnapshot(path=path, db=db).refresh()
+        db.collections["exercises"]["ex001"] = {"name": "Renamed", "updated_at": T0 + timedelta(hours=1)}
+        db.collections["exercises"]["ex002"]["review_metadata"] = {"quality_score": 0.5, "updated_at": T0 + timedelta(hours=2)}
+        db.queries.clear()
+
+        snapshot = CatalogSnapshot(path=path, db=db)
+        result = snapshot.refresh()
+
+        assert not result.full
+        assert _queries(db) == ["updated_at", "review_metadata.updated_at"]
+        assert sorted(result.changed) == ["ex001", "ex002"]
+        assert snapshot.get("ex001")["name"] == "Renamed"
+        assert snapshot.get("ex002")["review_metadata"]["quality_score"] == 0.5
+        assert snapshot.high_water == T0 + timedelta(hours=2)
+
+    def test_incremental_refresh_prunes_deleted(self, db, path):
+        CatalogSnapshot(path=path, db=db).refresh()
+        del db.collections["exercises"]["ex005"]
+        db.queries.clear()
+
+        snapshot = CatalogSnapshot(path=path, db=db)
+        result = snapshot.refresh()
+
+        assert not result.full
+        assert result.deleted == ["ex005"]
+        assert snapshot.get("ex005") is None
+        assert len(snapshot) == 1199
+
+        reloaded = CatalogSnapshot(path=path, db=db)
+        assert reloaded.load() and reloaded.get("ex005") is None
+
+    def test_matching_count_skips_keys_scan(self, db, path):
+        CatalogSnapshot(path=path, db=db).refresh()
+        db.queries.clear()
+
+        result = CatalogSnapshot(path=path, db=db).refresh()
+
+        assert result.deleted == [] and result.changed == []
+        assert _queries(db) == ["updated_at", "review_metadata.updated_at"]
+        assert len(db.aggregations) == 1
+
+    def test_unstamped_new_doc_is_fetched(self, db, path):
+        CatalogSnapshot(path=path, db=db).refresh()
+        db.collections["exercises"]["ex9999"] = {"name": "Imported"}
+
+        snapshot = CatalogSnapshot(path=path, db=db)
+        result = snapshot.refresh()
+
+        assert result.changed == ["ex9999"]
+        assert snapshot.get("ex9999") == {"name": "Imported"}
+
+    def test_datetimes_round_trip(self, db, path):
+        CatalogSnapshot(path=path, db=db).refresh()
+
+        snapshot = CatalogSnapshot(path=path, db=db)
+        assert snapshot.load()
+        assert snapshot.get("ex000")["updated_at"] == T0
+
+    def test_stale_snapshot_re_exports(self, db, path):
+        CatalogSnapshot(path=path, db=db).refresh()
+        del db.collections["exercises"]["ex000"]
+
+        snapshot = CatalogSnapshot(path=path, db=db, max_age_secs=-1)
+        result = snapshot.refresh()
+
+        assert result.full
+        assert snapshot.get("ex000") is None
+
+    def test_other_project_re_exports(self, db, path):
+        CatalogSnapshot(path=path, db=db).refresh()
+        db.project = "demo-povver"
+
+        assert CatalogSnapshot(path=path, db=db).refresh().full
+
+    def test_returns_copies(self, db, path):
+        snapshot = CatalogSnapshot(path=path, db=db)
+        snapshot.refresh()
+
+        snapshot.exercises()[0]["name"] = "mutated"
+        assert snapshot.get("ex1199")["name"] == "Exercise 0000"
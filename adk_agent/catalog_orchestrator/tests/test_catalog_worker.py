@@ -0,0 +1,166 @@
+"""
+Tests for concurrent job processing in CatalogWorker (WORKER_CONCURRENCY).
+
+The worker runs its real loop and _process_job; the queue calls, the
+executor and run history are replaced with in-memory fakes. The fake family
+lock refuses a second holder, so two same-family jobs running side by side
+would show up as LOCK_CONTENTION failures.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.jobs import executor, queue
+from app.jobs.models import Job, JobPayload, JobType
+from workers import catalog_worker
+from workers.catalog_worker import CatalogWorker
+
+
+class FakeQueue:
+    """Serves leased jobs and records lock, completion and release calls."""
+
+    def __init__(self, jobs, run_secs=0.05):
+        self.jobs = list(jobs)
+        self.run_secs = run_secs
+        self.lock = threading.Lock()
+        self.family_locks = {}
+        self.running = set()
+        self.max_running = 0
+        self.overlaps = []
+        self.completed = []
+        self.failed = []
+        self.released = []
+        self.on_execute = None
+
+    def poll_jobs(self, worker_id, max_jobs):
+        with self.lock:
+            leased, self.jobs = self.jobs[:max_jobs], self.jobs[max_jobs:]
+        return leased
+
+    def acquire_family_lock(self, family_slug, job_id, worker_id):
+        with self.lock:
+            if family_slug in self.family_locks:
+                return False
+            self.family_locks[family_slug] = job_id
+            return True
+
+    def release_family_lock(self, family_slug, job_id, worker_id):
+        with self.lock:
+            if self.family_locks.get(family_slug) == job_id:
+                del self.family_locks[family_slug]
+
+    def execute_job(self, job, worker_id):
+        family = job["payload"].get("family_slug")
+        with self.lock:
+            if family in {f for _, f in self.running}:
+                self.overlaps.append(job["id"])
+            self.running.add((job["id"], family))
+            self.max_running = max(self.max_running, len(self.running))
+        if self.on_execute:
+            self.on_execute(job)
+        time.sleep(self.run_secs)
+        with self.lock:
+            self.running.discard((job["id"], family))
+        return {"success": True}
+
+    def complete_job(self, job_id, worker_id, status, summary):
+        with self.lock:
+            self.completed.append(job_id)
+
+    def fail_job(self, job_id, worker_id, error, is_transient=True):
+        with self.lock:
+            self.failed.append((job_id, error["code"]))
+
+    def release_jobs(self, job_ids, worker_id):
+        self.released.extend(job_ids)
+        return len(job_ids)
+
+
+def _job(job_id, family):
+    return Job(
+        id=job_id,
+        type=JobType.CATALOG_ENRICH_FIELD,
+        payload=JobPayload(family_slug=family, mode="dry_run"),
+    )
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    monkeypatch.setattr(catalog_worker, "WORKER_CONCURRENCY", 3)
+    monkeypatch.setattr(catalog_worker, "POLL_BATCH_SIZE", 10)
+    monkeypatch.setattr(catalog_worker, "MAX_JOBS_PER_RUN", 0)
+    monkeypatch.setattr(catalog_worker, "MAX_SECONDS_PER_RUN", 0)
+    worker = CatalogWorker("worker-1")
+    worker.running = True
+    monkeypatch.setattr(worker, "_write_run_history", lambda **kwargs: None)
+    return worker
+
+
+def _serve(monkeypatch, jobs, **kwargs):
+    fake = FakeQueue(jobs, **kwargs)
+    for name in (
+        "poll_jobs", "acquire_family_lock", "release_family_lock",
+        "complete_job", "fail_job", "release_jobs",
+    ):
+        monkeypatch.setattr(queue, name, getattr(fake, name))
+    monkeypatch.setattr(queue, "mark_job_running", lambda job_id, worker_id: None)
+    monkeypatch.setattr(executor, "execute_job", fake.execute_job)
+    return fake
+
+
+class TestConcurrentWorker:
+
+    def test_jobs_of_different_families_run_together(self, worker, monkeypatch):
+        fake = _serve(monkeypatch, [_job(f"job{i}", f"family-{i}") for i in range(6)])
+
+        worker._run_loop()
+
+        assert sorted(fake.completed) == [f"job{i}" for i in range(6)]
+        assert fake.max_running == 3
+        assert worker.jobs_processed == 6 and worker.jobs_failed == 0
+
+    def test_same_family_jobs_never_overlap(self, worker, monkeypatch):
+        jobs = [
+            _job("a1", "family-a"),
+            _job("a2", "family-a"),
+            _job("b1", "family-b"),
+            _job("a3", "family-a"),
+            _job("c1", "family-c"),
+        ]
+        fake = _serve(monkeypatch, jobs)
+        order = []
+        fake.on_execute = lambda job: order.append(job["id"])
+
+        worker._run_loop()
+
+        assert fake.overlaps == []
+        assert fake.failed == []
+        assert sorted(fake.completed) == ["a1", "a2", "a3", "b1", "c1"]
+        # Family order is kept; other families run while family-a waits
+        assert [job_id for job_id in order if job_id.startswith("a")] == ["a1", "a2", "a3"]
+        assert order.index("c1") < order.index("a2")
+
+    def test_stop_finishes_in_flight_and_releases_batch(self, worker, monkeypatch):
+        fake = _serve(monkeypatch, [_job(f"job{i}", f"family-{i}") for i in range(6)])
+        events = []
+        monkeypatch.setattr(catalog_worker, "log_event", lambda event, **kw: events.append((event, kw)))
+        stopped = threading.Event()
+
+        def stop_once(job):
+            if not stopped.is_set():
+                stopped.set()
+                deadline = time.time() + 2
+                while len(fake.running) < 3 and time.time() < deadline:
+                    time.sleep(0.001)  # let the other slots start
+                worker.stop()
+
+        fake.on_execute = stop_once
+
+        worker._run_loop()
+
+        assert sorted(fake.completed + fake.released) == [f"job{i}" for i in range(6)]
+        assert len(fake.completed) == 3
+        stopping = [kw for event, kw in events if event == "worker_stopping"]
+        assert stopping == [{"reason": "signal", "in_flight_job_ids": ["job0", "job1", "job2"]}]
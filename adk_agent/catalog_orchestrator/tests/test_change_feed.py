@@ -0,0 +1,202 @@
+"""
+Tests for the review/scan change feed.
+
+Runs against the in-memory Firestore fake (tests/fakes.py).
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.reviewer.change_feed import CHANGE_FEED_OVERLAP, ChangeFeed
+
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _filters(db):
+    return [query.filters[0] for query in db.queries]
+
+
+@pytest.fixture
+def db(fake_db):
+    fake_db.collections["exercises"] = {
+        f"ex{i}": {"name": f"Exercise {i}", "updated_at": T0 + timedelta(hours=i)}
+        for i in range(5)
+    }
+    return fake_db
+
+
+class TestChangeFeed:
+
+    def test_no_marks_means_full_pass(self, db):
+        assert ChangeFeed("scan", ["updated_at"], db).fetch() is None
+        assert _filters(db) == []
+
+    def test_fetches_only_docs_after_mark(self, db):
+        feed = ChangeFeed("scan", ["updated_at"], db)
+        feed.reset(T0 + timedelta(hours=2, minutes=30))
+
+        changed = ChangeFeed("scan", ["updated_at"], db).fetch()
+
+        assert _filters(db) == [("updated_at", ">", T0 + timedelta(hours=2, minutes=30) - CHANGE_FEED_OVERLAP)]
+        assert [ex["doc_id"] for ex in changed] == ["ex3", "ex4"]
+
+    def test_extra_filters_add_backlog(self, db):
+        db.collections["exercises"]["ex0"]["review_metadata"] = {"needs_full_review": True}
+        feed = ChangeFeed("review", ["updated_at"], db)
+        feed.reset(T0 + timedelta(hours=10))
+
+        changed = feed.fetch([("review_metadata.needs_full_review", "==", True)])
+
+        assert [ex["doc_id"] for ex in changed] == ["ex0"]
+
+    def test_advance_to_newest_processed(self, db):
+        feed = ChangeFeed("scan", ["updated_at"], db)
+        feed.reset(T0)
+        changed = feed.fetch()
+
+        marks = feed.advance(changed, [ex["doc_id"] for ex in changed])
+
+        assert marks == {"updated_at": T0 + timedelta(hours=4)}
+        assert ChangeFeed("scan", ["updated_at"], db).marks() == marks
+
+    def test_advance_stops_before_deferred(self, db):
+        feed = ChangeFeed("scan", ["updated_at"], db)
+        feed.reset(T0)
+        changed = feed.fetch()
+
+        marks = feed.advance(changed, ["ex0", "ex1", "ex2"])
+
+        assert marks["updated_at"] == T0 + timedelta(hours=3) - timedelta(microseconds=1)
+        assert [ex["doc_id"] for ex in feed.fetch()] == ["ex3", "ex4"]
+
+    def test_marks_never_move_back(self, db):
+        feed = ChangeFeed("scan", ["updated_at"], db)
+        feed.reset(T0 + timedelta(hours=3))
+        changed = feed.fetch()
+
+        assert feed.advance(changed, [])["updated_at"] == T0 + timedelta(hours=3)
+
+    def test_dotted_fields_round_trip(self, db):
+        fields = ["updated_at", "review_metadata.updated_at"]
+        ChangeFeed("review", fields, db).reset(T0)
+
+        assert ChangeFeed("review", fields, db).marks() == {field: T0 for field in fields}
+
+
+class TestQualityScanFeed:
+
+    @pytest.fixture
+    def scan(self, db, monkeypatch):
+        from app.reviewer import scheduled_quality_scan
+        from app.reviewer.quality_scanner import QualityScanBatchResult, QualityScanner, QualityScanResult
+
+        def scan_batch(self, exercises):
+            return QualityScanBatchResult(
+                total_scanned=len(exercises),
+                results=[QualityScanResult(ex["doc_id"], ex["name"], 0.95, "none", False, "heuristic")
+                         for ex in exercises],
+            )
+
+        monkeypatch.setattr(scheduled_quality_scan, "_get_firestore_client", lambda: db)
+        monkeypatch.setattr(scheduled_quality_scan, "fetch_exercises", lambda _db: [
+            {**data, "id": doc_id, "doc_id": doc_id}
+            for doc_id, data in sorted(db.collections["exercises"].items())
+        ])
+        monkeypatch.setattr(QualityScanner, "scan_batch", scan_batch)
+        return lambda: scheduled_quality_scan.run_quality_scan(
+            dry_run=False, create_jobs=False, changes_only=True,
+        )
+
+    @staticmethod
+    def _fail_commits(db):
+        def fail(batch):
+            raise RuntimeError("commit failed")
+        db.before_commit = fail
+
+    def test_failed_save_holds_marks(self, db, scan):
+        ChangeFeed("quality_scan", ["updated_at"], db).reset(T0 + timedelta(hours=2, minutes=30))
+        self._fail_commits(db)
+
+        result = scan()
+
+        assert result["save"]["errors"] == 2
+        assert ChangeFeed("quality_scan", ["updated_at"], db).marks()["updated_at"] < T0 + timedelta(hours=3)
+
+    def test_failed_full_pass_does_not_start_feed(self, db, scan):
+        self._fail_commits(db)
+
+        scan()
+
+        assert ChangeFeed("quality_scan", ["updated_at"], db).marks() == {}
+
+    def test_saved_changes_advance_marks(self, db, scan):
+        ChangeFeed("quality_scan", ["updated_at"], db).reset(T0 + timedelta(hours=2, minutes=30))
+
+        scan()
+
+        assert ChangeFeed("quality_scan", ["updated_at"], db).marks()["updated_at"] == T0 + timedelta(hours=4)
+
+
+class TestScheduledReviewFeed:
+
+    FIELDS = ["updated_at", "review_metadata.updated_at"]
+
+    @pytest.fixture
+    def review(self, db, monkeypatch):
+        from app.reviewer import scheduled_review
+
+        state = {"failed_ids": [], "unreviewed_ids": []}
+
+        def run_review_pipeline(db, exercises, **kwargs):
+            return {
+                "totals": {key: 0 for key in (
+                    "reviewed", "keep", "enrich", "fix_identity", "archive", "merge", "gaps", "duplicates",
+                )},
+                "jobs": {"total_jobs": 0, "by_type": {}},
+                "review_metadata": {"updated": len(exercises), "errors": len(state["failed_ids"]),
+                                    "failed_ids": state["failed_ids"]},
+                "unreviewed_ids": state["unreviewed_ids"],
+            }
+
+        monkeypatch.setattr(scheduled_review, "_get_firestore_client", lambda: db)
+        monkeypatch.setattr(scheduled_review, "fetch_all_exercises", lambda _db, n: [
+            {**data, "id": doc_id, "doc_id": doc_id}
+            for doc_id, data in sorted(db.collections["exercises"].items())
+        ][:n])
+        monkeypatch.setattr(scheduled_review, "run_review_pipeline", run_review_pipeline)
+
+        def run(failed_ids=(), unreviewed_ids=(), max_exercises=100):
+            state["failed_ids"] = list(failed_ids)
+            state["unreviewed_ids"] = list(unreviewed_ids)
+            return scheduled_review.run_scheduled_review(
+                max_exercises=max_exercises, dry_run=False, changes_only=True,
+            )
+        return run
+
+    def test_failed_metadata_holds_marks(self, db, review):
+        ChangeFeed("scheduled_review", self.FIELDS, db).reset(T0 + timedelta(hours=1, minutes=30))
+
+        review(failed_ids=["ex3"])
+
+        marks = ChangeFeed("scheduled_review", self.FIELDS, db).marks()
+        assert marks["updated_at"] == T0 + timedelta(hours=3) - timedelta(microseconds=1)
+
+    def test_unreviewed_at_max_jobs_holds_marks(self, db, review):
+        ChangeFeed("scheduled_review", self.FIELDS, db).reset(T0 + timedelta(hours=1, minutes=30))
+
+        review(unreviewed_ids=["ex3", "ex4"])
+
+        marks = ChangeFeed("scheduled_review", self.FIELDS, db).marks()
+        assert marks["updated_at"] == T0 + timedelta(hours=3) - timedelta(microseconds=1)
+
+    def test_capped_full_pass_does_not_start_feed(self, db, review):
+        review(max_exercises=3)
+
+        assert ChangeFeed("scheduled_review", self.FIELDS, db).marks() == {}
+
+    def test_uncapped_full_pass_starts_feed(self, db, review):
+        review()
+
+        assert set(ChangeFeed("scheduled_review", self.FIELDS, db).marks()) == set(self.FIELDS)
@@ -0,0 +1,107 @@
+"""
+Tests for the per-process family cache.
+
+Runs against the in-memory Firestore fake (tests/fakes.py).
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.family.cache import FamilyCache
+
+
+T0 = datetime(2026, 1, 1)
+
+
+class FamilyDB:
+    """Fake client seeded with two families; counts full family fetches."""
+
+    def __init__(self, db):
+        self.db = db
+        db.collections["exercises"] = {
+            "bench-barbell": {"family_slug": "bench", "name": "Bench (Barbell)", "updated_at": T0},
+            "bench-dumbbell": {"family_slug": "bench", "name": "Bench (Dumbbell)", "updated_at": T0},
+            "squat-barbell": {"family_slug": "squat", "name": "Squat", "updated_at": T0},
+        }
+
+    @property
+    def family_reads(self):
+        # Stamp checks are ordered, one-document queries
+        return sum(1 for query in self.db.queries if not query.orders)
+
+    def touch(self, doc_id, **fields):
+        data = self.db.collections["exercises"][doc_id]
+        data.update(fields, updated_at=data["updated_at"] + timedelta(seconds=1))
+
+
+@pytest.fixture
+def families(fake_db):
+    return FamilyDB(fake_db)
+
+
+@pytest.fixture
+def db(families):
+    return families.db
+
+
+@pytest.fixture
+def cache():
+    return FamilyCache(ttl_secs=300, enabled=True)
+
+
+class TestFamilyCache:
+
+    def test_repeat_reads_served_from_cache(self, cache, db, families):
+        first = cache.get_exercises("bench", db=db)
+        second = cache.get_exercises("bench", db=db)
+
+        assert first == second
+        assert set(first) == {"bench-barbell", "bench-dumbbell"}
+        assert families.family_reads == 1
+        assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+    def test_changed_stamp_refetches(self, cache, db, families):
+        cache.get_exercises("bench", db=db)
+        families.touch("bench-barbell", name="Barbell Bench Press")
+
+        docs = cache.get_exercises("bench", db=db)
+
+        assert docs["bench-barbell"]["name"] == "Barbell Bench Press"
+        assert families.family_reads == 2
+
+    def test_departed_exercise_refetches(self, cache, db, families):
+        # The departing doc does not hold the family's max updated_at
+        families.touch("bench-barbell")
+        cache.get_exercises("bench", db=db)
+        db.collections["exercises"]["bench-dumbbell"]["family_slug"] = "bench-dumbbell"
+
+        docs = cache.get_exercises("bench", db=db)
+
+        assert set(docs) == {"bench-barbell"}
+        assert families.family_reads == 2
+
+    def test_returns_copies(self, cache, db):
+        cache.get_exercises("bench", db=db)["bench-barbell"]["name"] = "mutated"
+        assert cache.get_exercises("bench", db=db)["bench-barbell"]["name"] == "Bench (Barbell)"
+
+    def test_invalidate_targets_by_doc_id_or_family(self, cache, db):
+        cache.get_exercises("bench", db=db)
+        cache.get_exercises("squat", db=db)
+
+        assert cache.invalidate_targets(["bench-dumbbell"]) == 1
+        assert cache.invalidate_targets(["squat"]) == 1
+        assert cache.stats()["entries"] == 0
+
+    def test_expired_entry_refetches(self, db, cache, families):
+        cache.ttl_secs = 0
+        cache.get_exercises("bench", db=db)
+        cache.get_exercises("bench", db=db)
+        assert families.family_reads == 2
+
+    def test_disabled_always_reads(self, db, families):
+        cache = FamilyCache(enabled=False)
+        cache.get_exercises("bench", db=db)
+        cache.get_exercises("bench", db=db)
+        assert families.family_reads == 2
+        assert cache.stats()["entries"] == 0
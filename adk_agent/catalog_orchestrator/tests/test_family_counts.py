@@ -0,0 +1,123 @@
+"""
+Tests for maintained family counts.
+
+Runs against the in-memory Firestore fake (tests/fakes.py).
+"""
+
+import asyncio
+
+import pytest
+
+from app.family.counts import (
+    FAMILY_COUNTS_COLLECTION,
+    adjust_family_counts,
+    family_count_deltas,
+    family_counts_built,
+    rebuild_family_counts,
+)
+from app.skills import catalog_read_skills
+
+
+EXERCISES = {
+    "bench-barbell": {"family_slug": "bench"},
+    "bench-dumbbell": {"family_slug": "bench", "status": "approved"},
+    "bench-smith": {"family_slug": "bench", "status": "merged"},
+    "squat-barbell": {"family_slug": "squat"},
+    "squat-old": {"family_slug": "squat", "status": "deprecated"},
+}
+
+
+class TestFamilyCountDeltas:
+
+    def test_create_counts_toward_family(self):
+        assert family_count_deltas(None, {"family_slug": "bench"}) == {"bench": 1}
+
+    def test_deprecate_and_merge_keep_count(self):
+        before = {"family_slug": "bench", "status": "approved"}
+        assert family_count_deltas(before, {**before, "status": "deprecated"}) == {}
+        assert family_count_deltas(before, {**before, "status": "merged"}) == {}
+
+    def test_reassign_moves_count(self):
+        assert family_count_deltas({"family_slug": "a"}, {"family_slug": "b"}) == {"a": -1, "b": 1}
+
+    def test_unchanged_is_noop(self):
+        assert family_count_deltas({"family_slug": "a"}, {"family_slug": "a", "name": "x"}) == {}
+
+    def test_reassigning_deprecated_exercise_moves_count(self):
+        old = {"family_slug": "a", "status": "deprecated"}
+        assert family_count_deltas(old, {**old, "family_slug": "b"}) == {"a": -1, "b": 1}
+
+
+def _counts(db):
+    return {
+        slug: data["exercise_count"]
+        for slug, data in db.collections.get(FAMILY_COUNTS_COLLECTION, {}).items()
+    }
+
+
+@pytest.fixture
+def db(fake_db):
+    fake_db.collections["exercises"] = dict(EXERCISES)
+    return fake_db
+
+
+class TestRebuildFamilyCounts:
+
+    def test_counts_every_exercise_whatever_its_status(self, db):
+        result = rebuild_family_counts(db)
+
+        assert result["counts"] == {"bench": 3, "squat": 2}
+        assert result["exercises"] == 5
+        assert _counts(db) == {"bench": 3, "squat": 2}
+
+    def test_dry_run_reports_drift_without_writing(self, db):
+        db.collections[FAMILY_COUNTS_COLLECTION] = {"bench": {"exercise_count": 5}}
+
+        result = rebuild_family_counts(db, dry_run=True)
+
+        assert result["changed"] == {"bench": (5, 3), "squat": (None, 2)}
+        assert db.commits == 0
+        assert not family_counts_built(db)
+
+    def test_only_changed_families_written_and_stale_zeroed(self, db):
+        db.collections[FAMILY_COUNTS_COLLECTION] = {
+            "bench": {"exercise_count": 3},
+            "lunge": {"exercise_count": 4},
+        }
+
+        result = rebuild_family_counts(db)
+
+        assert set(result["changed"]) == {"squat", "lunge"}
+        assert _counts(db) == {"bench": 3, "squat": 2, "lunge": 0}
+
+    def test_writes_built_marker(self, db):
+        assert not family_counts_built(db)
+
+        rebuild_family_counts(db)
+
+        assert family_counts_built(db)
+
+
+class TestListFamiliesSummary:
+
+    @pytest.fixture
+    def summary(self, db, monkeypatch):
+        monkeypatch.setattr(catalog_read_skills, "_get_db", lambda: db)
+        return lambda: {
+            f["family_slug"]: f["exercise_count"]
+            for f in asyncio.run(catalog_read_skills.list_families_summary())["families"]
+        }
+
+    def test_partial_counters_ignored_until_built(self, db, summary):
+        # A reassign before the first rebuild leaves partial counters
+        adjust_family_counts({"squat": -1, "lunge": 1}, db=db)
+
+        assert summary() == {"bench": 3, "squat": 2}
+
+    def test_reads_counters_once_built(self, db, summary):
+        rebuild_family_counts(db)
+        db.collections["exercises"].clear()
+        db.queries.clear()
+
+        assert summary() == {"bench": 3, "squat": 2}
+        assert [query.collection for query in db.queries] == [FAMILY_COUNTS_COLLECTION]
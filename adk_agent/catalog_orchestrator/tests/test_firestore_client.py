@@ -0,0 +1,162 @@
+"""
+Tests for the shared Firestore client provider.
+
+The real client is never built: _build_client is replaced with a counter
+and the bulk helpers run against the shared in-memory Firestore fake
+(tests/fakes.py).
+"""
+
+import threading
+
+import pytest
+
+from app import firestore_client
+from app.firestore_client import (
+    count_by_value,
+    get_documents,
+    get_firestore_client,
+    is_emulator,
+    query_in,
+    reset_firestore_client,
+)
+from tests.fakes import FakeDB
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    calls = []
+
+    def build():
+        calls.append(1)
+        return object()
+
+    monkeypatch.setattr(firestore_client, "_build_client", build)
+    reset_firestore_client()
+    yield calls
+    reset_firestore_client()
+
+
+class TestGetFirestoreClient:
+
+    def test_built_once_and_shared(self, builds):
+        assert get_firestore_client() is get_firestore_client()
+        assert len(builds) == 1
+
+    def test_concurrent_first_use_builds_once(self, builds):
+        clients = []
+        threads = [
+            threading.Thread(target=lambda: clients.append(get_firestore_client()))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(builds) == 1
+        assert len({id(c) for c in clients}) == 1
+
+    def test_reset_rebuilds(self, builds):
+        first = get_firestore_client()
+        reset_firestore_client()
+        assert get_firestore_client() is not first
+        assert len(builds) == 2
+
+
+class TestIsEmulator:
+
+    def test_detects_emulator_host(self, monkeypatch):
+        monkeypatch.setenv("FIRESTORE_EMULATOR_HOST", "localhost:8080")
+        assert is_emulator()
+
+    def test_production_by_default(self, monkeypatch):
+        monkeypatch.delenv("FIRESTORE_EMULATOR_HOST", raising=False)
+        assert not is_emulator()
+
+
+class TestGetDocuments:
+
+    DOCS = {f"ex{i}": {"name": f"Exercise {i}"} for i in range(200)}
+
+    @pytest.fixture
+    def db(self):
+        return FakeDB({"exercises": self.DOCS})
+
+    def test_single_call_for_shard(self, db):
+        ids = list(self.DOCS)
+
+        docs = get_documents("exercises", ids, db=db, chunk_size=300)
+
+        assert len(db.get_all_calls) == 1
+        assert [d.id for d in docs] == ids
+
+    def test_chunks_concurrently_and_keeps_order(self, db):
+        ids = list(self.DOCS)
+
+        docs = get_documents("exercises", ids, db=db, chunk_size=50, max_concurrency=4)
+
+        assert len(db.get_all_calls) == 4
+        assert [d.id for d in docs] == ids
+
+    def test_skips_missing_and_duplicates(self, db):
+
+        docs = get_documents("exercises", ["ex3", "missing", "ex1", "ex3"], db=db)
+
+        assert [d.id for d in docs] == ["ex3", "ex1"]
+        assert db.get_all_calls[0][0] == ["ex3", "missing", "ex1"]
+
+    def test_passes_field_mask(self, db):
+
+        get_documents("exercises", ["ex1"], field_paths=["name"], db=db)
+
+        assert db.get_all_calls == [(["ex1"], ["name"])]
+
+    def test_empty_ids_make_no_calls(self, db):
+        assert get_documents("exercises", [], db=db) == []
+        assert db.get_all_calls == []
+
+
+class TestQueryIn:
+
+    DOCS = {f"ex{i}": {"name_slug": f"slug-{i}"} for i in range(100)}
+
+    @pytest.fixture
+    def db(self):
+        return FakeDB({"exercises": self.DOCS})
+
+    def test_chunks_values_into_in_filters(self, db):
+        slugs = [f"slug-{i}" for i in range(0, 100, 2)] + ["unknown"]
+
+        docs = query_in("exercises", "name_slug", slugs, field_paths=["name_slug"], db=db)
+
+        assert len(db.queries) == 2
+        assert all(len(query.filters[0][2]) <= 30 for query in db.queries)
+        assert all(query.projection == ["name_slug"] for query in db.queries)
+        assert sorted(d.id for d in docs) == sorted(f"ex{i}" for i in range(0, 100, 2))
+
+    def test_no_values_no_queries(self, db):
+        assert query_in("exercises", "name_slug", [], db=db) == []
+        assert db.queries == []
+
+
+class TestCountByValue:
+
+    DOCS = {f"job{i}": {"status": "queued" if i % 3 else "running"} for i in range(30)}
+
+    @pytest.fixture
+    def db(self):
+        return FakeDB({"catalog_jobs": self.DOCS})
+
+    def test_one_aggregation_per_value(self, db):
+
+        counts = count_by_value("catalog_jobs", "status", ["queued", "running", "failed"], db=db)
+
+        assert counts == {"queued": 20, "running": 10, "failed": 0}
+        assert sorted(query.filters for query in db.aggregations) == [
+            (("status", "==", "failed"),), (("status", "==", "queued"),), (("status", "==", "running"),),
+        ]
+        assert db.queries == []
+
+    def test_no_values_no_aggregations(self, db):
+        assert count_by_value("catalog_jobs", "status", [], db=db) == {}
+        assert db.aggregations == []
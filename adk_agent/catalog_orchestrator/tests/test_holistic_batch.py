@@ -0,0 +1,140 @@
+"""
+Tests for batched holistic enrichment (K exercises per LLM call).
+
+The batch prompt builder and the single-exercise path are replaced so the
+tests only cover response parsing, per-item post-processing and fallback.
+"""
+
+import json
+
+import pytest
+
+from app.enrichment import engine
+from app.enrichment.engine import enrich_exercises_holistic_batch
+from app.enrichment.llm_client import MockLLMClient
+
+
+class ScriptedClient(MockLLMClient):
+    """Returns a fixed batch response and counts single-exercise fallbacks."""
+
+    def __init__(self, batch_response):
+        super().__init__()
+        self.batch_response = batch_response
+        self.batch_calls = 0
+        self.single_calls = 0
+        self.discarded = []
+
+    def complete(self, prompt, output_schema=None, response_schema=None, require_reasoning=False):
+        self.batch_calls += 1
+        return self.batch_response
+
+    def discard_cached_response(self, prompt, output_schema=None, response_schema=None,
+                                require_reasoning=False, prefix=None):
+        self.discarded.append(prompt)
+
+
+def _single(exercise, reviewer_hint="", llm_client=None, use_pro_model=False):
+    llm_client.single_calls += 1
+    return {
+        "success": True,
+        "changes": {"category": "isolation"},
+        "reasoning": "single",
+        "confidence": "high",
+    }
+
+
+@pytest.fixture(autouse=True)
+def isolate_prompts(monkeypatch):
+    monkeypatch.setattr(
+        engine, "_build_holistic_batch_prompt",
+        lambda exercises, hints: ("", f"BATCH {len(exercises)}"),
+    )
+    monkeypatch.setattr(engine, "enrich_exercise_holistic", _single)
+
+
+def _exercises(n):
+    return [{"id": f"ex-{i}", "name": f"Exercise {i}"} for i in range(n)]
+
+
+def _item(key, changes):
+    return {"exercise_key": key, "reasoning": "batch", "confidence": "high", "changes": changes}
+
+
+class TestEnrichExercisesHolisticBatch:
+
+    def test_one_call_per_batch(self):
+        response = json.dumps({"results": [
+            _item("ex1", {"category": "compound"}),
+            _item("ex2", {}),
+            _item("ex3", {"movement.type": "push"}),
+        ]})
+        client = ScriptedClient(response)
+
+        results = enrich_exercises_holistic_batch(_exercises(3), llm_client=client, batch_size=3)
+
+        assert client.batch_calls == 1
+        assert client.single_calls == 0
+        assert client.discarded == []
+        assert [r["changes"] for r in results] == [
+            {"category": "compound"}, {}, {"movement.type": "push"},
+        ]
+        assert all(r["success"] for r in results)
+
+    def test_missing_item_falls_back_to_single_call(self):
+        response = json.dumps({"results": [_item("ex1", {"category": "compound"})]})
+        client = ScriptedClient(response)
+
+        results = enrich_exercises_holistic_batch(_exercises(2), llm_client=client, batch_size=2)
+
+        assert client.single_calls == 1
+        assert results[0]["reasoning"] == "batch"
+        assert results[1]["reasoning"] == "single"
+        # The partial answer must not be served from the response cache again
+        assert client.discarded == ["BATCH 2"]
+
+    def test_validation_drop_falls_back_to_single_call(self):
+        response = json.dumps({"results": [
+            _item("ex1", {"description": "Too short."}),
+            _item("ex2", {"category": "compound"}),
+        ]})
+        client = ScriptedClient(response)
+
+        results = enrich_exercises_holistic_batch(_exercises(2), llm_client=client, batch_size=2)
+
+        assert client.single_calls == 1
+        assert results[0]["changes"] == {"category": "isolation"}
+        assert results[1]["changes"] == {"category": "compound"}
+
+    def test_unparseable_response_falls_back_for_whole_batch(self):
+        client = ScriptedClient("not json at all")
+
+        results = enrich_exercises_holistic_batch(_exercises(3), llm_client=client, batch_size=3)
+
+        assert client.single_calls == 3
+        assert all(r["reasoning"] == "single" for r in results)
+        assert client.discarded == ["BATCH 3"]
+
+    def test_duplicate_keys_fall_back(self):
+        response = json.dumps({"results": [
+            _item("ex1", {"category": "compound"}),
+            _item("ex1", {"category": "core"}),
+            _item("ex2", {}),
+        ]})
+        client = ScriptedClient(response)
+
+        results = enrich_exercises_holistic_batch(_exercises(2), llm_client=client, batch_size=2)
+
+        assert client.single_calls == 1
+        assert results[0]["reasoning"] == "single"
+        assert results[1]["changes"] == {}
+
+    def test_splits_into_batches_in_input_order(self):
+        response = json.dumps({"results": [_item("ex1", {}), _item("ex2", {})]})
+        client = ScriptedClient(response)
+
+        results = enrich_exercises_holistic_batch(_exercises(5), llm_client=client, batch_size=2)
+
+        assert client.batch_calls == 2
+        assert client.single_calls == 1  # trailing batch of one uses the single path
+        assert len(results) == 5
+        assert results[4]["reasoning"] == "single"
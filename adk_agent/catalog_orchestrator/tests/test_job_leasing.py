@@ -0,0 +1,261 @@
+"""
+Tests for batch job leasing: poll_jobs, renew_leases, release_jobs and the
+worker's BatchLeaseHeartbeat.
+
+Runs against the shared in-memory Firestore fake (tests/fakes.py).
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.jobs import queue
+from app.jobs.models import JobStatus, JobType
+from workers import catalog_worker
+from workers.catalog_worker import BatchLeaseHeartbeat, CatalogWorker
+
+
+ENRICH = JobType.CATALOG_ENRICH_FIELD.value
+
+
+@pytest.fixture
+def db(fake_db, monkeypatch):
+    monkeypatch.setattr(queue, "get_db", lambda: fake_db)
+    return fake_db
+
+
+def _job(db, job_id, **fields):
+    data = {
+        "id": job_id,
+        "type": ENRICH,
+        "queue": "priority",
+        "priority": 100,
+        "status": JobStatus.QUEUED.value,
+        "attempts": 0,
+        "payload": {},
+    }
+    data.update(fields)
+    db.docs(queue.JOBS_COLLECTION)[job_id] = data
+    return data
+
+
+def _leased(db, job_id, owner="worker-1", expires_in=60, status=JobStatus.LEASED.value):
+    return _job(
+        db, job_id,
+        status=status,
+        lease_owner=owner,
+        lease_expires_at=datetime.utcnow() + timedelta(seconds=expires_in),
+        attempts=1,
+    )
+
+
+def _doc(db, job_id):
+    return db.docs(queue.JOBS_COLLECTION)[job_id]
+
+
+class TestPollJobs:
+
+    def test_leases_batch_in_queue_order(self, db):
+        _job(db, "low", priority=10)
+        _job(db, "high", priority=200)
+        _job(db, "later", run_after=datetime.utcnow() + timedelta(hours=1))
+        _job(db, "running", status=JobStatus.RUNNING.value)
+
+        jobs = queue.poll_jobs("worker-1", 10)
+
+        assert [job.id for job in jobs] == ["high", "low"]
+        for job in jobs:
+            assert job.status == JobStatus.LEASED
+            assert job.lease_owner == "worker-1"
+            assert job.attempts == 1
+            assert _doc(db, job.id)["status"] == JobStatus.LEASED.value
+        assert _doc(db, "later")["status"] == JobStatus.QUEUED.value
+
+    def test_stops_at_max_jobs(self, db):
+        for i in range(5):
+            _job(db, f"job{i}")
+
+        jobs = queue.poll_jobs("worker-1", 2)
+
+        assert len(jobs) == 2
+        statuses = [data["status"] for data in db.docs(queue.JOBS_COLLECTION).values()]
+        assert statuses.count(JobStatus.LEASED.value) == 2
+
+    def test_transaction_reads_only_the_batch(self, db):
+        for i in range(5):
+            _job(db, f"job{i}")
+        _job(db, "held", priority=200, lease_expires_at=datetime.utcnow() + timedelta(seconds=60))
+
+        jobs = queue.poll_jobs("worker-1", 3)
+
+        assert [job.id for job in jobs] == ["job0", "job1", "job2"]
+        assert [sorted(ids) for ids, _ in db.get_all_calls] == [["job0", "job1", "job2"]]
+
+    def test_job_leased_after_query_is_dropped(self, db, monkeypatch):
+        for i in range(5):
+            _job(db, f"job{i}")
+        get_all = db.get_all
+
+        def leased_elsewhere(refs, **kwargs):
+            _doc(db, "job1").update(status=JobStatus.LEASED.value, lease_owner="worker-2")
+            return get_all(refs, **kwargs)
+
+        monkeypatch.setattr(db, "get_all", leased_elsewhere)
+
+        jobs = queue.poll_jobs("worker-1", 3)
+
+        # Not refilled from job3/job4; the next poll picks them up
+        assert [job.id for job in jobs] == ["job0", "job2"]
+        assert _doc(db, "job1")["lease_owner"] == "worker-2"
+        assert _doc(db, "job3")["status"] == JobStatus.QUEUED.value
+
+    def test_empty_queue(self, db):
+        assert queue.poll_jobs("worker-1", 5) == []
+
+
+class TestRenewLeases:
+
+    def test_renews_only_leases_held_by_worker(self, db):
+        _leased(db, "expiring", expires_in=30)
+        fresh = _leased(db, "fresh", expires_in=290)["lease_expires_at"]
+        _leased(db, "other", owner="worker-2", expires_in=30)
+
+        held = queue.renew_leases(["expiring", "fresh", "other", "missing"], "worker-1")
+
+        assert sorted(held) == ["expiring", "fresh"]
+        renewed = _doc(db, "expiring")["lease_expires_at"]
+        assert renewed > datetime.utcnow() + timedelta(seconds=queue.LEASE_RENEWAL_MARGIN_SECS)
+        assert _doc(db, "fresh")["lease_expires_at"] == fresh
+        assert _doc(db, "other")["lease_owner"] == "worker-2"
+
+    def test_failed_transaction_returns_none(self, db, monkeypatch):
+        _leased(db, "job0")
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("contention")
+
+        monkeypatch.setattr(db, "get_all", fail)
+
+        assert queue.renew_leases(["job0"], "worker-1") is None
+
+
+class TestReleaseJobs:
+
+    def test_returns_unstarted_leases_to_queue(self, db):
+        _leased(db, "waiting")
+        _leased(db, "started", status=JobStatus.RUNNING.value)
+        _leased(db, "other", owner="worker-2")
+
+        released = queue.release_jobs(["waiting", "started", "other", "missing"], "worker-1")
+
+        assert released == 1
+        waiting = _doc(db, "waiting")
+        assert waiting["status"] == JobStatus.QUEUED.value
+        assert waiting["lease_owner"] is None
+        assert waiting["lease_expires_at"] is None
+        assert waiting["attempts"] == 0
+        assert _doc(db, "started")["status"] == JobStatus.RUNNING.value
+        assert _doc(db, "other")["lease_owner"] == "worker-2"
+
+    def test_released_jobs_can_be_polled_again(self, db):
+        _job(db, "job0")
+        queue.poll_jobs("worker-1", 5)
+        queue.release_jobs(["job0"], "worker-1")
+
+        jobs = queue.poll_jobs("worker-2", 5)
+
+        assert [(job.id, job.lease_owner, job.attempts) for job in jobs] == [("job0", "worker-2", 1)]
+
+
+class TestBatchLeaseHeartbeat:
+
+    def _run_once(self, monkeypatch, renew):
+        """Start a heartbeat, let it renew once, and stop it."""
+        monkeypatch.setattr(catalog_worker, "HEARTBEAT_INTERVAL_SECS", 0.01)
+        renewed = threading.Event()
+        calls = []
+
+        def renew_leases(job_ids, worker_id):
+            calls.append(list(job_ids))
+            result = renew(job_ids)
+            renewed.set()
+            return result
+
+        monkeypatch.setattr(queue, "renew_leases", renew_leases)
+        heartbeat = BatchLeaseHeartbeat("worker-1")
+        heartbeat.add(["job0", "job1", "job2"])
+        heartbeat.start()
+        assert renewed.wait(2.0)
+        heartbeat.stop()
+        return heartbeat, calls
+
+    def test_lost_leases_are_not_claimed(self, monkeypatch):
+        heartbeat, calls = self._run_once(monkeypatch, lambda ids: ["job0", "job2"])
+
+        assert calls[0] == ["job0", "job1", "job2"]
+        assert heartbeat.pending() == ["job0", "job2"]
+        assert heartbeat.claim("job0") is True
+        assert heartbeat.claim("job1") is False
+        assert heartbeat.pending() == ["job2"]
+
+    def test_failed_renewal_keeps_jobs(self, monkeypatch):
+        heartbeat, _ = self._run_once(monkeypatch, lambda ids: None)
+
+        assert heartbeat.pending() == ["job0", "job1", "job2"]
+        assert heartbeat.claim("job1") is True
+
+    def test_claimed_jobs_are_no_longer_renewed(self, monkeypatch):
+        monkeypatch.setattr(catalog_worker, "HEARTBEAT_INTERVAL_SECS", 0.01)
+        calls = []
+        second = threading.Event()
+
+        def renew_leases(job_ids, worker_id):
+            calls.append(list(job_ids))
+            if len(calls) >= 2:
+                second.set()
+            return list(job_ids)
+
+        monkeypatch.setattr(queue, "renew_leases", renew_leases)
+        heartbeat = BatchLeaseHeartbeat("worker-1")
+        heartbeat.add(["job0", "job1"])
+        heartbeat.claim("job0")
+        heartbeat.start()
+        assert second.wait(2.0)
+        heartbeat.stop()
+
+        assert all(ids == ["job1"] for ids in calls)
+
+
+class TestWorkerPoll:
+
+    @pytest.fixture
+    def polls(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(queue, "poll_jobs", lambda worker_id, n: calls.append(n) or [])
+        monkeypatch.setattr(queue, "poll_job", lambda worker_id: calls.append(1))
+        return calls
+
+    def test_batch_sized_to_remaining_job_limit(self, monkeypatch, polls):
+        monkeypatch.setattr(catalog_worker, "MAX_JOBS_PER_RUN", 10)
+        monkeypatch.setattr(catalog_worker, "POLL_BATCH_SIZE", 5)
+
+        CatalogWorker("worker-1")._poll(7)
+
+        assert polls == [3]
+
+    @pytest.mark.parametrize("batch_size", [1, 5])
+    def test_no_poll_once_job_limit_is_claimed(self, monkeypatch, polls, batch_size):
+        monkeypatch.setattr(catalog_worker, "MAX_JOBS_PER_RUN", 4)
+        monkeypatch.setattr(catalog_worker, "POLL_BATCH_SIZE", batch_size)
+
+        assert CatalogWorker("worker-1")._poll(4) == []
+        assert polls == []
+
+    def test_unlimited_run_polls_full_batch(self, monkeypatch, polls):
+        monkeypatch.setattr(catalog_worker, "MAX_JOBS_PER_RUN", 0)
+        monkeypatch.setattr(catalog_worker, "POLL_BATCH_SIZE", 5)
+
+        CatalogWorker("worker-1")._poll(100)
+
+        assert polls == [5]
@@ -0,0 +1,204 @@
+"""
+Tests for fan-out progress aggregation.
+
+Runs against the shared in-memory Firestore fake (tests/fakes.py).
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.jobs import queue
+from app.jobs.models import JobType
+from app.jobs.progress import (
+    JOB_PROGRESS_COLLECTION,
+    rebuild_job_progress,
+    record_child_progress,
+    shard_progress_counts,
+    summarize_progress,
+)
+
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db(fake_db, monkeypatch):
+    monkeypatch.setattr(queue, "get_db", lambda: fake_db)
+    return fake_db
+
+
+def _progress(db, parent_job_id):
+    return db.docs(JOB_PROGRESS_COLLECTION).get(parent_job_id)
+
+
+def _shard(parent="job-parent", **summary):
+    return {"payload": {"parent_job_id": parent}}, {"shard_result": summary}
+
+
+def _record(db, job_data, status, result_summary=None, sign=1):
+    batch = db.batch()
+    added = record_child_progress(db, job_data, status, batch, result_summary, sign=sign)
+    batch.commit()
+    return added
+
+
+class TestSummarizeProgress:
+
+    def test_eta_from_shard_rate(self):
+        data = {"children_total": 10, "children_done": 2, "started_at": T0}
+
+        summary = summarize_progress(data, now=T0 + timedelta(minutes=4))
+
+        assert summary["percent"] == 20.0
+        assert summary["remaining"] == 8
+        assert summary["eta_secs"] == 16 * 60
+        assert not summary["complete"]
+
+    def test_no_eta_before_first_shard(self):
+        summary = summarize_progress({"children_total": 3, "children_done": 0, "started_at": T0}, now=T0)
+
+        assert summary["eta_secs"] is None
+
+    def test_complete(self):
+        summary = summarize_progress({"children_total": 3, "children_done": 3, "started_at": T0}, now=T0)
+
+        assert summary["complete"]
+        assert summary["eta_secs"] == 0
+
+
+class TestShardProgressCounts:
+
+    def test_skipped_counts_as_no_changes(self):
+        result = {"shard_result": {"succeeded": 3, "failed": 1, "skipped": 2, "tokens_used": 900, "results": []}}
+
+        assert shard_progress_counts(result) == {
+            "succeeded": 3, "failed": 1, "no_changes": 2, "tokens_used": 900,
+        }
+
+    def test_non_shard_result(self):
+        assert shard_progress_counts({"success": True}) is None
+
+
+class TestProgressMaintenance:
+
+    def test_bulk_fan_out_starts_progress(self, db):
+        db.collections["catalog_jobs"] = {"job-parent": {"status": "running"}}
+        specs = [
+            {"job_type": JobType.CATALOG_ENRICH_FIELD_SHARD, "exercise_doc_ids": [f"ex{i}", f"ex{i}b"]}
+            for i in range(3)
+        ]
+
+        queue.create_jobs_bulk(specs, parent_job_id="job-parent")
+
+        progress = _progress(db, "job-parent")
+        assert progress["children_total"] == 3
+        assert progress["exercises_total"] == 6
+        assert progress["children_done"] == 0
+
+    def test_shard_finishing_during_fan_out_is_kept(self, db, monkeypatch):
+        db.collections["catalog_jobs"] = {"job-parent": {"status": "running"}}
+        monkeypatch.setattr(queue, "MAX_BATCH_WRITES", 2)
+        specs = [
+            {"job_type": JobType.CATALOG_ENRICH_FIELD_SHARD, "exercise_doc_ids": [f"ex{i}"]}
+            for i in range(3)
+        ]
+
+        def finish_first_shard(batch):
+            # First child batch is in; its first shard completes before the second batch commits
+            if db.commits == 3:
+                job_id = next(doc_id for doc_id in db.docs("catalog_jobs") if doc_id != "job-parent")
+                _record(db, db.docs("catalog_jobs")[job_id], "succeeded", {"shard_result": {"succeeded": 1}})
+        db.before_commit = finish_first_shard
+
+        queue.create_jobs_bulk(specs, parent_job_id="job-parent", max_concurrency=1)
+
+        progress = _progress(db, "job-parent")
+        assert progress["children_total"] == 3
+        assert progress["children_done"] == 1
+        assert progress["succeeded"] == 1
+
+    def test_failed_children_are_trimmed_from_fan_out(self, db, monkeypatch):
+        db.collections["catalog_jobs"] = {"job-parent": {"status": "running"}}
+        monkeypatch.setattr(queue, "MAX_BATCH_WRITES", 2)
+        specs = [
+            {"job_type": JobType.CATALOG_ENRICH_FIELD_SHARD, "exercise_doc_ids": [f"ex{i}", f"ex{i}b"]}
+            for i in range(3)
+        ]
+
+        def fail_second_child_batch(batch):
+            if db.commits == 3:
+                raise RuntimeError("commit failed")
+        db.before_commit = fail_second_child_batch
+
+        with pytest.raises(queue.BulkCreateError) as err:
+            queue.create_jobs_bulk(specs, parent_job_id="job-parent", max_concurrency=1)
+
+        assert len(err.value.created_ids) == 2
+        parent = db.docs("catalog_jobs")["job-parent"]
+        assert parent["child_job_ids"] == err.value.created_ids
+        assert parent["children_total"] == 2
+        progress = _progress(db, "job-parent")
+        assert (progress["children_total"], progress["exercises_total"]) == (2, 4)
+
+    def test_shard_completions_accumulate(self, db):
+        job_data, summary = _shard(succeeded=4, no_changes=1, tokens_used=500)
+        _record(db, job_data, "succeeded", summary)
+        _record(db, job_data, "succeeded", summary)
+        _record(db, job_data, "deadletter")
+
+        progress = _progress(db, "job-parent")
+        assert progress["children_done"] == 3
+        assert progress["children_succeeded"] == 2
+        assert progress["children_failed"] == 1
+        assert progress["succeeded"] == 8
+        assert progress["tokens_used"] == 1000
+
+    def test_retry_takes_shard_back_out(self, db):
+        job_data, summary = _shard(succeeded=4, tokens_used=500)
+        _record(db, job_data, "succeeded", summary)
+
+        _record(db, job_data, "succeeded", summary, sign=-1)
+
+        progress = _progress(db, "job-parent")
+        assert progress["children_done"] == 0
+        assert progress["succeeded"] == 0
+
+    def test_jobs_without_parent_are_ignored(self, db):
+        assert not _record(db, {"payload": {}}, "succeeded")
+        assert _progress(db, "job-parent") is None
+
+
+class TestRebuildJobProgress:
+
+    def test_recomputes_from_shards(self, db):
+        db.collections["catalog_jobs"] = {
+            "job-a": {"status": "succeeded", "created_at": T0 + timedelta(minutes=1),
+                      "payload": {"parent_job_id": "job-parent", "exercise_doc_ids": ["ex1", "ex2"]},
+                      "result_summary": {"shard_result": {"succeeded": 2, "tokens_used": 300}}},
+            "job-b": {"status": "queued", "created_at": T0,
+                      "payload": {"parent_job_id": "job-parent", "exercise_doc_ids": ["ex3"]}},
+            "job-c": {"status": "needs_review", "created_at": T0,
+                      "payload": {"parent_job_id": "job-parent", "exercise_doc_ids": ["ex4"]}},
+            "job-other": {"status": "succeeded", "payload": {"parent_job_id": "job-x"}},
+        }
+
+        result = rebuild_job_progress("job-parent", db)
+
+        assert _progress(db, "job-parent") == result
+        assert result["children_total"] == 3
+        assert result["exercises_total"] == 4
+        assert result["children_done"] == 2
+        assert result["children_failed"] == 1
+        assert result["succeeded"] == 2
+        assert result["tokens_used"] == 300
+        assert result["started_at"] == T0
+
+    def test_dry_run_writes_nothing(self, db):
+        db.collections["catalog_jobs"] = {
+            "job-a": {"status": "queued", "payload": {"parent_job_id": "job-parent"}},
+        }
+
+        rebuild_job_progress("job-parent", db, dry_run=True)
+
+        assert _progress(db, "job-parent") is None
@@ -0,0 +1,323 @@
+"""
+Tests for the pending-job index.
+
+Runs against the shared in-memory Firestore fake (tests/fakes.py).
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.jobs import queue
+from app.jobs.models import JobType
+from app.reviewer.catalog_reviewer import (
+    BatchReviewResult,
+    IssueCategory,
+    IssueSeverity,
+    QualityIssue,
+    ReviewResult,
+)
+from app.reviewer.review_job_creator import ReviewJobCreator
+from app.jobs.targets import (
+    INDEX_MARKERS_COLLECTION,
+    JOB_TARGETS_COLLECTION,
+    JOB_TARGETS_MARKER,
+    clear_job_targets,
+    find_pending_targets,
+    job_target_writes,
+    rebuild_job_targets,
+)
+
+
+T0 = datetime(2026, 1, 1)
+ENRICH = JobType.CATALOG_ENRICH_FIELD.value
+
+
+def _targets(db):
+    return {doc_id: data["job_id"] for doc_id, data in db.docs(JOB_TARGETS_COLLECTION).items()}
+
+
+def _index(db, job_id, exercise_ids, job_type=ENRICH, status="queued"):
+    db.docs("catalog_jobs").setdefault(job_id, {
+        "type": job_type, "status": status, "payload": {"exercise_doc_ids": list(exercise_ids)},
+    })
+    batch = db.batch()
+    for ref, data in job_target_writes(db, job_id, job_type, exercise_ids, T0):
+        batch.set(ref, data)
+    batch.commit()
+
+
+def _mark_built(db):
+    db.docs(INDEX_MARKERS_COLLECTION)[JOB_TARGETS_MARKER] = {"built_at": T0}
+
+
+@pytest.fixture
+def db(fake_db, monkeypatch):
+    monkeypatch.setattr(queue, "get_db", lambda: fake_db)
+    _mark_built(fake_db)
+    return fake_db
+
+
+class TestJobTargets:
+
+    def test_create_job_indexes_targets_in_one_batch(self, db):
+        job = queue.create_job(JobType.CATALOG_ENRICH_FIELD, exercise_doc_ids=["ex1", "ex2", "ex1"])
+
+        assert db.commits == 1
+        assert _targets(db) == {f"{ENRICH}:ex1": job.id, f"{ENRICH}:ex2": job.id}
+
+    def test_large_job_is_written_after_its_index(self, db, monkeypatch):
+        monkeypatch.setattr(queue, "MAX_BATCH_WRITES", 4)
+
+        job = queue.create_job(JobType.CATALOG_ENRICH_FIELD, exercise_doc_ids=[f"ex{i}" for i in range(6)])
+
+        assert db.commits == 2
+        assert len(_targets(db)) == 6
+        assert find_pending_targets(ENRICH, ["ex0", "ex5"], db=db) == {"ex0": job.id, "ex5": job.id}
+
+    def test_failed_index_batch_leaves_no_job(self, db, monkeypatch):
+        monkeypatch.setattr(queue, "MAX_BATCH_WRITES", 4)
+        exercise_ids = [f"ex{i}" for i in range(6)]
+
+        def fail_second(batch):
+            if db.commits == 2:
+                raise RuntimeError("commit failed")
+        db.before_commit = fail_second
+
+        with pytest.raises(RuntimeError):
+            queue.create_job(JobType.CATALOG_ENRICH_FIELD, exercise_doc_ids=exercise_ids)
+
+        # Entries from the first batch point at a job that was never written
+        assert len(_targets(db)) == 4
+        assert db.docs("catalog_jobs") == {}
+        assert find_pending_targets(ENRICH, exercise_ids, db=db) == {}
+
+        db.before_commit = None
+        job = queue.create_job(JobType.CATALOG_ENRICH_FIELD, exercise_doc_ids=exercise_ids)
+
+        assert find_pending_targets(ENRICH, exercise_ids, db=db) == {ex_id: job.id for ex_id in exercise_ids}
+
+    def test_shard_jobs_are_not_indexed(self, db):
+        queue.create_job(JobType.CATALOG_ENRICH_FIELD_SHARD, exercise_doc_ids=["ex1"])
+
+        assert _targets(db) == {}
+
+    def test_find_pending_jobs_batch_reads_index_then_jobs(self, db):
+        _index(db, "job-a", ["ex1"])
+        _index(db, "job-b", ["ex3"], job_type=JobType.TARGETED_FIX.value)
+
+        found = queue.find_pending_jobs_batch(
+            JobType.CATALOG_ENRICH_FIELD, [f"ex{i}" for i in range(100)],
+        )
+
+        assert found == {"ex1": "job-a"}
+        assert [(len(ids), fields) for ids, fields in db.get_all_calls] == [
+            (100, ["job_id", "exercise_id"]), (1, ["status"]),
+        ]
+
+    def test_entries_for_finished_or_missing_jobs_are_ignored(self, db):
+        _index(db, "job-done", ["ex1"])
+        _index(db, "job-gone", ["ex2"])
+        _index(db, "job-live", ["ex3"])
+        db.docs("catalog_jobs")["job-done"]["status"] = "succeeded"
+        del db.docs("catalog_jobs")["job-gone"]
+
+        found = find_pending_targets(ENRICH, ["ex1", "ex2", "ex3"], db=db)
+
+        assert found == {"ex3": "job-live"}
+
+    def test_unbuilt_index_falls_back_to_pending_jobs(self, db):
+        del db.docs(INDEX_MARKERS_COLLECTION)[JOB_TARGETS_MARKER]
+        db.docs("catalog_jobs").update({
+            "job-a": {"type": ENRICH, "status": "queued", "payload": {"exercise_doc_ids": ["ex1", "ex2"]}},
+            "job-b": {"type": ENRICH, "status": "succeeded", "payload": {"exercise_doc_ids": ["ex3"]}},
+            "job-c": {"type": "TARGETED_FIX", "status": "queued", "payload": {"exercise_doc_ids": ["ex3"]}},
+        })
+
+        found = find_pending_targets(ENRICH, ["ex2", "ex3"], db=db)
+
+        assert found == {"ex2": "job-a"}
+        assert db.get_all_calls == []
+
+    def test_find_pending_job(self, db):
+        _index(db, "job-a", ["ex1"])
+
+        assert queue.find_pending_job(JobType.CATALOG_ENRICH_FIELD, "ex1") == "job-a"
+        assert queue.find_pending_job(JobType.CATALOG_ENRICH_FIELD, "ex2") is None
+
+    def test_clear_only_removes_own_entries(self, db):
+        _index(db, "job-old", ["ex1", "ex2"])
+        _index(db, "job-new", ["ex2"])
+
+        batch = db.batch()
+        cleared = clear_job_targets(db, "job-old", {
+            "type": ENRICH, "payload": {"exercise_doc_ids": ["ex1", "ex2"]},
+        }, batch)
+        batch.commit()
+
+        assert cleared == 1
+        assert find_pending_targets(ENRICH, ["ex1", "ex2"], db=db) == {"ex2": "job-new"}
+
+
+class TestCreateJobsBulk:
+
+    def test_packs_jobs_and_targets_into_full_batches(self, db):
+        specs = [
+            {"job_type": JobType.CATALOG_ENRICH_FIELD, "exercise_doc_ids": [f"ex{i}a", f"ex{i}b"]}
+            for i in range(400)
+        ]
+
+        job_ids = queue.create_jobs_bulk(specs, max_concurrency=1)
+
+        # 1200 writes, no job split across batches
+        assert db.commits == 3
+        assert len(set(job_ids)) == 400
+        assert list(db.collections["catalog_jobs"]) == job_ids
+        assert _targets(db)[f"{ENRICH}:ex7b"] == job_ids[7]
+
+    def test_large_job_spills_into_next_batch(self, db):
+        specs = [{"job_type": JobType.CATALOG_ENRICH_FIELD, "exercise_doc_ids": [f"ex{i}" for i in range(700)]}]
+
+        queue.create_jobs_bulk(specs)
+
+        assert db.commits == 2
+        assert len(_targets(db)) == 700
+
+    def test_large_job_with_failed_index_batch_is_not_created(self, db, monkeypatch):
+        monkeypatch.setattr(queue, "MAX_BATCH_WRITES", 4)
+        specs = [
+            {"job_type": JobType.CATALOG_ENRICH_FIELD, "exercise_doc_ids": ["small"]},
+            {"job_type": JobType.CATALOG_ENRICH_FIELD, "exercise_doc_ids": [f"ex{i}" for i in range(6)]},
+        ]
+
+        def fail_index(batch):
+            if any(ref.id == f"{ENRICH}:ex3" for _, ref, *_ in batch.ops):
+                raise RuntimeError("commit failed")
+        db.before_commit = fail_index
+
+        with pytest.raises(queue.BulkCreateError) as err:
+            queue.create_jobs_bulk(specs, max_concurrency=1)
+
+        assert (len(err.value.created_ids), len(err.value.failed_ids)) == (1, 1)
+        assert list(db.collections["catalog_jobs"]) == err.value.created_ids
+        assert find_pending_targets(ENRICH, ["small", "ex0", "ex5"], db=db) == {"small": err.value.created_ids[0]}
+
+    def test_parent_records_fan_out(self, db):
+        db.collections["catalog_jobs"] = {"job-parent": {"status": "running"}}
+        specs = [
+            {"job_type": JobType.CATALOG_ENRICH_FIELD_SHARD, "exercise_doc_ids": [f"ex{i}"]}
+            for i in range(3)
+        ]
+
+        job_ids = queue.create_jobs_bulk(specs, parent_job_id="job-parent")
+
+        jobs = db.collections["catalog_jobs"]
+        assert jobs["job-parent"]["child_job_ids"] == job_ids
+        assert jobs["job-parent"]["children_total"] == 3
+        assert all(jobs[job_id]["payload"]["parent_job_id"] == "job-parent" for job_id in job_ids)
+
+    def test_partial_failure_reports_committed_jobs(self, db):
+        specs = [
+            {"job_type": JobType.CATALOG_ENRICH_FIELD, "exercise_doc_ids": [f"ex{i}a", f"ex{i}b"]}
+            for i in range(400)
+        ]
+
+        def fail_second(batch):
+            if db.commits == 2:
+                raise RuntimeError("commit failed")
+        db.before_commit = fail_second
+
+        with pytest.raises(queue.BulkCreateError) as err:
+            queue.create_jobs_bulk(specs, max_concurrency=1)
+
+        assert db.commits == 3
+        assert len(err.value.created_ids) + len(err.value.failed_ids) == 400
+        assert set(err.value.created_ids) == set(db.collections["catalog_jobs"])
+        assert isinstance(err.value.__cause__, RuntimeError)
+
+    def test_preassigned_ids_are_kept(self, db):
+        job_id = queue.new_job_id()
+
+        assert queue.create_jobs_bulk([{"job_type": JobType.TARGETED_FIX, "job_id": job_id}]) == [job_id]
+        assert job_id in db.collections["catalog_jobs"]
+
+
+class TestReviewJobCreator:
+
+    @staticmethod
+    def _results(count):
+        issue = QualityIssue("description", IssueCategory.CONTENT, IssueSeverity.MEDIUM, "Missing description")
+        return BatchReviewResult(results=[
+            ReviewResult(f"ex{i}", f"Exercise {i}", issues=[issue], needs_enrichment=True)
+            for i in range(count)
+        ])
+
+    def test_batch_is_one_bulk_write_and_skips_pending(self, db):
+        _index(db, "job-a", ["ex1"])
+
+        summary = ReviewJobCreator(dry_run=False).create_jobs_from_batch_review(self._results(3))
+
+        assert summary["jobs_created"] == 3
+        assert summary["jobs"][1]["existing_job_id"] == "job-a"
+        assert db.commits == 2
+        assert _targets(db)[f"{ENRICH}:ex2"] == summary["jobs"][2]["job_id"]
+
+    def test_only_uncommitted_jobs_are_marked_failed(self, db, monkeypatch):
+        monkeypatch.setattr(queue, "MAX_BATCH_WRITES", 4)
+
+        def fail_second(batch):
+            if db.commits == 2:
+                raise RuntimeError("commit failed")
+        db.before_commit = fail_second
+
+        creator = ReviewJobCreator(dry_run=False)
+        summary = creator.create_jobs_from_batch_review(self._results(4))
+
+        created = [info for info in summary["jobs"] if "job_id" in info]
+        failed = [info for info in summary["jobs"] if "error" in info]
+        assert (len(created), len(failed)) == (2, 2)
+        assert {info["job_id"] for info in created} == set(db.collections["catalog_jobs"])
+        assert failed[0]["error"] == "commit failed"
+        assert creator._jobs_created == 2
+
+
+class TestRebuildJobTargets:
+
+    @pytest.fixture
+    def jobs(self, db):
+        db.collections["catalog_jobs"] = {
+            "job-old": {"type": ENRICH, "status": "queued", "created_at": T0,
+                        "payload": {"exercise_doc_ids": ["ex1", "ex2"]}},
+            "job-new": {"type": ENRICH, "status": "running", "created_at": T0 + timedelta(hours=1),
+                        "payload": {"exercise_doc_ids": ["ex2"]}},
+            "job-done": {"type": ENRICH, "status": "succeeded", "created_at": T0,
+                         "payload": {"exercise_doc_ids": ["ex3"]}},
+        }
+        return db
+
+    def test_newest_pending_job_wins_and_stale_removed(self, jobs):
+        _index(jobs, "job-done", ["ex3"])
+
+        result = rebuild_job_targets(jobs)
+
+        assert result == {"pending_jobs": 2, "targets": 2, "written": 2, "deleted": 1}
+        assert _targets(jobs) == {f"{ENRICH}:ex1": "job-old", f"{ENRICH}:ex2": "job-new"}
+
+    def test_dry_run_writes_nothing(self, jobs):
+        del jobs.docs(INDEX_MARKERS_COLLECTION)[JOB_TARGETS_MARKER]
+
+        result = rebuild_job_targets(jobs, dry_run=True)
+
+        assert result["written"] == 2
+        assert jobs.commits == 0
+        assert _targets(jobs) == {}
+        assert jobs.docs(INDEX_MARKERS_COLLECTION) == {}
+
+    def test_rebuild_writes_built_marker(self, jobs):
+        del jobs.docs(INDEX_MARKERS_COLLECTION)[JOB_TARGETS_MARKER]
+
+        rebuild_job_targets(jobs)
+
+        marker = jobs.docs(INDEX_MARKERS_COLLECTION)[JOB_TARGETS_MARKER]
+        assert (marker["pending_jobs"], marker["targets"]) == (2, 2)
+        assert find_pending_targets(ENRICH, ["ex1", "ex3"], db=jobs) == {"ex1": "job-old"}
@@ -0,0 +1,288 @@
+"""
+Tests for the prompt-prefix cache, model registry and client helpers.
+
+No Vertex access: caches are driven with fake factories.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.enrichment import llm_client
+from app.enrichment.llm_client import (
+    MockLLMClient,
+    ModelRegistry,
+    PromptPrefixCache,
+    VertexLLMClient,
+    get_llm_client,
+)
+from app.enrichment.rate_limit import RateLimitedLLMClient
+
+
+LONG_PREFIX = "static guidance " * 1000  # ~4000 tokens
+
+
+class CountingCreate:
+    def __init__(self, fail: bool = False):
+        self.calls = 0
+        self.fail = fail
+
+    def __call__(self, key, ttl_secs):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("caching unavailable")
+        return f"cachedContents/{key[:8]}"
+
+
+class TestPromptPrefixCache:
+
+    def test_reuses_handle_by_hash(self):
+        cache = PromptPrefixCache(ttl_secs=3600, min_tokens=100, enabled=True)
+        create = CountingCreate()
+
+        first = cache.get("gemini-2.5-flash", LONG_PREFIX, create)
+        second = cache.get("gemini-2.5-flash", LONG_PREFIX, create)
+
+        assert first == second
+        assert create.calls == 1
+        assert cache.stats() == {"entries": 1, "hits": 1, "creates": 1, "failures": 0}
+
+    def test_keyed_by_model(self):
+        cache = PromptPrefixCache(ttl_secs=3600, min_tokens=100, enabled=True)
+        create = CountingCreate()
+
+        cache.get("gemini-2.5-flash", LONG_PREFIX, create)
+        cache.get("gemini-2.5-pro", LONG_PREFIX, create)
+
+        assert create.calls == 2
+
+    def test_short_prefix_goes_inline(self):
+        cache = PromptPrefixCache(ttl_secs=3600, min_tokens=100, enabled=True)
+        create = CountingCreate()
+
+        assert cache.get("gemini-2.5-flash", "short", create) is None
+        assert create.calls == 0
+
+    def test_failed_create_backs_off(self):
+        cache = PromptPrefixCache(ttl_secs=3600, min_tokens=100, enabled=True)
+        create = CountingCreate(fail=True)
+
+        assert cache.get("gemini-2.5-flash", LONG_PREFIX, create) is None
+        assert cache.get("gemini-2.5-flash", LONG_PREFIX, create) is None
+        assert create.calls == 1
+        assert cache.stats()["failures"] == 1
+
+    def test_expired_entry_recreated(self):
+        cache = PromptPrefixCache(ttl_secs=0, min_tokens=100, enabled=True)
+        create = CountingCreate()
+
+        cache.get("gemini-2.5-flash", LONG_PREFIX, create)
+        cache.get("gemini-2.5-flash", LONG_PREFIX, create)
+
+        assert create.calls == 2
+
+    def test_concurrent_callers_create_once(self):
+        cache = PromptPrefixCache(ttl_secs=3600, min_tokens=100, enabled=True)
+        create = CountingCreate()
+        threads = [
+            threading.Thread(target=cache.get, args=("gemini-2.5-flash", LONG_PREFIX, create))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert create.calls == 1
+
+    def test_invalidate_with_stale_handle_keeps_fresh_entry(self):
+        cache = PromptPrefixCache(ttl_secs=3600, min_tokens=100, enabled=True)
+        create = CountingCreate()
+        handle = cache.get("gemini-2.5-flash", LONG_PREFIX, create)
+
+        assert cache.invalidate("gemini-2.5-flash", LONG_PREFIX, "cachedContents/stale") is False
+        assert cache.get("gemini-2.5-flash", LONG_PREFIX, create) == handle
+        assert cache.invalidate("gemini-2.5-flash", LONG_PREFIX, handle) is True
+        assert cache.stats()["entries"] == 0
+
+
+class NotFound(Exception):
+    pass
+
+
+class ResourceExhausted(Exception):
+    pass
+
+
+class InvalidArgument(Exception):
+    pass
+
+
+class FakeCachedContent:
+    resource_name = "cachedContents/abc"
+
+    def __init__(self):
+        self.deleted = False
+
+    def delete(self):
+        self.deleted = True
+
+
+class FakeModel:
+    """Fails requests made through the cached prefix with `error`."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.requests = []
+
+    def generate_content(self, text, generation_config=None):
+        self.requests.append(text)
+        if self.error is not None:
+            raise self.error
+        return text
+
+
+class TestCachedPrefixFallback:
+
+    def _client(self, monkeypatch, error):
+        cache = PromptPrefixCache(ttl_secs=3600, min_tokens=100, enabled=True)
+        monkeypatch.setattr(llm_client, "_prefix_cache", cache)
+        client = VertexLLMClient(project_id="test")
+        client._initialized = True
+        handle = FakeCachedContent()
+        cached_model, inline_model = FakeModel(error), FakeModel()
+        monkeypatch.setattr(client, "_create_cached_prefix", lambda *args: handle)
+        monkeypatch.setattr(
+            client, "_get_model",
+            lambda model, reasoning, schema, cached: (cached_model if cached else inline_model, None),
+        )
+        monkeypatch.setattr(client, "_handle_response", lambda response, model: response)
+        return client, cache, handle, cached_model, inline_model
+
+    def test_missing_cache_falls_back_inline_and_deletes(self, monkeypatch):
+        client, cache, handle, cached_model, inline_model = self._client(monkeypatch, NotFound("gone"))
+
+        result = client.complete_with_prefix(LONG_PREFIX, "body")
+
+        assert result == LONG_PREFIX + "body"
+        assert cached_model.requests == ["body"]
+        assert handle.deleted
+        assert cache.stats()["entries"] == 0
+
+    def test_unrelated_bad_request_propagates_and_keeps_cache(self, monkeypatch):
+        error = InvalidArgument("invalid response_schema")
+        client, cache, handle, _, inline_model = self._client(monkeypatch, error)
+
+        with pytest.raises(InvalidArgument):
+            client.complete_with_prefix(LONG_PREFIX, "body")
+
+        assert inline_model.requests == []
+        assert not handle.deleted
+        assert cache.stats()["entries"] == 1
+
+    def test_rate_limit_propagates_and_keeps_cache(self, monkeypatch):
+        client, cache, handle, _, inline_model = self._client(monkeypatch, ResourceExhausted("quota"))
+
+        with pytest.raises(ResourceExhausted):
+            client.complete_with_prefix(LONG_PREFIX, "body")
+
+        assert inline_model.requests == []
+        assert not handle.deleted
+        assert cache.stats()["entries"] == 1
+
+
+class TestIsCachedPrefixError:
+
+    @pytest.mark.parametrize("error", [
+        NotFound("cachedContents/abc not found"),
+        InvalidArgument("Cached content cachedContents/abc has expired"),
+        InvalidArgument("invalid cached_content name"),
+    ])
+    def test_cache_errors(self, error):
+        assert llm_client.is_cached_prefix_error(error)
+
+    @pytest.mark.parametrize("error", [
+        InvalidArgument("Request contains an invalid argument: response_schema"),
+        ResourceExhausted("quota"),
+        ValueError("bad json"),
+    ])
+    def test_other_errors(self, error):
+        assert not llm_client.is_cached_prefix_error(error)
+
+    def test_matches_http_codes(self):
+        class HttpError(Exception):
+            def __init__(self, message, code):
+                super().__init__(message)
+                self.code = code
+
+        assert llm_client.is_cached_prefix_error(HttpError("not found", 404))
+        assert llm_client.is_cached_prefix_error(HttpError("bad cachedContent", 400))
+        assert not llm_client.is_cached_prefix_error(HttpError("bad request", 400))
+
+
+class TestCompleteWithPrefix:
+
+    def test_mock_client_sends_prefix_inline(self):
+        client = MockLLMClient()
+        client.complete_with_prefix(prefix="PREFIX ", prompt="body")
+        assert client.last_prompt == "PREFIX body"
+
+    def test_rate_limited_client_forwards_prefix(self):
+        inner = MockLLMClient()
+        client = RateLimitedLLMClient(inner)
+        client.complete_with_prefix(prefix="PREFIX ", prompt="body")
+        assert inner.last_prompt == "PREFIX body"
+        assert inner.call_count == 1
+
+
+class TestModelRegistry:
+
+    def test_reuses_entry_per_key(self):
+        registry = ModelRegistry(max_entries=4)
+        builds = []
+
+        def build():
+            builds.append(1)
+            return object(), object()
+
+        first = registry.get(("gemini-2.5-flash", 0.0, None, None), build)
+        second = registry.get(("gemini-2.5-flash", 0.0, None, None), build)
+        registry.get(("gemini-2.5-flash", 0.0, "schema", None), build)
+
+        assert first is second
+        assert len(builds) == 2
+
+    def test_evicts_least_recently_used(self):
+        registry = ModelRegistry(max_entries=2)
+        registry.get("a", lambda: ("a", None))
+        registry.get("b", lambda: ("b", None))
+        registry.get("a", lambda: ("a2", None))
+        registry.get("c", lambda: ("c", None))
+
+        assert len(registry) == 2
+        assert registry.get("a", lambda: ("a3", None)) == ("a", None)
+        assert registry.get("b", lambda: ("b2", None)) == ("b2", None)
+
+
+class TestGetLLMClient:
+
+    def test_vertex_client_shared_across_calls(self, monkeypatch):
+        monkeypatch.delenv("USE_MOCK_LLM", raising=False)
+        monkeypatch.setattr(llm_client, "_shared_client", None)
+
+        first = get_llm_client()
+        assert isinstance(first, VertexLLMClient)
+        assert get_llm_client() is first
+
+    def test_mock_not_shared(self):
+        assert get_llm_client(use_mock=True) is not get_llm_client(use_mock=True)
+
+
+class TestCompleteAsync:
+
+    def test_default_runs_sync_client(self):
+        client = MockLLMClient()
+        result = asyncio.run(client.complete_async("body", prefix="PREFIX "))
+        assert result == "intermediate"
+        assert client.last_prompt == "PREFIX body"
@@ -0,0 +1,415 @@
+"""
+Tests for bounded concurrent LLM calls and 429 backoff.
+
+Uses MockLLMClient subclasses, no network access.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.enrichment import rate_limit
+from app.enrichment.engine import compute_enrichment_batch
+from app.enrichment.llm_client import MockLLMClient
+from app.enrichment.models import EnrichmentSpec
+from app.enrichment.rate_limit import (
+    AdaptiveRateLimitGate,
+    RateLimitGate,
+    RateLimitedLLMClient,
+    TokenBudget,
+    get_token_budget,
+    is_rate_limit_error,
+    map_concurrent,
+)
+
+
+class ResourceExhausted(Exception):
+    """Stand-in for google.api_core.exceptions.ResourceExhausted."""
+
+
+class FlakyClient(MockLLMClient):
+    """Raises a 429 for the first `failures` calls, then succeeds."""
+
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    def complete(self, prompt, output_schema=None, response_schema=None, require_reasoning=False):
+        self.call_count += 1
+        if self.call_count <= self.failures:
+            raise ResourceExhausted("429 Quota exceeded")
+        return f"ok:{prompt}"
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(rate_limit, "compute_rate_limit_backoff", lambda attempt: 0.01)
+
+
+# =============================================================================
+# is_rate_limit_error
+# =============================================================================
+
+
+class TestIsRateLimitError:
+
+    def test_matches_resource_exhausted_class(self):
+        assert is_rate_limit_error(ResourceExhausted("quota"))
+
+    def test_matches_429_code(self):
+        error = RuntimeError("quota")
+        error.code = 429
+        assert is_rate_limit_error(error)
+
+    def test_ignores_429_in_message(self):
+        assert not is_rate_limit_error(RuntimeError("exercise 429 failed validation"))
+        assert not is_rate_limit_error(ValueError("RESOURCE_EXHAUSTED mentioned in prompt"))
+
+    def test_ignores_other_errors(self):
+        assert not is_rate_limit_error(ValueError("bad schema"))
+
+
+# =============================================================================
+# RateLimitedLLMClient
+# =============================================================================
+
+
+class TestRateLimitedLLMClient:
+
+    def test_retries_rate_limit_then_succeeds(self):
+        inner = FlakyClient(failures=2)
+        client = RateLimitedLLMClient(inner, RateLimitGate(2))
+        assert client.complete("p") == "ok:p"
+        assert inner.call_count == 3
+        assert client.gate.rate_limited_count == 2
+
+    def test_gives_up_after_max_retries(self):
+        inner = FlakyClient(failures=10)
+        client = RateLimitedLLMClient(inner, RateLimitGate(2), max_retries=2)
+        with pytest.raises(ResourceExhausted):
+            client.complete("p")
+        assert inner.call_count == 3
+
+    def test_non_rate_limit_error_not_retried(self):
+        class BrokenClient(MockLLMClient):
+            def complete(self, *args, **kwargs):
+                self.call_count += 1
+                raise ValueError("bad prompt")
+
+        inner = BrokenClient()
+        client = RateLimitedLLMClient(inner, RateLimitGate(2))
+        with pytest.raises(ValueError):
+            client.complete("p")
+        assert inner.call_count == 1
+
+    def test_delegates_model_name(self):
+        client = RateLimitedLLMClient(MockLLMClient())
+        assert client.get_model_name() == "mock-model"
+
+    def test_async_retries_rate_limit_then_succeeds(self):
+        inner = FlakyClient(failures=1)
+        client = RateLimitedLLMClient(inner, RateLimitGate(2))
+        assert asyncio.run(client.complete_async("p", prefix="x:")) == "ok:x:p"
+        assert inner.call_count == 2
+        assert client.rate_limited_count == 1
+
+    def test_reports_latency_to_gate(self):
+        gate = AdaptiveRateLimitGate(initial_concurrency=2, max_concurrency=8)
+        client = RateLimitedLLMClient(MockLLMClient(), gate)
+        for _ in range(4):
+            client.complete("p")
+        assert gate.limit == 3
+
+    def test_counts_tokens_of_successful_calls(self):
+        inner = FlakyClient(failures=1)
+        client = RateLimitedLLMClient(inner, RateLimitGate(2))
+        client.complete("p" * 40)
+        # 11 prompt tokens + 11 for "ok:" + prompt; the 429 attempt adds nothing
+        assert client.tokens_used == 22
+
+
+# =============================================================================
+# AdaptiveRateLimitGate
+# =============================================================================
+
+
+class TestAdaptiveRateLimitGate:
+
+    @pytest.fixture(autouse=True)
+    def no_hold(self, monkeypatch):
+        monkeypatch.setattr(rate_limit, "DECREASE_HOLD_SECS", 0.0)
+
+    def test_additive_increase_on_healthy_calls(self):
+        gate = AdaptiveRateLimitGate(initial_concurrency=4, max_concurrency=6)
+        for _ in range(5):
+            gate.report_success(1.0)
+        assert gate.limit == 5
+        for _ in range(100):
+            gate.report_success(1.0)
+        assert gate.limit == 6
+
+    def test_halves_on_rate_limit(self):
+        gate = AdaptiveRateLimitGate(initial_concurrency=8, min_concurrency=2)
+        gate.report_rate_limited(0.0)
+        assert gate.limit == 4
+        gate.report_rate_limited(0.0)
+        gate.report_rate_limited(0.0)
+        assert gate.limit == 2
+
+    def test_burst_of_rate_limits_is_one_decrease(self, monkeypatch):
+        monkeypatch.setattr(rate_limit, "DECREASE_HOLD_SECS", 60.0)
+        gate = AdaptiveRateLimitGate(initial_concurrency=8)
+        for _ in range(5):
+            gate.report_rate_limited(0.0)
+        assert gate.limit == 4
+        assert gate.rate_limited_count == 5
+
+    def test_backs_off_on_latency_spike(self):
+        gate = AdaptiveRateLimitGate(initial_concurrency=8, latency_tolerance=2.0)
+        gate.report_success(1.0, "flash:10")
+        gate.report_success(5.0, "flash:10")
+        assert gate.limit == 4
+        assert gate.latency_backoff_count == 1
+
+    def test_latency_baseline_per_key(self):
+        gate = AdaptiveRateLimitGate(initial_concurrency=8, latency_tolerance=2.0)
+        gate.report_success(1.0, "flash:8")
+        gate.report_success(5.0, "flash:12")
+        assert gate.limit == 8
+
+    def test_lower_limit_blocks_new_slots(self):
+        gate = AdaptiveRateLimitGate(initial_concurrency=2)
+        with gate.slot():
+            gate.report_rate_limited(0.0)
+            assert gate.limit == 1
+            acquired = threading.Event()
+
+            def take():
+                with gate.slot():
+                    acquired.set()
+
+            worker = threading.Thread(target=take)
+            worker.start()
+            assert not acquired.wait(0.05)
+        assert acquired.wait(1.0)
+        worker.join()
+
+    def test_async_slots_bounded_by_limit(self):
+        gate = AdaptiveRateLimitGate(initial_concurrency=3)
+        active = []
+        peak = []
+
+        async def work():
+            async with gate.slot_async():
+                active.append(1)
+                peak.append(len(active))
+                await asyncio.sleep(0.01)
+                active.pop()
+
+        async def run():
+            await asyncio.gather(*(work() for _ in range(10)))
+
+        asyncio.run(run())
+        assert max(peak) == 3
+        assert gate.in_flight == 0
+
+    def test_async_waiter_woken_by_thread_release(self, monkeypatch):
+        gate = AdaptiveRateLimitGate(initial_concurrency=1)
+        # Parked coroutines wait on a future; nothing may poll with sleep
+        sleeps = []
+        real_sleep = asyncio.sleep
+
+        async def recording_sleep(delay, *args):
+            sleeps.append(delay)
+            await real_sleep(delay, *args)
+
+        monkeypatch.setattr(asyncio, "sleep", recording_sleep)
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with gate.slot():
+                held.set()
+                release.wait()
+
+        worker = threading.Thread(target=hold)
+        worker.start()
+        held.wait()
+
+        async def take():
+            slot = gate.slot_async()
+            waiter = asyncio.ensure_future(slot.__aenter__())
+            await real_sleep(0.05)
+            assert not waiter.done()
+            release.set()
+            await asyncio.wait_for(waiter, 1.0)
+            await slot.__aexit__(None, None, None)
+
+        asyncio.run(take())
+        worker.join()
+        assert sleeps == []
+        assert gate.in_flight == 0
+
+    def test_limit_increase_wakes_async_waiters(self):
+        gate = AdaptiveRateLimitGate(initial_concurrency=1, max_concurrency=4)
+
+        async def run():
+            async with gate.slot_async():
+                slot = gate.slot_async()
+                waiter = asyncio.ensure_future(slot.__aenter__())
+                await asyncio.sleep(0.01)
+                assert not waiter.done()
+                gate.report_success(1.0)  # limit 1 -> 2
+                await asyncio.wait_for(waiter, 1.0)
+                assert gate.in_flight == 2
+            await slot.__aexit__(None, None, None)
+
+        asyncio.run(run())
+        assert gate.in_flight == 0
+
+
+# =============================================================================
+# map_concurrent
+# =============================================================================
+
+
+class TestMapConcurrent:
+
+    def test_preserves_input_order(self):
+        def slow_for_early_items(i):
+            time.sleep(0.01 * (10 - i))
+            return i * 2
+
+        assert map_concurrent(slow_for_early_items, list(range(10)), 4) == [i * 2 for i in range(10)]
+
+    def test_bounded_by_gate(self):
+        gate = RateLimitGate(3)
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def work(i):
+            with gate.slot():
+                with lock:
+                    active.append(i)
+                    peak.append(len(active))
+                time.sleep(0.01)
+                with lock:
+                    active.remove(i)
+            return i
+
+        assert map_concurrent(work, list(range(12)), 8) == list(range(12))
+        assert max(peak) <= 3
+
+    def test_sequential_when_concurrency_is_one(self):
+        threads = set()
+
+        def work(i):
+            threads.add(threading.get_ident())
+            return i
+
+        map_concurrent(work, [1, 2, 3], 1)
+        assert threads == {threading.get_ident()}
+
+    def test_timeout_fills_slot_and_keeps_going(self):
+        def work(i):
+            if i == 0:
+                time.sleep(1.0)
+            return i
+
+        start = time.monotonic()
+        results = map_concurrent(
+            work, [0, 1, 2, 3], 2, timeout_secs=0.1, on_timeout=lambda i: -1,
+        )
+        assert results == [-1, 1, 2, 3]
+        assert time.monotonic() - start < 0.5
+
+
+# =============================================================================
+# TokenBudget
+# =============================================================================
+
+
+class TestTokenBudget:
+
+    def test_acquire_within_budget_does_not_wait(self):
+        budget = TokenBudget(1000)
+        assert budget.acquire(400) == 0.0
+        assert budget.acquire(600) == 0.0
+        assert budget.used == 1000
+
+    def test_acquire_over_budget_waits_for_window(self, monkeypatch):
+        monkeypatch.setattr(rate_limit, "TOKEN_WINDOW_SECS", 0.1)
+        budget = TokenBudget(1000)
+        budget.acquire(900)
+        assert budget.acquire(200) > 0
+
+    def test_acquire_async_waits_on_the_event_loop(self, monkeypatch):
+        monkeypatch.setattr(rate_limit, "TOKEN_WINDOW_SECS", 0.1)
+        budget = TokenBudget(1000)
+        budget.acquire(900)
+
+        async def run():
+            ticks = []
+
+            async def tick():
+                while len(ticks) < 3:
+                    ticks.append(1)
+                    await asyncio.sleep(0.01)
+
+            waited, _ = await asyncio.gather(budget.acquire_async(200), tick())
+            return waited, ticks
+
+        waited, ticks = asyncio.run(run())
+        assert waited > 0
+        assert len(ticks) == 3
+        assert budget.used == 200
+
+    def test_unlimited_budget(self):
+        budget = TokenBudget(0)
+        assert budget.acquire(10 ** 9) == 0.0
+
+    def test_budget_shared_per_model(self):
+        assert get_token_budget("gemini-2.5-flash") is get_token_budget("gemini-2.5-flash")
+        assert get_token_budget("gemini-2.5-flash") is not get_token_budget("gemini-2.5-pro")
+
+
+# =============================================================================
+# compute_enrichment_batch
+# =============================================================================
+
+
+class TestComputeEnrichmentBatch:
+
+    SPEC = EnrichmentSpec(
+        spec_id="difficulty",
+        spec_version="v1",
+        field_path="metadata.difficulty",
+        instructions="Pick a difficulty.",
+        output_type="enum",
+        allowed_values=["beginner", "intermediate", "advanced"],
+    )
+
+    def test_concurrent_results_in_input_order(self):
+        client = MockLLMClient()
+        exercises = [{"id": f"ex{i}", "name": f"Exercise {i}"} for i in range(6)]
+        results = compute_enrichment_batch(exercises, self.SPEC, client, max_concurrency=3)
+        assert [r.exercise_id for r in results] == [e["id"] for e in exercises]
+        assert all(r.success for r in results)
+
+    def test_slow_exercise_times_out(self):
+        class SlowClient(MockLLMClient):
+            def complete(self, prompt, **kwargs):
+                if "Slow" in prompt:
+                    time.sleep(1.0)
+                return "beginner"
+
+        exercises = [{"id": "slow", "name": "Slow Lift"}, {"id": "fast", "name": "Fast Lift"}]
+        results = compute_enrichment_batch(
+            exercises, self.SPEC, SlowClient(), max_concurrency=2, timeout_secs=0.1,
+        )
+        assert not results[0].success
+        assert "Timed out" in results[0].validation_errors[0]
+        assert results[1].success and results[1].value == "beginner"
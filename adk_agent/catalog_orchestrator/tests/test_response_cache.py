@@ -0,0 +1,295 @@
+"""
+Tests for the content-addressed LLM response cache.
+
+Uses the SQLite backend on a temp file and MockLLMClient subclasses.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.enrichment.llm_client import MockLLMClient
+from app.enrichment import rate_limit
+from app.enrichment.rate_limit import AdaptiveRateLimitGate, RateLimitedLLMClient
+from app.enrichment.response_cache import (
+    CachedLLMClient,
+    ResponseCache,
+    SQLiteResponseCache,
+    response_cache_key,
+)
+from app.enrichment.engine import compute_enrichment, enrich_exercise_holistic
+from app.enrichment.models import EnrichmentSpec
+from app.reviewer.review_agent import CatalogReviewAgent
+
+
+class CountingClient(MockLLMClient):
+
+    def __init__(self, temperature: float = 0.0):
+        super().__init__()
+        self.temperature = temperature
+
+    def generation_config(self, require_reasoning=False):
+        return {"temperature": self.temperature, "max_output_tokens": 100}
+
+    def complete(self, prompt, output_schema=None, response_schema=None, require_reasoning=False):
+        self.call_count += 1
+        return f"answer {self.call_count}"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(SQLiteResponseCache(str(tmp_path / "cache.sqlite3")), ttl_secs=3600)
+
+
+class TestResponseCacheKey:
+
+    def test_key_covers_all_inputs(self):
+        base = response_cache_key("m", {"temperature": 0.0}, "p", None, {"type": "object"})
+        assert base == response_cache_key("m", {"temperature": 0.0}, "p", None, {"type": "object"})
+        assert base != response_cache_key("m2", {"temperature": 0.0}, "p", None, {"type": "object"})
+        assert base != response_cache_key("m", {"temperature": 0.0}, "p2", None, {"type": "object"})
+        assert base != response_cache_key("m", {"temperature": 0.0}, "p", None, {"type": "array"})
+        assert base != response_cache_key("m", {"temperature": 0.1}, "p", None, {"type": "object"})
+
+
+class TestCachedLLMClient:
+
+    def test_repeat_prompt_served_from_cache(self, cache):
+        inner = CountingClient()
+        client = CachedLLMClient(inner, cache)
+
+        assert client.complete("same") == "answer 1"
+        assert client.complete("same") == "answer 1"
+        assert client.complete("different") == "answer 2"
+        assert inner.call_count == 2
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 2
+
+    def test_prefix_and_inline_share_key(self, cache):
+        inner = CountingClient()
+        client = CachedLLMClient(inner, cache)
+
+        client.complete_with_prefix(prefix="PRE ", prompt="body")
+        assert client.complete("PRE body") == "answer 1"
+        assert inner.call_count == 1
+
+    def test_nonzero_temperature_not_cached(self, cache):
+        inner = CountingClient(temperature=0.1)
+        client = CachedLLMClient(inner, cache)
+
+        client.complete("same")
+        client.complete("same")
+        assert inner.call_count == 2
+        assert cache.stats() == {"hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+    def test_async_uses_cache(self, cache):
+        inner = CountingClient()
+        client = CachedLLMClient(inner, cache)
+
+        client.complete("same")
+        assert asyncio.run(client.complete_async("same")) == "answer 1"
+        assert inner.call_count == 1
+
+
+    def test_discard_sends_next_call_to_model(self, cache):
+        inner = CountingClient()
+        client = RateLimitedLLMClient(CachedLLMClient(inner, cache), use_token_budget=False)
+
+        assert client.complete_with_prefix("PREFIX ", "same") == "answer 1"
+        client.discard_cached_response("same", prefix="PREFIX ")
+
+        assert client.complete_with_prefix("PREFIX ", "same") == "answer 2"
+        assert client.complete("PREFIX same") == "answer 2"
+        assert inner.call_count == 2
+
+
+class RecordingGate(AdaptiveRateLimitGate):
+
+    def __init__(self):
+        super().__init__(initial_concurrency=8, min_concurrency=1, max_concurrency=8)
+        self.slots = 0
+        self.latencies = []
+
+    def _acquire(self):
+        self.slots += 1
+        super()._acquire()
+
+    def _try_acquire(self):
+        acquired = super()._try_acquire()
+        self.slots += acquired
+        return acquired
+
+    def report_success(self, latency_secs, key=""):
+        self.latencies.append(latency_secs)
+        super().report_success(latency_secs, key)
+
+
+class RecordingBudget:
+
+    def __init__(self):
+        self.reserved = []
+
+    def acquire(self, tokens):
+        self.reserved.append(tokens)
+
+    async def acquire_async(self, tokens):
+        self.reserved.append(tokens)
+
+
+class SlowClient(CountingClient):
+
+    def complete(self, prompt, output_schema=None, response_schema=None, require_reasoning=False):
+        time.sleep(0.02)
+        return super().complete(prompt, output_schema, response_schema, require_reasoning)
+
+
+class TestGatedCache:
+    """RateLimitedLLMClient over CachedLLMClient: hits never touch the gate."""
+
+    @pytest.fixture
+    def budget(self, monkeypatch):
+        budget = RecordingBudget()
+        monkeypatch.setattr(rate_limit, "get_token_budget", lambda model: budget)
+        return budget.reserved
+
+    def test_hits_skip_gate_budget_and_latency(self, cache, budget):
+        inner = SlowClient()
+        gate = RecordingGate()
+        client = RateLimitedLLMClient(CachedLLMClient(inner, cache), gate)
+
+        for prompt in ["a", "a", "a", "a", "b", "a", "a", "c"]:
+            client.complete(prompt)
+
+        assert inner.call_count == 3
+        assert gate.slots == 3
+        assert len(gate.latencies) == 3 and min(gate.latencies) >= 0.02
+        assert len(budget) == 3
+        assert gate.limit == 8 and gate.latency_backoff_count == 0
+        assert cache.stats()["hits"] == 5
+
+    def test_async_hits_skip_gate(self, cache, budget):
+        inner = SlowClient()
+        gate = RecordingGate()
+        client = RateLimitedLLMClient(CachedLLMClient(inner, cache), gate)
+
+        async def run():
+            for prompt in ["a", "a", "b", "a"]:
+                await client.complete_async(prompt)
+
+        asyncio.run(run())
+
+        assert inner.call_count == 2
+        assert gate.slots == 2
+        assert len(budget) == 2
+        assert gate.latency_backoff_count == 0
+
+
+class RejectedFirstClient(CountingClient):
+    """First answer has no decisions, later ones review every exercise."""
+
+    def complete(self, prompt, output_schema=None, response_schema=None, require_reasoning=False):
+        self.call_count += 1
+        if self.call_count == 1:
+            return "not json"
+        return '{"exercises": [{"exercise_id": "ex1", "decision": "KEEP"}]}'
+
+
+class TestReviewRetryBypassesCache:
+
+    EXERCISES = [{"id": "ex1", "name": "Bench Press", "equipment": ["barbell"]}]
+
+    def test_sync_retry_reaches_model(self, cache):
+        inner = RejectedFirstClient()
+        agent = CatalogReviewAgent(llm_client=CachedLLMClient(inner, cache))
+
+        result = agent.review_batch(self.EXERCISES)
+
+        assert inner.call_count == 2
+        assert [d.exercise_id for d in result.decisions] == ["ex1"]
+        assert result.retry_failed_ids == []
+        # The accepted answer is what stays cached
+        assert agent.review_batch(self.EXERCISES).decisions[0].exercise_id == "ex1"
+        assert inner.call_count == 2
+
+    def test_async_retry_reaches_model(self, cache):
+        inner = RejectedFirstClient()
+        agent = CatalogReviewAgent(llm_client=CachedLLMClient(inner, cache))
+
+        result = asyncio.run(agent.review_batch_async(self.EXERCISES))
+
+        assert inner.call_count == 2
+        assert result.retry_failed_ids == []
+
+
+class ScriptedClient(CountingClient):
+    """Answers with `responses` in turn."""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+
+    def complete(self, prompt, output_schema=None, response_schema=None, require_reasoning=False):
+        self.call_count += 1
+        return self.responses[min(self.call_count, len(self.responses)) - 1]
+
+
+class TestEnrichmentRejectsBypassCache:
+
+    SPEC = EnrichmentSpec(
+        spec_id="difficulty",
+        spec_version="v1",
+        field_path="metadata.difficulty",
+        instructions="Rate the difficulty.",
+        output_type="enum",
+        allowed_values=["beginner", "intermediate", "advanced"],
+    )
+    EXERCISE = {"id": "ex1", "name": "Bench Press"}
+
+    def test_invalid_value_not_served_again(self, cache):
+        inner = ScriptedClient(["impossible", "beginner"])
+        client = CachedLLMClient(inner, cache)
+
+        assert not compute_enrichment(self.EXERCISE, self.SPEC, client).success
+        retry = compute_enrichment(self.EXERCISE, self.SPEC, client)
+
+        assert retry.success and retry.value == "beginner"
+        assert inner.call_count == 2
+        # The accepted value is cached
+        assert compute_enrichment(self.EXERCISE, self.SPEC, client).value == "beginner"
+        assert inner.call_count == 2
+
+    def test_unparseable_holistic_response_not_served_again(self, cache):
+        inner = ScriptedClient(["not json", '{"reasoning": "ok", "changes": {}}'])
+        client = CachedLLMClient(inner, cache)
+
+        assert enrich_exercise_holistic(self.EXERCISE, llm_client=client)["confidence"] == "low"
+        retry = enrich_exercise_holistic(self.EXERCISE, llm_client=client)
+
+        assert retry["reasoning"] == "ok"
+        assert inner.call_count == 2
+
+
+class TestSQLiteResponseCache:
+
+    def test_ttl_expiry(self, tmp_path):
+        backend = SQLiteResponseCache(str(tmp_path / "c.sqlite3"))
+        backend.set("k", "v", ttl_secs=1)
+        assert backend.get("k", ttl_secs=3600) == "v"
+        time.sleep(0.02)
+        assert backend.get("k", ttl_secs=0) is None
+        assert len(backend) == 0
+
+    def test_size_eviction_drops_least_recently_used(self, tmp_path):
+        backend = SQLiteResponseCache(str(tmp_path / "c.sqlite3"), max_bytes=250)
+        backend.set("a", "x" * 100, ttl_secs=3600)
+        time.sleep(0.01)
+        backend.set("b", "x" * 100, ttl_secs=3600)
+        time.sleep(0.01)
+        backend.get("a", ttl_secs=3600)  # a is now more recent than b
+        time.sleep(0.01)
+        backend.set("c", "x" * 100, ttl_secs=3600)
+
+        assert backend.get("a", ttl_secs=3600) is not None
+        assert backend.get("b", ttl_secs=3600) is None
+        assert backend.get("c", ttl_secs=3600) is not None
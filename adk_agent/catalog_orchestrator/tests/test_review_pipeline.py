@@ -0,0 +1,164 @@
+"""
+Tests for the streaming review pipeline.
+
+The LLM call is replaced by a fake that records how many batches are in
+flight.
+"""
+
+import asyncio
+
+import pytest
+
+from app.reviewer import scheduled_review
+from app.reviewer.review_agent import (
+    BatchReviewResult,
+    CatalogReviewAgent,
+    ExerciseDecision,
+    review_catalog_stream,
+)
+
+
+EXERCISES = [
+    {"id": f"ex{i}", "name": f"Exercise {i}", "family_slug": "bench"}
+    for i in range(10)
+]
+
+
+@pytest.fixture
+def reviews(monkeypatch):
+    state = {"in_flight": 0, "peak": 0, "batches": []}
+
+    async def review_batch_async(self, exercises, family_context=None):
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01 * len(state["batches"]))
+        state["in_flight"] -= 1
+        state["batches"].append([ex["id"] for ex in exercises])
+        decisions = [
+            ExerciseDecision(ex["id"], ex["name"], "ENRICH", "high", "thin")
+            for ex in exercises
+        ]
+        return BatchReviewResult(
+            exercises_reviewed=len(exercises),
+            decisions=decisions,
+            enrich_count=len(decisions),
+        )
+
+    monkeypatch.setattr(CatalogReviewAgent, "review_batch_async", review_batch_async)
+    return state
+
+
+async def _collect(stream, consumer_delay=0.0):
+    results = []
+    async for batch in stream:
+        results.append(batch)
+        await asyncio.sleep(consumer_delay)
+    return results
+
+
+class TestReviewCatalogStream:
+
+    def test_reviews_every_batch(self, reviews):
+        results = asyncio.run(_collect(review_catalog_stream(EXERCISES, batch_size=3)))
+
+        assert sum(r.exercises_reviewed for r in results) == 10
+        assert len(results) == 4
+
+    def test_bounded_in_flight(self, reviews):
+        asyncio.run(_collect(review_catalog_stream(EXERCISES, batch_size=2, max_in_flight=2)))
+
+        assert reviews["peak"] == 2
+
+    def test_slow_consumer_holds_back_reviews(self, reviews):
+        async def run():
+            stream = review_catalog_stream(EXERCISES, batch_size=2, max_in_flight=2)
+            first = await stream.__anext__()
+            await asyncio.sleep(0.1)
+            started = len(reviews["batches"]) + reviews["in_flight"]
+            await stream.aclose()
+            return first, started
+
+        first, started = asyncio.run(run())
+
+        assert first.exercises_reviewed == 2
+        assert started == 3
+
+
+class TestRunReviewPipeline:
+
+    @pytest.fixture
+    def calls(self, reviews, monkeypatch):
+        calls = []
+
+        def create_jobs(batch_results, exercises=None, dry_run=True, max_jobs=0):
+            decisions = [d for b in batch_results for d in b.decisions][:max_jobs]
+            calls.append(("jobs", len(decisions)))
+            return {
+                "total_jobs": len(decisions),
+                "jobs": {"enrich": decisions, "fixidentity": [], "archive": [], "merge": [], "add_exercise": []},
+            }
+
+        def save_metadata(db, decisions, dry_run=True, retry_failed_ids=None):
+            calls.append(("metadata", len(decisions)))
+            return {"updated": len(decisions), "errors": 0, "failed_ids": []}
+
+        monkeypatch.setattr(scheduled_review, "create_jobs_from_decisions", create_jobs)
+        monkeypatch.setattr(scheduled_review, "save_review_metadata", save_metadata)
+        return calls
+
+    def test_jobs_and_metadata_per_batch(self, calls):
+        result = scheduled_review.run_review_pipeline(
+            None, EXERCISES, batch_size=4, dry_run=False, max_jobs=20,
+        )
+
+        # Each batch is acted on as it arrives
+        assert [kind for kind, _ in calls] == ["jobs", "metadata"] * 3
+        assert sorted(n for kind, n in calls if kind == "metadata") == [2, 4, 4]
+        assert result["totals"]["reviewed"] == 10
+        assert result["totals"]["enrich"] == 10
+        assert result["jobs"]["total_jobs"] == 10
+        assert result["jobs"]["by_type"]["enrich"] == 10
+        assert result["review_metadata"] == {"updated": 10, "errors": 0, "failed_ids": []}
+        assert result["unreviewed_ids"] == []
+
+    def test_stops_reviewing_at_max_jobs(self, calls, reviews):
+        result = scheduled_review.run_review_pipeline(
+            None, EXERCISES, batch_size=2, dry_run=False, max_jobs=3, max_in_flight=2,
+        )
+
+        # The job cap spans batches; once it is hit the stream is closed
+        # and the batch still in flight is cancelled
+        assert [kind for kind, _ in calls] == ["jobs", "metadata"] * 2
+        assert result["jobs"]["total_jobs"] == 3
+        assert result["totals"]["reviewed"] == 4
+        reviewed = {ex_id for batch in reviews["batches"][:2] for ex_id in batch}
+        assert sorted(result["unreviewed_ids"]) == sorted(
+            ex["id"] for ex in EXERCISES if ex["id"] not in reviewed
+        )
+        assert len(reviews["batches"]) == 2
+
+
+class TestCreateJobsFromDecisions:
+
+    def test_only_uncommitted_jobs_are_marked_failed(self, fake_db, monkeypatch):
+        from app.jobs import queue
+
+        monkeypatch.setattr(queue, "get_db", lambda: fake_db)
+        monkeypatch.setattr(queue, "MAX_BATCH_WRITES", 4)
+
+        def fail_second(batch):
+            if fake_db.commits == 2:
+                raise RuntimeError("commit failed")
+        fake_db.before_commit = fail_second
+
+        batch = BatchReviewResult(decisions=[
+            ExerciseDecision(ex["id"], ex["name"], "ENRICH", "high", "thin") for ex in EXERCISES[:4]
+        ])
+
+        result = scheduled_review.create_jobs_from_decisions([batch], EXERCISES, dry_run=False)
+
+        created = [info for info in result["jobs"]["enrich"] if "job_id" in info]
+        failed = [info for info in result["jobs"]["enrich"] if "error" in info]
+        assert result["total_jobs"] == 2
+        assert (len(created), len(failed)) == (2, 2)
+        assert {info["job_id"] for info in created} == set(fake_db.collections["catalog_jobs"])
@@ -0,0 +1,123 @@
+"""
+Tests for watchdog pagination and bulk recovery.
+
+Runs against the shared in-memory Firestore fake (tests/fakes.py), whose
+BulkWriter applies writes on close().
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.jobs import watchdog
+
+
+NOW = datetime.utcnow()
+EXPIRED = NOW - timedelta(minutes=10)
+
+
+@pytest.fixture
+def db(fake_db, monkeypatch):
+    monkeypatch.setattr(watchdog, "get_db", lambda: fake_db)
+    monkeypatch.setattr(watchdog, "WATCHDOG_PAGE_SIZE", 50)
+    return fake_db
+
+
+def _stuck_jobs(db, count, attempts=1, status="running"):
+    jobs = db.collections.setdefault("catalog_jobs", {})
+    for i in range(count):
+        jobs[f"job{len(jobs):04d}"] = {
+            "type": "CATALOG_ENRICH_FIELD",
+            "status": status,
+            "lease_owner": "worker-1",
+            "lease_expires_at": EXPIRED + timedelta(seconds=i),
+            "attempts": attempts,
+            "max_attempts": 5,
+            "payload": {},
+        }
+
+
+def _statuses(db):
+    return sorted(data["status"] for data in db.collections["catalog_jobs"].values())
+
+
+class TestRecoverStuckJobs:
+
+    def test_recovers_every_page_in_one_run(self, db):
+        _stuck_jobs(db, 120)
+        _stuck_jobs(db, 30, status="leased")
+
+        results = watchdog.recover_stuck_jobs(dry_run=False)
+
+        assert results["found"] == 150
+        assert results["recovered"] == 150
+        assert results["pages"] == 4
+        assert _statuses(db) == ["queued"] * 150
+        assert len(db.bulk_writers) == 1 and db.bulk_writers[0].closed
+
+    def test_exhausted_jobs_are_deadlettered(self, db):
+        _stuck_jobs(db, 3)
+        _stuck_jobs(db, 2, attempts=5)
+
+        results = watchdog.recover_stuck_jobs(dry_run=False)
+
+        assert (results["recovered"], results["deadlettered"]) == (3, 2)
+        assert _statuses(db) == ["deadletter"] * 2 + ["queued"] * 3
+
+    def test_jobs_changed_since_scan_are_skipped(self, db):
+        _stuck_jobs(db, 4)
+        _stuck_jobs(db, 1, attempts=5)
+        db.stale_reads = {"job0001", "job0004"}
+
+        results = watchdog.recover_stuck_jobs(dry_run=False)
+
+        assert results["recovered"] == 3
+        assert results["deadlettered"] == 0
+        assert results["skipped"] == 2
+        assert db.collections["catalog_jobs"]["job0001"]["status"] == "running"
+        assert db.collections["catalog_jobs"]["job0004"]["status"] == "running"
+
+    def test_dry_run_reports_throughput_and_writes_nothing(self, db):
+        _stuck_jobs(db, 60)
+
+        results = watchdog.recover_stuck_jobs(dry_run=True)
+
+        assert results["found"] == 60
+        assert results["pages"] == 2
+        assert results["elapsed_secs"] >= 0
+        assert "docs_per_sec" in results
+        assert db.bulk_writers == []
+        assert _statuses(db) == ["running"] * 60
+
+
+class TestCleanup:
+
+    def test_expired_locks_deleted_except_reacquired(self, db):
+        db.collections["catalog_locks"] = {
+            f"family-{i}": {"job_id": f"job{i}", "expires_at": EXPIRED + timedelta(seconds=i)}
+            for i in range(70)
+        }
+        db.collections["catalog_locks"]["family-live"] = {"expires_at": NOW + timedelta(hours=1)}
+        db.stale_reads = {"family-3"}
+
+        results = watchdog.cleanup_expired_locks(dry_run=False)
+
+        assert results["found"] == 70
+        assert results["cleaned"] == 69
+        assert results["skipped"] == 1
+        assert results["pages"] == 2
+        assert sorted(db.collections["catalog_locks"]) == ["family-3", "family-live"]
+
+    def test_idempotency_records_by_expiry_and_age(self, db):
+        old = NOW - timedelta(days=30)
+        db.collections["catalog_idempotency"] = {
+            **{f"exp{i}": {"expires_at": EXPIRED, "created_at": old} for i in range(60)},
+            **{f"old{i}": {"created_at": old} for i in range(10)},
+            "fresh": {"created_at": NOW, "expires_at": NOW + timedelta(days=1)},
+        }
+
+        results = watchdog.cleanup_idempotency_records(dry_run=False)
+
+        assert results["found"] == 70
+        assert results["cleaned"] == 70
+        assert list(db.collections["catalog_idempotency"]) == ["fresh"]
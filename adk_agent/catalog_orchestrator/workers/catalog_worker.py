@@ -3,6 +3,10 @@ Catalog Worker - Job processing worker for Catalog Orchestrator.
 
 This worker:
 1. Polls for available jobs (exits immediately if none)
+   - POLL_BATCH_SIZE > 1 leases a batch of jobs in one transaction and
+     works through it locally; a batch heartbeat keeps the waiting jobs leased
+   - WORKER_CONCURRENCY > 1 runs that many jobs at once on a thread pool;
+     jobs that need the same family lock never run side by side
 2. Acquires job lease and family lock
 3. Starts heartbeat for lease renewal
 4. Executes job via shell agent
@@ -25,8 +29,10 @@ import signal
 import threading
 import time
 import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +42,8 @@ MAX_JOBS_PER_RUN = int(os.getenv("MAX_JOBS_PER_RUN", "0"))  # 0 = unlimited
 MAX_SECONDS_PER_RUN = int(os.getenv("MAX_SECONDS_PER_RUN", "0"))  # 0 = no deadline
 SAFETY_MARGIN_SECS = int(os.getenv("SAFETY_MARGIN_SECS", "60"))  # Buffer if deadline set
 HEARTBEAT_INTERVAL_SECS = int(os.getenv("HEARTBEAT_INTERVAL_SECS", "60"))
+POLL_BATCH_SIZE = int(os.getenv("POLL_BATCH_SIZE", "1"))  # 1 = lease one job per poll
+WORKER_CONCURRENCY = max(1, int(os.getenv("WORKER_CONCURRENCY", "1")))  # Jobs run at once
 
 # Apply mode gate
 APPLY_ENABLED = os.getenv("CATALOG_APPLY_ENABLED", "false").lower() == "true"
@@ -133,6 +141,82 @@ class HeartbeatThread:
                 log_event("heartbeat_error", job_id=self.job_id, error=str(e))
 
 
+class BatchLeaseHeartbeat:
+    """
+    Background thread renewing leases for jobs waiting in a local batch.
+
+    Jobs leased by poll_jobs() sit in the worker's batch until processed.
+    This thread keeps their leases alive with one renew_leases() call per
+    interval. Once a job is claimed for processing, its own HeartbeatThread
+    takes over and it is no longer renewed here.
+    """
+
+    def __init__(self, worker_id: str):
+        self.worker_id = worker_id
+        self._pending: Set[str] = set()
+        self._lost: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, job_ids: Iterable[str]) -> None:
+        """Start covering newly leased jobs."""
+        with self._lock:
+            self._pending.update(job_ids)
+
+    def claim(self, job_id: str) -> bool:
+        """
+        Stop covering a job because it is about to be processed.
+
+        Returns:
+            False if the lease was lost while the job waited in the batch
+        """
+        with self._lock:
+            self._pending.discard(job_id)
+            return job_id not in self._lost
+
+    def pending(self) -> List[str]:
+        """Job IDs still waiting in the batch."""
+        with self._lock:
+            return sorted(self._pending)
+
+    def start(self):
+        """Start the batch heartbeat thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the batch heartbeat thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _loop(self):
+        """Heartbeat loop - renew leases of all waiting jobs in one call."""
+        from app.jobs.queue import renew_leases
+
+        while not self._stop.wait(HEARTBEAT_INTERVAL_SECS):
+            job_ids = self.pending()
+            if not job_ids:
+                continue
+            try:
+                held = renew_leases(job_ids, self.worker_id)
+                if held is None:
+                    # Transaction failed - retry next interval, leases may still be valid
+                    log_event("batch_lease_renewal_failed", job_count=len(job_ids))
+                    continue
+                held = set(held)
+                lost = [job_id for job_id in job_ids if job_id not in held]
+                if lost:
+                    with self._lock:
+                        self._lost.update(lost)
+                        self._pending.difference_update(lost)
+                    log_event("batch_leases_lost", job_ids=lost)
+            except Exception as e:
+                log_event("batch_heartbeat_error", error=str(e))
+
+
 class CatalogWorker:
     """
     Catalog job processing worker.
@@ -141,6 +225,10 @@ class CatalogWorker:
     MAX_SECONDS_PER_RUN time budget, then exits.
     
     No long-lived polling - exits immediately if no jobs available.
+    
+    Up to WORKER_CONCURRENCY jobs run at once, each on its own pool thread
+    with its own HeartbeatThread, JobContext and family lock. Jobs are
+    I/O-bound (Vertex AI, Firestore), so threads overlap the waiting.
     """
     
     def __init__(self, worker_id: Optional[str] = None):
@@ -154,7 +242,8 @@ class CatalogWorker:
         self.running = False
         self.jobs_processed = 0
         self.jobs_failed = 0
-        self._current_job_id: Optional[str] = None
+        self._current_job_ids: Set[str] = set()
+        self._state_lock = threading.Lock()
         self._deadline: float = 0.0
         self._start_time: float = 0.0
     
@@ -167,6 +256,8 @@ class CatalogWorker:
             "worker_started",
             apply_enabled=APPLY_ENABLED,
             max_jobs=MAX_JOBS_PER_RUN,
+            poll_batch_size=POLL_BATCH_SIZE,
+            concurrency=WORKER_CONCURRENCY,
             deadline_secs=MAX_SECONDS_PER_RUN - SAFETY_MARGIN_SECS,
         )
         
@@ -190,8 +281,10 @@ class CatalogWorker:
             )
     
     def stop(self):
-        """Signal the worker to stop."""
-        log_event("worker_stopping", reason="signal")
+        """Signal the worker to stop; in-flight jobs run to completion."""
+        with self._state_lock:
+            in_flight = sorted(self._current_job_ids)
+        log_event("worker_stopping", reason="signal", in_flight_job_ids=in_flight)
         self.running = False
     
     def _handle_signal(self, signum, frame):
@@ -225,48 +318,172 @@ class CatalogWorker:
         - MAX_JOBS_PER_RUN reached (if > 0)
         - Deadline exceeded (if MAX_SECONDS_PER_RUN > 0)
         - Signal received
+        
+        In-flight jobs always run to completion before the loop returns.
+        
+        With POLL_BATCH_SIZE > 1, jobs are leased in batches and worked
+        through locally. With WORKER_CONCURRENCY > 1, up to that many jobs
+        run at once; a job whose family is already locked by an in-flight
+        job waits in the local batch until that job finishes. Any leased
+        jobs left unprocessed on exit are released back to the queue.
         """
-        from app.jobs.queue import poll_job
+        from app.jobs.queue import release_jobs
         
-        jobs_this_run = 0
+        jobs_started = 0
+        queue_drained = False
+        batch: deque = deque()
+        in_flight: Dict[Future, Any] = {}
+        busy_families: Set[str] = set()
         
-        # 0 = unlimited jobs
-        while self.running and (MAX_JOBS_PER_RUN == 0 or jobs_this_run < MAX_JOBS_PER_RUN):
-            # Check time budget before polling (skipped if no deadline)
-            if not self._check_deadline():
-                break
-            
-            try:
-                job = poll_job(self.worker_id)
-            except Exception as e:
-                log_event("poll_error", error=str(e), error_type=type(e).__name__)
-                # Exit on poll error, don't retry
-                break
-            
-            if job is None:
-                # No jobs available - exit immediately, no sleep-retry
-                log_event("no_jobs_available", action="exiting")
-                break
-            
-            # Check time budget before processing
-            if not self._check_deadline():
-                # Return job to queue (it was leased but we can't process)
-                log_event(
-                    "job_returned",
-                    job_id=job.id,
-                    reason="deadline_reached",
-                )
-                # Job will be reclaimed by watchdog after lease expires
-                break
-            
-            success = self._process_job(job)
+        # Jobs can wait in the local batch longer than a lease when leased
+        # in batches or held back behind a busy family
+        batch_heartbeat = None
+        if POLL_BATCH_SIZE > 1 or WORKER_CONCURRENCY > 1:
+            batch_heartbeat = BatchLeaseHeartbeat(self.worker_id)
+            batch_heartbeat.start()
+        
+        pool = ThreadPoolExecutor(
+            max_workers=WORKER_CONCURRENCY,
+            thread_name_prefix="catalog-job",
+        )
+        
+        try:
+            while True:
+                # Fill free slots (0 = unlimited jobs)
+                while (
+                    self.running
+                    and len(in_flight) < WORKER_CONCURRENCY
+                    and (MAX_JOBS_PER_RUN == 0 or jobs_started < MAX_JOBS_PER_RUN)
+                ):
+                    # Check time budget before polling or starting (skipped if no deadline)
+                    if not self._check_deadline():
+                        self.running = False
+                        break
+                    
+                    job = self._take_runnable(batch, busy_families)
+                    
+                    if job is None:
+                        # Batch is empty or everything in it waits on a busy
+                        # family; lease more, but keep at most
+                        # WORKER_CONCURRENCY blocked jobs waiting locally
+                        if queue_drained or len(batch) >= WORKER_CONCURRENCY:
+                            break
+                        
+                        try:
+                            leased = self._poll(jobs_started + len(batch))
+                        except Exception as e:
+                            log_event("poll_error", error=str(e), error_type=type(e).__name__)
+                            # Stop polling on poll error, don't retry
+                            queue_drained = True
+                            break
+                        
+                        if not leased:
+                            # No jobs available - stop polling, no sleep-retry
+                            log_event("no_jobs_available", action="exiting")
+                            queue_drained = True
+                            break
+                        
+                        batch.extend(leased)
+                        if batch_heartbeat:
+                            batch_heartbeat.add(job.id for job in leased)
+                            if len(leased) > 1:
+                                log_event("batch_leased", job_count=len(leased))
+                        continue
+                    
+                    if batch_heartbeat and not batch_heartbeat.claim(job.id):
+                        log_event("job_lease_lost", job_id=job.id, reason="lease_lost_in_batch")
+                        continue
+                    
+                    lock_key = self._lock_key(job)
+                    if lock_key:
+                        busy_families.add(lock_key)
+                    in_flight[pool.submit(self._process_job, job)] = job
+                    jobs_started += 1
+                
+                if not in_flight:
+                    break
+                
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = in_flight.pop(future)
+                    lock_key = self._lock_key(job)
+                    if lock_key:
+                        busy_families.discard(lock_key)
+                    
+                    try:
+                        success = future.result()
+                    except Exception as e:
+                        # _process_job handles its own errors; this is a safety net
+                        log_event("job_exception", job_id=job.id, error=str(e),
+                                  error_type=type(e).__name__)
+                        success = False
+                    
+                    with self._state_lock:
+                        if success:
+                            self.jobs_processed += 1
+                        else:
+                            self.jobs_failed += 1
+        finally:
+            pool.shutdown(wait=True)
             
-            if success:
-                self.jobs_processed += 1
-            else:
-                self.jobs_failed += 1
+            if batch_heartbeat:
+                batch_heartbeat.stop()
             
-            jobs_this_run += 1
+            # Hand unprocessed leases back instead of waiting for the watchdog
+            if batch:
+                job_ids = [job.id for job in batch]
+                for job_id in job_ids:
+                    log_event("job_returned", job_id=job_id, reason="worker_stopping")
+                released = release_jobs(job_ids, self.worker_id)
+                log_event("batch_released", job_ids=job_ids, released=released)
+    
+    def _lock_key(self, job) -> Optional[str]:
+        """Family slug that serialises this job locally, if it takes a family lock."""
+        if job.payload.family_slug and self._job_needs_lock(job.type):
+            return job.payload.family_slug
+        return None
+    
+    def _take_runnable(self, batch: deque, busy_families: Set[str]):
+        """
+        Pop the first job in the batch whose family is not busy.
+        
+        Jobs behind a busy family keep their place, so queue order is
+        preserved within each family.
+        
+        Returns:
+            Job to start, or None if the batch is empty or fully blocked
+        """
+        for idx, job in enumerate(batch):
+            lock_key = self._lock_key(job)
+            if lock_key and lock_key in busy_families:
+                continue
+            del batch[idx]
+            return job
+        return None
+    
+    def _poll(self, jobs_claimed: int) -> List[Any]:
+        """
+        Lease the next job(s), honouring POLL_BATCH_SIZE and MAX_JOBS_PER_RUN.
+        
+        Args:
+            jobs_claimed: Jobs already started or waiting in the local batch
+        
+        Returns:
+            Leased jobs in queue order (empty if none available, or if
+            jobs_claimed already covers MAX_JOBS_PER_RUN)
+        """
+        from app.jobs.queue import poll_job, poll_jobs
+        
+        remaining = MAX_JOBS_PER_RUN - jobs_claimed if MAX_JOBS_PER_RUN > 0 else POLL_BATCH_SIZE
+        if remaining <= 0:
+            # poll_jobs would clamp to 1 and lease a job this run never starts
+            return []
+        
+        if POLL_BATCH_SIZE <= 1:
+            job = poll_job(self.worker_id)
+            return [job] if job else []
+        
+        return poll_jobs(self.worker_id, min(POLL_BATCH_SIZE, remaining))
     
     def _process_job(self, job) -> bool:
         """
@@ -288,6 +505,7 @@ class CatalogWorker:
         )
         from app.jobs.models import JobStatus
         from app.jobs.executor import execute_job
+        from app.jobs.progress import shard_progress_counts
         from app.jobs.context import JobContext, set_current_job_context, clear_current_job_context
         
         job_id = job.id
@@ -296,7 +514,8 @@ class CatalogWorker:
         mode = job.payload.mode
         attempt = job.attempts
         
-        self._current_job_id = job_id
+        with self._state_lock:
+            self._current_job_ids.add(job_id)
         start_time = time.time()
         
         log_event(
@@ -387,6 +606,10 @@ class CatalogWorker:
                     "mode": mode,
                     "applied": result.get("apply_result", {}).get("applied_count", 0) if isinstance(result.get("apply_result"), dict) else 0,
                 }
+                # Shard counts feed the parent's catalog_job_progress doc
+                shard_counts = shard_progress_counts(result)
+                if shard_counts:
+                    minimal_summary["shard_result"] = shard_counts
                 
                 complete_job(job_id, self.worker_id, final_status, minimal_summary)
                 
@@ -465,7 +688,8 @@ class CatalogWorker:
             
             # Clear context
             clear_current_job_context()
-            self._current_job_id = None
+            with self._state_lock:
+                self._current_job_ids.discard(job_id)
     
     def _job_needs_lock(self, job_type) -> bool:
         """Check if job type requires family lock."""
@@ -48,11 +48,15 @@ def track_usage(
     completion_tokens: int,
     total_tokens: int,
     thinking_tokens: Optional[int] = None,
+    cached_tokens: Optional[int] = None,
 ) -> None:
     """Write a single usage record to Firestore.
 
     All parameters are keyword-only to prevent positional mistakes.
     Silently returns on any error so the caller's hot path is never affected.
+
+    ``cached_tokens`` is the part of ``prompt_tokens`` served from context
+    cache; the uncached part is ``prompt_tokens - cached_tokens``.
     """
     if not TRACKING_ENABLED:
         return
@@ -71,6 +75,7 @@ def track_usage(
             "prompt_tokens": prompt_tokens,
             "completion_tokens": completion_tokens,
             "thinking_tokens": thinking_tokens,
+            "cached_tokens": cached_tokens,
             "total_tokens": total_tokens,
             "created_at": _fs.SERVER_TIMESTAMP,
         })
@@ -93,6 +98,7 @@ def extract_usage_from_genai_response(response) -> Dict[str, Any]:
         "completion_tokens": getattr(meta, "candidates_token_count", 0) or 0,
         "total_tokens": getattr(meta, "total_token_count", 0) or 0,
         "thinking_tokens": getattr(meta, "thoughts_token_count", None),
+        "cached_tokens": getattr(meta, "cached_content_token_count", None),
     }
 
 
@@ -106,6 +112,7 @@ def extract_usage_from_vertex_response(response) -> Dict[str, Any]:
         "completion_tokens": getattr(meta, "candidates_token_count", 0) or 0,
         "total_tokens": getattr(meta, "total_token_count", 0) or 0,
         "thinking_tokens": getattr(meta, "thoughts_token_count", None),
+        "cached_tokens": getattr(meta, "cached_content_token_count", None),
     }
 
 
@@ -5,6 +5,7 @@ Provides API endpoints for monitoring:
 - Cloud Scheduler jobs (next run times)
 - Cloud Run Jobs (execution status, manual triggers)
 - Firestore job queue (pending/running jobs)
+- Fan-out progress (catalog_job_progress, one doc per parent job)
 - Cloud Logging (real-time log streaming)
 
 Run locally:
@@ -220,7 +221,8 @@ def get_queue_stats():
     try:
         db = get_firestore_client()
         
-        # Count jobs by status
+        # Count jobs by status (server-side count() aggregations: exact at any
+        # queue depth, one read per 1,000 matching jobs instead of one per job)
         status_counts = {}
         statuses = ['queued', 'leased', 'running', 'succeeded', 'succeeded_dry_run', 
                     'failed', 'needs_review', 'deadletter']
@@ -228,10 +230,11 @@ def get_queue_stats():
         for status in statuses:
             query = db.collection('catalog_jobs').where(
                 filter=firestore.FieldFilter('status', '==', status)
-            ).limit(1000)
-            docs = list(query.stream())
-            if docs:
-                status_counts[status] = len(docs)
+            )
+            result = query.count(alias='count').get()
+            count = int(result[0][0].value) if result else 0
+            if count:
+                status_counts[status] = count
         
         # Get recent jobs
         recent_jobs = []
@@ -272,6 +275,61 @@ def get_queue_stats():
         }), 500
 
 
+def _summarize_progress(doc_id, data, now):
+    """Progress doc plus percent/ETA (same derivation as app/jobs/progress.py)."""
+    total = data.get('children_total') or 0
+    done = data.get('children_done') or 0
+    started = data.get('started_at')
+    elapsed = max(0.0, (now - started).total_seconds()) if started else None
+    eta = None
+    if done >= total:
+        eta = 0
+    elif done and elapsed is not None:
+        eta = round(elapsed / done * (total - done))
+    return {
+        'parent_job_id': doc_id,
+        'children_total': total,
+        'children_done': done,
+        'children_failed': data.get('children_failed', 0),
+        'exercises_total': data.get('exercises_total', 0),
+        'succeeded': data.get('succeeded', 0),
+        'failed': data.get('failed', 0),
+        'no_changes': data.get('no_changes', 0),
+        'tokens_used': data.get('tokens_used', 0),
+        'percent': round(100.0 * done / total, 1) if total else 100.0,
+        'complete': done >= total,
+        'eta_secs': eta,
+        'started_at': started.isoformat() if started else None,
+        'updated_at': data.get('updated_at').isoformat() if data.get('updated_at') else None,
+    }
+
+
+@app.route('/api/firestore/progress')
+def get_job_progress():
+    """Get recent fan-out runs from catalog_job_progress (one read per run)."""
+    try:
+        db = get_firestore_client()
+        limit = int(request.args.get('limit', 10))
+        now = datetime.now(timezone.utc)
+        
+        query = db.collection('catalog_job_progress').order_by(
+            'updated_at', direction=firestore.Query.DESCENDING
+        ).limit(limit)
+        
+        runs = [_summarize_progress(doc.id, doc.to_dict(), now) for doc in query.stream()]
+        
+        return jsonify({
+            'success': True,
+            'runs': runs,
+            'timestamp': now.isoformat(),
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+        }), 500
+
+
 @app.route('/api/firestore/run-history')
 def get_run_history():
     """Get recent run history from catalog_run_history."""